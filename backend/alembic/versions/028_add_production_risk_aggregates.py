@@ -0,0 +1,48 @@
+"""Add production_risk_aggregates table and index recommendations.closed_at.
+
+Revision ID: 028
+Revises: 027
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "028"
+down_revision: Union[str, None] = "027"
+branch_labels: Union[Sequence[str], None] = None
+depends_on: Union[Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Running drawdown/streak aggregates; filled on first read or by app/scripts/rebuild_risk_aggregates.py
+    op.create_table(
+        "production_risk_aggregates",
+        sa.Column("scope", sa.String(length=32), nullable=False),
+        sa.Column("closed_trades", sa.Integer(), nullable=True),
+        sa.Column("equity_trades", sa.Integer(), nullable=True),
+        sa.Column("winning_trades", sa.Integer(), nullable=True),
+        sa.Column("losing_trades", sa.Integer(), nullable=True),
+        sa.Column("current_equity", sa.Float(), nullable=True),
+        sa.Column("peak_equity", sa.Float(), nullable=True),
+        sa.Column("max_drawdown", sa.Float(), nullable=True),
+        sa.Column("current_winning_streak", sa.Integer(), nullable=True),
+        sa.Column("current_losing_streak", sa.Integer(), nullable=True),
+        sa.Column("longest_winning_streak", sa.Integer(), nullable=True),
+        sa.Column("longest_losing_streak", sa.Integer(), nullable=True),
+        sa.Column("last_closed_at", sa.DateTime(), nullable=True),
+        sa.Column("last_recommendation_id", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("scope"),
+    )
+    # Closed-trade scans (rolling 24h counts, latest trades) order and filter by closed_at
+    op.create_index("ix_recommendations_closed_at", "recommendations", ["closed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recommendations_closed_at", table_name="recommendations")
+    op.drop_table("production_risk_aggregates")
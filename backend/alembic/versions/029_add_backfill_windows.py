@@ -0,0 +1,47 @@
+"""Add backfill_windows work queue for resumable backfills.
+
+Revision ID: 029
+Revises: 028
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "029"
+down_revision: Union[str, None] = "028"
+branch_labels: Union[Sequence[str], None] = None
+depends_on: Union[Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per backfill window; app/data/backfill_engine.py resumes from the pending/failed ones
+    op.create_table(
+        "backfill_windows",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("job_key", sa.String(length=64), nullable=False),
+        sa.Column("symbol", sa.String(length=32), nullable=False),
+        sa.Column("interval", sa.String(length=16), nullable=False),
+        sa.Column("partition", sa.String(length=16), nullable=False),
+        sa.Column("window_start", sa.DateTime(), nullable=False),
+        sa.Column("window_end", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=True),
+        sa.Column("rows", sa.Integer(), nullable=True),
+        sa.Column("error", sa.String(length=255), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("job_key", "window_start", name="uq_backfill_windows_job_start"),
+    )
+    op.create_index("ix_backfill_windows_job_key", "backfill_windows", ["job_key"])
+    op.create_index("ix_backfill_windows_status", "backfill_windows", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_backfill_windows_status", table_name="backfill_windows")
+    op.drop_index("ix_backfill_windows_job_key", table_name="backfill_windows")
+    op.drop_table("backfill_windows")
@@ -14,7 +14,7 @@ from app.core.database import SessionLocal
 from app.db.models import PerformancePeriodicORM, PeriodicHorizon
 from app.services.worm_storage import store_artifact
 from app.core.config import settings
-from app.utils.cache import get_cached, set_cached
+from app.utils.cache import get_response_cache
 from app.utils.async_timeout import with_timeout, ProcessingResponse
 import time
 
@@ -99,12 +99,8 @@ async def compute_livelihood(payload: LivelihoodRequest) -> LivelihoodResponse:
         payload.horizon_months,
         payload.ruin_threshold,
     )
-    cached_result = get_cached("analytics_livelihood", ttl_seconds=300.0, *cache_key_args)
-    if cached_result:
-        duration = time.time() - start_time
-        ENDPOINT_RESPONSE_TIME.labels(endpoint="/analytics/livelihood", status="cached").observe(duration)
-        return LivelihoodResponse(**cached_result)
-    
+    computed = False
+
     # Execute with timeout (20 seconds max)
     async def compute():
         series = pd.Series(payload.monthly_returns)
@@ -115,19 +111,27 @@ async def compute_livelihood(payload: LivelihoodRequest) -> LivelihoodResponse:
             "survival": survival,
             "scenarios": [s.__dict__ for s in scenarios],
         }
-    
-    result = await with_timeout(compute, timeout_seconds=20.0, timeout_message="Livelihood computation timed out")
-    if result is None:
-        # Return processing response if timeout
-        processing = ProcessingResponse(
-            operation_id=f"livelihood_{int(time.time())}",
-            message="Computation is taking longer than expected. Please retry in a few moments.",
-            estimated_seconds=30.0,
-        )
-        raise HTTPException(status_code=202, detail=processing.to_dict())
-    
-    # Cache result
-    set_cached("analytics_livelihood", result, ttl_seconds=300.0, *cache_key_args)
+
+    async def compute_with_timeout():
+        nonlocal computed
+        computed = True
+        result = await with_timeout(compute, timeout_seconds=20.0, timeout_message="Livelihood computation timed out")
+        if result is None:
+            # Return processing response if timeout (raised, so it is not cached)
+            processing = ProcessingResponse(
+                operation_id=f"livelihood_{int(time.time())}",
+                message="Computation is taking longer than expected. Please retry in a few moments.",
+                estimated_seconds=30.0,
+            )
+            raise HTTPException(status_code=202, detail=processing.to_dict())
+        return result
+
+    # Identical concurrent requests share one simulation
+    result = await get_response_cache().aget_or_compute("analytics_livelihood", compute_with_timeout, *cache_key_args)
+    if not computed:
+        duration = time.time() - start_time
+        ENDPOINT_RESPONSE_TIME.labels(endpoint="/analytics/livelihood", status="cached").observe(duration)
+        return LivelihoodResponse(**result)
     
     duration = time.time() - start_time
     ENDPOINT_RESPONSE_TIME.labels(endpoint="/analytics/livelihood", status="success").observe(duration)
@@ -1,13 +1,18 @@
 """Export endpoints for recommendations with audit trail."""
+import csv
+import hashlib
 import io
 import json
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from itertools import islice
 from typing import Any
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from fastapi import APIRouter, Query, Response, HTTPException, Header
 from fastapi.responses import StreamingResponse
-from sqlalchemy import and_, select, desc, case, func
+from sqlalchemy import and_, or_, select, desc, case, func
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
@@ -16,7 +21,7 @@ from app.core.logging import logger
 from app.db.crud import get_recommendation_history
 from app.db.models import ExportAuditORM, RecommendationORM
 from app.models.audit import ExportAuditRequest, ExportAuditResponse
-from app.utils.hashing import calculate_file_md5, calculate_file_sha256, calculate_params_hash
+from app.utils.hashing import calculate_file_sha256, calculate_params_hash
 
 router = APIRouter()
 
@@ -174,73 +179,300 @@ def _recommendation_to_dict(rec: RecommendationORM, cumulative_equity: float = 1
     return base_dict
 
 
-def _export_to_csv(recommendations: list[RecommendationORM]) -> bytes:
-    """Export recommendations to CSV format."""
-    cumulative_equity = 1.0
-    data = []
-    for rec in recommendations:
-        data.append(_recommendation_to_dict(rec, cumulative_equity))
-        # Update cumulative equity for next iteration
-        if rec.exit_price_pct is not None:
-            cumulative_equity *= (1 + (rec.exit_price_pct / 100.0))
-    df = pd.DataFrame(data)
+# Columns read for export; the remaining wide columns are never loaded
+EXPORT_SOURCE_COLUMNS = (
+    "id",
+    "date",
+    "signal",
+    "entry_min",
+    "entry_max",
+    "entry_optimal",
+    "stop_loss",
+    "take_profit",
+    "stop_loss_pct",
+    "take_profit_pct",
+    "confidence",
+    "confidence_calibrated",
+    "current_price",
+    "market_timestamp",
+    "spot_source",
+    "status",
+    "opened_at",
+    "closed_at",
+    "exit_reason",
+    "exit_price",
+    "exit_price_pct",
+    "code_commit",
+    "dataset_version",
+    "params_digest",
+    "created_at",
+    "indicators",
+    "risk_metrics",
+    "factors",
+    "signal_breakdown",
+    "analysis",
+    "snapshot_json",
+)
+
+# Rows fetched per keyset page and written per CSV chunk / parquet row group
+EXPORT_BATCH_SIZE = 500
+
+_JSON_EXPORT_COLUMNS = ("indicators", "risk_metrics", "factors", "signal_breakdown", "fill_quality")
+
+EXPORT_PARQUET_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("date", pa.string()),
+        ("signal", pa.string()),
+        ("entry_min", pa.float64()),
+        ("entry_max", pa.float64()),
+        ("entry_optimal", pa.float64()),
+        ("stop_loss", pa.float64()),
+        ("take_profit", pa.float64()),
+        ("stop_loss_pct", pa.float64()),
+        ("take_profit_pct", pa.float64()),
+        ("confidence", pa.float64()),
+        ("confidence_calibrated", pa.float64()),
+        ("current_price", pa.float64()),
+        ("market_timestamp", pa.string()),
+        ("spot_source", pa.string()),
+        ("status", pa.string()),
+        ("opened_at", pa.string()),
+        ("closed_at", pa.string()),
+        ("exit_reason", pa.string()),
+        ("exit_price", pa.float64()),
+        ("exit_price_pct", pa.float64()),
+        ("code_commit", pa.string()),
+        ("dataset_version", pa.string()),
+        ("params_digest", pa.string()),
+        ("created_at", pa.string()),
+        ("indicators", pa.string()),
+        ("risk_metrics", pa.string()),
+        ("factors", pa.string()),
+        ("signal_breakdown", pa.string()),
+        ("analysis", pa.string()),
+        ("tracking_error_pct", pa.float64()),
+        ("tracking_error_bps", pa.float64()),
+        ("equity_realistic", pa.float64()),
+        ("fill_quality", pa.string()),
+        ("orderbook_fallback_count", pa.int64()),
+        ("snapshot_hash", pa.string()),
+        ("snapshot_has_worm", pa.bool_()),
+    ]
+)
+EXPORT_FIELDS = tuple(EXPORT_PARQUET_SCHEMA.names)
+
+
+def _flatten_json(value: Any) -> str:
+    return json.dumps(value) if isinstance(value, dict) else (str(value) if value else "")
+
+
+def _as_int(value: Any) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
 
-    # Flatten nested JSON columns
-    for col in ["indicators", "risk_metrics", "factors", "signal_breakdown", "fill_quality"]:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: json.dumps(x) if isinstance(x, dict) else (str(x) if x else ""))
 
-    buffer = io.BytesIO()
-    df.to_csv(buffer, index=False, encoding="utf-8")
-    return buffer.getvalue()
+def _batched(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
-def _export_to_parquet(recommendations: list[RecommendationORM]) -> bytes:
-    """Export recommendations to Parquet format."""
+def _iter_export_rows(db: Session, filters: dict[str, Any], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Any]:
+    """
+    Filtered recommendations, newest first, fetched in keyset-paginated pages.
+
+    Each page is a fresh ``(created_at, id) <`` seek on the projected columns,
+    so memory stays bounded by ``batch_size`` whatever the export size.
+    """
+    columns = [getattr(RecommendationORM, name) for name in EXPORT_SOURCE_COLUMNS]
+    base = _apply_filters(select(*columns), {k: v for k, v in filters.items() if k != "limit"})
+    remaining = filters.get("limit")
+    last_key: tuple[datetime, int] | None = None
+    while remaining is None or remaining > 0:
+        page_size = batch_size if remaining is None else min(batch_size, remaining)
+        query = base.order_by(desc(RecommendationORM.created_at), desc(RecommendationORM.id))
+        if last_key is not None:
+            created_at, rec_id = last_key
+            query = query.where(
+                or_(
+                    RecommendationORM.created_at < created_at,
+                    and_(RecommendationORM.created_at == created_at, RecommendationORM.id < rec_id),
+                )
+            )
+        page = db.execute(query.limit(page_size)).all()
+        if not page:
+            return
+        yield from page
+        last_key = (page[-1].created_at, page[-1].id)
+        if remaining is not None:
+            remaining -= len(page)
+        if len(page) < page_size:
+            return
+
+
+class _ExportStats:
+    """Counts and provenance metadata accumulated while rows stream out."""
+
+    def __init__(self) -> None:
+        self.record_count = 0
+        self.has_execution_metrics = 0
+        self.has_tracking_error = 0
+        self._values: dict[str, set[str]] = {"commit_hash": set(), "dataset_hash": set(), "params_hash": set()}
+
+    def add(self, rec: Any) -> None:
+        self.record_count += 1
+        if rec.snapshot_json and "execution_stats" in rec.snapshot_json:
+            self.has_execution_metrics += 1
+        if rec.exit_price and rec.exit_reason:
+            self.has_tracking_error += 1
+        # Distinct values stay tiny: one per deployed commit/dataset/params version
+        for key, value in (
+            ("commit_hash", rec.code_commit),
+            ("dataset_hash", rec.dataset_version),
+            ("params_hash", rec.params_digest),
+        ):
+            if value and len(self._values[key]) < 2:
+                self._values[key].add(value)
+
+    @property
+    def metadata(self) -> dict[str, str]:
+        metadata: dict[str, str] = {}
+        for key, values in self._values.items():
+            if len(values) == 1:
+                metadata[key] = next(iter(values))
+            elif values:
+                metadata[key] = "multiple"
+        return metadata
+
+
+def _export_records(rows: Iterable[Any], stats: _ExportStats) -> Iterator[dict[str, Any]]:
+    """Export dicts with the running realistic equity, flattened for CSV/parquet."""
     cumulative_equity = 1.0
-    data = []
-    for rec in recommendations:
-        data.append(_recommendation_to_dict(rec, cumulative_equity))
+    for rec in rows:
+        stats.add(rec)
+        record = _recommendation_to_dict(rec, cumulative_equity)
         # Update cumulative equity for next iteration
         if rec.exit_price_pct is not None:
             cumulative_equity *= (1 + (rec.exit_price_pct / 100.0))
-    df = pd.DataFrame(data)
-
-    # Convert nested dicts to JSON strings for parquet
-    for col in ["indicators", "risk_metrics", "factors", "signal_breakdown", "fill_quality"]:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: json.dumps(x) if isinstance(x, dict) else (str(x) if x else ""))
-
-    buffer = io.BytesIO()
-    df.to_parquet(buffer, index=False, engine="pyarrow", compression="snappy")
-    return buffer.getvalue()
-
-
-def _get_metadata_from_recommendations(recommendations: list[RecommendationORM]) -> dict[str, str]:
-    """Extract metadata from recommendations."""
-    metadata: dict[str, str] = {}
-
-    # Get unique values
-    commits = {rec.code_commit for rec in recommendations if rec.code_commit}
-    dataset_versions = {rec.dataset_version for rec in recommendations if rec.dataset_version}
-    params_digests = {rec.params_digest for rec in recommendations if rec.params_digest}
-
-    if len(commits) == 1:
-        metadata["commit_hash"] = list(commits)[0]
-    elif commits:
-        metadata["commit_hash"] = "multiple"
-
-    if len(dataset_versions) == 1:
-        metadata["dataset_hash"] = list(dataset_versions)[0]
-    elif dataset_versions:
-        metadata["dataset_hash"] = "multiple"
+        for col in _JSON_EXPORT_COLUMNS:
+            record[col] = _flatten_json(record[col])
+        record["orderbook_fallback_count"] = _as_int(record["orderbook_fallback_count"])
+        yield record
+
+
+def _iter_csv_chunks(records: Iterable[dict[str, Any]], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """CSV header then one encoded chunk per batch of records."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for batch in _batched(records, batch_size):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose written bytes are drained between row groups."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_parquet_chunks(records: Iterable[dict[str, Any]], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Parquet file written one row group per batch, yielding bytes as they are produced."""
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, EXPORT_PARQUET_SCHEMA, compression="snappy") as writer:
+        for batch in _batched(records, batch_size):
+            writer.write_table(pa.Table.from_pylist(batch, schema=EXPORT_PARQUET_SCHEMA))
+            if chunk := sink.drain():
+                yield chunk
+    # Footer (and the schema-only file of an empty export) is written on close
+    if chunk := sink.drain():
+        yield chunk
+
+
+def _stream_export(filters: dict[str, Any], export_format: str, audit_id: int, exported_by: str) -> Iterator[bytes]:
+    """
+    Encoded export chunks; hashes and counts are accumulated as they are sent
+    and written to the audit record once the stream ends.
+    """
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    size = 0
+    stats = _ExportStats()
+    status = "aborted"
+    try:
+        with SessionLocal() as db:
+            records = _export_records(_iter_export_rows(db, filters, EXPORT_BATCH_SIZE), stats)
+            write_chunks = _iter_csv_chunks if export_format == "csv" else _iter_parquet_chunks
+            chunks = write_chunks(records, EXPORT_BATCH_SIZE)
+            for chunk in chunks:
+                sha256.update(chunk)
+                md5.update(chunk)
+                size += len(chunk)
+                yield chunk
+        status = "complete"
+    except Exception as e:
+        status = "failed"
+        logger.error(f"Error streaming recommendations export {audit_id}: {e}", exc_info=True)
+        raise
+    finally:
+        _finalize_export_audit(
+            audit_id,
+            status=status,
+            record_count=stats.record_count,
+            file_hash=sha256.hexdigest(),
+            md5_hash=md5.hexdigest(),
+            file_size_bytes=size,
+            export_params={
+                **stats.metadata,
+                "exported_by": exported_by,
+                "has_execution_metrics": stats.has_execution_metrics,
+                "has_tracking_error": stats.has_tracking_error,
+            },
+        )
 
-    if len(params_digests) == 1:
-        metadata["params_hash"] = list(params_digests)[0]
-    elif params_digests:
-        metadata["params_hash"] = "multiple"
 
-    return metadata
+def _finalize_export_audit(audit_id: int, *, status: str, md5_hash: str, export_params: dict[str, Any], **fields: Any) -> None:
+    try:
+        with SessionLocal() as db:
+            audit = db.get(ExportAuditORM, audit_id)
+            if audit is None:
+                return
+            for name, value in fields.items():
+                setattr(audit, name, value)
+            audit.export_params = {**export_params, "status": status, "md5": md5_hash}
+            db.commit()
+        logger.info(
+            f"Export audit recorded: {audit_id}, {fields.get('record_count')} records, status={status}, "
+            f"user={export_params.get('exported_by')}"
+        )
+    except Exception as e:
+        logger.error(f"Failed to finalize export audit {audit_id}: {e}", exc_info=True)
 
 
 @router.get("/export")
@@ -258,8 +490,11 @@ async def export_recommendations(
     """
     Export recommendations with filters and audit trail.
 
-    Returns CSV or Parquet file with Content-Disposition and Content-MD5 headers.
-    Includes metadata: commit_hash, dataset_hash, params_hash.
+    Streams a CSV or Parquet file (newest first) with a Content-Disposition
+    header. The audit record is created up front (``X-Export-Audit-Id``) and
+    completed when the stream ends with the record count, size, SHA-256/MD5 and
+    metadata (commit_hash, dataset_hash, params_hash); see ``/export/audit``
+    and ``/export/manifest``.
     """
     filters: dict[str, Any] = {
         "date_from": date_from,
@@ -273,81 +508,48 @@ async def export_recommendations(
 
     # Remove None values
     filters = {k: v for k, v in filters.items() if v is not None}
+    exported_by = x_user_id or "anonymous"
 
     try:
         with SessionLocal() as db:
-            # Build query
-            query = select(RecommendationORM).order_by(desc(RecommendationORM.created_at))
-
-            # Apply filters
-            query = _apply_filters(query, filters)
-
-            # Execute query
-            recommendations = list(db.execute(query).scalars().all())
-
-            if not recommendations:
+            exists_query = _apply_filters(select(RecommendationORM.id), {k: v for k, v in filters.items() if k != "limit"})
+            if db.execute(exists_query.limit(1)).first() is None:
                 raise HTTPException(status_code=404, detail="No recommendations found matching filters")
 
-            # Export to requested format
-            if format == "csv":
-                content = _export_to_csv(recommendations)
-                media_type = "text/csv"
-                file_ext = "csv"
-            else:  # parquet
-                content = _export_to_parquet(recommendations)
-                media_type = "application/octet-stream"
-                file_ext = "parquet"
-
-            # Calculate hashes
-            md5_hash = calculate_file_md5(content)
-            sha256_hash = calculate_file_sha256(content)
-
-            # Get metadata
-            metadata = _get_metadata_from_recommendations(recommendations)
-
-            # Create audit record with user tracking
+            # Create audit record with user tracking; hashes are filled in once streamed
             export_audit = ExportAuditORM(
                 filters=filters,
                 format=format,
-                record_count=len(recommendations),
-                file_hash=sha256_hash,
-                file_size_bytes=len(content),
-                export_params={**metadata, "exported_by": x_user_id or "anonymous"},
+                record_count=0,
+                file_hash="",
+                file_size_bytes=0,
+                export_params={"exported_by": exported_by, "status": "streaming"},
                 exported_by=x_user_id or settings.DEFAULT_USER_ID,
             )
             db.add(export_audit)
             db.commit()
-            logger.info(f"Export audit recorded: {export_audit.id}, {len(recommendations)} records, format={format}, user={x_user_id or 'anonymous'}")
-
-            # Generate filename
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            filename = f"recommendations_{timestamp}.{file_ext}"
-
-            # Count recommendations with execution metrics
-            has_execution_metrics = sum(1 for rec in recommendations if rec.snapshot_json and "execution_stats" in rec.snapshot_json)
-            has_tracking_error = sum(1 for rec in recommendations if rec.exit_price and rec.exit_reason)
-            
-            # Create response with headers
-            return Response(
-                content=content,
-                media_type=media_type,
-                headers={
-                    "Content-Disposition": f'attachment; filename="{filename}"',
-                    "Content-MD5": md5_hash,
-                    "X-Export-Metadata": str(metadata),
-                    "X-Export-Record-Count": str(len(recommendations)),
-                    "X-Export-File-Hash": sha256_hash,
-                    "X-Export-Audit-Id": str(export_audit.id),
-                    "X-Export-Has-Execution-Metrics": str(has_execution_metrics),
-                    "X-Export-Has-Tracking-Error": str(has_tracking_error),
-                },
-            )
+            audit_id = export_audit.id
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error exporting recommendations: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
+    # Generate filename
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    file_ext = "csv" if format == "csv" else "parquet"
+    filename = f"recommendations_{timestamp}.{file_ext}"
+
+    # The sync generator runs in the threadpool, off the event loop
+    return StreamingResponse(
+        _stream_export(filters, format, audit_id, exported_by),
+        media_type="text/csv" if format == "csv" else "application/octet-stream",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Export-Audit-Id": str(audit_id),
+        },
+    )
+
 
 @router.get("/export/audit", response_model=list[ExportAuditResponse])
 async def get_export_audit(limit: int = Query(100, ge=1, le=1000)) -> list[ExportAuditResponse]:
@@ -408,7 +610,8 @@ async def get_export_manifest(
                     "verification": {
                         "hash_algorithm": "SHA-256",
                         "hash": audit.file_hash,
-                        "can_verify": True,
+                        # Aborted or in-flight streams have no hash of a complete file
+                        "can_verify": (audit.export_params or {}).get("status", "complete") == "complete",
                     },
                 }
                 for audit in audits
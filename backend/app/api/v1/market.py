@@ -5,7 +5,7 @@ import time
 from fastapi import APIRouter, HTTPException
 
 from app.services.market_service import MarketService
-from app.utils.cache import get_cached, set_cached
+from app.utils.cache import get_response_cache
 from app.observability.metrics import ENDPOINT_RESPONSE_TIME
 
 router = APIRouter()
@@ -19,18 +19,16 @@ async def get_market_data(interval: Interval):
     """
     Get market data for a specific interval with chart-ready data.
     
-    Results are cached for 60 seconds to reduce load on data curation layer.
+    Results are cached for 60 seconds (then served stale for up to 30 seconds
+    while one refresh runs) to reduce load on data curation layer; concurrent
+    misses share a single computation.
     """
     start_time = time.time()
-    
-    # Check cache
-    cached_result = get_cached("market_data", interval=interval, ttl_seconds=60.0)
-    if cached_result:
-        duration = time.time() - start_time
-        ENDPOINT_RESPONSE_TIME.labels(endpoint=f"/market/{interval}", status="cached").observe(duration)
-        return cached_result
-    
-    try:
+    computed = False
+
+    async def compute() -> dict:
+        nonlocal computed
+        computed = True
         data = await market_service.get_market_data(interval)
         # Add recent candles for charting if available
         df = market_service.curation.get_latest_curated(interval)
@@ -50,12 +48,13 @@ async def get_market_data(interval: Interval):
             # Ensure data key exists even if no candles
             if "data" not in data:
                 data["data"] = []
-        
-        # Cache result
-        set_cached("market_data", data, interval=interval, ttl_seconds=60.0)
-        
+        return data
+
+    try:
+        data = await get_response_cache().aget_or_compute("market_data", compute, interval=interval)
         duration = time.time() - start_time
-        ENDPOINT_RESPONSE_TIME.labels(endpoint=f"/market/{interval}", status="success").observe(duration)
+        status = "success" if computed else "cached"
+        ENDPOINT_RESPONSE_TIME.labels(endpoint=f"/market/{interval}", status=status).observe(duration)
         
         return data
     except Exception as e:
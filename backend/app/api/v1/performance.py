@@ -13,6 +13,7 @@ from app.services.monitoring_service import ContinuousMonitoringService
 from app.services.performance_service import get_performance_service
 from app.services.kpis_reporting_service import KPIsReportingService
 from app.core.logging import logger
+from app.utils.cache import get_response_cache
 
 router = APIRouter()
 performance_service = get_performance_service()
@@ -25,11 +26,17 @@ async def _background_backfill_summary(*, allow_stale_inputs: bool = False) -> N
     Background task to refresh performance summary cache.
     
     This runs asynchronously after the HTTP response is sent, ensuring
-    UI requests never block on full backtest execution.
+    UI requests never block on full backtest execution. Concurrent requests
+    enqueue at most one backtest: later tasks join the in-flight run, and a
+    run that finished within the ``performance_backfill`` TTL is not repeated.
     """
     try:
         service = get_performance_service()
-        summary = await service._run_backtest_and_cache(allow_stale_inputs=allow_stale_inputs)
+        summary = await get_response_cache().aget_or_compute(
+            "performance_backfill",
+            lambda: service._run_backtest_and_cache(allow_stale_inputs=allow_stale_inputs),
+            allow_stale_inputs=allow_stale_inputs,
+        )
         if summary:
             logger.info("Background backfill completed and cached new summary")
         else:
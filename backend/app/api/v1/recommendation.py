@@ -6,7 +6,7 @@ from io import BytesIO
 from fastapi import APIRouter, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
 
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal
 from app.core.logging import logger
 from app.core.exceptions import DataGapError, RiskValidationError
 from app.db.models import RecommendationORM
@@ -159,9 +159,9 @@ async def get_recommendation_snapshot(recommendation_id: int):
     Returns the full snapshot with code_commit, dataset_hash, and params_hash
     for independent verification.
     """
-    with SessionLocal() as db:
+    async with AsyncSessionLocal() as db:
         stmt = select(RecommendationORM).where(RecommendationORM.id == recommendation_id)
-        rec = db.execute(stmt).scalars().first()
+        rec = (await db.execute(stmt)).scalars().first()
         if not rec:
             raise HTTPException(status_code=404, detail="Recommendation not found")
 
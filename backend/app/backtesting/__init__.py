@@ -1,52 +1,61 @@
 """Backtesting engine and metrics calculation."""
+from app.core.lazy import lazy_exports
 
-from .objectives import CalmarUnderDrawdown, Objective, ObjectiveConfig
-from .optimizer import CampaignOptimizer, CandidateResult
-from .pipeline import ValidationPipeline, WalkSegment
-from .monitoring import PerformanceMonitor, RecalibrationEvent, statistical_significance_test
-from .recalibration import AdaptiveCampaignOptimizer, RecalibrationJob
-from .auto_shutdown import AutoShutdownManager, AutoShutdownPolicy, StrategyMetrics
-from .risk import RuinSimulator
-from .risk_sizing import AdaptiveRiskSizer, DrawdownController, RiskManager, RiskSizer
-from .volatility_targeting import CombinedSizer, KellySizer, VolatilityTargeting
-from .unified_risk_manager import RiskMetrics, UnifiedRiskManager
-from .engine import (
-    BacktestEngine,
-    BacktestRunRequest,
-    BacktestState,
-    BacktestTemporalError,
-    CandleSeries,
-    InvalidSignalError,
-    PartialFill,
-    RiskManagedPositionSizer,
-    StrategyProtocol,
-    TradeFill,
-)
-from .persistence import (
-    BacktestResultRepository,
-    BacktestRunResult,
-    save_backtest_result,
-)
-from .order_types import (
-    BaseOrder,
-    LimitOrder,
-    MarketOrder,
-    OrderConfig,
-    OrderResult,
-    OrderSide,
-    OrderStatus,
-    StopOrder,
-)
-from .position import Position, PositionConfig, PositionManager, PositionSide, PositionState
-from .sensitivity import SensitivityRunner, SensitivityResult
-from .validation import CampaignAbort, CampaignValidator, ValidationResult
-from .walk_forward import TrainValOOSSplit, WalkForwardPipeline, WalkForwardResult, WalkForwardWindow
-from .guardrails import CampaignRejectedReason, GuardrailChecker, GuardrailConfig, GuardrailResult
-from .observability import CampaignMetrics, CampaignObservability
-from .advanced_metrics import MetricsReport, calmar_penalized
-from .ruin_simulation import RuinSimulationResult, monte_carlo_ruin
-from .visualization import plot_parameter_distributions, plot_response_surface, plot_tornado_chart
-from .trade_analytics import TradeAnalyticsRecord, TradeAnalyticsRepository
+# Submodules are imported when one of their names is first used
+_EXPORTS = {
+    ".objectives": ("CalmarUnderDrawdown", "Objective", "ObjectiveConfig"),
+    ".optimizer": ("CampaignOptimizer", "CandidateResult"),
+    ".pipeline": ("ValidationPipeline", "WalkSegment"),
+    ".monitoring": ("PerformanceMonitor", "RecalibrationEvent", "statistical_significance_test"),
+    ".recalibration": ("AdaptiveCampaignOptimizer", "RecalibrationJob"),
+    ".auto_shutdown": ("AutoShutdownManager", "AutoShutdownPolicy", "StrategyMetrics"),
+    ".risk": ("RuinSimulator",),
+    ".risk_sizing": ("AdaptiveRiskSizer", "DrawdownController", "RiskManager", "RiskSizer"),
+    ".volatility_targeting": ("CombinedSizer", "KellySizer", "VolatilityTargeting"),
+    ".unified_risk_manager": ("RiskMetrics", "UnifiedRiskManager"),
+    ".engine": (
+        "BacktestEngine",
+        "BacktestRunRequest",
+        "BacktestState",
+        "BacktestTemporalError",
+        "BarView",
+        "CandleArrays",
+        "CandleSeries",
+        "InvalidSignalError",
+        "PartialFill",
+        "RiskManagedPositionSizer",
+        "SeriesBarStrategyAdapter",
+        "StrategyProtocol",
+        "TradeFill",
+        "as_bar_view_strategy",
+    ),
+    ".equity_ledger": ("EquityLedger", "EquityPoint"),
+    ".persistence": ("BacktestResultRepository", "BacktestRunResult", "save_backtest_result"),
+    ".order_types": (
+        "BaseOrder",
+        "LimitOrder",
+        "MarketOrder",
+        "OrderConfig",
+        "OrderResult",
+        "OrderSide",
+        "OrderStatus",
+        "StopOrder",
+    ),
+    ".position": ("Position", "PositionConfig", "PositionManager", "PositionSide", "PositionState"),
+    ".sensitivity": ("SensitivityRunner", "SensitivityResult"),
+    ".validation": ("CampaignAbort", "CampaignValidator", "ValidationResult"),
+    ".walk_forward": ("TrainValOOSSplit", "WalkForwardPipeline", "WalkForwardResult", "WalkForwardWindow"),
+    ".guardrails": ("CampaignRejectedReason", "GuardrailChecker", "GuardrailConfig", "GuardrailResult"),
+    ".observability": ("CampaignMetrics", "CampaignObservability"),
+    ".advanced_metrics": ("MetricsReport", "calmar_penalized"),
+    ".ruin_simulation": ("RuinSimulationResult", "monte_carlo_ruin"),
+    ".visualization": ("plot_parameter_distributions", "plot_response_surface", "plot_tornado_chart"),
+    ".trade_analytics": ("TradeAnalyticsRecord", "TradeAnalyticsRepository"),
+    ".execution_metrics": ("ExecutionMetrics", "ExecutionTracker", "NoTradeEvent"),
+    ".tracking_error": ("TrackingErrorMetrics", "calculate_tracking_error", "calculate_period_tracking_error"),
+    ".execution_simulator": ("ExecutionSimulationResult", "ExecutionSimulator"),
+    ".stop_rebalancer": ("StopRebalanceEvent", "StopRebalancer"),
+}
 
 __all__ = [
     "CalmarUnderDrawdown",
@@ -106,12 +115,18 @@ __all__ = [
     "BacktestRunRequest",
     "BacktestState",
     "BacktestTemporalError",
+    "BarView",
+    "CandleArrays",
     "CandleSeries",
     "InvalidSignalError",
     "PartialFill",
     "RiskManagedPositionSizer",
+    "SeriesBarStrategyAdapter",
     "StrategyProtocol",
     "TradeFill",
+    "as_bar_view_strategy",
+    "EquityLedger",
+    "EquityPoint",
     "BacktestResultRepository",
     "BacktestRunResult",
     "save_backtest_result",
@@ -136,3 +151,4 @@ __all__ = [
     "TradeAnalyticsRepository",
 ]
 
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -7,6 +7,7 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
+from app.backtesting.monte_carlo import bootstrap_sampler, simulate_paths
 from app.core.logging import logger
 
 
@@ -234,64 +235,43 @@ class MetricsReport:
         rng = np.random.default_rng(seed)
         n = len(returns)
 
-        if n < 10:
+        if n < 10 or trials <= 0:
             return {}
 
-        # Bootstrap samples
-        cagr_samples = []
-        sharpe_samples = []
-        calmar_samples = []
-
-        for _ in range(trials):
-            # Resample with replacement
-            sample_indices = rng.integers(0, n, size=n)
-            sample_returns = returns.iloc[sample_indices]
-
-            # Calculate metrics for this sample
-            if len(sample_returns) > 0:
-                total_return = (1 + sample_returns).prod() - 1
-                years = n / 252.0
-                cagr_sample = ((1 + total_return) ** (1 / years) - 1) * 100 if years > 0 and total_return > -1 else 0.0
-
-                mean_ret = sample_returns.mean()
-                std_ret = sample_returns.std(ddof=1)
-                annual_ret = mean_ret * 252
-                annual_vol = std_ret * np.sqrt(252) if std_ret > 0 else 0.0
-                sharpe_sample = (annual_ret / annual_vol) if annual_vol > 0 else 0.0
-
-                # Max drawdown from sample
-                if equity_curve:
-                    sample_equity = [initial_capital]
-                    for ret in sample_returns:
-                        sample_equity.append(sample_equity[-1] * (1 + ret))
-                    equity_series = pd.Series(sample_equity)
-                    running_max = equity_series.expanding().max()
-                    drawdown = (equity_series - running_max) / running_max
-                    max_dd = abs(drawdown.min()) * 100 if not drawdown.empty else 0.0
-                else:
-                    max_dd = abs(sample_returns.min()) * 100
-
-                calmar_sample = (cagr_sample / max_dd) if max_dd > 0 else 0.0
-
-                cagr_samples.append(cagr_sample)
-                sharpe_samples.append(sharpe_sample)
-                calmar_samples.append(calmar_sample)
+        # Bootstrap samples: one batched kernel pass over all resampled paths
+        stats = simulate_paths(
+            bootstrap_sampler(returns.to_numpy(dtype=np.float64)),
+            trials,
+            n,
+            rng=rng,
+            initial=initial_capital,
+            periods_per_year=252.0,
+        )
+        cagr_samples = stats.cagr
+        sharpe_samples = stats.sharpe
+        if equity_curve:
+            calmar_samples = stats.calmar
+        else:
+            # Without an equity curve the drawdown proxy is the worst single return
+            max_dd = np.abs(stats.worst_step) * 100
+            with np.errstate(divide="ignore", invalid="ignore"):
+                calmar_samples = np.where(max_dd > 0, cagr_samples / max_dd, 0.0)
 
         # Calculate percentiles
         results = {}
-        if cagr_samples:
+        if len(cagr_samples):
             results["cagr"] = {
                 "p5": float(np.percentile(cagr_samples, 5)),
                 "p50": float(np.percentile(cagr_samples, 50)),
                 "p95": float(np.percentile(cagr_samples, 95)),
             }
-        if sharpe_samples:
+        if len(sharpe_samples):
             results["sharpe"] = {
                 "p5": float(np.percentile(sharpe_samples, 5)),
                 "p50": float(np.percentile(sharpe_samples, 50)),
                 "p95": float(np.percentile(sharpe_samples, 95)),
             }
-        if calmar_samples:
+        if len(calmar_samples):
             results["calmar"] = {
                 "p5": float(np.percentile(calmar_samples, 5)),
                 "p50": float(np.percentile(calmar_samples, 50)),
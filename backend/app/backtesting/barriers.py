@@ -0,0 +1,145 @@
+"""
+First-touch stop-loss / take-profit detection over candle arrays.
+
+``first_barrier_touch`` finds the first bar whose range reaches either level
+with vectorised comparisons and ``argmax``. When a bar reaches both levels the
+stop-loss wins, as in the bar-by-bar loops it replaces. It serves historical
+replays (``RecommendationService.get_signal_performance``) and the live
+auto-close job. In the live case ``BarrierTracker`` remembers how far each
+open trade has been checked, so each tick only scans the bars added since.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable
+
+import numpy as np
+import pandas as pd
+
+STOP_LOSS = "SL"
+TAKE_PROFIT = "TP"
+
+
+@dataclass(frozen=True, slots=True)
+class BarrierHit:
+    """Bar position (within the scanned arrays), level touched and its price."""
+
+    index: int
+    reason: str
+    price: float
+
+
+def first_barrier_touch(
+    signal: str,
+    low: np.ndarray,
+    high: np.ndarray,
+    *,
+    stop_loss: float,
+    take_profit: float,
+) -> BarrierHit | None:
+    """First bar touching ``stop_loss`` or ``take_profit`` for a BUY or SELL trade."""
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    if signal == "BUY":
+        sl_hit = low <= stop_loss
+        tp_hit = high >= take_profit
+    elif signal == "SELL":
+        sl_hit = high >= stop_loss
+        tp_hit = low <= take_profit
+    else:
+        return None
+
+    touched = sl_hit | tp_hit
+    if touched.size == 0:
+        return None
+    index = int(np.argmax(touched))
+    if not touched[index]:
+        return None
+    if sl_hit[index]:
+        return BarrierHit(index, STOP_LOSS, float(stop_loss))
+    return BarrierHit(index, TAKE_PROFIT, float(take_profit))
+
+
+def _utc(value) -> pd.Timestamp:
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+
+class BarrierTracker:
+    """
+    Incremental first-touch scan for open trades, keyed by trade id.
+
+    The cursor kept per trade is the open time of the newest bar already
+    checked. That bar is checked again on the next scan because it may still
+    have been forming. If a trade's levels change, its cursor resets to the
+    open time so earlier bars are checked against the new levels.
+    """
+
+    def __init__(self, max_trades: int = 1024) -> None:
+        self.max_trades = max_trades
+        self._cursors: OrderedDict[Hashable, tuple[tuple[str, float, float], pd.Timestamp]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def scan_from(self, key: Hashable, signal: str, *, stop_loss: float, take_profit: float, opened_at) -> pd.Timestamp:
+        """Earliest bar open time (UTC) that the next ``scan`` of ``key`` needs."""
+        opened_at = _utc(opened_at)
+        with self._lock:
+            state = self._cursors.get(key)
+        if state is None or state[0] != (signal, float(stop_loss), float(take_profit)):
+            return opened_at
+        return max(opened_at, state[1])
+
+    def scan(
+        self,
+        key: Hashable,
+        signal: str,
+        *,
+        stop_loss: float,
+        take_profit: float,
+        opened_at,
+        open_time: pd.Series | pd.DatetimeIndex,
+        low: np.ndarray,
+        high: np.ndarray,
+    ) -> tuple[BarrierHit, pd.Timestamp] | None:
+        """
+        Check bars not scanned yet for ``key``; returns the hit and its bar open
+        time, or ``None`` after advancing the cursor. A hit forgets the trade.
+        """
+        start = self.scan_from(key, signal, stop_loss=stop_loss, take_profit=take_profit, opened_at=opened_at)
+        times = pd.DatetimeIndex(open_time)
+        times = times.tz_localize("UTC") if times.tz is None else times.tz_convert("UTC")
+        first = int(times.searchsorted(start, side="left"))
+        if first >= len(times):
+            return None
+
+        hit = first_barrier_touch(
+            signal,
+            np.asarray(low)[first:],
+            np.asarray(high)[first:],
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+        )
+        if hit is not None:
+            self.forget(key)
+            return BarrierHit(first + hit.index, hit.reason, hit.price), times[first + hit.index]
+
+        with self._lock:
+            self._cursors[key] = ((signal, float(stop_loss), float(take_profit)), times[-1])
+            self._cursors.move_to_end(key)
+            while len(self._cursors) > self.max_trades:
+                self._cursors.popitem(last=False)
+        return None
+
+    def forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._cursors.pop(key, None)
+
+
+_exit_tracker = BarrierTracker()
+
+
+def get_exit_tracker() -> BarrierTracker:
+    """Process-wide tracker of the open trades watched by the auto-close job."""
+    return _exit_tracker
@@ -1,11 +1,14 @@
 """Adapter to wrap DailySignalEngine as StrategyProtocol for backtesting."""
 from __future__ import annotations
 
+from functools import partial
 from typing import Any
 
 import pandas as pd
 
 from app.backtesting.engine import StrategyProtocol
+from app.core.logging import logger
+from app.quant.precomputed_signals import PrecomputedSignalEngine
 from app.quant.signal_engine import DailySignalEngine
 from app.utils.seeding import generate_deterministic_seed
 
@@ -17,6 +20,9 @@ class DailyStrategyAdapter:
     This allows the daily signal engine to be used in backtesting by converting
     the bar-by-bar context into the format expected by DailySignalEngine.
     """
+
+    # Only ``bar.name`` is read, so BacktestEngine fast mode can pass BarView objects directly.
+    supports_bar_view = True
     
     def __init__(
         self,
@@ -25,6 +31,7 @@ class DailyStrategyAdapter:
         df_1d: pd.DataFrame,
         seed: int | None = None,
         symbol: str = "BTCUSDT",
+        precompute: bool = False,
     ):
         """
         Initialize the adapter.
@@ -36,6 +43,11 @@ class DailyStrategyAdapter:
             seed: Optional fallback seed (only used if date-based seed cannot be derived).
                   If None, seed will be derived from timestamp in on_bar().
             symbol: Trading symbol for seed generation (default: "BTCUSDT")
+            precompute: Compute indicators/factors once over the full history and read
+                  per-bar signals by index (PrecomputedSignalEngine) instead of slicing
+                  and regenerating on every bar. Output is identical; falls back to the
+                  per-bar path if the frames cannot be precomputed or the engine
+                  overrides ``generate``.
         """
         self.signal_engine = signal_engine
         self.df_1h_full = df_1h.copy()
@@ -52,6 +64,27 @@ class DailyStrategyAdapter:
             if "timestamp" in self.df_1d_full.columns:
                 self.df_1d_full["timestamp"] = pd.to_datetime(self.df_1d_full["timestamp"])
                 self.df_1d_full = self.df_1d_full.set_index("timestamp")
+
+        self._precomputed: PrecomputedSignalEngine | None = None
+        if precompute:
+            self._precomputed = self._build_precomputed()
+
+    def _build_precomputed(self) -> PrecomputedSignalEngine | None:
+        # Custom engines (or test doubles) keep the per-bar path so their generate() is honoured
+        if getattr(type(self.signal_engine), "generate", None) is not DailySignalEngine.generate:
+            return None
+        try:
+            return PrecomputedSignalEngine(
+                self.df_1h_full,
+                self.df_1d_full,
+                mc_trials=self.signal_engine.mc_trials,
+            )
+        except Exception as exc:
+            logger.warning(
+                "Signal precompute unavailable, falling back to per-bar generation",
+                extra={"error": str(exc), "symbol": self.symbol},
+            )
+            return None
     
     def on_bar(self, context: dict[str, Any]) -> dict[str, Any]:
         """
@@ -103,19 +136,27 @@ class DailyStrategyAdapter:
             # If date extraction fails, use fallback seed or let engine generate it
             daily_seed = self.fallback_seed
         
-        # Slice dataframes up to current timestamp
-        # Ensure timestamp comparison works with timezone-aware indices
-        df_1h = self.df_1h_full[self.df_1h_full.index <= timestamp].copy()
-        df_1d = self.df_1d_full[self.df_1d_full.index <= timestamp].copy()
-        
-        # Need at least some data to generate signal
-        if df_1h.empty or df_1d.empty:
-            return {"action": "hold"}  # HOLD - no action
+        if self._precomputed is not None:
+            # Same data availability rule as the slicing below, without copying history
+            rows_1h, rows_1d = self._precomputed.locate(timestamp)
+            if rows_1h == 0 or rows_1d == 0:
+                return {"action": "hold"}
+            generate = partial(self._precomputed.generate, timestamp)
+        else:
+            # Slice dataframes up to current timestamp
+            # Ensure timestamp comparison works with timezone-aware indices
+            df_1h = self.df_1h_full[self.df_1h_full.index <= timestamp].copy()
+            df_1d = self.df_1d_full[self.df_1d_full.index <= timestamp].copy()
+
+            # Need at least some data to generate signal
+            if df_1h.empty or df_1d.empty:
+                return {"action": "hold"}  # HOLD - no action
+            generate = partial(self.signal_engine.generate, df_1h, df_1d)
         
         # Generate signal using DailySignalEngine with date-based seed
         # This ensures same confidence for same date in both backtest and production
         try:
-            signal = self.signal_engine.generate(df_1h, df_1d, seed=daily_seed)
+            signal = generate(seed=daily_seed)
             
             # Convert to backtest format
             signal_type = signal.get("signal", "HOLD")
@@ -6,15 +6,16 @@ import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Protocol
+from typing import Any, Callable, Iterator, Protocol
 
 import numpy as np
 import pandas as pd
 
+from app.backtesting.equity_ledger import EquityLedger
 from app.backtesting.execution_simulator import ExecutionSimulator
 from app.backtesting.order_types import BaseOrder, LimitOrder, MarketOrder, OrderSide, StopOrder
 from app.backtesting.position import Position, PositionSide
-from app.backtesting.tracking_error import TrackingErrorCalculator, calculate_tracking_error
+from app.backtesting.tracking_error import ExpandingTrackingError, TrackingErrorCalculator, calculate_tracking_error
 from app.backtesting.unified_risk_manager import UnifiedRiskManager
 from app.core.logging import logger, sanitize_log_extra
 from app.data.orderbook import OrderBookRepository
@@ -51,6 +52,7 @@ class CandleSeries:
     timeframe: str
     data: pd.DataFrame  # Must have: timestamp, open, high, low, close, volume
     data_hash: str = field(default="")
+    _arrays: CandleArrays | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Validate and normalize candle data."""
@@ -124,6 +126,161 @@ class CandleSeries:
         for idx, row in self.data.iterrows():
             yield row
 
+    def to_arrays(self) -> CandleArrays:
+        """Return (and cache) the columnar NumPy representation of the series."""
+        if self._arrays is None or len(self._arrays) != len(self.data):
+            self._arrays = CandleArrays.from_frame(self.data)
+        return self._arrays
+
+    def stream_views(self) -> Iterator[BarView]:
+        """Stream lightweight bar views backed by contiguous arrays (fast mode)."""
+        return self.to_arrays().iter_views()
+
+
+class CandleArrays:
+    """
+    Columnar OHLCV block extracted once from a candle DataFrame.
+
+    Numeric columns are stored as contiguous float64 arrays (matching the upcast
+    applied by ``DataFrame.iterrows`` on all-numeric frames); any other column is
+    kept as an object array so that ``BarView.to_dict`` stays lossless.
+    """
+
+    __slots__ = ("timestamps", "columns", "_column_names", "_column_index", "_row_matrix")
+
+    def __init__(self, timestamps: pd.DatetimeIndex, columns: dict[str, np.ndarray]) -> None:
+        self.timestamps = timestamps
+        self.columns = columns
+        self._column_names = tuple(columns.keys())
+        self._column_index = pd.Index(self._column_names)
+        self._row_matrix: np.ndarray | None = None
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> CandleArrays:
+        """Build arrays from a DataFrame indexed by timestamp."""
+        columns: dict[str, np.ndarray] = {}
+        for col in data.columns:
+            series = data[col]
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                columns[col] = np.ascontiguousarray(series.to_numpy(dtype=np.float64))
+            else:
+                columns[col] = series.to_numpy(dtype=object)
+        return cls(pd.DatetimeIndex(data.index), columns)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the backing array for a column."""
+        return self.columns[name]
+
+    def row_matrix(self) -> np.ndarray:
+        """Row-major matrix used to materialize Series rows for legacy strategies."""
+        if self._row_matrix is None:
+            arrays = list(self.columns.values())
+            if arrays and all(arr.dtype == np.float64 for arr in arrays):
+                self._row_matrix = np.column_stack(arrays)
+            else:
+                self._row_matrix = np.column_stack([arr.astype(object) for arr in arrays]) if arrays else np.empty((len(self), 0))
+        return self._row_matrix
+
+    def view(self, idx: int) -> BarView:
+        """Return a bar view for row ``idx``."""
+        return BarView(self, idx, self.timestamps[idx])
+
+    def iter_views(self) -> Iterator[BarView]:
+        """Yield one bar view per row in chronological order."""
+        for idx, ts in enumerate(self.timestamps):
+            yield BarView(self, idx, ts)
+
+
+class BarView:
+    """
+    Read-only view of a single bar inside a ``CandleArrays`` block.
+
+    Exposes the subset of the ``pd.Series`` API the engine and strategies rely on
+    (``name``, ``get``, ``[]``, ``to_dict``) without allocating a Series per bar.
+    """
+
+    __slots__ = ("_arrays", "index", "name")
+
+    def __init__(self, arrays: CandleArrays, index: int, name: pd.Timestamp) -> None:
+        self._arrays = arrays
+        self.index = index
+        self.name = name
+
+    def __getitem__(self, key: str) -> Any:
+        return self._arrays.columns[key][self.index]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._arrays.columns
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return column value for this bar, or ``default`` if the column is missing."""
+        column = self._arrays.columns.get(key)
+        if column is None:
+            return default
+        return column[self.index]
+
+    def keys(self) -> tuple[str, ...]:
+        """Column names available on the bar."""
+        return self._arrays._column_names
+
+    @property
+    def open(self) -> float:
+        return float(self._arrays.columns["open"][self.index])
+
+    @property
+    def high(self) -> float:
+        return float(self._arrays.columns["high"][self.index])
+
+    @property
+    def low(self) -> float:
+        return float(self._arrays.columns["low"][self.index])
+
+    @property
+    def close(self) -> float:
+        return float(self._arrays.columns["close"][self.index])
+
+    @property
+    def volume(self) -> float:
+        return float(self._arrays.columns["volume"][self.index])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Materialize the bar as a plain dict (same keys as ``pd.Series.to_dict``)."""
+        idx = self.index
+        return {name: column[idx] for name, column in self._arrays.columns.items()}
+
+    def to_series(self) -> pd.Series:
+        """Materialize the bar as a ``pd.Series`` named by its timestamp."""
+        arrays = self._arrays
+        return pd.Series(arrays.row_matrix()[self.index], index=arrays._column_index, name=self.name, copy=False)
+
+
+class SeriesBarStrategyAdapter:
+    """
+    Adapter that lets a legacy ``StrategyProtocol`` run in fast mode.
+
+    Strategies that do not declare ``supports_bar_view = True`` receive the bar
+    materialized as a ``pd.Series`` exactly as in the ``iterrows`` loop.
+    """
+
+    def __init__(self, strategy: Any) -> None:
+        self.strategy = strategy
+
+    def on_bar(self, context: dict[str, Any]) -> dict[str, Any]:
+        bar = context.get("bar")
+        if isinstance(bar, BarView):
+            context["bar"] = bar.to_series()
+        return self.strategy.on_bar(context)
+
+
+def as_bar_view_strategy(strategy: Any) -> Any:
+    """Return the strategy itself if it accepts ``BarView`` bars, else wrap it in an adapter."""
+    if getattr(strategy, "supports_bar_view", False):
+        return strategy
+    return SeriesBarStrategyAdapter(strategy)
+
 
 @dataclass
 class TradeFill:
@@ -218,7 +375,7 @@ class BacktestState:
     partial_fills: list[PartialFill]  # Track partial fills
     rejected_orders: list[dict[str, Any]]  # Track rejected/cancelled orders
     active_orders: list[BaseOrder]  # Track pending orders (stops, limits, trailing stops)
-    equity_curve: pd.DataFrame  # DataFrame with columns: timestamp, equity_theoretical, equity_realistic, equity_divergence_pct
+    equity_curve: EquityLedger  # Columns: timestamp, equity_theoretical, equity_realistic, equity_divergence_pct
     returns_daily: list[float]
     returns_weekly: list[float]
     returns_monthly: list[float]
@@ -230,8 +387,13 @@ class BacktestState:
     trailing_stop_price: float | None = None  # Current trailing stop price
     trailing_stop_distance: float | None = None  # Distance from peak for trailing stop
 
+    def __post_init__(self) -> None:
+        """Accept a legacy DataFrame equity curve and convert it to an EquityLedger."""
+        if not isinstance(self.equity_curve, EquityLedger):
+            self.equity_curve = EquityLedger.from_frame(self.equity_curve)
+
     def update_equity(self, theoretical: float, realistic: float, timestamp: pd.Timestamp) -> None:
-        """Update equity and track curves with timestamp in DataFrame format."""
+        """Update equity and append the observation to the equity ledger."""
         self.equity_theoretical = theoretical
         self.equity_realistic = realistic
         self.peak_equity = max(self.peak_equity, realistic)
@@ -256,16 +418,9 @@ class BacktestState:
                 },
             )
         
-        # Append to DataFrame
-        new_row = pd.DataFrame({
-            "timestamp": [timestamp],
-            "equity_theoretical": [theoretical],
-            "equity_realistic": [realistic],
-            "equity_divergence_pct": [equity_divergence_pct],
-        })
-        self.equity_curve = pd.concat([self.equity_curve, new_row], ignore_index=True)
-
-    def build_context(self, bar: pd.Series) -> dict[str, Any]:
+        self.equity_curve.append(timestamp, theoretical, realistic, equity_divergence_pct)
+
+    def build_context(self, bar: pd.Series | BarView) -> dict[str, Any]:
         """Build context dict for strategy."""
         return {
             "bar": bar,
@@ -571,7 +726,7 @@ class BacktestEngine:
     def _process_active_orders(
         self,
         state: BacktestState,
-        bar: pd.Series,
+        bar: pd.Series | BarView,
         bar_date: pd.Timestamp,
         request: BacktestRunRequest,
     ) -> list[BaseOrder]:
@@ -720,7 +875,7 @@ class BacktestEngine:
         
         Args:
             target_timestamp: Target timestamp (can be None/NaT)
-            state: BacktestState with equity curve DataFrame
+            state: BacktestState with equity ledger
             
         Returns:
             Equity value at or before timestamp, or None if not found or target is None/NaT
@@ -729,15 +884,8 @@ class BacktestEngine:
         if target_timestamp is None or pd.isna(target_timestamp):
             return None
         
-        if state.equity_curve.empty:
-            return None
-        
-        # Filter to timestamps <= target and get last row
-        filtered = state.equity_curve[state.equity_curve["timestamp"] <= target_timestamp]
-        if filtered.empty:
-            return None
-        
-        return float(filtered.iloc[-1]["equity_realistic"])
+        # Binary search over the ledger timestamps (O(log n))
+        return state.equity_curve.realistic_at_or_before(target_timestamp)
 
     def _validate_equity_divergence(self, state: BacktestState, timestamp: pd.Timestamp) -> None:
         """
@@ -750,14 +898,13 @@ class BacktestEngine:
         Raises:
             ValueError if divergence is invalid
         """
-        if state.equity_curve.empty:
+        latest = state.equity_curve.latest()
+        if latest is None:
             return
         
-        # Get latest row
-        latest = state.equity_curve.iloc[-1]
-        theoretical = latest["equity_theoretical"]
-        realistic = latest["equity_realistic"]
-        divergence_pct = latest["equity_divergence_pct"]
+        theoretical = latest.equity_theoretical
+        realistic = latest.equity_realistic
+        divergence_pct = latest.equity_divergence_pct
         
         # Realistic should never exceed theoretical by more than 0.1% (rounding tolerance)
         # In practice, realistic should always be <= theoretical due to fees/slippage
@@ -824,6 +971,7 @@ class BacktestEngine:
         use_orderbook: bool | None = None,
         risk_manager: UnifiedRiskManager | None = None,
         seed: int | None = None,
+        fast_mode: bool = False,
         **kwargs: Any,
     ) -> dict[str, Any]:
         """
@@ -842,6 +990,9 @@ class BacktestEngine:
             use_orderbook: Override use_orderbook flag
             risk_manager: Optional risk manager for sizing
             seed: Random seed for reproducibility
+            fast_mode: Feed bars from pre-extracted NumPy arrays as ``BarView`` objects
+                instead of ``iterrows`` Series. Strategies without
+                ``supports_bar_view = True`` are wrapped in ``SeriesBarStrategyAdapter``.
             **kwargs: Additional strategy/engine args
 
         Returns:
@@ -940,12 +1091,8 @@ class BacktestEngine:
                 else:
                     initial_timestamp = initial_timestamp.tz_convert("UTC")
         
-        initial_equity_df = pd.DataFrame({
-            "timestamp": [initial_timestamp],
-            "equity_theoretical": [initial_capital],
-            "equity_realistic": [initial_capital],
-            "equity_divergence_pct": [0.0],
-        })
+        initial_equity = EquityLedger()
+        initial_equity.append(initial_timestamp, initial_capital, initial_capital, 0.0)
         
         state = BacktestState(
             equity_theoretical=initial_capital,
@@ -958,7 +1105,7 @@ class BacktestEngine:
             partial_fills=[],
             rejected_orders=[],
             active_orders=[],
-            equity_curve=initial_equity_df,
+            equity_curve=initial_equity,
             returns_daily=[],
             returns_weekly=[],
             returns_monthly=[],
@@ -972,6 +1119,19 @@ class BacktestEngine:
         # Position sizer
         position_sizer = RiskManagedPositionSizer(max_risk_pct=0.01)
 
+        # Get bars_per_year based on timeframe for annualization of the tracking error
+        bars_per_year_map = {
+            "15m": 365 * 24 * 4,  # 4 bars per hour
+            "30m": 365 * 24 * 2,  # 2 bars per hour
+            "1h": 365 * 24,  # 24 bars per day
+            "4h": 365 * 6,  # 6 bars per day
+            "1d": 365,  # Daily
+            "1w": 52,  # Weekly
+        }
+        tracking = ExpandingTrackingError(bars_per_year=bars_per_year_map.get(request.timeframe, 252))  # Default to 252 for daily
+        for theoretical, realistic in zip(state.equity_curve.theoretical, state.equity_curve.realistic):
+            tracking.update(float(theoretical), float(realistic))
+
         # Main loop with temporal validation
         prev_bar_ts = None
         total_bars = 0
@@ -980,7 +1140,14 @@ class BacktestEngine:
         timeframe_duration = self._get_timeframe_duration(request.timeframe)
         gap_threshold = timeframe_duration * self.gap_threshold_multiplier
 
-        for bar in candle_series.stream():
+        if fast_mode:
+            bars: Iterator[Any] = candle_series.stream_views()
+            strategy = as_bar_view_strategy(request.strategy)
+        else:
+            bars = candle_series.stream()
+            strategy = request.strategy
+
+        for bar in bars:
             bar_date = bar.name if isinstance(bar.name, pd.Timestamp) else pd.Timestamp(bar.get("timestamp", pd.Timestamp.utcnow()))
             total_bars += 1
             
@@ -1032,7 +1199,7 @@ class BacktestEngine:
 
             # Get signal from strategy
             try:
-                signal = request.strategy.on_bar(ctx)
+                signal = strategy.on_bar(ctx)
             except Exception as exc:
                 logger.warning("Strategy error", extra={"error": str(exc), "bar_date": str(bar_date)})
                 signal = {}
@@ -1398,25 +1565,10 @@ class BacktestEngine:
             # Update equity curves
             state.update_equity(state.equity_theoretical, state.equity_realistic, bar_date)
 
-            # Calculate tracking error after updating equity curves
+            # Running tracking error: O(1) per bar instead of rescanning the equity curve
+            tracking.update(state.equity_theoretical, state.equity_realistic)
             if len(state.equity_curve) >= 2:
-                # Get bars_per_year based on timeframe for annualization
-                bars_per_year_map = {
-                    "15m": 365 * 24 * 4,  # 4 bars per hour
-                    "30m": 365 * 24 * 2,  # 2 bars per hour
-                    "1h": 365 * 24,  # 24 bars per day
-                    "4h": 365 * 6,  # 6 bars per day
-                    "1d": 365,  # Daily
-                    "1w": 52,  # Weekly
-                }
-                bars_per_year = bars_per_year_map.get(request.timeframe, 252)  # Default to 252 for daily
-
-                tracking_stats = TrackingErrorCalculator.from_curves(
-                    theoretical=state.equity_curve["equity_theoretical"],
-                    realistic=state.equity_curve["equity_realistic"],
-                    bars_per_year=bars_per_year,
-                )
-                state.tracking_error_stats.append(tracking_stats.to_dict())
+                state.tracking_error_stats.append(tracking.stats().to_dict())
 
             # Calculate periodic returns based on actual dates
             # Daily returns
@@ -1481,7 +1633,8 @@ class BacktestEngine:
         trades = [t.to_dict() for t in state.closed_trades]
         final_capital = state.equity_realistic
         
-        equity_curve_df = state.equity_curve.copy()
+        # Materialize the equity ledger once, at the end of the run
+        equity_curve_df = state.equity_curve.to_frame()
         equity_curve_dict: list[dict[str, Any]] = []
         equity_curve_theoretical_records: list[dict[str, Any]] = []
         equity_curve_realistic_records: list[dict[str, Any]] = []
@@ -1601,8 +1754,8 @@ class BacktestEngine:
             "equity_curve": equity_curve_dict,  # DataFrame as list of dicts
             "equity_curve_theoretical": equity_curve_theoretical_records,
             "equity_curve_realistic": equity_curve_realistic_records,
-            "equity_theoretical": state.equity_curve["equity_theoretical"].tolist() if not state.equity_curve.empty else [],  # Legacy compatibility
-            "equity_realistic": state.equity_curve["equity_realistic"].tolist() if not state.equity_curve.empty else [],  # Legacy compatibility
+            "equity_theoretical": state.equity_curve.theoretical.tolist(),  # Legacy compatibility
+            "equity_realistic": state.equity_curve.realistic.tolist(),  # Legacy compatibility
             "equity_divergence_metrics": {
                 "max_divergence_pct": max_divergence_pct,
                 "min_divergence_pct": min_divergence_pct,
@@ -1648,6 +1801,7 @@ class BacktestEngine:
                 "commission_rate": request.commission_rate,
                 "slippage_model": request.slippage_model,
                 "use_orderbook": request.use_orderbook,
+                "fast_mode": fast_mode,
             },
             "tracking_error": tracking_error,
             "tracking_error_metrics": tracking_error_metrics,
@@ -0,0 +1,176 @@
+"""Array-backed equity ledger used by BacktestState instead of a growing DataFrame."""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+EQUITY_COLUMNS = ("timestamp", "equity_theoretical", "equity_realistic", "equity_divergence_pct")
+
+
+class EquityPoint(NamedTuple):
+    """Single row of the equity ledger."""
+
+    timestamp: pd.Timestamp
+    equity_theoretical: float
+    equity_realistic: float
+    equity_divergence_pct: float
+
+
+class EquityLedger:
+    """
+    Growable columnar equity curve.
+
+    Rows are stored in preallocated NumPy buffers (timestamps as int64 nanoseconds,
+    equity values as float64). Capacity is reserved ``chunk_size`` rows at a time and
+    grows geometrically, so appends are amortized O(1). "Latest" lookups are O(1),
+    "at-or-before timestamp" lookups are O(log n) via binary search, and the ledger
+    is converted to a DataFrame only when ``to_frame`` is called at the end of a run.
+    """
+
+    def __init__(self, chunk_size: int = 4096) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self._size = 0
+        self._tz: str | None = None
+        self._monotonic = True
+        self._ts = np.empty(chunk_size, dtype=np.int64)
+        self._theoretical = np.empty(chunk_size, dtype=np.float64)
+        self._realistic = np.empty(chunk_size, dtype=np.float64)
+        self._divergence = np.empty(chunk_size, dtype=np.float64)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, chunk_size: int = 4096) -> EquityLedger:
+        """Build a ledger from a DataFrame with the canonical equity columns."""
+        ledger = cls(chunk_size=chunk_size)
+        if frame is None or frame.empty:
+            return ledger
+        divergence = (
+            frame["equity_divergence_pct"]
+            if "equity_divergence_pct" in frame.columns
+            else pd.Series(0.0, index=frame.index)
+        )
+        for ts, theoretical, realistic, div in zip(
+            frame["timestamp"], frame["equity_theoretical"], frame["equity_realistic"], divergence
+        ):
+            ledger.append(pd.Timestamp(ts), float(theoretical), float(realistic), float(div))
+        return ledger
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def _reserve(self, required: int) -> None:
+        capacity = len(self._ts)
+        if required <= capacity:
+            return
+        new_capacity = max(capacity * 2, capacity + self.chunk_size)
+        while new_capacity < required:
+            new_capacity *= 2
+        for name in ("_ts", "_theoretical", "_realistic", "_divergence"):
+            old = getattr(self, name)
+            grown = np.empty(new_capacity, dtype=old.dtype)
+            grown[: self._size] = old[: self._size]
+            setattr(self, name, grown)
+
+    def _to_ns(self, timestamp: pd.Timestamp) -> int:
+        ts = pd.Timestamp(timestamp)
+        if ts.tz is not None:
+            ts = ts.tz_convert("UTC")
+        return int(ts.value)
+
+    def append(
+        self,
+        timestamp: pd.Timestamp,
+        theoretical: float,
+        realistic: float,
+        divergence_pct: float,
+    ) -> None:
+        """Append one equity observation."""
+        ts = pd.Timestamp(timestamp)
+        if self._size == 0:
+            self._tz = "UTC" if ts.tz is not None else None
+        ts_ns = self._to_ns(ts)
+        if self._size and ts_ns < self._ts[self._size - 1]:
+            self._monotonic = False
+        self._reserve(self._size + 1)
+        idx = self._size
+        self._ts[idx] = ts_ns
+        self._theoretical[idx] = theoretical
+        self._realistic[idx] = realistic
+        self._divergence[idx] = divergence_pct
+        self._size += 1
+
+    def _timestamp_at(self, idx: int) -> pd.Timestamp:
+        return pd.Timestamp(int(self._ts[idx]), tz=self._tz)
+
+    def latest(self) -> EquityPoint | None:
+        """Return the most recent row, or None if the ledger is empty."""
+        if self._size == 0:
+            return None
+        idx = self._size - 1
+        return EquityPoint(
+            self._timestamp_at(idx),
+            float(self._theoretical[idx]),
+            float(self._realistic[idx]),
+            float(self._divergence[idx]),
+        )
+
+    def index_at_or_before(self, target: pd.Timestamp) -> int | None:
+        """Index of the last row whose timestamp is <= target, or None."""
+        if self._size == 0:
+            return None
+        target_ns = self._to_ns(target)
+        if self._monotonic:
+            pos = int(np.searchsorted(self._ts[: self._size], target_ns, side="right")) - 1
+            return pos if pos >= 0 else None
+        matches = np.flatnonzero(self._ts[: self._size] <= target_ns)
+        return int(matches[-1]) if matches.size else None
+
+    def realistic_at_or_before(self, target: pd.Timestamp) -> float | None:
+        """Realistic equity at or before target timestamp."""
+        idx = self.index_at_or_before(target)
+        return float(self._realistic[idx]) if idx is not None else None
+
+    @property
+    def timestamps_ns(self) -> np.ndarray:
+        """Read-only view of the timestamp column (int64 ns since epoch)."""
+        return self._readonly(self._ts)
+
+    @property
+    def theoretical(self) -> np.ndarray:
+        """Read-only view of the theoretical equity column."""
+        return self._readonly(self._theoretical)
+
+    @property
+    def realistic(self) -> np.ndarray:
+        """Read-only view of the realistic equity column."""
+        return self._readonly(self._realistic)
+
+    @property
+    def divergence_pct(self) -> np.ndarray:
+        """Read-only view of the divergence column (percent)."""
+        return self._readonly(self._divergence)
+
+    def _readonly(self, buffer: np.ndarray) -> np.ndarray:
+        view = buffer[: self._size]
+        view.flags.writeable = False
+        return view
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the ledger as a DataFrame with the canonical equity columns."""
+        n = self._size
+        timestamps = pd.to_datetime(self._ts[:n], unit="ns", utc=self._tz is not None)
+        return pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "equity_theoretical": self._theoretical[:n].copy(),
+                "equity_realistic": self._realistic[:n].copy(),
+                "equity_divergence_pct": self._divergence[:n].copy(),
+            }
+        )
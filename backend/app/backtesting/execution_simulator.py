@@ -99,9 +99,9 @@ class ExecutionSimulator:
             should_warn = False  # Only warn for unexpected conditions (file exists but no snapshot)
             # Check if file exists to provide more specific reason
             try:
-                from pathlib import Path
-                orderbook_path = self.orderbook_repo._get_orderbook_path(symbol)
-                if not orderbook_path.exists():
+                has_data = getattr(self.orderbook_repo, "has_data", None)
+                data_exists = has_data(symbol) if has_data is not None else self.orderbook_repo._get_orderbook_path(symbol).exists()
+                if not data_exists:
                     reason = "file_not_found"
                     # Don't warn for missing files (expected in fresh environments)
                     should_warn = False
@@ -7,7 +7,6 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
-from scipy import stats
 
 from app.core.logging import logger
 from app.quant.regime import RegimeClassifier
@@ -241,6 +240,8 @@ def statistical_significance_test(
     
     t_stat = improvement / se
     df = candidate_trades + baseline_trades - 2
+    from scipy import stats
+
     p_value = 1.0 - stats.t.cdf(abs(t_stat), df)
     
     is_significant = p_value < alpha
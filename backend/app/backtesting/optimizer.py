@@ -1,9 +1,12 @@
 """Campaign optimizer tracking objective-driven improvements."""
 from __future__ import annotations
 
+import asyncio
+import tempfile
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 import pandas as pd
@@ -12,16 +15,33 @@ from app.backtesting.engine import BacktestEngine, BacktestRunRequest
 from app.backtesting.guardrails import GuardrailChecker, GuardrailConfig
 from app.backtesting.metrics import calculate_metrics
 from app.backtesting.objectives import CalmarUnderDrawdown, Objective
+from app.backtesting.sweep import OrderedProcessPool, SharedCandles, export_candles, init_worker, use_shared_candles
 from app.backtesting.tracking_error import TrackingErrorCalculator
 from app.backtesting.validation import CampaignAbort, CampaignValidator
 from app.backtesting.walk_forward import WalkForwardPipeline
 from app.core.logging import logger, sanitize_log_extra
+from app.utils.seeding import derive_task_seed
 
 # Maximum annualized tracking error threshold for candidate acceptance (3%)
 MAX_ANNUALIZED_TRACKING_ERROR_PCT = 3.0
 
 PersistRecordFn = Callable[[dict[str, Any]], None]
 
+# Parts of a backtest result the candidate filters read; the rest stays in the worker
+CANDIDATE_RESULT_KEYS = (
+    "error",
+    "error_type",
+    "initial_capital",
+    "metadata",
+    "tracking_error",
+    "tracking_error_stats",
+    "equity_theoretical",
+    "equity_realistic",
+)
+
+# Metric sections the candidate filters and guardrails read (ruin, negative months, Calmar CI)
+CANDIDATE_METRIC_SECTIONS = ("ruin", "periodic", "confidence")
+
 
 @dataclass(slots=True)
 class CandidateResult:
@@ -53,6 +73,7 @@ class CampaignOptimizer:
         enable_guardrails: bool = True,
         enable_walk_forward: bool = False,
         guardrail_config: GuardrailConfig | None = None,
+        engine_factory: Callable[..., BacktestEngine] = BacktestEngine,
     ) -> None:
         """
         Initialize campaign optimizer.
@@ -67,6 +88,8 @@ class CampaignOptimizer:
             enable_guardrails: Enable guardrail checks (default: True)
             enable_walk_forward: Enable walk-forward analysis (default: False)
             guardrail_config: Guardrail configuration (uses defaults if None)
+            engine_factory: Builds the engine from each variant's ``execution_overrides``;
+                must be picklable (e.g. a module-level class) for parallel evaluation
         """
         self.objective = objective or CalmarUnderDrawdown()
         self.persist_fn = persist_fn
@@ -81,6 +104,7 @@ class CampaignOptimizer:
         self.validator = CampaignValidator() if enable_validation else None
         self.guardrail_checker = GuardrailChecker(guardrail_config) if enable_guardrails else None
         self.walk_forward_pipeline = WalkForwardPipeline() if enable_walk_forward else None
+        self.engine_factory = engine_factory
 
     async def evaluate(
         self,
@@ -88,181 +112,268 @@ class CampaignOptimizer:
         start,
         end,
         params_variants: Iterable[dict[str, Any]],
+        workers: int = 1,
     ) -> list[CandidateResult]:
-        """Execute backtests over multiple parameter variants."""
-        results: list[CandidateResult] = []
+        """
+        Execute backtests over multiple parameter variants.
+
+        With ``workers`` > 1 the backtests (and their metrics) run on a bounded
+        process pool that shares one read-only copy of the curated candles.
+        Filtering, scoring and persistence stay in this process and follow
+        variant order, so records are persisted as soon as every earlier
+        variant is done and in the same order as a serial run. Each variant
+        without an explicit ``seed`` gets one derived from its id and window.
+        A ``CampaignAbort`` raised during a backtest stops the campaign: later
+        variants are cancelled (or discarded if already running).
+        """
+        tasks: list[dict[str, Any]] = []
         for variant in params_variants:
             params_id = variant.get("id")
             if params_id is None:
                 logger.warning("Skipping candidate without identifier", extra={"variant": variant})
                 continue
-            execution_overrides = variant.get("execution_overrides", {})
-            engine_args = variant.get("engine_args", {})
-
-            # Pre-execution validation
-            if self.validator:
-                try:
-                    start_ts = pd.to_datetime(start) if not isinstance(start, pd.Timestamp) else start
-                    end_ts = pd.to_datetime(end) if not isinstance(end, pd.Timestamp) else end
-                    validation_result = self.validator.validate_window(start_ts, end_ts)
-                    validation_result.raise_if_invalid()
-                except CampaignAbort as exc:
-                    logger.warning(
-                        "Campaign validation failed",
-                        extra={"params_id": params_id, "reason": exc.reason, "details": exc.details},
-                    )
-                    continue
+            engine_args = dict(variant.get("engine_args", {}))
+            engine_args.setdefault("seed", derive_task_seed("campaign", params_id, start, end))
+            tasks.append(
+                {
+                    "params_id": params_id,
+                    "start": start,
+                    "end": end,
+                    "engine_args": engine_args,
+                    "execution_overrides": variant.get("execution_overrides", {}),
+                }
+            )
+        if not tasks:
+            return []
 
+        # Pre-execution validation (the window is shared by every variant)
+        if self.validator:
             try:
-                engine = BacktestEngine(**execution_overrides)
-                backtest_result = await engine.run_backtest(start, end, **engine_args)
+                start_ts = pd.to_datetime(start) if not isinstance(start, pd.Timestamp) else start
+                end_ts = pd.to_datetime(end) if not isinstance(end, pd.Timestamp) else end
+                validation_result = self.validator.validate_window(start_ts, end_ts)
+                validation_result.raise_if_invalid()
             except CampaignAbort as exc:
                 logger.warning(
-                    "Campaign aborted",
-                    extra={"params_id": params_id, "reason": exc.reason, "details": exc.details},
-                )
-                continue
-            except Exception as exc:
-                logger.warning(
-                    "Campaign candidate failed during backtest",
-                    extra={"params_id": variant.get("id"), "error": str(exc)},
+                    "Campaign validation failed",
+                    extra={
+                        "params_ids": [task["params_id"] for task in tasks],
+                        "reason": exc.reason,
+                        "details": exc.details,
+                    },
                 )
-                continue
+                return []
 
-            if "error" in backtest_result:
-                logger.warning(
-                    "Backtest returned application error",
-                    extra={"params_id": variant.get("id"), "error": backtest_result.get("error_type")},
-                )
-                continue
-
-            metrics = calculate_metrics(backtest_result)
-            # Optional pre-filtering by ruin probability or negative month probability (approx)
-            if self.max_ruin_probability is not None:
-                ruin_prob = metrics.get("risk_of_ruin") or metrics.get("ruin_simulation", {}).get("ruin_probability")
-                if ruin_prob is not None and ruin_prob > self.max_ruin_probability:
-                    logger.info("Candidate filtered by ruin probability", extra={"params_id": params_id, "ruin_prob": ruin_prob})
-                    continue
-            if self.max_negative_month_prob is not None:
-                neg_prob = metrics.get("negative_month_prob_approx")
-                if neg_prob is not None and neg_prob > self.max_negative_month_prob:
-                    logger.info("Candidate filtered by negative month probability", extra={"params_id": params_id, "negative_month_prob": neg_prob})
+        results: list[CandidateResult] = []
+        if workers <= 1:
+            for task in tasks:
+                try:
+                    outcome = await _backtest_candidate(self.engine_factory, task)
+                except Exception as exc:
+                    if self._stop_on_failure(task, exc):
+                        break
                     continue
-            
-            # Check tracking error if enabled
-            if self.max_annualized_tracking_error_pct is not None:
-                tracking_error = backtest_result.get("tracking_error")
-                equity_theoretical = backtest_result.get("equity_theoretical", [])
-                equity_realistic = backtest_result.get("equity_realistic", [])
-                
-                if equity_theoretical and equity_realistic and len(equity_theoretical) > 1 and len(equity_realistic) > 1:
-                    # Get timeframe from engine args or result metadata
-                    timeframe = engine_args.get("timeframe") or backtest_result.get("metadata", {}).get("timeframe", "1d")
-                    bars_per_year_map = {
-                        "15m": 365 * 24 * 4,
-                        "30m": 365 * 24 * 2,
-                        "1h": 365 * 24,
-                        "4h": 365 * 6,
-                        "1d": 365,
-                        "1w": 52,
-                    }
-                    bars_per_year = bars_per_year_map.get(timeframe, 365)
-                    
-                    tracking_error_calc = TrackingErrorCalculator.from_curves(
-                        theoretical=equity_theoretical,
-                        realistic=equity_realistic,
-                        bars_per_year=bars_per_year,
-                    )
-                    
-                    # Convert annualized tracking error to percentage
-                    annualized_te = tracking_error_calc.annualized_tracking_error
-                    initial_capital = backtest_result.get("initial_capital", 10000.0)
-                    if initial_capital > 0 and annualized_te > 1.0:
-                        # Likely absolute value, convert to percentage
-                        annualized_te_pct = (annualized_te / initial_capital) * 100.0
-                    else:
-                        # Already a percentage
-                        annualized_te_pct = annualized_te * 100.0 if annualized_te <= 1.0 else annualized_te
-                    
-                    if annualized_te_pct > self.max_annualized_tracking_error_pct:
-                        logger.info(
-                            "Candidate filtered by tracking error",
-                            extra={
-                                "params_id": params_id,
-                                "annualized_tracking_error_pct": annualized_te_pct,
-                                "threshold_pct": self.max_annualized_tracking_error_pct,
-                            },
-                        )
+                self._accept(task, outcome, results)
+            return results
+
+        with tempfile.TemporaryDirectory(prefix="campaign-candles-") as tmp:
+            shared = self._export_candles(tasks[0], Path(tmp))
+            with OrderedProcessPool(workers, initializer=init_worker, initargs=(shared,)) as pool:
+                payloads = ((self.engine_factory, task) for task in tasks)
+                index = 0
+                async for future in pool.results(_run_candidate_task, payloads):
+                    task = tasks[index]
+                    index += 1
+                    try:
+                        outcome = future.result()
+                    except Exception as exc:
+                        if self._stop_on_failure(task, exc):
+                            break
                         continue
-                    
-                    # Store tracking error summary in metrics for persistence
-                    metrics["tracking_error_summary"] = tracking_error_calc.to_dict()
-            # Guardrail checks
-            if self.guardrail_checker:
-                duration_days = (pd.to_datetime(end) - pd.to_datetime(start)).days
-                # Extract Calmar CI if available
-                calmar_ci_low = None
-                if "confidence_intervals" in metrics and "calmar" in metrics.get("confidence_intervals", {}):
-                    calmar_ci_low = metrics["confidence_intervals"]["calmar"].get("p5")
-                
-                # Get tracking error stats for RMSE check
-                tracking_error_stats = backtest_result.get("tracking_error_stats", [])
-                initial_capital = backtest_result.get("initial_capital", 10000.0)
-                
-                guardrail_result = self.guardrail_checker.check_all(
-                    max_drawdown_pct=metrics.get("max_drawdown"),
-                    risk_of_ruin=metrics.get("risk_of_ruin"),
-                    trade_count=metrics.get("total_trades", 0),
-                    duration_days=duration_days,
-                    calmar_ci_low=calmar_ci_low,
+                    self._accept(task, outcome, results)
+        return results
+
+    def _export_candles(self, task: dict[str, Any], directory: Path) -> SharedCandles | None:
+        """Preload the campaign window once for the pool workers."""
+        engine_args = task["engine_args"]
+        try:
+            engine = self.engine_factory(**task["execution_overrides"])
+        except Exception as exc:
+            logger.warning("Could not preload candles for pool workers", extra={"error": str(exc)})
+            return None
+        request = BacktestRunRequest(
+            instrument=engine_args.get("instrument", "BTCUSDT"),
+            timeframe=engine_args.get("timeframe", "1h"),
+            start_date=pd.Timestamp(task["start"]),
+            end_date=pd.Timestamp(task["end"]),
+            strategy=None,
+        )
+        return export_candles(engine, request, directory)
+
+    @staticmethod
+    def _stop_on_failure(task: dict[str, Any], exc: Exception) -> bool:
+        """Log a failed backtest; True when it was a ``CampaignAbort`` and the campaign stops."""
+        if isinstance(exc, CampaignAbort):
+            logger.warning(
+                "Campaign aborted",
+                extra={"params_id": task["params_id"], "reason": exc.reason, "details": exc.details},
+            )
+            return True
+        logger.warning(
+            "Campaign candidate failed during backtest",
+            extra={"params_id": task["params_id"], "error": str(exc)},
+        )
+        return False
+
+    def _accept(self, task: dict[str, Any], outcome: dict[str, Any], results: list[CandidateResult]) -> None:
+        """Filter, score and persist one finished candidate, appending it to ``results`` if kept."""
+        candidate = self._build_candidate(task, outcome["result"], outcome["metrics"])
+        if candidate is None:
+            return
+        status = self._determine_status(candidate)
+        candidate.status = status
+        results.append(candidate)
+        self._persist_record(candidate)
+
+        if status == "improved":
+            self.best = candidate
+
+    def _build_candidate(
+        self,
+        task: dict[str, Any],
+        backtest_result: dict[str, Any],
+        metrics: dict[str, Any] | None,
+    ) -> CandidateResult | None:
+        """Apply the candidate filters and guardrails; None when the candidate is rejected."""
+        params_id = task["params_id"]
+        start = task["start"]
+        end = task["end"]
+        engine_args = task["engine_args"]
+        execution_overrides = task["execution_overrides"]
+
+        if "error" in backtest_result:
+            logger.warning(
+                "Backtest returned application error",
+                extra={"params_id": params_id, "error": backtest_result.get("error_type")},
+            )
+            return None
+
+        # Optional pre-filtering by ruin probability or negative month probability (approx)
+        if self.max_ruin_probability is not None:
+            ruin_prob = metrics.get("risk_of_ruin") or metrics.get("ruin_simulation", {}).get("ruin_probability")
+            if ruin_prob is not None and ruin_prob > self.max_ruin_probability:
+                logger.info("Candidate filtered by ruin probability", extra={"params_id": params_id, "ruin_prob": ruin_prob})
+                return None
+        if self.max_negative_month_prob is not None:
+            neg_prob = metrics.get("negative_month_prob_approx")
+            if neg_prob is not None and neg_prob > self.max_negative_month_prob:
+                logger.info("Candidate filtered by negative month probability", extra={"params_id": params_id, "negative_month_prob": neg_prob})
+                return None
+
+        # Check tracking error if enabled
+        if self.max_annualized_tracking_error_pct is not None:
+            tracking_error = backtest_result.get("tracking_error")
+            equity_theoretical = backtest_result.get("equity_theoretical", [])
+            equity_realistic = backtest_result.get("equity_realistic", [])
+
+            if equity_theoretical and equity_realistic and len(equity_theoretical) > 1 and len(equity_realistic) > 1:
+                # Get timeframe from engine args or result metadata
+                timeframe = engine_args.get("timeframe") or backtest_result.get("metadata", {}).get("timeframe", "1d")
+                bars_per_year_map = {
+                    "15m": 365 * 24 * 4,
+                    "30m": 365 * 24 * 2,
+                    "1h": 365 * 24,
+                    "4h": 365 * 6,
+                    "1d": 365,
+                    "1w": 52,
+                }
+                bars_per_year = bars_per_year_map.get(timeframe, 365)
+
+                tracking_error_calc = TrackingErrorCalculator.from_curves(
+                    theoretical=equity_theoretical,
+                    realistic=equity_realistic,
+                    bars_per_year=bars_per_year,
                 )
-                if not guardrail_result.passed:
+
+                # Convert annualized tracking error to percentage
+                annualized_te = tracking_error_calc.annualized_tracking_error
+                initial_capital = backtest_result.get("initial_capital", 10000.0)
+                if initial_capital > 0 and annualized_te > 1.0:
+                    # Likely absolute value, convert to percentage
+                    annualized_te_pct = (annualized_te / initial_capital) * 100.0
+                else:
+                    # Already a percentage
+                    annualized_te_pct = annualized_te * 100.0 if annualized_te <= 1.0 else annualized_te
+
+                if annualized_te_pct > self.max_annualized_tracking_error_pct:
                     logger.info(
-                        "Candidate rejected by guardrails",
-                        extra={"params_id": params_id, "reason": guardrail_result.reason, "details": guardrail_result.details},
+                        "Candidate filtered by tracking error",
+                        extra={
+                            "params_id": params_id,
+                            "annualized_tracking_error_pct": annualized_te_pct,
+                            "threshold_pct": self.max_annualized_tracking_error_pct,
+                        },
                     )
-                    continue
-                
-                # Check tracking error RMSE guardrail if tracking_error_stats available
-                if tracking_error_stats and initial_capital > 0:
-                    rmse_result = self.guardrail_checker.check_tracking_error_rmse(
-                        tracking_error_stats=tracking_error_stats,
-                        initial_capital=initial_capital,
-                    )
-                    if not rmse_result.passed:
-                        logger.info(
-                            "Candidate rejected by tracking error RMSE guardrail",
-                            extra={
-                                "params_id": params_id,
-                                "reason": rmse_result.reason,
-                                "details": rmse_result.details,
-                            },
-                        )
-                        continue
+                    return None
+
+                # Store tracking error summary in metrics for persistence
+                metrics["tracking_error_summary"] = tracking_error_calc.to_dict()
+        # Guardrail checks
+        if self.guardrail_checker:
+            duration_days = (pd.to_datetime(end) - pd.to_datetime(start)).days
+            # Extract Calmar CI if available
+            calmar_ci_low = None
+            if "confidence_intervals" in metrics and "calmar" in metrics.get("confidence_intervals", {}):
+                calmar_ci_low = metrics["confidence_intervals"]["calmar"].get("p5")
 
-            score = self.objective.score(metrics)
-            objective_value = metrics.get(self.objective.config.target_metric, 0.0)
-
-            candidate = CandidateResult(
-                params_id=params_id,
-                start_date=start,
-                end_date=end,
-                metrics=metrics,
-                score=score,
-                objective_value=objective_value,
-                engine_args=dict(engine_args),
-                execution_overrides=dict(execution_overrides),
+            # Get tracking error stats for RMSE check
+            tracking_error_stats = backtest_result.get("tracking_error_stats", [])
+            initial_capital = backtest_result.get("initial_capital", 10000.0)
+
+            guardrail_result = self.guardrail_checker.check_all(
+                max_drawdown_pct=metrics.get("max_drawdown"),
+                risk_of_ruin=metrics.get("risk_of_ruin"),
+                trade_count=metrics.get("total_trades", 0),
+                duration_days=duration_days,
+                calmar_ci_low=calmar_ci_low,
             )
+            if not guardrail_result.passed:
+                logger.info(
+                    "Candidate rejected by guardrails",
+                    extra={"params_id": params_id, "reason": guardrail_result.reason, "details": guardrail_result.details},
+                )
+                return None
 
-            status = self._determine_status(candidate)
-            candidate.status = status
-            results.append(candidate)
-            self._persist_record(candidate)
+            # Check tracking error RMSE guardrail if tracking_error_stats available
+            if tracking_error_stats and initial_capital > 0:
+                rmse_result = self.guardrail_checker.check_tracking_error_rmse(
+                    tracking_error_stats=tracking_error_stats,
+                    initial_capital=initial_capital,
+                )
+                if not rmse_result.passed:
+                    logger.info(
+                        "Candidate rejected by tracking error RMSE guardrail",
+                        extra={
+                            "params_id": params_id,
+                            "reason": rmse_result.reason,
+                            "details": rmse_result.details,
+                        },
+                    )
+                    return None
 
-            if status == "improved":
-                self.best = candidate
+        score = self.objective.score(metrics)
+        objective_value = metrics.get(self.objective.config.target_metric, 0.0)
 
-        return results
+        return CandidateResult(
+            params_id=params_id,
+            start_date=start,
+            end_date=end,
+            metrics=metrics,
+            score=score,
+            objective_value=objective_value,
+            engine_args=dict(engine_args),
+            execution_overrides=dict(execution_overrides),
+        )
 
     def _determine_status(self, candidate: CandidateResult) -> str:
         """Classify candidate relative to the current best."""
@@ -305,3 +416,20 @@ class CampaignOptimizer:
             # Persisted records may include dynamic metrics; scrub reserved logging keys.
             logger.info("Campaign candidate evaluated", extra=sanitize_log_extra(record))
 
+
+async def _backtest_candidate(engine_factory: Callable[..., BacktestEngine], task: dict[str, Any]) -> dict[str, Any]:
+    """Run one variant's backtest and metrics; returns only what the candidate filters need."""
+    engine = use_shared_candles(engine_factory(**task["execution_overrides"]))
+    backtest_result = await engine.run_backtest(task["start"], task["end"], **task["engine_args"])
+    metrics = None if "error" in backtest_result else calculate_metrics(
+        backtest_result, tier="minimal", sections=CANDIDATE_METRIC_SECTIONS
+    )
+    return {
+        "result": {key: backtest_result[key] for key in CANDIDATE_RESULT_KEYS if key in backtest_result},
+        "metrics": metrics,
+    }
+
+
+def _run_candidate_task(payload: tuple[Callable[..., BacktestEngine], dict[str, Any]]) -> dict[str, Any]:
+    engine_factory, task = payload
+    return asyncio.run(_backtest_candidate(engine_factory, task))
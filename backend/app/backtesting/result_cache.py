@@ -0,0 +1,208 @@
+"""
+Content-addressed cache for the pre-publish validation backtest.
+
+A backtest over the same curated data, signal parameters, code, seed and
+window always produces the same metrics, so ``BacktestResultCache`` keeps the
+metrics of each run under a digest of those inputs (``BacktestCacheKey``). An
+entry records where the inputs came from and the ``run_id`` under which
+``BacktestResultRepository`` persisted the full result. Entries are single JSON
+files next to the repository; a lookup touches the file so eviction by count
+drops the least recently used entries, and entries older than ``max_age`` are
+dropped regardless.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.data.storage import DATA_ROOT
+from app.observability.metrics import BACKTEST_CACHE_ENTRIES, BACKTEST_CACHE_EVICTIONS, BACKTEST_CACHE_LOOKUPS
+
+CACHE_VERSION = 1
+_UNKNOWN = {"", "unknown", None}
+
+
+@dataclass(frozen=True, slots=True)
+class BacktestCacheKey:
+    """Everything the validation backtest result depends on."""
+
+    dataset_version: str
+    params_digest: str
+    code_commit: str
+    seed: int | None
+    start: str
+    end: str
+    # Execution settings (instrument, commission, slippage, capital, ...)
+    settings: dict[str, Any] = field(default_factory=dict, hash=False)
+
+    @property
+    def cacheable(self) -> bool:
+        """False when a version component could not be determined."""
+        return not {self.dataset_version, self.params_digest, self.code_commit} & _UNKNOWN
+
+    def digest(self) -> str:
+        payload = json.dumps({"version": CACHE_VERSION, **asdict(self)}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class BacktestCacheEntry:
+    key: dict[str, Any]
+    metrics: dict[str, Any]
+    execution_stats: dict[str, Any]
+    run_id: str | None
+    created_at: str
+    compute_seconds: float | None = None
+
+
+class BacktestResultCache:
+    """On-disk validation results keyed by ``BacktestCacheKey.digest()``."""
+
+    def __init__(
+        self,
+        base_path: Path | None = None,
+        *,
+        max_entries: int | None = None,
+        max_age: timedelta | None = None,
+    ) -> None:
+        self.base_path = base_path or (DATA_ROOT / "backtest_results" / "cache")
+        self.max_entries = settings.BACKTEST_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_age = max_age or timedelta(days=settings.BACKTEST_CACHE_MAX_AGE_DAYS)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions: dict[str, int] = {}
+
+    def _path(self, digest: str) -> Path:
+        return self.base_path / f"{digest}.json"
+
+    def get(self, key: BacktestCacheKey) -> BacktestCacheEntry | None:
+        if not key.cacheable:
+            BACKTEST_CACHE_LOOKUPS.labels(result="bypass").inc()
+            return None
+        path = self._path(key.digest())
+        entry = None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            entry = BacktestCacheEntry(**data)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Dropping unreadable backtest cache entry", extra={"path": str(path), "error": str(exc)})
+            self._evict(path, "corrupt")
+
+        if entry is not None and datetime.utcnow() - datetime.fromisoformat(entry.created_at) > self.max_age:
+            self._evict(path, "age")
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        BACKTEST_CACHE_LOOKUPS.labels(result="miss" if entry is None else "hit").inc()
+        if entry is not None:
+            # Most recently used: eviction by count keeps it
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return entry
+
+    def put(
+        self,
+        key: BacktestCacheKey,
+        *,
+        metrics: dict[str, Any],
+        execution_stats: dict[str, Any] | None = None,
+        run_id: str | None = None,
+        compute_seconds: float | None = None,
+    ) -> BacktestCacheEntry | None:
+        if not key.cacheable:
+            return None
+        entry = BacktestCacheEntry(
+            key=asdict(key),
+            metrics=metrics,
+            execution_stats=dict(execution_stats or {}),
+            run_id=run_id,
+            created_at=datetime.utcnow().isoformat(),
+            compute_seconds=compute_seconds,
+        )
+        path = self._path(key.digest())
+        try:
+            self.base_path.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+            tmp.write_text(json.dumps(asdict(entry), default=str), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Could not write backtest cache entry", extra={"path": str(path), "error": str(exc)})
+            return None
+        self.prune()
+        return entry
+
+    def prune(self) -> dict[str, int]:
+        """Drop expired entries, then the least recently used beyond ``max_entries``."""
+        evicted = {"age": 0, "capacity": 0}
+        if not self.base_path.exists():
+            return evicted
+        cutoff = time.time() - self.max_age.total_seconds()
+        live: list[tuple[float, Path]] = []
+        for path in self.base_path.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if stat.st_mtime < cutoff:
+                self._evict(path, "age")
+                evicted["age"] += 1
+            else:
+                live.append((stat.st_mtime, path))
+        live.sort()
+        excess = len(live) - self.max_entries
+        for _, path in live[: max(excess, 0)]:
+            self._evict(path, "capacity")
+            evicted["capacity"] += 1
+        BACKTEST_CACHE_ENTRIES.set(len(live) - max(excess, 0))
+        if any(evicted.values()):
+            logger.info("Backtest cache pruned", extra={"evicted": evicted, "max_entries": self.max_entries})
+        return evicted
+
+    def _evict(self, path: Path, reason: str) -> None:
+        path.unlink(missing_ok=True)
+        BACKTEST_CACHE_EVICTIONS.labels(reason=reason).inc()
+        with self._lock:
+            self._evictions[reason] = self._evictions.get(reason, 0) + 1
+
+    def stats(self) -> dict[str, Any]:
+        paths = list(self.base_path.glob("*.json")) if self.base_path.exists() else []
+        with self._lock:
+            return {
+                "entries": len(paths),
+                "bytes": sum(path.stat().st_size for path in paths if path.exists()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": dict(self._evictions),
+                "max_entries": self.max_entries,
+                "max_age_days": self.max_age.days,
+            }
+
+
+_cache: BacktestResultCache | None = None
+
+
+def get_backtest_result_cache() -> BacktestResultCache:
+    """Process-wide cache used by the pre-publish validation."""
+    global _cache
+    if _cache is None:
+        _cache = BacktestResultCache()
+    return _cache
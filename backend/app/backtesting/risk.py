@@ -7,6 +7,8 @@ from typing import Any, Sequence
 import numpy as np
 import pandas as pd
 
+from app.backtesting.monte_carlo import simulate_paths
+
 
 @dataclass(slots=True)
 class RiskSimulationConfig:
@@ -155,8 +157,14 @@ class RuinSimulator:
     
     Uses historical trade parameters (win_rate, avg_win, avg_loss) to estimate
     the probability of reaching a capital threshold (e.g., -50%).
+
+    Pass ``seed`` for reproducible estimates; each call draws from a fresh
+    generator seeded with it.
     """
 
+    def __init__(self, seed: int | None = None) -> None:
+        self.seed = seed
+
     def estimate(
         self,
         win_rate: float,
@@ -194,27 +202,11 @@ class RuinSimulator:
         if horizon <= 0 or trials <= 0:
             return 0.0
         
-        rng = np.random.default_rng()
-        
-        # Generate random outcomes: wins (payoff_ratio) or losses (-1.0)
-        # Each outcome represents a standardized return (positive for wins, negative for losses)
-        random_values = rng.random(size=(trials, horizon))
-        outcomes = np.where(random_values < win_rate, payoff_ratio, -1.0)
-        
-        # Calculate cumulative equity paths (standardized)
-        # Each path starts at 0, accumulates wins and losses
-        # Positive values = above initial, negative values = below initial
-        equity_paths = outcomes.cumsum(axis=1)
-        
-        # Check if any path touches threshold
-        # Threshold is in log space (e.g., log(0.5) for -50% from initial)
-        # Convert threshold to standardized scale: log(threshold) represents the log-space threshold
-        # For simplicity, we interpret threshold as a multiplier: 0.5 means 50% of initial
-        # In standardized returns, we check if path goes below log(threshold)
-        threshold_log = np.log(threshold) if threshold > 0 else float("-inf")
-        ruin = (equity_paths.min(axis=1) <= threshold_log).mean()
-        
-        return float(round(ruin, 4))
+        # Each outcome is a standardized return: +payoff_ratio for wins, -1.0 for losses.
+        # Paths start at 0 and accumulate them; positive values = above initial.
+        min_levels = self._simulate_min_levels(win_rate, payoff_ratio, horizon, trials)
+
+        return self._ruin_probability(min_levels, threshold)
 
     def estimate_from_trades(
         self,
@@ -323,18 +315,43 @@ class RuinSimulator:
             thresholds = [0.9, 0.8, 0.7, 0.5, 0.3]  # -10%, -20%, -30%, -50%, -70%
         
         results = {}
+        if win_rate <= 0 or win_rate >= 1 or payoff_ratio <= 0 or horizon <= 0 or trials <= 0:
+            for threshold in thresholds:
+                prob = self.estimate(win_rate, payoff_ratio, horizon=horizon, threshold=threshold, trials=trials)
+                results[f"ruin_prob_{int((1 - threshold) * 100)}pct"] = prob
+            return results
+
+        # One batch of paths serves every threshold, so the probabilities are monotonic
+        min_levels = self._simulate_min_levels(win_rate, payoff_ratio, horizon, trials)
         for threshold in thresholds:
-            prob = self.estimate(
-                win_rate=win_rate,
-                payoff_ratio=payoff_ratio,
-                horizon=horizon,
-                threshold=threshold,
-                trials=trials,
-            )
+            prob = self._ruin_probability(min_levels, threshold)
             results[f"ruin_prob_{int((1 - threshold) * 100)}pct"] = prob
         
         return results
 
+    def _simulate_min_levels(self, win_rate: float, payoff_ratio: float, horizon: int, trials: int) -> np.ndarray:
+        """Lowest cumulative standardized outcome of each simulated path."""
+
+        def sample(rng: np.random.Generator, shape: tuple[int, int]) -> np.ndarray:
+            return np.where(rng.random(size=shape) < win_rate, payoff_ratio, -1.0)
+
+        stats = simulate_paths(
+            sample,
+            trials,
+            horizon,
+            rng=np.random.default_rng(self.seed),
+            initial=0.0,
+            compound=False,
+        )
+        return stats.min_level
+
+    @staticmethod
+    def _ruin_probability(min_levels: np.ndarray, threshold: float) -> float:
+        # Threshold is in log space (e.g., log(0.5) for -50% from initial):
+        # a path is ruined when its lowest point reaches log(threshold)
+        threshold_log = np.log(threshold) if threshold > 0 else float("-inf")
+        return float(round((min_levels <= threshold_log).mean(), 4))
+
 
 __all__ = [
     "RiskSimulationConfig",
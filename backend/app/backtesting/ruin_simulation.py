@@ -7,6 +7,7 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
+from app.backtesting.monte_carlo import bootstrap_sampler, simulate_paths
 from app.core.logging import logger
 
 
@@ -75,39 +76,22 @@ def monte_carlo_ruin(
     horizon = horizon_trades or len(returns)
     ruin_threshold_equity = equity * ruin_threshold
 
-    # Initialize RNG with seed
+    # Initialize RNG with seed; the kernel draws every path from it in order
     rng = np.random.default_rng(seed)
-
-    # Run simulations
-    final_equities = []
-    sample_paths = []
-    ruin_count = 0
-
-    for path_idx in range(n_paths):
-        # Sample returns with replacement
-        sample_indices = rng.integers(0, len(returns), size=horizon)
-        path_returns = returns.iloc[sample_indices].values
-
-        # Simulate equity path
-        equity_path = [equity]
-        for ret in path_returns:
-            new_equity = equity_path[-1] * (1 + ret)
-            equity_path.append(new_equity)
-
-            # Check for ruin
-            if new_equity <= ruin_threshold_equity:
-                ruin_count += 1
-                break
-
-        final_equity = equity_path[-1]
-        final_equities.append(final_equity)
-
-        # Store sample paths
-        if store_sample_paths and path_idx < n_sample_paths:
-            sample_paths.append(equity_path)
+    stats = simulate_paths(
+        bootstrap_sampler(returns.to_numpy(dtype=np.float64)),
+        n_paths,
+        horizon,
+        rng=rng,
+        initial=equity,
+        ruin_level=ruin_threshold_equity,
+        n_sample_paths=n_sample_paths if store_sample_paths else 0,
+    )
+    final_equities = stats.final.tolist()
+    sample_paths = stats.sample_paths
 
     # Calculate ruin probability
-    ruin_probability = ruin_count / n_paths
+    ruin_probability = stats.ruin_probability
 
     # Build result
     result = RuinSimulationResult(
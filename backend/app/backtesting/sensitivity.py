@@ -1,22 +1,27 @@
 """Comprehensive sensitivity analysis with statistical testing and visualization."""
 from __future__ import annotations
 
+import asyncio
+import copy
 import hashlib
+import inspect
 import json
+import tempfile
 from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
 import pandas as pd
-from scipy import stats
-from sklearn.model_selection import ParameterGrid
 
-from app.backtesting.engine import BacktestEngine
+from app.backtesting.engine import BacktestEngine, BacktestRunRequest
 from app.backtesting.metrics import calculate_metrics
 from app.backtesting.objectives import Objective
+from app.backtesting.sweep import SharedCandles, default_workers, export_candles, init_worker, use_shared_candles
 from app.core.logging import logger
+from app.quant.config_manager import signal_params_override
 
 
 @dataclass
@@ -36,15 +41,20 @@ class SensitivityRunner:
     def __init__(
         self,
         objective: Objective | None = None,
+        *,
+        engine_factory: Callable[..., BacktestEngine] = BacktestEngine,
     ) -> None:
         """
         Initialize sensitivity runner.
         
         Args:
             objective: Objective function for scoring (default: CalmarUnderDrawdown)
+            engine_factory: Builds the engine for each run from ``execution_overrides``;
+                must be picklable (e.g. a module-level class) for parallel sweeps
         """
         from app.backtesting.objectives import CalmarUnderDrawdown
         self.objective = objective or CalmarUnderDrawdown()
+        self.engine_factory = engine_factory
 
     @staticmethod
     def default_param_grid() -> dict[str, Sequence[Any]]:
@@ -73,6 +83,8 @@ class SensitivityRunner:
         Returns:
             List of strategy_overrides dicts
         """
+        from sklearn.model_selection import ParameterGrid
+
         grid = ParameterGrid(param_grid)
         overrides_list = []
         
@@ -139,6 +151,7 @@ class SensitivityRunner:
         end_date: Any,
         base_params: dict[str, Any] | None = None,
         use_nested_override: bool = True,
+        workers: int | None = 1,
     ) -> pd.DataFrame:
         """
         Run systematic parameter sweep.
@@ -151,77 +164,124 @@ class SensitivityRunner:
             end_date: Backtest end date
             base_params: Base parameters to merge with each variant
             use_nested_override: If True, convert nested keys to strategy_overrides format
+            workers: Worker processes for the sweep (None: one per core, 1: run serially
+                in this process). Rows come back in grid order either way.
             
         Returns:
             DataFrame with parameter combinations and results (calmar, max_dd, etc.)
         """
         base = base_params or {}
-        runs = []
         
         if use_nested_override and any("." in k for k in param_grid.keys()):
             override_list = self.param_grid_to_overrides(param_grid)
             grid_size = len(override_list)
         else:
+            from sklearn.model_selection import ParameterGrid
+
             grid = ParameterGrid(param_grid)
             grid_size = len(list(grid))
             override_list = [{"strategy_overrides": {k: v} for k, v in combo.items()} for combo in grid]
         
+        workers = default_workers() if workers is None else max(int(workers), 1)
+        workers = min(workers, max(grid_size, 1))
         logger.info(
             "Starting sensitivity analysis",
             extra={
                 "param_grid_size": grid_size,
                 "params": list(param_grid.keys()),
+                "workers": workers,
             },
         )
         
-        for idx, override_dict in enumerate(override_list, start=1):
-            params = {**base, **override_dict}
-            flat_params = self._flatten_overrides(override_dict.get("strategy_overrides", {}))
-            params_id = self._generate_params_id(params)
-            
-            try:
-                result = self._evaluate_params(params, start_date, end_date)
-                
-                runs.append({
-                    **flat_params,
-                    "params_id": params_id,
-                    "calmar": result.metrics.get("calmar", 0.0),
-                    "max_dd": result.metrics.get("max_drawdown", 0.0),
-                    "sharpe": result.metrics.get("sharpe", 0.0),
-                    "cagr": result.metrics.get("cagr", 0.0),
-                    "win_rate": result.metrics.get("win_rate", 0.0),
-                    "profit_factor": result.metrics.get("profit_factor", 0.0),
-                    "score": result.score,
-                    "valid": result.valid,
-                    "total_trades": result.metrics.get("total_trades", 0),
-                    "longest_losing_streak": result.metrics.get("longest_losing_streak", 0),
-                    "risk_of_ruin": result.metrics.get("risk_of_ruin", 0.0),
-                })
-            except Exception as exc:
-                logger.warning(
-                    "Sensitivity run failed",
-                    extra={"params_id": params_id, "error": str(exc)},
-                )
-                runs.append({
-                    **flat_params,
-                    "params_id": params_id,
-                    "calmar": 0.0,
-                    "max_dd": 100.0,
-                    "sharpe": 0.0,
-                    "cagr": 0.0,
-                    "win_rate": 0.0,
-                    "profit_factor": 0.0,
-                    "score": float("-inf"),
-                    "valid": False,
-                    "total_trades": 0,
-                    "longest_losing_streak": 0,
-                    "risk_of_ruin": 1.0,
-                })
+        tasks = [({**base, **override_dict}, start_date, end_date) for override_dict in override_list]
+        if workers <= 1:
+            # Each run gets its own copy of engine_args (and so a fresh strategy
+            # instance), as it does when the task is pickled to a worker
+            runs = [self._run_params(*copy.deepcopy(task)) for task in tasks]
+        else:
+            runs = self._run_parallel(tasks, workers)
         
         df = pd.DataFrame(runs)
         logger.info("Sensitivity analysis completed", extra={"total_runs": len(df), "valid_runs": df["valid"].sum()})
         return df
 
+    def _run_parallel(self, tasks: list[tuple[dict[str, Any], Any, Any]], workers: int) -> list[dict[str, Any]]:
+        """Evaluate ``tasks`` on a process pool sharing one memory-mapped copy of the candles."""
+        with tempfile.TemporaryDirectory(prefix="sensitivity-candles-") as tmp:
+            shared = self._export_candles(tasks[0], Path(tmp))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_sweep_worker,
+                initargs=(self.objective, self.engine_factory, shared),
+            ) as pool:
+                return list(pool.map(_run_sweep_task, tasks))
+
+    def _export_candles(self, task: tuple[dict[str, Any], Any, Any], directory: Path) -> SharedCandles | None:
+        """
+        Load the sweep's candle series once in the parent and export it for the
+        workers. Only strategy overrides vary across the grid, so the first
+        task's instrument/timeframe/date range applies to all of them.
+        """
+        params, start_date, end_date = task
+        engine_args = params.get("engine_args", {})
+        try:
+            engine = self.engine_factory(**params.get("execution_overrides", {}))
+        except Exception as exc:
+            logger.warning("Could not preload candles for pool workers", extra={"error": str(exc)})
+            return None
+        request = BacktestRunRequest(
+            instrument=engine_args.get("instrument", "BTCUSDT"),
+            timeframe=engine_args.get("timeframe", "1h"),
+            start_date=pd.Timestamp(start_date),
+            end_date=pd.Timestamp(end_date),
+            strategy=None,
+        )
+        return export_candles(engine, request, directory)
+
+    def _run_params(self, params: dict[str, Any], start_date: Any, end_date: Any) -> dict[str, Any]:
+        """Evaluate one grid point and return its result row (failures score -inf)."""
+        flat_params = self._flatten_overrides(params.get("strategy_overrides", {}))
+        params_id = self._generate_params_id(params)
+        
+        try:
+            result = self._evaluate_params(params, start_date, end_date)
+            
+            return {
+                **flat_params,
+                "params_id": params_id,
+                "calmar": result.metrics.get("calmar", 0.0),
+                "max_dd": result.metrics.get("max_drawdown", 0.0),
+                "sharpe": result.metrics.get("sharpe", 0.0),
+                "cagr": result.metrics.get("cagr", 0.0),
+                "win_rate": result.metrics.get("win_rate", 0.0),
+                "profit_factor": result.metrics.get("profit_factor", 0.0),
+                "score": result.score,
+                "valid": result.valid,
+                "total_trades": result.metrics.get("total_trades", 0),
+                "longest_losing_streak": result.metrics.get("longest_losing_streak", 0),
+                "risk_of_ruin": result.metrics.get("risk_of_ruin", 0.0),
+            }
+        except Exception as exc:
+            logger.warning(
+                "Sensitivity run failed",
+                extra={"params_id": params_id, "error": str(exc)},
+            )
+            return {
+                **flat_params,
+                "params_id": params_id,
+                "calmar": 0.0,
+                "max_dd": 100.0,
+                "sharpe": 0.0,
+                "cagr": 0.0,
+                "win_rate": 0.0,
+                "profit_factor": 0.0,
+                "score": float("-inf"),
+                "valid": False,
+                "total_trades": 0,
+                "longest_losing_streak": 0,
+                "risk_of_ruin": 1.0,
+            }
+
     def _flatten_overrides(self, overrides: dict[str, Any], prefix: str = "") -> dict[str, Any]:
         """Flatten nested dict to flat keys with dots."""
         result = {}
@@ -243,79 +303,49 @@ class SensitivityRunner:
         Evaluate a single parameter combination.
         
         Supports both engine parameters (position_size_pct, commission, slippage)
-        and strategy parameters via temporary params.yaml override.
+        and strategy parameters. Strategy overrides are applied in memory through
+        ``signal_params_override`` for the duration of the backtest; params.yaml
+        is never rewritten.
         """
         engine_args = params.get("engine_args", {})
         execution_overrides = params.get("execution_overrides", {})
         strategy_overrides = params.get("strategy_overrides", {})
         
-        original_params = None
-        if strategy_overrides:
-            try:
-                from app.quant.strategies import PARAMS, PARAMS_PATH
-                import yaml
-                original_params = PARAMS.copy()
-                
-                merged_params = self._deep_merge(PARAMS.copy(), strategy_overrides)
-                with PARAMS_PATH.open("w") as fh:
-                    yaml.dump(merged_params, fh, default_flow_style=False)
-                
-                from importlib import reload
-                import app.quant.strategies
-                reload(app.quant.strategies)
-            except Exception as exc:
-                logger.warning("Failed to apply strategy overrides", extra={"error": str(exc)})
-        
-        try:
-            engine = BacktestEngine(**execution_overrides)
+        with signal_params_override(strategy_overrides):
+            engine = self._build_engine(execution_overrides)
             backtest_result = engine.run_backtest(start_date, end_date, **engine_args)
-            
-            if "error" in backtest_result:
-                return SensitivityResult(
-                    params=params,
-                    metrics={},
-                    score=float("-inf"),
-                    valid=False,
-                    params_id=self._generate_params_id(params),
-                )
-            
-            metrics = calculate_metrics(backtest_result)
-            score = self.objective.score(metrics)
-            valid = self.objective.is_valid(metrics)
-            
+            if inspect.isawaitable(backtest_result):
+                # asyncio.run copies the current context, so the override reaches the engine
+                backtest_result = asyncio.run(backtest_result)
+        
+        if "error" in backtest_result:
             return SensitivityResult(
                 params=params,
-                metrics=metrics,
-                score=score,
-                valid=valid,
+                metrics={},
+                score=float("-inf"),
+                valid=False,
                 params_id=self._generate_params_id(params),
             )
-        finally:
-            if original_params and strategy_overrides:
-                try:
-                    from app.quant.strategies import PARAMS_PATH
-                    import yaml
-                    with PARAMS_PATH.open("w") as fh:
-                        yaml.dump(original_params, fh, default_flow_style=False)
-                    from importlib import reload
-                    import app.quant.strategies
-                    reload(app.quant.strategies)
-                except Exception as exc:
-                    logger.warning("Failed to restore original params", extra={"error": str(exc)})
-
-    def _deep_merge(self, base: dict[str, Any], overrides: dict[str, Any]) -> dict[str, Any]:
-        """Deep merge two dictionaries."""
-        result = base.copy()
-        for key, value in overrides.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
-            else:
-                result[key] = value
-        return result
+        
+        # Sweep points only need the headline stats plus risk of ruin for the summary table
+        metrics = calculate_metrics(backtest_result, tier="minimal", sections=("ruin",))
+        score = self.objective.score(metrics)
+        valid = self.objective.is_valid(metrics)
+        
+        return SensitivityResult(
+            params=params,
+            metrics=metrics,
+            score=score,
+            valid=valid,
+            params_id=self._generate_params_id(params),
+        )
+
+    def _build_engine(self, execution_overrides: dict[str, Any]) -> BacktestEngine:
+        return use_shared_candles(self.engine_factory(**execution_overrides))
 
     def _generate_params_id(self, params: dict[str, Any]) -> str:
         """Generate deterministic ID from parameters."""
-        serialized = json.dumps(params, sort_keys=True, default=str)
+        serialized = json.dumps(params, sort_keys=True, default=_stable_str)
         return hashlib.md5(serialized.encode()).hexdigest()[:8]
 
     def analyze_dominance(
@@ -375,6 +405,8 @@ class SensitivityRunner:
                 if len(groups) < 2:
                     continue
                 
+                from scipy import stats
+
                 f_stat, p_value = stats.f_oneway(*groups)
                 
                 means = df.groupby(param)[target_metric].mean()
@@ -422,6 +454,8 @@ class SensitivityRunner:
                 if valid_mask.sum() < 3:
                     continue
                 
+                from scipy import stats
+
                 corr, p_value = stats.pearsonr(param_values[valid_mask], metric_values[valid_mask])
                 
                 results["parameter_importance"][param] = {
@@ -648,3 +682,28 @@ class SensitivityRunner:
             "analysis_json": str(json_path),
         }
 
+
+def _stable_str(value: Any) -> str:
+    """``str`` for JSON fallbacks, minus the memory address of plain objects (e.g. strategies)."""
+    cls = type(value)
+    if cls.__str__ is object.__str__ and cls.__repr__ is object.__repr__:
+        return f"{cls.__module__}.{cls.__qualname__}"
+    return str(value)
+
+
+# Per-process runner used by sweep workers; set once by the pool initializer
+_WORKER_RUNNER: SensitivityRunner | None = None
+
+
+def _init_sweep_worker(
+    objective: Objective,
+    engine_factory: Callable[..., BacktestEngine],
+    shared: SharedCandles | None,
+) -> None:
+    global _WORKER_RUNNER
+    init_worker(shared)
+    _WORKER_RUNNER = SensitivityRunner(objective, engine_factory=engine_factory)
+
+
+def _run_sweep_task(task: tuple[dict[str, Any], Any, Any]) -> dict[str, Any]:
+    return _WORKER_RUNNER._run_params(*task)
@@ -8,7 +8,6 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
-from scipy import stats
 
 from app.core.logging import logger
 
@@ -251,6 +250,8 @@ class SensitivityGuard:
                 if len(groups) < 2:
                     continue
                 
+                from scipy import stats
+
                 f_stat, p_value = stats.f_oneway(*groups)
                 min_p_value = min(min_p_value, p_value)
             except Exception as exc:
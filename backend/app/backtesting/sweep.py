@@ -0,0 +1,201 @@
+"""
+Process-pool support for sweeps, campaigns and walk-forward runs.
+
+A sweep evaluates the same curated series under many parameter sets or
+windows. Instead of every worker re-reading and decoding the parquet file for
+every run, the parent loads it once and exports the float64 columns as a
+single ``.npy`` matrix; workers map it with ``mmap_mode="r"`` so all processes
+share the same page-cache pages and nobody can modify them. Remaining columns
+(integers, strings, flags) are small and travel as a pickle next to it.
+
+``OrderedProcessPool`` keeps a bounded number of tasks in flight and hands
+results back in submission order, so callers can persist them as they arrive
+exactly as a serial loop would, and stop early without queueing the rest.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.backtesting.engine import BacktestEngine, BacktestRunRequest, CandleSeries
+from app.core.logging import logger
+
+VALUES_FILE = "values.npy"
+INDEX_FILE = "index.npy"
+EXTRA_FILE = "extra.pkl"
+
+
+def default_workers() -> int:
+    """Worker count for sweeps: every available core."""
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+@dataclass(frozen=True)
+class SharedCandles:
+    """Handle to a candle frame exported for memory-mapped access; cheap to pickle."""
+
+    directory: Path
+    symbol: str
+    timeframe: str
+    columns: tuple[str, ...]
+    float_columns: tuple[str, ...]
+
+    @classmethod
+    def export(cls, series: CandleSeries, directory: Path) -> SharedCandles:
+        """Write ``series.data`` under ``directory`` (which must outlive the workers)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        frame = series.data
+        float_columns = tuple(col for col in frame.columns if frame[col].dtype == np.float64)
+        extra_columns = [col for col in frame.columns if col not in float_columns]
+
+        values = np.ascontiguousarray(frame[list(float_columns)].to_numpy(dtype=np.float64))
+        np.save(directory / VALUES_FILE, values)
+        index = pd.DatetimeIndex(frame.index).tz_convert("UTC").as_unit("ns")
+        np.save(directory / INDEX_FILE, index.asi8)
+        if extra_columns:
+            frame[extra_columns].reset_index(drop=True).to_pickle(directory / EXTRA_FILE)
+
+        return cls(
+            directory=directory,
+            symbol=series.symbol,
+            timeframe=series.timeframe,
+            columns=tuple(frame.columns),
+            float_columns=float_columns,
+        )
+
+    def load(self) -> pd.DataFrame:
+        """Map the exported frame; float columns are read-only views of the shared file."""
+        values = np.load(self.directory / VALUES_FILE, mmap_mode="r")
+        stamps = np.load(self.directory / INDEX_FILE, mmap_mode="r")
+        index = pd.DatetimeIndex(np.asarray(stamps).view("datetime64[ns]")).tz_localize("UTC")
+        frame = pd.DataFrame(values, index=index, columns=list(self.float_columns), copy=False)
+        extra_path = self.directory / EXTRA_FILE
+        if extra_path.exists():
+            extra = pd.read_pickle(extra_path)
+            # Inserting in original position order restores the column layout
+            # without reindexing, which would copy the mapped block
+            for position, column in enumerate(self.columns):
+                if column not in self.float_columns:
+                    frame.insert(position, column, extra[column].to_numpy())
+        return frame
+
+
+class SharedCandleLoader:
+    """
+    Drop-in for ``BacktestEngine._load_candle_series`` serving a preloaded frame.
+
+    Requests for another instrument or timeframe fall through to ``fallback``
+    (the engine's own loader).
+    """
+
+    def __init__(self, shared: SharedCandles, frame: pd.DataFrame, fallback) -> None:
+        self.shared = shared
+        self.frame = frame
+        self.fallback = fallback
+
+    def __call__(self, request: BacktestRunRequest) -> CandleSeries:
+        if request.instrument != self.shared.symbol or request.timeframe != self.shared.timeframe:
+            return self.fallback(request)
+        start = pd.Timestamp(request.start_date)
+        end = pd.Timestamp(request.end_date)
+        start = start.tz_localize("UTC") if start.tz is None else start.tz_convert("UTC")
+        end = end.tz_localize("UTC") if end.tz is None else end.tz_convert("UTC")
+        index = self.frame.index
+        window = self.frame[(index >= start) & (index <= end)].copy()
+        if window.empty:
+            raise ValueError(
+                f"No data in range {start} to {end}. "
+                f"Available data range: {index.min()} to {index.max()}"
+            )
+        return CandleSeries(symbol=request.instrument, timeframe=request.timeframe, data=window)
+
+
+def export_candles(engine: BacktestEngine, request: BacktestRunRequest, directory: Path) -> SharedCandles | None:
+    """
+    Load ``request``'s candle series through ``engine`` and export it for workers.
+
+    Returns None when the data cannot be loaded here; workers then load it
+    themselves and report the error per task, as a serial run would.
+    """
+    try:
+        return SharedCandles.export(engine._load_candle_series(request), directory)
+    except Exception as exc:
+        logger.warning("Could not preload candles for pool workers", extra={"error": str(exc)})
+        return None
+
+
+# Candles mapped by this worker process; set by ``init_worker``
+_WORKER_CANDLES: tuple[SharedCandles, pd.DataFrame] | None = None
+
+
+def init_worker(shared: SharedCandles | None) -> None:
+    """Pool initializer: map the exported candles once per worker process."""
+    global _WORKER_CANDLES
+    _WORKER_CANDLES = (shared, shared.load()) if shared is not None else None
+
+
+def use_shared_candles(engine: BacktestEngine) -> BacktestEngine:
+    """Serve this worker's shared candles from ``engine`` (no-op outside pool workers)."""
+    if _WORKER_CANDLES is not None:
+        shared, frame = _WORKER_CANDLES
+        engine._load_candle_series = SharedCandleLoader(shared, frame, engine._load_candle_series)
+    return engine
+
+
+class OrderedProcessPool:
+    """
+    Process pool with at most ``max_pending`` submitted tasks, yielding
+    finished futures in submission order. Leaving the ``with`` block cancels
+    tasks that have not started yet.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        initializer: Callable[..., None] | None = None,
+        initargs: tuple[Any, ...] = (),
+        max_pending: int | None = None,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending or 2 * workers
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+
+    def __enter__(self) -> OrderedProcessPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    async def results(self, func: Callable[[Any], Any], tasks: Iterable[Any]) -> AsyncIterator[Future]:
+        """Yield one completed future per task, in task order; call ``.result()`` on it."""
+        pending: deque[Future] = deque()
+        remaining = iter(tasks)
+
+        def _fill() -> None:
+            while len(pending) < self.max_pending:
+                try:
+                    task = next(remaining)
+                except StopIteration:
+                    return
+                pending.append(self._pool.submit(func, task))
+
+        _fill()
+        while pending:
+            future = pending.popleft()
+            await asyncio.wait([asyncio.wrap_future(future)])
+            _fill()
+            yield future
@@ -316,3 +316,56 @@ class TrackingErrorCalculator:
         )
 
 
+
+
+class ExpandingTrackingError:
+    """
+    Running version of ``TrackingErrorCalculator.from_curves`` over a growing curve.
+
+    ``update`` folds in one (theoretical, realistic) observation in O(1) and
+    ``stats`` returns the metrics ``from_curves`` would compute on every observation
+    seen so far, so per-bar tracking error no longer rescans the whole history.
+    The variance uses Welford's update, which stays exact for constant curves.
+    """
+
+    def __init__(self, *, divergence_threshold_bps: float = 10.0, bars_per_year: int = 252) -> None:
+        self.divergence_threshold_bps = divergence_threshold_bps
+        self.bars_per_year = bars_per_year
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._sum_sq = 0.0
+        self._above_threshold = 0
+        self._sum_abs_bps = 0.0
+        self._max_abs_bps = 0.0
+
+    def update(self, theoretical: float, realistic: float) -> None:
+        error = realistic - theoretical
+        self.count += 1
+        delta = error - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (error - self._mean)
+        self._sum_sq += error * error
+        abs_bps = abs(error / theoretical * 10000.0) if theoretical > 0 else 0.0
+        if abs_bps > self.divergence_threshold_bps:
+            self._above_threshold += 1
+        self._sum_abs_bps += abs_bps
+        self._max_abs_bps = max(self._max_abs_bps, abs_bps)
+
+    def stats(self) -> PeriodTrackingError:
+        if self.count < 2:
+            return PeriodTrackingError(
+                rmse=0.0,
+                annualized_tracking_error=0.0,
+                bars_with_divergence_above_threshold_pct=0.0,
+                mean_divergence_bps=0.0,
+                max_divergence_bps=0.0,
+            )
+        std_error = float(np.sqrt(max(self._m2, 0.0) / self.count))
+        return PeriodTrackingError(
+            rmse=float(np.sqrt(self._sum_sq / self.count)),
+            annualized_tracking_error=std_error * float(np.sqrt(self.bars_per_year)) if std_error > 0 else 0.0,
+            bars_with_divergence_above_threshold_pct=self._above_threshold / self.count * 100.0,
+            mean_divergence_bps=self._sum_abs_bps / self.count,
+            max_divergence_bps=self._max_abs_bps,
+        )
@@ -64,6 +64,7 @@ class UnifiedRiskManager:
         target_volatility: float = 0.10,
         ruin_threshold: float = 0.5,
         ruin_horizon: int = 250,
+        ruin_seed: int | None = None,
     ) -> None:
         """
         Initialize unified risk manager.
@@ -79,6 +80,7 @@ class UnifiedRiskManager:
             target_volatility: Target volatility for vol targeting (default: 0.10 = 10%)
             ruin_threshold: Ruin threshold (default: 0.5 = -50% drawdown)
             ruin_horizon: Ruin simulation horizon in trades (default: 250)
+            ruin_seed: Optional seed for reproducible ruin estimates
         """
         self.base_capital = base_capital
         self.current_equity = base_capital
@@ -113,7 +115,7 @@ class UnifiedRiskManager:
         self.shutdown_manager = AutoShutdownManager(policy=self.shutdown_policy)
         
         # Ruin simulation
-        self.ruin_simulator = RuinSimulator()
+        self.ruin_simulator = RuinSimulator(seed=ruin_seed)
         self.ruin_threshold = ruin_threshold
         self.ruin_horizon = ruin_horizon
         
@@ -4,10 +4,10 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from scipy.interpolate import griddata
+
+from app.core.lazy import pyplot
 
 
 def plot_tornado_chart(
@@ -26,6 +26,7 @@ def plot_tornado_chart(
         top_n: Number of top parameters to show
         output_path: Optional path to save figure
     """
+    plt = pyplot()
     param_importance = analysis_results.get("parameter_importance", {})
     if not param_importance:
         return
@@ -102,6 +103,7 @@ def plot_response_surface(
         output_path: Optional path to save figure
         resolution: Grid resolution for interpolation
     """
+    plt = pyplot()
     if param_x not in results_df.columns or param_y not in results_df.columns:
         return
     
@@ -132,6 +134,8 @@ def plot_response_surface(
         yi = np.linspace(y_min, y_max, resolution)
         xi_grid, yi_grid = np.meshgrid(xi, yi)
         
+        from scipy.interpolate import griddata
+
         zi_grid = griddata(
             (x_vals, y_vals),
             z_vals,
@@ -172,6 +176,7 @@ def plot_parameter_distributions(
         target_metric: Metric to plot
         output_path: Optional path to save figure
     """
+    plt = pyplot()
     if param not in results_df.columns or target_metric not in results_df.columns:
         return
     
@@ -1,14 +1,20 @@
 """Walk-forward and train/validation/OOS pipeline."""
 from __future__ import annotations
 
+import asyncio
+import copy
+import tempfile
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Callable
 
 import pandas as pd
 
 from app.backtesting.engine import BacktestEngine, BacktestRunRequest
 from app.backtesting.metrics import calculate_metrics
+from app.backtesting.sweep import OrderedProcessPool, export_candles, init_worker, use_shared_candles
 from app.core.logging import logger
+from app.utils.seeding import derive_task_seed
 
 
 @dataclass
@@ -169,15 +175,23 @@ class WalkForwardPipeline:
         scorer: Callable[[dict[str, Any]], float],
         *,
         dd_limit: float = 0.25,
+        workers: int = 1,
     ) -> WalkForwardResult:
         """
         Run walk-forward analysis.
 
+        Windows are independent: each one backtests its own copy of the
+        strategy and risk manager, seeded with ``request.seed`` or, if unset,
+        a seed derived from the window dates. With ``workers`` > 1 windows run
+        on a bounded process pool sharing one read-only copy of the curated
+        candles; results are collected in window order, exactly as a serial run.
+
         Args:
-            engine: BacktestEngine instance
+            engine: BacktestEngine instance (pickled to workers in parallel mode)
             request: BacktestRunRequest (will be modified for each window)
             scorer: Function to score results (returns Calmar or similar)
             dd_limit: Maximum drawdown limit (default: 25%)
+            workers: Worker processes (default: 1, run serially in this process)
 
         Returns:
             WalkForwardResult
@@ -193,84 +207,48 @@ class WalkForwardPipeline:
         train_scores = []
         test_scores = []
 
-        for window in windows:
-            # Train window
-            train_request = BacktestRunRequest(
-                instrument=request.instrument,
-                timeframe=request.timeframe,
-                start_date=window.train_start,
-                end_date=window.train_end,
-                strategy=request.strategy,
-                initial_capital=request.initial_capital,
-                commission_rate=request.commission_rate,
-                slippage_model=request.slippage_model,
-                fixed_slippage_bps=request.fixed_slippage_bps,
-                use_orderbook=request.use_orderbook,
-                risk_manager=request.risk_manager,
-                seed=request.seed,
-            )
-
-            try:
-                train_result = await engine.run_backtest(
-                    window.train_start,
-                    window.train_end,
-                    instrument=request.instrument,
-                    timeframe=request.timeframe,
-                    strategy=request.strategy,
-                    initial_capital=request.initial_capital,
-                    commission_rate=request.commission_rate,
-                    slippage_model=request.slippage_model,
-                    fixed_slippage_bps=request.fixed_slippage_bps,
-                    use_orderbook=request.use_orderbook,
-                    risk_manager=request.risk_manager,
-                    seed=request.seed,
-                )
-
-                if "error" in train_result:
-                    logger.warning("Train window failed", extra={"window": window.window_index, "error": train_result.get("error")})
-                    continue
-
-                train_metrics = calculate_metrics(train_result)
-                train_score = scorer(train_metrics)
-
-                # Skip if drawdown exceeds limit
-                max_dd = train_metrics.get("max_drawdown", 0.0) / 100.0  # Convert from percentage
-                if max_dd > dd_limit:
-                    logger.info("Train window rejected due to drawdown", extra={"window": window.window_index, "max_dd": max_dd})
+        def _collect(window: WalkForwardWindow, outcome: dict[str, Any]) -> None:
+            if "train_error" in outcome:
+                logger.warning("Train window failed", extra={"window": window.window_index, "error": outcome["train_error"]})
+                return
+
+            train_score = scorer(outcome["train_metrics"])
+            if "max_dd" in outcome:
+                logger.info("Train window rejected due to drawdown", extra={"window": window.window_index, "max_dd": outcome["max_dd"]})
+                return
+
+            train_results.append(outcome["train_result"])
+            train_scores.append(train_score)
+
+            if "test_error" in outcome:
+                logger.warning("Test window failed", extra={"window": window.window_index, "error": outcome["test_error"]})
+                return
+
+            test_score = scorer(outcome["test_metrics"])
+            test_results.append(outcome["test_result"])
+            test_scores.append(test_score)
+
+        if workers <= 1:
+            for window in windows:
+                try:
+                    _collect(window, await _evaluate_window(engine, _window_request(request, window), window, dd_limit))
+                except Exception as exc:
+                    logger.exception("Walk-forward window failed", extra={"window": window.window_index, "error": str(exc)})
                     continue
-
-                train_results.append(train_result)
-                train_scores.append(train_score)
-
-                # Test window
-                test_result = await engine.run_backtest(
-                    window.test_start,
-                    window.test_end,
-                    instrument=request.instrument,
-                    timeframe=request.timeframe,
-                    strategy=request.strategy,
-                    initial_capital=request.initial_capital,
-                    commission_rate=request.commission_rate,
-                    slippage_model=request.slippage_model,
-                    fixed_slippage_bps=request.fixed_slippage_bps,
-                    use_orderbook=request.use_orderbook,
-                    risk_manager=request.risk_manager,
-                    seed=request.seed,
-                )
-
-                if "error" in test_result:
-                    logger.warning("Test window failed", extra={"window": window.window_index, "error": test_result.get("error")})
-                    continue
-
-                test_metrics = calculate_metrics(test_result)
-                test_score = scorer(test_metrics)
-
-                test_results.append(test_result)
-                test_scores.append(test_score)
-
-            except Exception as exc:
-                logger.exception("Walk-forward window failed", extra={"window": window.window_index, "error": str(exc)})
-                continue
+        elif windows:
+            with tempfile.TemporaryDirectory(prefix="walk-forward-candles-") as tmp:
+                shared = export_candles(engine, request, Path(tmp))
+                with OrderedProcessPool(workers, initializer=init_worker, initargs=(shared,)) as pool:
+                    payloads = ((engine, _window_request(request, window), window, dd_limit) for window in windows)
+                    index = 0
+                    async for future in pool.results(_run_window_task, payloads):
+                        window = windows[index]
+                        index += 1
+                        try:
+                            _collect(window, future.result())
+                        except Exception as exc:
+                            logger.exception("Walk-forward window failed", extra={"window": window.window_index, "error": str(exc)})
+                            continue
 
         avg_train_score = sum(train_scores) / len(train_scores) if train_scores else 0.0
         avg_test_score = sum(test_scores) / len(test_scores) if test_scores else 0.0
@@ -339,3 +317,72 @@ class WalkForwardPipeline:
             "length_days": oos_length_days,
         }
 
+
+def _window_request(request: BacktestRunRequest, window: WalkForwardWindow) -> BacktestRunRequest:
+    """Per-window request with its own strategy/risk manager copies and a deterministic seed."""
+    seed = request.seed
+    if seed is None:
+        seed = derive_task_seed("walk_forward", window.train_start, window.test_end)
+    return BacktestRunRequest(
+        instrument=request.instrument,
+        timeframe=request.timeframe,
+        start_date=window.train_start,
+        end_date=window.test_end,
+        strategy=copy.deepcopy(request.strategy),
+        initial_capital=request.initial_capital,
+        commission_rate=request.commission_rate,
+        slippage_model=request.slippage_model,
+        fixed_slippage_bps=request.fixed_slippage_bps,
+        use_orderbook=request.use_orderbook,
+        risk_manager=copy.deepcopy(request.risk_manager),
+        seed=seed,
+    )
+
+
+async def _evaluate_window(
+    engine: BacktestEngine,
+    request: BacktestRunRequest,
+    window: WalkForwardWindow,
+    dd_limit: float,
+) -> dict[str, Any]:
+    """
+    Backtest one window's train period and, if its drawdown is within
+    ``dd_limit``, its test period. Scoring is left to the caller.
+    """
+    run_kwargs = {
+        "instrument": request.instrument,
+        "timeframe": request.timeframe,
+        "strategy": request.strategy,
+        "initial_capital": request.initial_capital,
+        "commission_rate": request.commission_rate,
+        "slippage_model": request.slippage_model,
+        "fixed_slippage_bps": request.fixed_slippage_bps,
+        "use_orderbook": request.use_orderbook,
+        "risk_manager": request.risk_manager,
+        "seed": request.seed,
+    }
+    train_result = await engine.run_backtest(window.train_start, window.train_end, **run_kwargs)
+    if "error" in train_result:
+        return {"train_error": train_result.get("error")}
+
+    outcome: dict[str, Any] = {"train_result": train_result, "train_metrics": calculate_metrics(train_result, tier="minimal")}
+
+    # Skip if drawdown exceeds limit
+    max_dd = outcome["train_metrics"].get("max_drawdown", 0.0) / 100.0  # Convert from percentage
+    if max_dd > dd_limit:
+        outcome["max_dd"] = max_dd
+        return outcome
+
+    test_result = await engine.run_backtest(window.test_start, window.test_end, **run_kwargs)
+    if "error" in test_result:
+        outcome["test_error"] = test_result.get("error")
+        return outcome
+
+    outcome["test_result"] = test_result
+    outcome["test_metrics"] = calculate_metrics(test_result)
+    return outcome
+
+
+def _run_window_task(payload: tuple[BacktestEngine, BacktestRunRequest, WalkForwardWindow, float]) -> dict[str, Any]:
+    engine, request, window, dd_limit = payload
+    return asyncio.run(_evaluate_window(use_shared_candles(engine), request, window, dd_limit))
@@ -7,10 +7,6 @@ from typing import Any, Literal
 
 import joblib
 import numpy as np
-from sklearn.isotonic import IsotonicRegression
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import brier_score_loss
-from sklearn.model_selection import train_test_split
 
 CalibratorType = Literal["platt", "isotonic"]
 
@@ -73,6 +69,7 @@ class PlattCalibrator(BaseCalibrator):
     """Logistic regression (Platt scaling)."""
 
     def __init__(self, *, C: float = 1.0, max_iter: int = 1000):
+        from sklearn.linear_model import LogisticRegression
         self.model = LogisticRegression(C=C, max_iter=max_iter)
 
     def fit(self, X: np.ndarray, y: np.ndarray) -> None:
@@ -86,6 +83,7 @@ class IsotonicCalibrator(BaseCalibrator):
     """Isotonic regression calibrator."""
 
     def __init__(self):
+        from sklearn.isotonic import IsotonicRegression
         self.model = IsotonicRegression(out_of_bounds="clip")
 
     def fit(self, X: np.ndarray, y: np.ndarray) -> None:
@@ -108,6 +106,8 @@ def train_calibrator(
     """Train calibrator and report metrics on holdout set."""
     if len(X) == 0:
         raise ValueError("Dataset vacío para entrenar calibrador")
+    from sklearn.metrics import brier_score_loss
+    from sklearn.model_selection import train_test_split
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state, stratify=y)
 
     if calibration_type == "platt":
@@ -8,15 +8,44 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./data/trading.db"
+    ASYNC_DATABASE_URL: str | None = None  # Derived from DATABASE_URL (aiosqlite/asyncpg) when unset
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    SQLITE_WAL_ENABLED: bool = True  # WAL lets API reads proceed while scheduler jobs write
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait for the write lock instead of failing with "database is locked"
+    SQLITE_CACHE_SIZE_KB: int = 65536  # Page cache per connection (64 MiB)
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456  # Memory-map up to 256 MiB of the database file
 
     # Binance API
     BINANCE_API_BASE_URL: str = "https://api.binance.com/api/v3"
     BINANCE_RATE_LIMIT_REQUESTS: int = 1200
     BINANCE_RATE_LIMIT_WINDOW: int = 60
 
+    # Exchange HTTP connection pool (app/data/exchanges/http.py)
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    INGESTION_MAX_CONCURRENCY: int = 8  # Exchange requests in flight during multi-venue ingestion
+    BACKFILL_WORKERS: int = 4  # Concurrent window workers of the historical backfill engine
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
+    # Response cache (app/utils/cache.py)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_MAX_BYTES: int = 134217728  # 128 MiB, approximate
+    RESPONSE_CACHE_DEFAULT_TTL_SECONDS: float = 300.0
+    RESPONSE_CACHE_TTL_SECONDS: dict[str, float] = {
+        "market_data": 60.0,
+        "analytics_livelihood": 300.0,
+        "performance_backfill": 60.0,
+    }
+    # Seconds an expired value is still served while one refresh recomputes it
+    RESPONSE_CACHE_STALE_SECONDS: dict[str, float] = {"market_data": 30.0}
+    RESPONSE_CACHE_BACKEND_URL: str | None = None  # e.g. redis://host:6379/0, shared by all workers
+
     # Scheduler
     SCHEDULER_TIMEZONE: str = "UTC"
     RECOMMENDATION_UPDATE_TIME: str = "12:00"
@@ -99,6 +128,12 @@ class Settings(BaseSettings):
     BACKTEST_MAX_DRAWDOWN_PCT: float = 50.0  # Maximum drawdown percentage allowed
     BACKTEST_COMMISSION_RATE: float = 0.001  # 0.1% commission rate
     BACKTEST_SLIPPAGE_BPS: float = 5.0  # 5 basis points slippage
+    BACKTEST_CACHE_ENABLED: bool = True  # Reuse validation results for identical dataset/params/commit/seed/window
+    BACKTEST_CACHE_MAX_ENTRIES: int = 256
+    BACKTEST_CACHE_MAX_AGE_DAYS: int = 30
+    SIGNAL_JOURNAL_BATCH_SIZE: int = 500  # Pending signal emissions that trigger a bulk insert
+    SIGNAL_JOURNAL_FLUSH_SECONDS: float = 2.0  # Maximum time an emission waits in the journal
+    SIGNAL_JOURNAL_MAX_PENDING: int = 10_000  # Queue cap; the oldest emissions are dropped beyond it
     PERFORMANCE_STRATEGY_SOURCE: str | None = "daily_signal_engine"
     PERFORMANCE_STRATEGY_VENUE: str = "binance"
     PERFORMANCE_STRATEGY_SYMBOL: str = "BTCUSDT"
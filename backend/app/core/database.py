@@ -1,15 +1,131 @@
-"""Database configuration and session management."""
-from sqlalchemy import create_engine
+"""
+Database configuration and session management.
+
+``SessionLocal`` is the synchronous session factory used by services and CLI
+code. Async routes and scheduler jobs use ``AsyncSessionLocal()`` (or the
+``get_async_db`` dependency) so queries do not block the event loop; the async
+engine runs on aiosqlite for SQLite and asyncpg for PostgreSQL and is created
+on first use.
+
+SQLite connections are opened in WAL mode with a busy timeout, so readers are
+not blocked by the scheduler's writes and concurrent writers wait for the lock
+instead of failing.
+"""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {})
+# Async driver for each sync backend
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
+
+def _pool_options(url: str, *, is_async: bool = False) -> dict[str, Any]:
+    """Explicit pool configuration; in-memory SQLite shares one connection instead."""
+    if _is_memory_sqlite(url):
+        return {"poolclass": StaticPool}
+    options: dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": not _is_sqlite(url),
+    }
+    if _is_sqlite(url):
+        # SQLAlchemy would pick NullPool for aiosqlite file databases
+        options["poolclass"] = AsyncAdaptedQueuePool if is_async else QueuePool
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Apply the SQLite performance profile to each new connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.SQLITE_WAL_ENABLED:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # NORMAL is durable in WAL mode except for the last commits on power loss
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        # Negative cache_size is in KiB
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_BYTES)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def async_database_url(url: str) -> str:
+    """Async counterpart of a sync database URL (``sqlite`` -> ``sqlite+aiosqlite``)."""
+    parsed = make_url(url)
+    if parsed.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return url
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for database backend {parsed.get_backend_name()!r}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_db_engine(url: str) -> Engine:
+    """Sync engine with the pool configuration and, for SQLite, the pragma profile."""
+    connect_args = {"check_same_thread": False} if _is_sqlite(url) else {}
+    db_engine = create_engine(url, connect_args=connect_args, **_pool_options(url))
+    if _is_sqlite(url):
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+def create_async_db_engine(url: str) -> AsyncEngine:
+    """Async engine for ``url`` (a sync or async URL); requires aiosqlite or asyncpg."""
+    async_url = async_database_url(url)
+    db_engine = create_async_engine(async_url, **_pool_options(async_url, is_async=True))
+    if _is_sqlite(async_url):
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+engine = create_db_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """Process-wide async engine, created on first use."""
+    return create_async_db_engine(settings.ASYNC_DATABASE_URL or settings.DATABASE_URL)
+
+
+@lru_cache(maxsize=1)
+def _async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    # Rows stay readable after commit, as routes serialise them afterwards
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+def AsyncSessionLocal() -> AsyncSession:  # noqa: N802 - mirrors SessionLocal
+    """New ``AsyncSession``; use as ``async with AsyncSessionLocal() as db``."""
+    return _async_sessionmaker()()
+
+
 def get_db():
     """
     Dependency for getting database session.
@@ -22,3 +138,14 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (on application shutdown)."""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
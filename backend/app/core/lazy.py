@@ -0,0 +1,50 @@
+"""
+Deferred imports for package re-exports and heavy optional dependencies.
+
+Package ``__init__`` modules declare their public names with
+``lazy_exports``; a submodule is imported the first time one of its names is
+accessed, so ``import app.backtesting`` no longer loads matplotlib, scipy or
+sklearn. Heavy third-party libraries are imported inside the functions that
+use them (see ``scripts/benchmarks/bench_import_time.py`` for the budget).
+"""
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str, exports: dict[str, tuple[str, ...]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Module ``__getattr__`` and ``__dir__`` for ``package``.
+
+    ``exports`` maps each relative submodule to the public names it defines.
+    A resolved name is stored in the package namespace, so later lookups
+    do not go through ``__getattr__``.
+    """
+    namespace = importlib.import_module(package).__dict__
+    owners = {name: module for module, names in exports.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        module = owners.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(owners))
+
+    return __getattr__, __dir__
+
+
+def pyplot() -> Any:
+    """``matplotlib.pyplot`` on the non-interactive Agg backend, imported on first use."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
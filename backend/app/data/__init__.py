@@ -1,22 +1,30 @@
 """Data layer utilities for ingestion and curation."""
-from .binance_client import BinanceClient
-from .curation import DataCuration, DataIntegrityError
-from .derivatives import DerivativesDataCollector
-from .ingestion import DataIngestion, INTERVALS
-from .multi_ingestion import MultiVenueIngestion
-from .monitoring import DataAuditTrail, IngestionWindow
-from .quality import CrossVenueReconciler, DataQualityPipeline
-from .scheduler import BackfillScheduler
-from .fill_model import FillModel, FillModelConfig, FillSimulator, FillSimulationResult
-from .orderbook import OrderBookCollector, OrderBookRepository, OrderBookSnapshot
-from .preprocessing import (
-    batch_preprocess_snapshots,
-    derive_effective_depth,
-    derive_imbalance,
-    derive_spread,
-    preprocess_orderbook_snapshot,
-)
-from .universe import AssetSpec, DEFAULT_UNIVERSE, EXTENDED_UNIVERSE, MarketUniverseConfig
+from app.core.lazy import lazy_exports
+
+# Submodules are imported when one of their names is first used
+_EXPORTS = {
+    ".binance_client": ("BinanceClient",),
+    ".curation": ("DataCuration", "DataIntegrityError"),
+    ".derivatives": ("DerivativesDataCollector",),
+    ".ingestion": ("DataIngestion", "INTERVALS"),
+    ".multi_ingestion": ("MultiVenueIngestion",),
+    ".monitoring": ("DataAuditTrail", "IngestionWindow"),
+    ".quality": ("CrossVenueReconciler", "DataQualityPipeline"),
+    ".scheduler": ("BackfillScheduler",),
+    ".backfill_engine": ("BackfillEngine", "BackfillJob"),
+    ".fill_model": ("FillModel", "FillModelConfig", "FillSimulator", "FillSimulationResult"),
+    ".orderbook": ("OrderBookCollector", "OrderBookRepository", "OrderBookSnapshot"),
+    ".orderbook_partitions": ("OrderBookManifest", "PartitionedOrderBookStorage"),
+    ".orderbook_store": ("OrderBookArrays", "OrderBookStore"),
+    ".preprocessing": (
+        "batch_preprocess_snapshots",
+        "derive_effective_depth",
+        "derive_imbalance",
+        "derive_spread",
+        "preprocess_orderbook_snapshot",
+    ),
+    ".universe": ("AssetSpec", "DEFAULT_UNIVERSE", "EXTENDED_UNIVERSE", "MarketUniverseConfig"),
+}
 
 __all__ = [
     "BinanceClient",
@@ -31,9 +39,15 @@ __all__ = [
     "DataAuditTrail",
     "IngestionWindow",
     "BackfillScheduler",
+    "BackfillEngine",
+    "BackfillJob",
     "OrderBookSnapshot",
     "OrderBookCollector",
     "OrderBookRepository",
+    "OrderBookArrays",
+    "OrderBookStore",
+    "OrderBookManifest",
+    "PartitionedOrderBookStorage",
     "FillModel",
     "FillModelConfig",
     "FillSimulator",
@@ -48,3 +62,5 @@ __all__ = [
     "preprocess_orderbook_snapshot",
     "batch_preprocess_snapshots",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
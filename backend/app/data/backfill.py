@@ -6,20 +6,21 @@ import asyncio
 from datetime import datetime, timezone
 from typing import Sequence
 
+from app.core.config import settings
 from app.core.logging import logger
+from app.data.backfill_engine import DEFAULT_CANDLES_PER_WINDOW, BackfillEngine
 from app.data.exchanges import (
     BinanceFuturesUSDTDataSource,
     BitstampDataSource,
     CoinbaseDataSource,
+    close_http_pool,
 )
-from app.data.monitoring import DataAuditTrail, IngestionWindow
-from app.data.multi_ingestion import MultiVenueIngestion
-from app.data.scheduler import BackfillScheduler
+from app.data.monitoring import DataAuditTrail
 
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run historical backfill across venues.")
-    parser.add_argument("--symbol", required=True, help="Market symbol, e.g., BTCUSDT")
+    parser.add_argument("--symbol", required=True, help="Market symbols, comma separated, e.g., BTCUSDT,ETHUSDT")
     parser.add_argument("--interval", required=True, help="Interval alias, e.g., 1h")
     parser.add_argument("--start", required=True, help="Start timestamp (ISO format)")
     parser.add_argument("--end", required=True, help="End timestamp (ISO format)")
@@ -28,6 +29,13 @@ def _parse_args() -> argparse.Namespace:
         default="binance,coinbase,bitstamp",
         help="Comma separated venues: binance,coinbase,bitstamp",
     )
+    parser.add_argument("--workers", type=int, default=settings.BACKFILL_WORKERS, help="Concurrent window workers")
+    parser.add_argument(
+        "--window-candles",
+        type=int,
+        default=DEFAULT_CANDLES_PER_WINDOW,
+        help="Candles requested per window",
+    )
     return parser.parse_args()
 
 
@@ -54,32 +62,25 @@ async def _run() -> None:
     if start >= end:
         raise ValueError("Start must be before end")
     venues = [v.strip() for v in args.venues.split(",") if v.strip()]
+    symbols = [s.strip() for s in args.symbol.split(",") if s.strip()]
     sources = _build_sources(venues)
 
-    ingestion = MultiVenueIngestion(sources=sources)
     monitor = DataAuditTrail(venues=[src.venue for src in sources])
-    scheduler = BackfillScheduler(ingestion=ingestion, monitor=monitor)
-
-    windows = _enumerate_windows(start, end, args.interval)
+    engine = BackfillEngine(sources, workers=args.workers, monitor=monitor)
+    # Re-running with the same arguments resumes the same jobs
+    jobs = [
+        engine.job(symbol, args.interval, start, end, candles_per_window=args.window_candles) for symbol in symbols
+    ]
     logger.info(
         "Starting backfill",
-        extra={"symbol": args.symbol, "interval": args.interval, "windows": len(windows), "venues": venues},
+        extra={"symbols": symbols, "interval": args.interval, "venues": venues, "workers": args.workers},
     )
-    await scheduler.run_backfill(args.symbol, args.interval, windows)
-    logger.info("Backfill complete", extra={"symbol": args.symbol, "interval": args.interval})
-
-
-def _enumerate_windows(start: datetime, end: datetime, interval: str) -> list[IngestionWindow]:
-    from app.data.monitoring import DataAuditTrail
-
-    span = DataAuditTrail._interval_to_timedelta(interval)
-    windows: list[IngestionWindow] = []
-    cursor = start
-    while cursor < end:
-        next_end = min(cursor + span, end)
-        windows.append(IngestionWindow(start=cursor, end=next_end))
-        cursor = next_end
-    return windows
+    try:
+        summary = await engine.run(jobs)
+    finally:
+        await close_http_pool()
+    failed = sum(job["failed_windows"] for job in summary.values())
+    logger.info("Backfill complete", extra={"interval": args.interval, "jobs": len(summary), "failed_windows": failed})
 
 
 def main() -> None:
@@ -88,10 +89,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
-
-
-
-
-
-
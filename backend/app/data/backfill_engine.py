@@ -0,0 +1,403 @@
+"""
+Parallel, resumable historical backfill.
+
+A ``BackfillJob`` (symbol, interval, venues, time range) is split into windows
+of ``candles_per_window`` candles, cut at month boundaries, and queued in the
+``backfill_windows`` table. ``BackfillEngine.run`` drains the queue with N
+concurrent workers; requests go through the shared exchange connection pool,
+so the per-venue rate limits hold across all workers. Every finished window is
+staged as a parquet part and checkpointed, so an interrupted run re-queues only
+its unfinished windows. Once every window of a month is done its parts are
+merged into the venue's ``KlineStore`` month partition
+(``raw/{venue}/{symbol}/{interval}/klines-YYYY-MM.parquet``), the same files
+the incremental ingestion writes and curation reads, and recorded in the
+audit trail.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.data.exchanges.base import ExchangeDataSource
+from app.data.kline_store import KlineStore
+from app.data.monitoring import DataAuditTrail
+from app.data.multi_ingestion import MultiVenueIngestion
+from app.db import crud
+from app.observability.metrics import (
+    BACKFILL_ETA_SECONDS,
+    BACKFILL_ROWS,
+    BACKFILL_ROWS_PER_SECOND,
+    BACKFILL_WINDOWS,
+    BACKFILL_WINDOWS_PER_SECOND,
+    BACKFILL_WINDOWS_REMAINING,
+)
+
+# Staged window parts, next to the KlineStore partitions (curation only reads top-level files)
+STAGING_DIR = "_backfill_staging"
+# Smallest per-request candle limit among the connectors (Coinbase)
+DEFAULT_CANDLES_PER_WINDOW = 300
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _next_month(value: datetime) -> datetime:
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(month=value.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+@dataclass(frozen=True, slots=True)
+class BackfillJob:
+    """Historical range [start, end) to ingest for one symbol and interval across ``venues``."""
+
+    symbol: str
+    interval: str
+    venues: tuple[str, ...]
+    start: datetime
+    end: datetime
+    candles_per_window: int = DEFAULT_CANDLES_PER_WINDOW
+
+    @property
+    def key(self) -> str:
+        """Stable identity; re-running the same job resumes its queue."""
+        spec = json.dumps(
+            [
+                self.symbol,
+                self.interval,
+                sorted(self.venues),
+                _naive_utc(self.start).isoformat(),
+                _naive_utc(self.end).isoformat(),
+                self.candles_per_window,
+            ]
+        )
+        return f"{self.symbol}-{self.interval}-{hashlib.sha256(spec.encode()).hexdigest()[:16]}"
+
+    @property
+    def label(self) -> str:
+        return f"{self.symbol}:{self.interval}"
+
+    def windows(self) -> list[tuple[datetime, datetime, str]]:
+        """``(start, end, partition)`` in naive UTC; no window crosses a month boundary."""
+        span = DataAuditTrail._interval_to_timedelta(self.interval) * self.candles_per_window
+        end = _naive_utc(self.end)
+        cursor = _naive_utc(self.start)
+        windows: list[tuple[datetime, datetime, str]] = []
+        while cursor < end:
+            window_end = min(cursor + span, _next_month(cursor), end)
+            windows.append((cursor, window_end, cursor.strftime("%Y-%m")))
+            cursor = window_end
+        return windows
+
+
+class BackfillProgress:
+    """Throughput and ETA of one job, exported as Prometheus gauges."""
+
+    def __init__(self, job: BackfillJob, *, total: int, done: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.job = job
+        self.total = total
+        self.done_before = done
+        self.done = 0
+        self.failed = 0
+        self.rows = 0
+        self._clock = clock
+        self._started = clock()
+        self._publish()
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.done_before - self.done
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return max(self._clock() - self._started, 1e-9)
+
+    @property
+    def windows_per_second(self) -> float:
+        return self.done / self.elapsed_seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds
+
+    @property
+    def eta_seconds(self) -> float | None:
+        rate = self.windows_per_second
+        return self.remaining / rate if rate > 0 else None
+
+    def window_done(self, rows: int) -> None:
+        self.done += 1
+        self.rows += rows
+        BACKFILL_WINDOWS.labels(symbol=self.job.symbol, interval=self.job.interval, status="done").inc()
+        BACKFILL_ROWS.labels(symbol=self.job.symbol, interval=self.job.interval).inc(rows)
+        self._publish()
+
+    def window_failed(self) -> None:
+        self.failed += 1
+        BACKFILL_WINDOWS.labels(symbol=self.job.symbol, interval=self.job.interval, status="failed").inc()
+        self._publish()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "job": self.job.label,
+            "total_windows": self.total,
+            "resumed_windows": self.done_before,
+            "done_windows": self.done,
+            "failed_windows": self.failed,
+            "remaining_windows": self.remaining,
+            "rows": self.rows,
+            "windows_per_second": round(self.windows_per_second, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "eta_seconds": round(self.eta_seconds, 1) if self.eta_seconds is not None else None,
+        }
+
+    def _publish(self) -> None:
+        label = self.job.label
+        BACKFILL_WINDOWS_REMAINING.labels(job=label).set(self.remaining)
+        BACKFILL_WINDOWS_PER_SECOND.labels(job=label).set(self.windows_per_second)
+        BACKFILL_ROWS_PER_SECOND.labels(job=label).set(self.rows_per_second)
+        BACKFILL_ETA_SECONDS.labels(job=label).set(self.eta_seconds if self.eta_seconds is not None else -1)
+
+
+@dataclass(slots=True)
+class _WorkItem:
+    job: BackfillJob
+    window_id: int
+    start: datetime
+    end: datetime
+    partition: str
+
+
+@dataclass(slots=True)
+class _JobState:
+    job: BackfillJob
+    progress: BackfillProgress
+    # Windows not yet done per partition, and each partition's [start, end)
+    pending: dict[str, int] = field(default_factory=dict)
+    bounds: dict[str, tuple[datetime, datetime]] = field(default_factory=dict)
+    coalesced: list[str] = field(default_factory=list)
+
+
+class BackfillEngine:
+    """Drain the backfill queue of one or more jobs with ``workers`` concurrent workers."""
+
+    def __init__(
+        self,
+        sources: Sequence[ExchangeDataSource],
+        *,
+        workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 5.0,
+        monitor: DataAuditTrail | None = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        progress_log_seconds: float = 10.0,
+    ) -> None:
+        self.sources = list(sources)
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.monitor = monitor
+        self.session_factory = session_factory
+        self.progress_log_seconds = progress_log_seconds
+        self._ingestion = MultiVenueIngestion(sources=self.sources, max_concurrency=len(self.sources))
+        self._last_log = 0.0
+
+    def job(self, symbol: str, interval: str, start: datetime, end: datetime, **kwargs: Any) -> BackfillJob:
+        return BackfillJob(symbol, interval, tuple(source.venue for source in self.sources), start, end, **kwargs)
+
+    async def run(self, jobs: Sequence[BackfillJob]) -> dict[str, Any]:
+        """Process every queued window of ``jobs``; returns per-job progress snapshots."""
+        queue: asyncio.Queue[_WorkItem] = asyncio.Queue()
+        states: dict[str, _JobState] = {}
+        for job in jobs:
+            states[job.key] = await asyncio.to_thread(self._load_job, job, queue)
+
+        # Partitions finished by a run that stopped before coalescing them
+        for state in states.values():
+            for partition, pending in state.pending.items():
+                if pending == 0:
+                    await asyncio.to_thread(self._coalesce, state, partition)
+
+        tasks = [asyncio.create_task(self._worker(queue, states)) for _ in range(max(1, self.workers))]
+        try:
+            await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        summary = {}
+        for key, state in states.items():
+            summary[key] = {**state.progress.snapshot(), "partitions_coalesced": state.coalesced}
+            logger.info("Backfill job finished", extra=summary[key])
+        return summary
+
+    def _load_job(self, job: BackfillJob, queue: asyncio.Queue[_WorkItem]) -> _JobState:
+        with self.session_factory() as db:
+            added = crud.enqueue_backfill_windows(
+                db, job_key=job.key, symbol=job.symbol, interval=job.interval, windows=job.windows()
+            )
+            rows = crud.get_backfill_windows(db, job.key)
+        done = sum(1 for row in rows if row.status == "done")
+        state = _JobState(job=job, progress=BackfillProgress(job, total=len(rows), done=done))
+        for row in rows:
+            state.pending.setdefault(row.partition, 0)
+            start, end = state.bounds.get(row.partition, (row.window_start, row.window_end))
+            state.bounds[row.partition] = (min(start, row.window_start), max(end, row.window_end))
+            if row.status != "done":
+                state.pending[row.partition] += 1
+                queue.put_nowait(_WorkItem(job, row.id, row.window_start, row.window_end, row.partition))
+        logger.info(
+            "Backfill job queued",
+            extra={"job": job.label, "key": job.key, "windows": len(rows), "new": added, "resumed_done": done},
+        )
+        return state
+
+    async def _worker(self, queue: asyncio.Queue[_WorkItem], states: dict[str, _JobState]) -> None:
+        while True:
+            item = await queue.get()
+            try:
+                await self._process(item, states[item.job.key])
+            except Exception as exc:  # keep the worker alive; the window stays queued for the next run
+                logger.error(f"Backfill window crashed: {exc}", exc_info=True)
+            finally:
+                queue.task_done()
+
+    async def _process(self, item: _WorkItem, state: _JobState) -> None:
+        job = item.job
+        last_error: Exception | None = None
+        frames: dict[str, pd.DataFrame] | None = None
+        attempt = 0
+        while attempt < self.max_retries:
+            attempt += 1
+            await asyncio.to_thread(self._checkpoint, item.window_id, status="running", attempts=attempt)
+            try:
+                frames = await self._ingestion.fetch_candle_frames(
+                    job.symbol,
+                    job.interval,
+                    item.start.replace(tzinfo=timezone.utc),
+                    item.end.replace(tzinfo=timezone.utc),
+                )
+                break
+            except Exception as exc:
+                last_error = exc
+                logger.warning(
+                    "Backfill window attempt failed",
+                    extra={
+                        "job": job.label,
+                        "start": item.start.isoformat(),
+                        "attempt": attempt,
+                        "max_retries": self.max_retries,
+                        "error": str(exc),
+                    },
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.retry_backoff_seconds * attempt)
+
+        if frames is None:
+            await asyncio.to_thread(self._checkpoint, item.window_id, status="failed", error=str(last_error))
+            state.progress.window_failed()
+            return
+
+        rows = await asyncio.to_thread(self._stage, item, frames)
+        await asyncio.to_thread(self._checkpoint, item.window_id, status="done", rows=rows)
+        state.progress.window_done(rows)
+        state.pending[item.partition] -= 1
+        if state.pending[item.partition] == 0:
+            await asyncio.to_thread(self._coalesce, state, item.partition)
+        self._maybe_log_progress(state)
+
+    def _checkpoint(self, window_id: int, **values: Any) -> None:
+        with self.session_factory() as db:
+            crud.set_backfill_window_status(db, window_id, **values)
+
+    def _staging_dir(self, job: BackfillJob, venue: str, partition: str) -> Path:
+        return KlineStore(venue, job.symbol, job.interval).directory / STAGING_DIR / partition
+
+    def _stage(self, item: _WorkItem, frames: dict[str, pd.DataFrame]) -> int:
+        """Write each venue's window frame as a staged part; returns the rows staged.
+
+        Venues return the candle at the window end as well; it opens the next
+        window (possibly in the next month), so each part keeps [start, end) only.
+        """
+        start = pd.Timestamp(item.start, tz="UTC")
+        end = pd.Timestamp(item.end, tz="UTC")
+        rows = 0
+        for venue, frame in frames.items():
+            if not frame.empty:
+                open_time = pd.to_datetime(frame["open_time"], utc=True)
+                frame = frame[(open_time >= start) & (open_time < end)]
+            if frame.empty:
+                continue
+            directory = self._staging_dir(item.job, venue, item.partition)
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{int(item.start.replace(tzinfo=timezone.utc).timestamp() * 1000)}.parquet"
+            tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+            frame.to_parquet(tmp, compression="snappy", index=False)
+            os.replace(tmp, path)
+            rows += len(frame)
+        return rows
+
+    def _coalesce(self, state: _JobState, partition: str) -> None:
+        """Merge a finished partition's staged parts into each venue's KlineStore month."""
+        job = state.job
+        venue_results: list[dict[str, Any]] = []
+        for venue in job.venues:
+            directory = self._staging_dir(job, venue, partition)
+            parts = sorted(directory.glob("*.parquet")) if directory.exists() else []
+            if not parts:
+                continue
+            store = KlineStore(venue, job.symbol, job.interval)
+            merged = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+            stats = store.append(merged, metadata={"source": "backfill", "windows": len(parts)})
+            for part in parts:
+                part.unlink(missing_ok=True)
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+            venue_results.append(
+                {
+                    "venue": venue,
+                    "rows": len(merged),
+                    "rows_new": stats["rows_new"],
+                    "path": str(store.partition_path(partition)),
+                    "status": "stored",
+                }
+            )
+
+        if not venue_results:
+            return
+        state.coalesced.append(partition)
+        if self.monitor is not None:
+            start, end = state.bounds[partition]
+            self.monitor.record(
+                job.symbol,
+                job.interval,
+                start.replace(tzinfo=timezone.utc),
+                end.replace(tzinfo=timezone.utc),
+                {"venues": venue_results},
+            )
+
+    def _maybe_log_progress(self, state: _JobState) -> None:
+        now = time.monotonic()
+        if now - self._last_log < self.progress_log_seconds:
+            return
+        self._last_log = now
+        logger.info("Backfill progress", extra=state.progress.snapshot())
@@ -1,46 +1,14 @@
 from __future__ import annotations
 
-import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Sequence
 
-import httpx
+from app.data.exchanges.http import get_http_pool
 
 BASE_URL = "https://api.binance.com"
 KLINES_PATH = "/api/v3/klines"
-REQUESTS_PER_MINUTE = 1100
-WINDOW_SECONDS = 60.0
-
-
-class _RateLimiter:
-    """Simple token bucket to respect Binance rate limits."""
-
-    def __init__(self, max_requests: int, window: float) -> None:
-        self._max = max_requests
-        self._window = window
-        loop = asyncio.get_event_loop()
-        self._last_refill = loop.time()
-        self._tokens = max_requests
-        self._lock = asyncio.Lock()
-
-    async def acquire(self) -> None:
-        async with self._lock:
-            now = asyncio.get_event_loop().time()
-            elapsed = now - self._last_refill
-            if elapsed >= self._window:
-                self._tokens = self._max
-                self._last_refill = now
-            while self._tokens <= 0:
-                await asyncio.sleep(0.05)
-                now = asyncio.get_event_loop().time()
-                elapsed = now - self._last_refill
-                if elapsed >= self._window:
-                    self._tokens = self._max
-                    self._last_refill = now
-            self._tokens -= 1
-
-
-_rate_limiter = _RateLimiter(REQUESTS_PER_MINUTE, WINDOW_SECONDS)
+# Rate-limit bucket in the shared pool (EXCHANGE_RATE_LIMITS)
+VENUE = "binance"
 
 
 class BinanceClient:
@@ -63,16 +31,16 @@ class BinanceClient:
         if end is not None:
             params["endTime"] = int(end.timestamp() * 1000)
 
-        await _rate_limiter.acquire()
         import time
         from app.core.logging import logger
         from app.observability.metrics import BINANCE_REQUEST_LATENCY
         
         start_time = time.time()
-        async with httpx.AsyncClient(base_url=self._base_url, timeout=20.0) as client:  # Reduced from 30s to 20s
-            response = await client.get(KLINES_PATH, params=params)
-            response.raise_for_status()
-            data = response.json()
+        # Pooled keep-alive connection and the venue's rate limit; timeout reduced from 30s to 20s
+        response = await get_http_pool().request(
+            VENUE, "GET", f"{self._base_url}{KLINES_PATH}", params=params, timeout=20.0
+        )
+        data = response.json()
 
         latency_ms = 0.0
         latency_seconds = time.time() - start_time
@@ -131,4 +99,58 @@ class BinanceClient:
             "fetched_at": datetime.utcnow().isoformat(),
             "latency_ms": latency_ms,
         }
-        return data, meta
\ No newline at end of file
+        return data, meta
+
+    async def get_klines_range(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime | None = None,
+        *,
+        page_limit: int = 1000,
+        max_pages: int | None = None,
+    ) -> tuple[list[list[Any]], dict[str, Any]]:
+        """
+        Fetch every kline with ``start <= open_time <= end`` by paging ``get_klines``.
+
+        Each page starts 1 ms after the last ``open_time`` returned, so exchange
+        downtime gaps are skipped rather than re-requested. Paging stops on a
+        short page, once ``end`` is reached, or after ``max_pages`` requests.
+        """
+        end_ms = int(end.timestamp() * 1000) if end is not None else None
+        cursor_ms = int(start.timestamp() * 1000)
+        klines: dict[int, list[Any]] = {}
+        pages = 0
+        latency_ms = 0.0
+        while max_pages is None or pages < max_pages:
+            if end_ms is not None and cursor_ms > end_ms:
+                break
+            page, page_meta = await self.get_klines(
+                symbol,
+                interval,
+                datetime.fromtimestamp(cursor_ms / 1000, tz=timezone.utc),
+                end,
+                page_limit,
+            )
+            pages += 1
+            latency_ms += float(page_meta.get("latency_ms") or 0.0)
+            if not page:
+                break
+            for row in page:
+                klines[int(row[0])] = row
+            last_open_ms = int(page[-1][0])
+            if len(page) < page_limit or last_open_ms < cursor_ms:
+                break
+            cursor_ms = last_open_ms + 1
+
+        meta = {
+            "symbol": symbol,
+            "interval": interval,
+            "requested_limit": page_limit,
+            "pages": pages,
+            "rows": len(klines),
+            "fetched_at": datetime.utcnow().isoformat(),
+            "latency_ms": latency_ms,
+        }
+        return [klines[key] for key in sorted(klines)], meta
@@ -1,19 +1,62 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from pathlib import Path
+from typing import Any, Iterable
 
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 from app.core.config import settings
 from app.core.exceptions import DataFreshnessError, DataGapError
 from app.core.logging import logger
+from app.indicators.cache import tag_source
+from app.indicators.rolling import rolling_weighted_mean
 from .ingestion import INTERVALS
+from .kline_store import KlineStore
 from .quality import CrossVenueReconciler, DataQualityPipeline
 from .storage import CURATED_ROOT, RAW_ROOT, ensure_dirs, ensure_partition_dirs, get_curated_path, get_raw_path, read_parquet, write_parquet
 from .universe import AssetSpec, MarketUniverseConfig
 
+CONSOLIDATED_FILENAME = "consolidated.parquet"
+CONSOLIDATED_VERSION = 1
+# Longest indicator lookback in bars: realized_vol_90 needs 90 returns, i.e. 90 earlier closes
+INDICATOR_LOOKBACK = 90
+INDICATOR_COLUMNS = (
+    "returns",
+    "sma_20",
+    "sma_50",
+    "ema_21",
+    "ema_55",
+    "rsi_14",
+    "atr_14",
+    "bollinger_mid",
+    "bollinger_std",
+    "bollinger_upper",
+    "bollinger_lower",
+    "vwap",
+    "support",
+    "resistance",
+    "volatility_30",
+    "realized_vol_7",
+    "realized_vol_90",
+    "volume_imbalance",
+    "rolling_vwap_anchored",
+    "hl_range_pct",
+    "buy_volume_ratio",
+    "mid_price",
+    "spread_pct",
+    "orderbook_imbalance",
+    "liquidity_pressure",
+    "atr_multiple_sl",
+    "atr_multiple_tp",
+)
+# Depend on every earlier bar, so they are always recomputed over the whole series
+RECURSIVE_INDICATORS = ("ema_21", "ema_55", "vwap")
+
 
 class DataIntegrityError(Exception):
     """Raised when data quality checks fail."""
@@ -57,12 +100,16 @@ class DataCuration:
         lookback_files: int = 60,
         venue: str | None = None,
         symbol: str | None = None,
+        incremental: bool = True,
     ) -> dict[str, Any]:
         """
         Curate data for a specific interval, optionally filtered by venue and symbol.
         
         If venue/symbol are provided, uses partitioned paths {venue}/{symbol}/{interval}.
         Otherwise, falls back to legacy flat structure for backward compatibility.
+        When the venue/symbol has a consolidated KlineStore it is curated from there
+        instead of the last ``lookback_files`` snapshots; ``incremental=False``
+        forces a full indicator recompute (see ``_curate_consolidated``).
         """
         if interval not in INTERVALS:
             return {
@@ -72,6 +119,9 @@ class DataCuration:
             }
 
         if venue and symbol:
+            kline_store = KlineStore(venue, symbol, interval)
+            if kline_store.partitions():
+                return self._curate_consolidated(interval, kline_store, incremental=incremental)
             raw_dir = get_raw_path(venue, symbol, interval).parent
             curated_path = get_curated_path(venue, symbol, interval)
         else:
@@ -100,6 +150,108 @@ class DataCuration:
                 "symbol": symbol,
             }
 
+        df = self._prepare_raw(df)
+        df, quality_stats = self._apply_quality(df, interval=interval, venue=venue, symbol=symbol)
+        df, discrepancies = self._reconcile(df, interval=interval, venue=venue, symbol=symbol)
+        df = self._add_indicators(df)
+        df = self._finalize(df, interval=interval, venue=venue, symbol=symbol)
+        return self._write_curated(
+            df,
+            curated_path,
+            interval=interval,
+            venue=venue,
+            symbol=symbol,
+            quality_stats=quality_stats,
+            discrepancies=discrepancies,
+        )
+
+    def _curate_consolidated(self, interval: str, kline_store: KlineStore, *, incremental: bool) -> dict[str, Any]:
+        """
+        Curate the full history held in the consolidated KlineStore.
+
+        The pre-``dropna`` indicator frame of the previous run is kept next to
+        ``latest.parquet``. The quality pipeline uses whole-sample statistics
+        (return z-scores, volume MAD, winsor quantiles), so it still runs over the
+        whole series, which is cheap and vectorised; indicators are only recomputed
+        for bars whose sanitised inputs changed or are new, plus the bars whose
+        lookback window (``INDICATOR_LOOKBACK``) reaches them. The result is the
+        same frame a full recompute produces.
+        """
+        venue, symbol = kline_store.venue, kline_store.symbol
+        df = kline_store.read()
+        if not df.empty:
+            df = self._prepare_raw(df)
+        if df.empty:
+            return {
+                "status": "no_data",
+                "interval": interval,
+                "error": "Raw dataframe empty",
+                "venue": venue,
+                "symbol": symbol,
+            }
+        df, quality_stats = self._apply_quality(df, interval=interval, venue=venue, symbol=symbol)
+        df, discrepancies = self._reconcile(df, interval=interval, venue=venue, symbol=symbol)
+        df = df.reset_index(drop=True)
+
+        curated_path = get_curated_path(venue, symbol, interval)
+        consolidated_path = get_curated_path(venue, symbol, interval, filename=CONSOLIDATED_FILENAME)
+        fingerprint = self._curation_fingerprint()
+        previous = self._read_consolidated(consolidated_path, fingerprint) if incremental else None
+        frame, rows_recomputed = self._update_indicators(df, previous)
+
+        mode = "incremental" if previous is not None else "full"
+        if previous is not None and rows_recomputed == 0 and len(previous) == len(frame) and curated_path.exists():
+            return {
+                "status": "success",
+                "interval": interval,
+                "rows": len(frame.dropna()),
+                "path": str(curated_path),
+                "venue": venue,
+                "symbol": symbol,
+                "quality_stats": quality_stats,
+                "discrepancies": discrepancies,
+                "quality_pass": True,
+                "mode": mode,
+                "rows_recomputed": 0,
+                "unchanged": True,
+            }
+
+        write_parquet(
+            frame,
+            consolidated_path,
+            metadata={
+                "interval": interval,
+                "venue": venue,
+                "symbol": symbol,
+                "fingerprint": fingerprint,
+                "generated_at": datetime.utcnow().isoformat(),
+            },
+        )
+        curated = frame.dropna().reset_index(drop=True)
+        curated = self._finalize(curated, interval=interval, venue=venue, symbol=symbol)
+        result = self._write_curated(
+            curated,
+            curated_path,
+            interval=interval,
+            venue=venue,
+            symbol=symbol,
+            quality_stats=quality_stats,
+            discrepancies=discrepancies,
+        )
+        logger.info(
+            "Consolidated curation completed",
+            extra={
+                "interval": interval,
+                "venue": venue,
+                "symbol": symbol,
+                "mode": mode,
+                "rows": len(curated),
+                "rows_recomputed": rows_recomputed,
+            },
+        )
+        return result | {"mode": mode, "rows_recomputed": rows_recomputed}
+
+    def _prepare_raw(self, df: pd.DataFrame) -> pd.DataFrame:
         numeric_columns = [
             "open",
             "high",
@@ -122,137 +274,144 @@ class DataCuration:
         df.drop(columns=[c for c in ["ignore"] if c in df.columns], inplace=True)
 
         df.dropna(subset=["open", "high", "low", "close"], inplace=True)
+        return df
 
-        # Apply statistical quality pipeline
-        quality_stats = {}
-        if self.apply_quality:
-            quality_pipeline = DataQualityPipeline(
-                max_return_z=self.quality_config.get("max_return_z", 6.0),
-                max_volume_mad=self.quality_config.get("max_volume_mad", 10.0),
-                winsor_limits=tuple(self.quality_config.get("winsor_limits", [0.005, 0.995])),
-                interpolation_limit=self.quality_config.get("interpolation_limit", 2),
-            )
-            
-            rows_before = len(df)
-            df = quality_pipeline.sanitize(df)
-            rows_after = len(df)
-            
-            quality_stats = {
-                "rows_before": rows_before,
-                "rows_after": rows_after,
-                "rows_removed": rows_before - rows_after,
-                "quality_applied": True,
-            }
-            
-            logger.info(
-                "Quality pipeline applied",
-                extra={
-                    "interval": interval,
-                    "venue": venue,
-                    "symbol": symbol,
-                    **quality_stats,
-                },
-            )
+    def _apply_quality(
+        self,
+        df: pd.DataFrame,
+        *,
+        interval: str,
+        venue: str | None,
+        symbol: str | None,
+    ) -> tuple[pd.DataFrame, dict[str, Any]]:
+        """Apply the statistical quality pipeline when enabled."""
+        quality_stats: dict[str, Any] = {}
+        if not self.apply_quality:
+            return df, quality_stats
+
+        quality_pipeline = DataQualityPipeline(
+            max_return_z=self.quality_config.get("max_return_z", 6.0),
+            max_volume_mad=self.quality_config.get("max_volume_mad", 10.0),
+            winsor_limits=tuple(self.quality_config.get("winsor_limits", [0.005, 0.995])),
+            interpolation_limit=self.quality_config.get("interpolation_limit", 2),
+        )
+        
+        rows_before = len(df)
+        df = quality_pipeline.sanitize(df)
+        rows_after = len(df)
+        
+        quality_stats = {
+            "rows_before": rows_before,
+            "rows_after": rows_after,
+            "rows_removed": rows_before - rows_after,
+            "quality_applied": True,
+        }
+        
+        logger.info(
+            "Quality pipeline applied",
+            extra={
+                "interval": interval,
+                "venue": venue,
+                "symbol": symbol,
+                **quality_stats,
+            },
+        )
+        return df, quality_stats
 
-        # Apply cross-venue reconciliation if multi-venue mode
+    def _reconcile(
+        self,
+        df: pd.DataFrame,
+        *,
+        interval: str,
+        venue: str | None,
+        symbol: str | None,
+    ) -> tuple[pd.DataFrame, dict[str, Any] | None]:
+        """Apply cross-venue reconciliation if multi-venue mode."""
         discrepancies = None
-        if self.apply_reconciler and "venue" in df.columns:
-            venues = df["venue"].unique()
-            if len(venues) > 1:
-                reconciler = CrossVenueReconciler(
-                    tolerance_bps=self.quality_config.get("tolerance_bps", 5.0),
-                    benchmark=self.quality_config.get("benchmark_venue"),
-                )
-                
-                # Split by venue and prepare for reconciliation
-                venue_frames = {}
-                for v in venues:
-                    venue_df = df[df["venue"] == v].copy()
-                    if not venue_df.empty:
-                        venue_frames[v] = venue_df
-                
-                if len(venue_frames) > 1:
-                    discrepancies_df = reconciler.compare(venue_frames)
-                    
-                    if not discrepancies_df.empty:
-                        discrepancy_rate = len(discrepancies_df) / len(df)
-                        max_discrepancy_rate = self.quality_config.get("max_discrepancy_rate", 0.03)
-                        
-                        logger.warning(
-                            "Cross-venue discrepancies detected",
-                            extra={
-                                "interval": interval,
-                                "symbol": symbol,
-                                "discrepancy_count": len(discrepancies_df),
-                                "discrepancy_rate": discrepancy_rate,
-                                "max_allowed": max_discrepancy_rate,
-                            },
-                        )
-                        
-                        # Mark reconciled rows
-                        df["reconciled_flag"] = True
-                        if "open_time" in discrepancies_df.columns:
-                            discrepancy_times = set(discrepancies_df["open_time"])
-                            df.loc[df["open_time"].isin(discrepancy_times), "reconciled_flag"] = False
-                        
-                        # Persist discrepancy report
-                        self._persist_discrepancy_report(
-                            discrepancies_df,
-                            interval=interval,
-                            venue=venue,
-                            symbol=symbol,
-                        )
-                        
-                        # Raise error if discrepancy rate exceeds threshold
-                        if discrepancy_rate > max_discrepancy_rate:
-                            raise DataIntegrityError(
-                                f"Cross-venue discrepancy rate ({discrepancy_rate:.2%}) exceeds maximum ({max_discrepancy_rate:.2%})",
-                                details={
-                                    "discrepancy_count": len(discrepancies_df),
-                                    "discrepancy_rate": discrepancy_rate,
-                                    "max_allowed": max_discrepancy_rate,
-                                },
-                            )
-                        
-                        discrepancies = {
-                            "count": len(discrepancies_df),
-                            "rate": discrepancy_rate,
-                        }
-                    else:
-                        df["reconciled_flag"] = True
-                        discrepancies = {"count": 0, "rate": 0.0}
-                else:
-                    df["reconciled_flag"] = True
-            else:
-                df["reconciled_flag"] = True
+        if not (self.apply_reconciler and "venue" in df.columns):
+            return df, discrepancies
 
-        df = self._add_indicators(df)
+        venues = df["venue"].unique()
+        if len(venues) <= 1:
+            df["reconciled_flag"] = True
+            return df, discrepancies
+
+        reconciler = CrossVenueReconciler(
+            tolerance_bps=self.quality_config.get("tolerance_bps", 5.0),
+            benchmark=self.quality_config.get("benchmark_venue"),
+        )
+        
+        # Split by venue and prepare for reconciliation
+        venue_frames = {}
+        for v in venues:
+            venue_df = df[df["venue"] == v].copy()
+            if not venue_df.empty:
+                venue_frames[v] = venue_df
+        
+        if len(venue_frames) <= 1:
+            df["reconciled_flag"] = True
+            return df, discrepancies
+
+        discrepancies_df = reconciler.compare(venue_frames)
+        if discrepancies_df.empty:
+            df["reconciled_flag"] = True
+            return df, {"count": 0, "rate": 0.0}
+
+        discrepancy_rate = len(discrepancies_df) / len(df)
+        max_discrepancy_rate = self.quality_config.get("max_discrepancy_rate", 0.03)
+        
+        logger.warning(
+            "Cross-venue discrepancies detected",
+            extra={
+                "interval": interval,
+                "symbol": symbol,
+                "discrepancy_count": len(discrepancies_df),
+                "discrepancy_rate": discrepancy_rate,
+                "max_allowed": max_discrepancy_rate,
+            },
+        )
+        
+        # Mark reconciled rows
+        df["reconciled_flag"] = True
+        if "open_time" in discrepancies_df.columns:
+            discrepancy_times = set(discrepancies_df["open_time"])
+            df.loc[df["open_time"].isin(discrepancy_times), "reconciled_flag"] = False
+        
+        # Persist discrepancy report
+        self._persist_discrepancy_report(
+            discrepancies_df,
+            interval=interval,
+            venue=venue,
+            symbol=symbol,
+        )
+        
+        # Raise error if discrepancy rate exceeds threshold
+        if discrepancy_rate > max_discrepancy_rate:
+            raise DataIntegrityError(
+                f"Cross-venue discrepancy rate ({discrepancy_rate:.2%}) exceeds maximum ({max_discrepancy_rate:.2%})",
+                details={
+                    "discrepancy_count": len(discrepancies_df),
+                    "discrepancy_rate": discrepancy_rate,
+                    "max_allowed": max_discrepancy_rate,
+                },
+            )
+        
+        return df, {"count": len(discrepancies_df), "rate": discrepancy_rate}
+
+    def _finalize(
+        self,
+        df: pd.DataFrame,
+        *,
+        interval: str,
+        venue: str | None,
+        symbol: str | None,
+    ) -> pd.DataFrame:
         df["interval"] = interval
         if venue and symbol:
             df["venue"] = venue
             df["symbol"] = symbol
             ensure_partition_dirs(venue, symbol, interval)
 
-        def _convert_to_datetime_utc(series: pd.Series) -> pd.Series:
-            """Convert timestamp series to UTC datetime, handling numeric epoch values."""
-            # Check if numeric (int/float) and looks like epoch milliseconds (> 1e12)
-            if pd.api.types.is_numeric_dtype(series):
-                # If values are large (> 1e12), likely epoch milliseconds
-                if series.min() > 1e12:
-                    return pd.to_datetime(series, unit="ms", utc=True)
-                else:
-                    # Small numeric values might be seconds
-                    return pd.to_datetime(series, unit="s", utc=True)
-            else:
-                # String or datetime-like: parse normally
-                result = pd.to_datetime(series, utc=True)
-                # If result is naive, localize to UTC
-                if result.dt.tz is None:
-                    result = result.dt.tz_localize(timezone.utc)
-                else:
-                    result = result.dt.tz_convert(timezone.utc)
-                return result
-        
         # Ensure timestamp column exists for backtest compatibility
         # If open_time exists but timestamp doesn't, create timestamp from open_time
         if "timestamp" not in df.columns and "open_time" in df.columns:
@@ -260,32 +419,19 @@ class DataCuration:
         elif "timestamp" in df.columns:
             # Ensure existing timestamp is in UTC
             df["timestamp"] = _convert_to_datetime_utc(df["timestamp"])
+        return df
 
-        curated_path.parent.mkdir(parents=True, exist_ok=True)
-        write_parquet(
-            df,
-            curated_path,
-            metadata={
-                "interval": interval,
-                "rows": len(df),
-                "generated_at": datetime.utcnow().isoformat(),
-                "venue": venue,
-                "symbol": symbol,
-            },
-        )
-        result = {
-            "status": "success",
-            "interval": interval,
-            "rows": len(df),
-            "path": str(curated_path),
-            "venue": venue,
-            "symbol": symbol,
-            "quality_stats": quality_stats,
-            "discrepancies": discrepancies,
-            "quality_pass": True,
-        }
-        
-        # Update metadata with quality flags
+    def _write_curated(
+        self,
+        df: pd.DataFrame,
+        curated_path: Path,
+        *,
+        interval: str,
+        venue: str | None,
+        symbol: str | None,
+        quality_stats: dict[str, Any],
+        discrepancies: dict[str, Any] | None,
+    ) -> dict[str, Any]:
         metadata = {
             "interval": interval,
             "rows": len(df),
@@ -300,15 +446,43 @@ class DataCuration:
             metadata["quality_stats"] = quality_stats
         if discrepancies:
             metadata["discrepancies"] = discrepancies
-        
-        # Re-write with updated metadata
-        write_parquet(
-            df,
-            curated_path,
-            metadata=metadata,
-        )
-        
-        return result
+
+        curated_path.parent.mkdir(parents=True, exist_ok=True)
+        write_parquet(df, curated_path, metadata=metadata)
+        return {
+            "status": "success",
+            "interval": interval,
+            "rows": len(df),
+            "path": str(curated_path),
+            "venue": venue,
+            "symbol": symbol,
+            "quality_stats": quality_stats,
+            "discrepancies": discrepancies,
+            "quality_pass": True,
+        }
+
+    def _curation_fingerprint(self) -> str:
+        """Settings that shape the consolidated frame; a change invalidates it."""
+        payload = {
+            "version": CONSOLIDATED_VERSION,
+            "apply_quality": self.apply_quality,
+            "apply_reconciler": self.apply_reconciler,
+            "quality_config": self.quality_config,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    def _read_consolidated(self, path: Path, fingerprint: str) -> pd.DataFrame | None:
+        meta_path = path.with_suffix(".meta.json")
+        if not path.exists() or not meta_path.exists():
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta.get("fingerprint") != fingerprint:
+                return None
+            return read_parquet(path)
+        except Exception as exc:
+            logger.warning("Ignoring unreadable consolidated curated frame", extra={"path": str(path), "error": str(exc)})
+            return None
 
     def curate_timeframe(self, interval: str, *, lookback_files: int = 60) -> dict[str, Any]:
         """Backward-compatible alias used by scripts/tests."""
@@ -332,7 +506,38 @@ class DataCuration:
             path = CURATED_ROOT / interval / "latest.parquet"
         if not path.exists():
             raise FileNotFoundError(f"Curated dataset not found for {interval} (venue={venue}, symbol={symbol})")
-        return read_parquet(path)
+        # Tag the frame with its source so indicator consumers can share cached series
+        return tag_source(read_parquet(path), path)
+
+    def get_curated_since(
+        self,
+        interval: str,
+        since: datetime,
+        *,
+        columns: list[str] | None = None,
+        venue: str | None = None,
+        symbol: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Curated bars with ``open_time >= since``, reading only ``columns``
+        (``open_time`` is always included). Row groups entirely before
+        ``since`` are skipped without being decoded.
+        """
+        if venue and symbol:
+            path = get_curated_path(venue, symbol, interval)
+        else:
+            path = CURATED_ROOT / interval / "latest.parquet"
+        if not path.exists():
+            raise FileNotFoundError(f"Curated dataset not found for {interval} (venue={venue}, symbol={symbol})")
+        if columns is not None and "open_time" not in columns:
+            columns = ["open_time", *columns]
+        since_ts = pd.Timestamp(since)
+        since_ts = since_ts.tz_localize("UTC") if since_ts.tzinfo is None else since_ts.tz_convert("UTC")
+        # The filter must match the stored column: tz-aware or naive UTC
+        if getattr(pq.read_schema(path).field("open_time").type, "tz", None) is None:
+            since_ts = since_ts.tz_localize(None)
+        df = read_parquet(path, columns=columns, filters=[("open_time", ">=", since_ts)])
+        return df.sort_values("open_time", ignore_index=True)
 
     def validate_data_freshness(
         self,
@@ -585,49 +790,105 @@ class DataCuration:
         return results
 
     def _add_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        data = self._indicator_frame(df)
+        data.dropna(inplace=True)
+        data.reset_index(drop=True, inplace=True)
+        return data
+
+    def _indicator_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """All indicator columns, before dropping warm-up rows."""
+        return self._assemble_indicators(df, self._window_indicators(df), self._recursive_indicators(df))
+
+    def _update_indicators(self, df: pd.DataFrame, previous: pd.DataFrame | None) -> tuple[pd.DataFrame, int]:
+        """
+        Indicator frame for ``df`` reusing the windowed indicators of ``previous``.
+
+        ``previous`` is the frame built on the last run. A bar is recomputed when it
+        is new, when any of its sanitised columns changed, or when a changed bar
+        falls inside its lookback window. Recursive indicators (EMAs, cumulative
+        VWAP) depend on every earlier bar and are recomputed over the whole series.
+        Returns the frame and the number of bars whose windowed indicators were
+        recomputed.
+        """
+        if previous is None or not _is_prefix(previous, df):
+            return self._indicator_frame(df), len(df)
+
+        rows, known = len(df), len(previous)
+        dirty = np.ones(rows, dtype=bool)
+        dirty[:known] = ~_rows_equal(df.iloc[:known], previous, df.columns)
+        hits = np.concatenate(([0], np.cumsum(dirty)))
+        positions = np.arange(rows)
+        affected = hits[positions + 1] - hits[np.maximum(positions - INDICATOR_LOOKBACK, 0)] > 0
+
+        window_columns = [column for column in INDICATOR_COLUMNS if column not in RECURSIVE_INDICATORS]
+        windowed = previous[window_columns].reindex(range(rows))
+        for start, stop in _runs(affected):
+            lower = max(0, start - INDICATOR_LOOKBACK)
+            values = self._window_indicators(df.iloc[lower:stop].reset_index(drop=True))
+            windowed.iloc[start:stop] = values[window_columns].iloc[start - lower:].to_numpy()
+        windowed.index = df.index
+        frame = self._assemble_indicators(df, windowed, self._recursive_indicators(df))
+        return frame, int(affected.sum())
+
+    @staticmethod
+    def _assemble_indicators(df: pd.DataFrame, windowed: pd.DataFrame, recursive: pd.DataFrame) -> pd.DataFrame:
         data = df.copy()
-        data["returns"] = data["close"].pct_change()
+        for column in INDICATOR_COLUMNS:
+            data[column] = recursive[column] if column in RECURSIVE_INDICATORS else windowed[column]
+        return data
+
+    @staticmethod
+    def _recursive_indicators(data: pd.DataFrame) -> pd.DataFrame:
+        """Indicators whose value depends on the whole history up to the bar."""
+        typical_price = (data["high"] + data["low"] + data["close"]) / 3
+        cumulative_volume = data["volume"].cumsum()
+        return pd.DataFrame(
+            {
+                "ema_21": data["close"].ewm(span=21, adjust=False).mean(),
+                "ema_55": data["close"].ewm(span=55, adjust=False).mean(),
+                "vwap": (typical_price * data["volume"]).cumsum() / cumulative_volume.replace({0: np.nan}),
+            },
+            index=data.index,
+        )
+
+    def _window_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Indicators that only look back at most ``INDICATOR_LOOKBACK`` bars."""
+        out = pd.DataFrame(index=data.index)
+        out["returns"] = data["close"].pct_change()
 
-        data["sma_20"] = data["close"].rolling(window=20, min_periods=20).mean()
-        data["sma_50"] = data["close"].rolling(window=50, min_periods=50).mean()
-        data["ema_21"] = data["close"].ewm(span=21, adjust=False).mean()
-        data["ema_55"] = data["close"].ewm(span=55, adjust=False).mean()
+        out["sma_20"] = data["close"].rolling(window=20, min_periods=20).mean()
+        out["sma_50"] = data["close"].rolling(window=50, min_periods=50).mean()
 
         delta = data["close"].diff()
         gain = delta.clip(lower=0.0).rolling(window=14, min_periods=14).mean()
         loss = (-delta.clip(upper=0.0)).rolling(window=14, min_periods=14).mean()
         rs = gain / loss.replace({0: np.nan})
-        data["rsi_14"] = 100 - (100 / (1 + rs))
+        out["rsi_14"] = 100 - (100 / (1 + rs))
 
-        data["atr_14"] = self._atr(data, period=14)
-        data["bollinger_mid"] = data["close"].rolling(window=20, min_periods=20).mean()
-        data["bollinger_std"] = data["close"].rolling(window=20, min_periods=20).std()
-        data["bollinger_upper"] = data["bollinger_mid"] + 2 * data["bollinger_std"]
-        data["bollinger_lower"] = data["bollinger_mid"] - 2 * data["bollinger_std"]
+        out["atr_14"] = self._atr(data, period=14)
+        out["bollinger_mid"] = data["close"].rolling(window=20, min_periods=20).mean()
+        out["bollinger_std"] = data["close"].rolling(window=20, min_periods=20).std()
+        out["bollinger_upper"] = out["bollinger_mid"] + 2 * out["bollinger_std"]
+        out["bollinger_lower"] = out["bollinger_mid"] - 2 * out["bollinger_std"]
 
         typical_price = (data["high"] + data["low"] + data["close"]) / 3
-        cumulative_volume = data["volume"].cumsum()
-        data["vwap"] = (typical_price * data["volume"]).cumsum() / cumulative_volume.replace({0: np.nan})
 
-        data["support"] = data["low"].rolling(window=20, min_periods=20).min()
-        data["resistance"] = data["high"].rolling(window=20, min_periods=20).max()
-        data["volatility_30"] = data["returns"].rolling(window=30, min_periods=30).std() * np.sqrt(30)
+        out["support"] = data["low"].rolling(window=20, min_periods=20).min()
+        out["resistance"] = data["high"].rolling(window=20, min_periods=20).max()
+        out["volatility_30"] = out["returns"].rolling(window=30, min_periods=30).std() * np.sqrt(30)
 
-        data["realized_vol_7"] = (
-            data["returns"].rolling(window=7, min_periods=7).std() * np.sqrt(365)
+        out["realized_vol_7"] = (
+            out["returns"].rolling(window=7, min_periods=7).std() * np.sqrt(365)
         )
-        data["realized_vol_90"] = (
-            data["returns"].rolling(window=90, min_periods=90).std() * np.sqrt(365)
+        out["realized_vol_90"] = (
+            out["returns"].rolling(window=90, min_periods=90).std() * np.sqrt(365)
         )
-        data["volume_imbalance"] = (
+        out["volume_imbalance"] = (
             data["taker_buy_base"] - (data["volume"] - data["taker_buy_base"])
         ) / data["volume"].replace({0: np.nan})
-        data["rolling_vwap_anchored"] = (
-            typical_price.rolling(window=55, min_periods=30)
-            .apply(lambda x: np.average(x, weights=data["volume"].loc[x.index]))
-        )
-        data["hl_range_pct"] = (data["high"] - data["low"]) / data["close"]
-        data["buy_volume_ratio"] = data["taker_buy_base"] / data["volume"].replace({0: np.nan})
+        out["rolling_vwap_anchored"] = rolling_weighted_mean(typical_price, data["volume"], 55, min_periods=30)
+        out["hl_range_pct"] = (data["high"] - data["low"]) / data["close"]
+        out["buy_volume_ratio"] = data["taker_buy_base"] / data["volume"].replace({0: np.nan})
 
         bid_price_candidates = ["best_bid_price", "bid_price", "bid"]
         ask_price_candidates = ["best_ask_price", "ask_price", "ask"]
@@ -642,18 +903,16 @@ class DataCuration:
             (data["volume"] - data["taker_buy_base"]),
         )
 
-        data["mid_price"] = (bid_price_series + ask_price_series) / 2
-        spread_denominator = data["mid_price"].replace({0: np.nan})
-        data["spread_pct"] = (ask_price_series - bid_price_series) / spread_denominator
+        out["mid_price"] = (bid_price_series + ask_price_series) / 2
+        spread_denominator = out["mid_price"].replace({0: np.nan})
+        out["spread_pct"] = (ask_price_series - bid_price_series) / spread_denominator
         depth_total = (bid_qty_series + ask_qty_series).replace({0: np.nan})
-        data["orderbook_imbalance"] = (bid_qty_series - ask_qty_series) / depth_total
-        data["liquidity_pressure"] = (ask_qty_series / depth_total) - (bid_qty_series / depth_total)
+        out["orderbook_imbalance"] = (bid_qty_series - ask_qty_series) / depth_total
+        out["liquidity_pressure"] = (ask_qty_series / depth_total) - (bid_qty_series / depth_total)
 
-        data["atr_multiple_sl"] = data["close"] - 1.5 * data["atr_14"]
-        data["atr_multiple_tp"] = data["close"] + 2.5 * data["atr_14"]
-        data.dropna(inplace=True)
-        data.reset_index(drop=True, inplace=True)
-        return data
+        out["atr_multiple_sl"] = data["close"] - 1.5 * out["atr_14"]
+        out["atr_multiple_tp"] = data["close"] + 2.5 * out["atr_14"]
+        return out
 
     def _atr(self, df: pd.DataFrame, period: int) -> pd.Series:
         high_low = df["high"] - df["low"]
@@ -671,9 +930,6 @@ class DataCuration:
         symbol: str | None,
     ) -> None:
         """Persist discrepancy report to audit directory."""
-        from pathlib import Path
-        import json
-
         audit_dir = Path("data/audits")
         if venue and symbol:
             audit_dir = audit_dir / venue / symbol
@@ -695,4 +951,54 @@ class DataCuration:
         }
         
         report_path.write_text(json.dumps(report, indent=2, default=str))
-        logger.info(f"Discrepancy report persisted to {report_path}")
\ No newline at end of file
+        logger.info(f"Discrepancy report persisted to {report_path}")
+
+
+def _convert_to_datetime_utc(series: pd.Series) -> pd.Series:
+    """Convert timestamp series to UTC datetime, handling numeric epoch values."""
+    # Check if numeric (int/float) and looks like epoch milliseconds (> 1e12)
+    if pd.api.types.is_numeric_dtype(series):
+        # If values are large (> 1e12), likely epoch milliseconds
+        if series.min() > 1e12:
+            return pd.to_datetime(series, unit="ms", utc=True)
+        else:
+            # Small numeric values might be seconds
+            return pd.to_datetime(series, unit="s", utc=True)
+    else:
+        # String or datetime-like: parse normally
+        result = pd.to_datetime(series, utc=True)
+        # If result is naive, localize to UTC
+        if result.dt.tz is None:
+            result = result.dt.tz_localize(timezone.utc)
+        else:
+            result = result.dt.tz_convert(timezone.utc)
+        return result
+
+
+def _is_prefix(previous: pd.DataFrame, df: pd.DataFrame) -> bool:
+    """True when ``previous`` covers the first bars of ``df`` with the same columns."""
+    if len(previous) > len(df) or not set(df.columns) <= set(previous.columns):
+        return False
+    if not set(INDICATOR_COLUMNS) <= set(previous.columns):
+        return False
+    known = pd.to_datetime(previous["open_time"], utc=True).to_numpy()
+    current = pd.to_datetime(df["open_time"].iloc[: len(previous)], utc=True).to_numpy()
+    return bool(np.array_equal(known, current))
+
+
+def _rows_equal(left: pd.DataFrame, right: pd.DataFrame, columns: Iterable[str]) -> np.ndarray:
+    """Row-wise equality over ``columns``, treating NaN == NaN."""
+    equal = np.ones(len(left), dtype=bool)
+    for column in columns:
+        lhs = left[column].reset_index(drop=True)
+        rhs = right[column].reset_index(drop=True)
+        same = lhs.eq(rhs) | (lhs.isna() & rhs.isna())
+        equal &= same.to_numpy(dtype=bool)
+    return equal
+
+
+def _runs(mask: np.ndarray) -> list[tuple[int, int]]:
+    """[start, stop) ranges of consecutive True values."""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
@@ -12,6 +12,7 @@ from .binance import BinanceFuturesUSDTDataSource
 from .bitstamp import BitstampDataSource
 from .bybit import BybitPerpetualDataSource
 from .coinbase import CoinbaseDataSource
+from .http import AsyncRateLimiter, HTTPConnectionPool, close_http_pool, get_http_pool
 
 __all__ = [
     "Candle",
@@ -25,5 +26,9 @@ __all__ = [
     "CoinbaseDataSource",
     "BitstampDataSource",
     "BybitPerpetualDataSource",
+    "AsyncRateLimiter",
+    "HTTPConnectionPool",
+    "get_http_pool",
+    "close_http_pool",
 ]
 
@@ -1,10 +1,174 @@
-"""Shared HTTP utilities for exchange connectors."""
+"""
+Shared HTTP utilities for exchange connectors.
+
+Connectors send requests through one process-wide ``HTTPConnectionPool`` so
+TCP/TLS connections are kept alive and reused across calls and venues. Each
+venue has its own ``AsyncRateLimiter``; limits come from
+``EXCHANGE_RATE_LIMITS`` (requests per window, in seconds). Sockets belong
+to an event loop, so the pool keeps one client per loop; a client is closed
+when its ``asyncio.run`` loop shuts down (or earlier via ``close_http_pool``,
+which the FastAPI shutdown hook calls).
+"""
 from __future__ import annotations
 
-from typing import Any, Mapping
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Mapping
 
 import httpx
 
+from app.core.config import settings
+
+# Public REST limits per venue, kept below the documented caps
+EXCHANGE_RATE_LIMITS: dict[str, tuple[int, float]] = {
+    "binance": (1100, 60.0),
+    "binance_futures": (2000, 60.0),
+    "bybit_perp": (500, 5.0),
+    "coinbase": (10, 1.0),
+    "bitstamp": (400, 1.0),
+}
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket allowing ``max_requests`` per ``window`` seconds.
+
+    The bucket refills continuously. A caller that finds it empty reserves the
+    next token and sleeps until it is due, so waiters are served in order
+    without holding a lock; the limiter is not bound to an event loop.
+    """
+
+    def __init__(self, max_requests: int, window: float) -> None:
+        self._capacity = float(max_requests)
+        self._rate = max_requests / window
+        self._tokens = float(max_requests)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self._rate)
+
+
+class HTTPConnectionPool:
+    """Keep-alive ``httpx.AsyncClient`` shared by all connectors, plus per-venue rate limiters."""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        rate_limits: Mapping[str, tuple[int, float]] | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = timeout
+        self._rate_limits = dict(EXCHANGE_RATE_LIMITS if rate_limits is None else rate_limits)
+        self._limiters: dict[str, AsyncRateLimiter] = {}
+        self._transport = transport
+        # Per loop: its client and the async generator that closes it at loop shutdown
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, AsyncIterator[None]]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client for the running event loop (each loop gets its own client)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._clients.get(loop)
+            if entry is not None and not entry[0].is_closed:
+                return entry[0]
+            client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout, transport=self._transport)
+            closer = _close_on_loop_shutdown(client)
+            self._clients[loop] = (client, closer)
+        # Run the closer up to its ``yield``: the loop now tracks it, and asyncio.run
+        # finalises tracked async generators (``shutdown_asyncgens``) before closing
+        try:
+            closer.asend(None).send(None)
+        except StopIteration:
+            pass
+        return client
+
+    def limiter(self, venue: str) -> AsyncRateLimiter | None:
+        if venue not in self._limiters:
+            limit = self._rate_limits.get(venue)
+            if limit is None:
+                return None
+            self._limiters[venue] = AsyncRateLimiter(*limit)
+        return self._limiters[venue]
+
+    async def request(
+        self,
+        venue: str,
+        method: str,
+        url: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> httpx.Response:
+        """Rate-limited request for ``venue``; raises ``httpx.HTTPStatusError`` on error statuses."""
+        limiter = self.limiter(venue)
+        if limiter is not None:
+            await limiter.acquire()
+        response = await self.client().request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            timeout=self._timeout if timeout is None else timeout,
+        )
+        response.raise_for_status()
+        return response
+
+    async def aclose(self) -> None:
+        """Close the running loop's client; other loops close theirs when they shut down."""
+        with self._lock:
+            entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+
+async def _close_on_loop_shutdown(client: httpx.AsyncClient) -> AsyncIterator[None]:
+    try:
+        yield
+    finally:
+        if not client.is_closed:
+            await client.aclose()
+
+
+_pool: HTTPConnectionPool | None = None
+
+
+def get_http_pool() -> HTTPConnectionPool:
+    """Process-wide connection pool, created on first use."""
+    global _pool
+    if _pool is None:
+        _pool = HTTPConnectionPool(
+            max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS,
+        )
+    return _pool
+
+
+async def close_http_pool() -> None:
+    """Close pooled connections (on application shutdown)."""
+    if _pool is not None:
+        await _pool.aclose()
+
 
 class HTTPExchangeClient:
     """Lightweight async HTTP client wrapper for exchange data sources."""
@@ -18,10 +182,12 @@ class HTTPExchangeClient:
         client: httpx.AsyncClient | None = None,
         timeout: float = 10.0,
         headers: Mapping[str, str] | None = None,
+        pool: HTTPConnectionPool | None = None,
     ) -> None:
         self._external_client = client
         self._timeout = timeout
         self._headers = dict(headers or {})
+        self._pool = pool
 
     async def _request(
         self,
@@ -36,10 +202,16 @@ class HTTPExchangeClient:
             response.raise_for_status()
             return response.json()
 
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=self._timeout, headers=self._headers) as client:
-            response = await client.request(method, path, params=params)
-            response.raise_for_status()
-            return response.json()
+        pool = self._pool or get_http_pool()
+        response = await pool.request(
+            self.venue,
+            method,
+            url,
+            params=params,
+            headers=self._headers,
+            timeout=self._timeout,
+        )
+        return response.json()
 
     def _build_url(self, path: str) -> str:
         if path.startswith("http://") or path.startswith("https://"):
@@ -47,14 +219,3 @@ class HTTPExchangeClient:
         if path.startswith("/"):
             return f"{self.base_url}{path}"
         return f"{self.base_url}/{path}"
-
-
-
-
-
-
-
-
-
-
-
@@ -10,6 +10,7 @@ import pandas as pd
 warnings.filterwarnings("ignore", message=".*fillna with 'method' is deprecated.*", category=FutureWarning)
 
 from .binance_client import BinanceClient
+from .kline_store import KlineStore
 from .storage import RAW_ROOT, ensure_partition_dirs, get_raw_path, write_parquet
 from .universe import AssetSpec
 
@@ -140,11 +141,22 @@ class DataIngestion:
 
         return gaps
 
-    async def ingest_all_timeframes(self) -> list[dict[str, Any]]:
+    async def ingest_all_timeframes(self, *, incremental: bool = True) -> list[dict[str, Any]]:
+        """
+        Ingest every interval.
+
+        In incremental mode (default) only candles at or after each interval's
+        high-water mark are requested and merged into the deduplicated KlineStore.
+        ``incremental=False`` keeps the legacy behaviour of writing a fresh
+        1,000-candle snapshot file per interval.
+        """
         results: list[dict[str, Any]] = []
         for interval in INTERVALS:
             try:
-                result = await self.ingest_timeframe(interval)
+                if incremental:
+                    result = await self.ingest_incremental(interval)
+                else:
+                    result = await self.ingest_timeframe(interval)
             except Exception as exc:  # pragma: no cover - bubbled to caller
                 result = {
                     "status": "error",
@@ -164,14 +176,20 @@ class DataIngestion:
         symbol: str = "BTCUSDT",
         venue: str = "binance",
         limit: int = 1000,
+        paginate: bool = False,
     ) -> dict[str, Any]:
         """
         Ingest data for a specific timeframe, optionally partitioned by venue/symbol.
         
         If venue is provided, uses partitioned paths {venue}/{symbol}/{interval}.
         Otherwise, falls back to legacy flat structure for backward compatibility.
+        With ``paginate=True`` and a ``start``, the whole [start, end] range is
+        fetched in pages of ``limit`` candles instead of only the first page.
         """
-        raw_klines, meta = await self.client.get_klines(symbol, interval, start, end, limit)
+        if paginate and start is not None:
+            raw_klines, meta = await self.client.get_klines_range(symbol, interval, start, end, page_limit=limit)
+        else:
+            raw_klines, meta = await self.client.get_klines(symbol, interval, start, end, limit)
         if not raw_klines:
             return {
                 "status": "empty",
@@ -209,6 +227,69 @@ class DataIngestion:
             "path": str(output),
         }
 
+    async def ingest_incremental(
+        self,
+        interval: str,
+        *,
+        symbol: str = "BTCUSDT",
+        venue: str = "binance",
+        bootstrap_limit: int = 1000,
+        page_limit: int = 1000,
+        max_pages: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Fetch only candles newer than the stored high-water mark and merge them into the KlineStore.
+
+        Only closed candles are stored: the still-open one changes on every tick and
+        would rewrite its month partition on every run, so it is left for the run
+        after it closes. Long outages are covered by paginating from the high-water
+        mark; an empty store is seeded with the latest ``bootstrap_limit`` candles.
+        """
+        store = KlineStore(venue, symbol, interval)
+        high_water_mark = store.high_water_mark()
+        if high_water_mark is None:
+            raw_klines, meta = await self.client.get_klines(symbol, interval, None, None, bootstrap_limit)
+            meta = dict(meta) | {"pages": 1}
+        else:
+            raw_klines, meta = await self.client.get_klines_range(
+                symbol,
+                interval,
+                high_water_mark.to_pydatetime(),
+                page_limit=page_limit,
+                max_pages=max_pages,
+            )
+
+        result: dict[str, Any] = {
+            "interval": interval,
+            "symbol": symbol,
+            "venue": venue,
+            "mode": "incremental",
+            "high_water_mark": high_water_mark.isoformat() if high_water_mark is not None else None,
+            "requests": meta.get("pages", 1),
+            "meta": meta,
+        }
+        empty = {"status": "empty", "rows": 0, "new_rows": 0, "bytes_written": 0}
+        if not raw_klines:
+            return result | empty
+
+        df = self._klines_to_dataframe(raw_klines)
+        df = df[df["close_time"] <= pd.Timestamp.now(tz="UTC")].copy()
+        if df.empty:
+            return result | empty
+
+        df["venue"] = venue
+        df["symbol"] = symbol
+        ensure_partition_dirs(venue, symbol, interval)
+        stats = store.append(df, metadata=meta)
+        return result | {
+            "status": "success",
+            "rows": len(df),
+            "new_rows": stats["rows_new"],
+            "bytes_written": stats["bytes_written"],
+            "partitions_written": stats["partitions_written"],
+            "path": str(store.directory),
+        }
+
     async def ingest_asset(
         self,
         asset: AssetSpec,
@@ -0,0 +1,164 @@
+"""Deduplicated, month-partitioned raw kline store with a per-partition high-water mark."""
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .storage import get_raw_path, read_parquet, write_parquet
+
+STATE_FILENAME = "_hwm.json"
+PARTITION_PREFIX = "klines-"
+
+
+class KlineStore:
+    """
+    Raw klines for one venue/symbol/interval, one parquet file per calendar month.
+
+    Files live next to the legacy timestamped snapshots
+    (``{venue}/{symbol}/{interval}/klines-YYYY-MM.parquet``) so readers that glob
+    the raw directory keep working. ``append`` only rewrites the months that
+    receive new or changed candles and records the last stored ``open_time``
+    (the high-water mark) in ``_hwm.json``, so the next run only asks the
+    exchange for newer candles.
+    """
+
+    def __init__(self, venue: str, symbol: str, interval: str) -> None:
+        self.venue = venue
+        self.symbol = symbol
+        self.interval = interval
+
+    @property
+    def directory(self) -> Path:
+        return get_raw_path(self.venue, self.symbol, self.interval).parent
+
+    @property
+    def state_path(self) -> Path:
+        return self.directory / STATE_FILENAME
+
+    def partition_path(self, key: str) -> Path:
+        return self.directory / f"{PARTITION_PREFIX}{key}.parquet"
+
+    def partitions(self) -> list[Path]:
+        return sorted(self.directory.glob(f"{PARTITION_PREFIX}*.parquet"))
+
+    def high_water_mark(self) -> pd.Timestamp | None:
+        """Last stored ``open_time`` (UTC), or None when the store is empty."""
+        state = self._read_state()
+        if state and state.get("last_open_time"):
+            return pd.Timestamp(state["last_open_time"]).tz_convert("UTC")
+        partitions = self.partitions()
+        if not partitions:
+            return None
+        # State file missing (first run after upgrade or manual cleanup): derive it from the data
+        open_times = pd.to_datetime(read_parquet(partitions[-1])["open_time"], utc=True)
+        return open_times.max() if not open_times.empty else None
+
+    def read(self, start: pd.Timestamp | None = None, end: pd.Timestamp | None = None) -> pd.DataFrame:
+        """Stored klines in [start, end], reading only the months that overlap the range."""
+        selected = []
+        for path in self.partitions():
+            key = path.stem[len(PARTITION_PREFIX):]
+            month = pd.Timestamp(f"{key}-01", tz="UTC")
+            if start is not None and month + pd.offsets.MonthBegin(1) <= start:
+                continue
+            if end is not None and month > end:
+                continue
+            selected.append(read_parquet(path))
+        if not selected:
+            return pd.DataFrame()
+        df = pd.concat(selected, ignore_index=True)
+        if start is not None:
+            df = df[df["open_time"] >= start]
+        if end is not None:
+            df = df[df["open_time"] <= end]
+        return df.reset_index(drop=True)
+
+    def append(self, df: pd.DataFrame, *, metadata: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Merge klines into their monthly partitions, newest version of a candle wins.
+
+        Months whose content does not change are not rewritten, so re-fetching the
+        last stored candle costs nothing. Callers pass closed candles only: an open
+        candle's values move on every fetch and would rewrite its month each time.
+        """
+        stats = {"rows_new": 0, "rows_updated": 0, "partitions_written": [], "bytes_written": 0}
+        if df.empty:
+            return stats
+        df = df.copy()
+        df["open_time"] = pd.to_datetime(df["open_time"], utc=True)
+        df = df.drop_duplicates(subset="open_time", keep="last").sort_values("open_time")
+        keys = df["open_time"].dt.strftime("%Y-%m")
+
+        for key, batch in df.groupby(keys.to_numpy(), sort=True):
+            path = self.partition_path(str(key))
+            if path.exists():
+                existing = read_parquet(path)
+                existing["open_time"] = pd.to_datetime(existing["open_time"], utc=True)
+                merged = (
+                    pd.concat([existing, batch], ignore_index=True)
+                    .drop_duplicates(subset="open_time", keep="last")
+                    .sort_values("open_time")
+                    .reset_index(drop=True)
+                )
+                known = existing["open_time"].isin(batch["open_time"])
+                new_rows = len(batch) - int(known.sum())
+                if new_rows == 0 and _same_rows(existing, merged):
+                    continue
+                stats["rows_updated"] += int(known.sum())
+            else:
+                merged = batch.reset_index(drop=True)
+                new_rows = len(batch)
+            stats["rows_new"] += new_rows
+            write_parquet(
+                merged,
+                path,
+                metadata=(metadata or {}) | {
+                    "venue": self.venue,
+                    "symbol": self.symbol,
+                    "interval": self.interval,
+                    "partition": str(key),
+                },
+            )
+            stats["partitions_written"].append(path.name)
+            stats["bytes_written"] += path.stat().st_size
+
+        last = df.iloc[-1]
+        hwm = self.high_water_mark()
+        if hwm is None or last["open_time"] >= hwm:
+            self._write_state(
+                {
+                    "last_open_time": last["open_time"].isoformat(),
+                    "last_close_time": pd.Timestamp(last["close_time"]).isoformat() if "close_time" in df.columns else None,
+                    "updated_at": datetime.utcnow().isoformat(),
+                }
+            )
+        return stats
+
+    def _read_state(self) -> dict[str, Any] | None:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_state(self, state: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(f".{STATE_FILENAME}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+
+def _same_rows(existing: pd.DataFrame, merged: pd.DataFrame) -> bool:
+    if len(existing) != len(merged):
+        return False
+    left = existing.sort_values("open_time").reset_index(drop=True)
+    try:
+        pd.testing.assert_frame_equal(left, merged[left.columns], check_dtype=False)
+    except (AssertionError, KeyError):
+        return False
+    return True
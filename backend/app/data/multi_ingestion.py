@@ -1,20 +1,32 @@
 """Coordinate multi-venue ingestion with normalised candle output."""
 from __future__ import annotations
 
-from collections.abc import Iterable
+import asyncio
+from collections.abc import Awaitable, Iterable
 from dataclasses import dataclass, field
 from typing import Any
 
 import pandas as pd
 
+from app.core.config import settings
+from app.core.logging import logger
 from app.data.exchanges.base import Candle, ExchangeDataSource
 from app.data.storage import RAW_ROOT, ensure_partition_dirs, get_raw_path, write_parquet
 
 
 @dataclass(slots=True)
 class MultiVenueIngestion:
+    """
+    Fetch candles and order books from every source and store them per venue.
+
+    Requests for all venues (and, in ``ingest_universe``, all symbols and
+    intervals) run concurrently, at most ``max_concurrency`` at a time; the
+    connectors' shared connection pool applies the per-venue rate limits.
+    """
+
     sources: Iterable[ExchangeDataSource]
     writer: Any = field(default=write_parquet)
+    max_concurrency: int = field(default_factory=lambda: settings.INGESTION_MAX_CONCURRENCY)
 
     async def ingest_interval(
         self,
@@ -23,22 +35,75 @@ class MultiVenueIngestion:
         start=None,
         end=None,
     ) -> dict[str, Any]:
-        staging: list[dict[str, Any]] = []
-        for source in self.sources:
-            candles = await source.fetch_candles(symbol, interval, start, end)
-            frame = self._to_dataframe(candles)
-            depth = await source.fetch_orderbook(symbol)
-            if depth and not frame.empty:
-                best_bid = depth.best_bid
-                best_ask = depth.best_ask
-                frame["best_bid_price"] = best_bid.price if best_bid else None
-                frame["best_ask_price"] = best_ask.price if best_ask else None
-                frame["best_bid_qty"] = best_bid.quantity if best_bid else None
-                frame["best_ask_qty"] = best_ask.quantity if best_ask else None
-                frame["bid_depth"] = depth.bid_depth
-                frame["ask_depth"] = depth.ask_depth
-                frame["orderbook_timestamp"] = depth.timestamp
-            staging.append({"source": source, "frame": frame})
+        return await self._ingest_interval(symbol, interval, start, end, asyncio.Semaphore(self.max_concurrency))
+
+    async def ingest_universe(
+        self,
+        symbols: Iterable[str],
+        intervals: Iterable[str],
+        start=None,
+        end=None,
+    ) -> list[dict[str, Any]]:
+        """
+        Ingest every symbol/interval pair concurrently, sharing one concurrency
+        bound. A failing pair is reported with ``status="error"`` instead of
+        aborting the others.
+        """
+        limit = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(symbol: str, interval: str) -> dict[str, Any]:
+            try:
+                return await self._ingest_interval(symbol, interval, start, end, limit)
+            except Exception as exc:
+                logger.warning(
+                    "Universe ingestion failed",
+                    extra={"symbol": symbol, "interval": interval, "error": str(exc)},
+                )
+                return {"status": "error", "symbol": symbol, "interval": interval, "error": str(exc)}
+
+        intervals = list(intervals)
+        return list(await asyncio.gather(*(run(symbol, interval) for symbol in symbols for interval in intervals)))
+
+    async def fetch_candle_frames(self, symbol: str, interval: str, start, end) -> dict[str, pd.DataFrame]:
+        """
+        Candles only (no order book) from every source, with ``relative_volume``,
+        keyed by venue. Used for historical windows, where a current order book
+        snapshot would be meaningless.
+        """
+        sources = list(self.sources)
+        limit = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(source: ExchangeDataSource) -> pd.DataFrame:
+            async with limit:
+                return self._to_dataframe(await source.fetch_candles(symbol, interval, start, end))
+
+        frames = await asyncio.gather(*(fetch(source) for source in sources))
+        staging = [{"source": source, "frame": frame} for source, frame in zip(sources, frames)]
+        self._apply_relative_volume(staging)
+        return {item["source"].venue: item["frame"] for item in staging}
+
+    async def _ingest_interval(
+        self,
+        symbol: str,
+        interval: str,
+        start,
+        end,
+        limit: asyncio.Semaphore,
+    ) -> dict[str, Any]:
+        sources = list(self.sources)
+        # TaskGroup cancels the other venues' requests if one of them fails
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(self._fetch_source(source, symbol, interval, start, end, limit))
+                    for source in sources
+                ]
+        except ExceptionGroup as exc:
+            # Surface the venue's own error to the retry logic
+            raise exc.exceptions[0] from None
+        staging: list[dict[str, Any]] = [
+            {"source": source, "frame": task.result()} for source, task in zip(sources, tasks)
+        ]
 
         self._apply_relative_volume(staging)
 
@@ -51,7 +116,9 @@ class MultiVenueIngestion:
                 continue
             path = get_raw_path(source.venue, symbol, interval, filename=f"{symbol}.parquet")
             ensure_partition_dirs(source.venue, symbol, interval)
-            write_result = self.writer(
+            # Off the event loop, so other symbols keep fetching during the write
+            write_result = await asyncio.to_thread(
+                self.writer,
                 frame,
                 path,
                 metadata={
@@ -79,6 +146,36 @@ class MultiVenueIngestion:
             "venues": results,
         }
 
+    async def _fetch_source(
+        self,
+        source: ExchangeDataSource,
+        symbol: str,
+        interval: str,
+        start,
+        end,
+        limit: asyncio.Semaphore,
+    ) -> pd.DataFrame:
+        async def bounded(request: Awaitable[Any]) -> Any:
+            async with limit:
+                return await request
+
+        candles, depth = await asyncio.gather(
+            bounded(source.fetch_candles(symbol, interval, start, end)),
+            bounded(source.fetch_orderbook(symbol)),
+        )
+        frame = self._to_dataframe(candles)
+        if depth and not frame.empty:
+            best_bid = depth.best_bid
+            best_ask = depth.best_ask
+            frame["best_bid_price"] = best_bid.price if best_bid else None
+            frame["best_ask_price"] = best_ask.price if best_ask else None
+            frame["best_bid_qty"] = best_bid.quantity if best_bid else None
+            frame["best_ask_qty"] = best_ask.quantity if best_ask else None
+            frame["bid_depth"] = depth.bid_depth
+            frame["ask_depth"] = depth.ask_depth
+            frame["orderbook_timestamp"] = depth.timestamp
+        return frame
+
     def _to_dataframe(self, candles: Iterable[Candle]) -> pd.DataFrame:
         records: list[dict[str, Any]] = []
         for candle in candles:
@@ -12,7 +12,9 @@ import pandas as pd
 
 from app.core.logging import logger
 from app.data.exchanges.base import ExchangeDataSource
-from app.data.storage import ensure_partition_dirs, get_raw_path, write_parquet
+from app.data.orderbook_partitions import snapshots_to_frame
+from app.data.orderbook_store import OrderBookArrays, OrderBookStore, parse_levels
+from app.data.storage import ensure_partition_dirs, get_raw_path
 
 
 @dataclass
@@ -261,35 +263,32 @@ class OrderBookRepository:
         """
         self.venue = venue
         self.interval = interval
+        self.store = OrderBookStore(venue=venue, interval=interval)
 
     @staticmethod
     def _parse_levels(levels: Any) -> list[tuple[float, float]]:
-        """Parse order book levels from various formats."""
-        if isinstance(levels, list):
-            # Already a list of tuples/lists
-            return [tuple(level) if isinstance(level, (list, tuple)) else (float(level[0]), float(level[1])) for level in levels]
-        elif isinstance(levels, str):
-            # JSON string
-            import json
-            try:
-                parsed = json.loads(levels)
-                return [tuple(level) for level in parsed]
-            except Exception:
-                return []
-        else:
-            return []
+        """Parse order book levels from various formats (lists, parquet arrays, JSON strings)."""
+        return parse_levels(levels)
 
     def _get_orderbook_path(self, symbol: str) -> Path:
-        """Get path to order book parquet file."""
+        """Get path to the legacy single-file order book parquet (pre-partitioning layout)."""
         return get_raw_path(self.venue, symbol, self.interval, filename="orderbook.parquet")
 
+    def has_data(self, symbol: str) -> bool:
+        """Whether any order book data (partitioned or legacy single file) exists for symbol."""
+        return self.store.has_data(symbol)
+
     async def save_snapshots(
         self,
         symbol: str,
         snapshots: list[OrderBookSnapshot],
     ) -> dict[str, Any]:
         """
-        Save snapshots to parquet file.
+        Append snapshots as new partition files and register them in the manifest.
+        
+        Existing files are never read or rewritten, so the cost is proportional
+        to the batch. Duplicate timestamps are resolved at read time in favour of
+        the latest write; ``compact`` folds them into one file per partition.
         
         Args:
             symbol: Trading symbol
@@ -302,67 +301,33 @@ class OrderBookRepository:
             return {"status": "no_data", "snapshots": 0}
         
         try:
-            # Convert snapshots to DataFrame
-            data = []
-            for snapshot in snapshots:
-                row = {
-                    "timestamp": snapshot.timestamp,
-                    "symbol": snapshot.symbol,
-                    "venue": snapshot.venue,
-                    "best_bid": snapshot.best_bid,
-                    "best_ask": snapshot.best_ask,
-                    "mid_price": snapshot.mid_price,
-                    "spread": snapshot.spread,
-                    "spread_pct": snapshot.spread_pct,
-                    "bids": snapshot.bids,
-                    "asks": snapshot.asks,
-                    "bid_levels": len(snapshot.bids),
-                    "ask_levels": len(snapshot.asks),
-                }
-                data.append(row)
-            
-            df = pd.DataFrame(data)
-            
-            # Ensure partition directories exist
             ensure_partition_dirs(self.venue, symbol, self.interval)
-            path = self._get_orderbook_path(symbol)
-            
-            # Load existing data if file exists
-            if path.exists():
-                existing_df = pd.read_parquet(path)
-                # Combine and deduplicate by timestamp
-                df = pd.concat([existing_df, df], ignore_index=True)
-                df = df.drop_duplicates(subset=["timestamp"], keep="last")
-                df = df.sort_values("timestamp")
-            
-            # Save to parquet
-            result = write_parquet(
-                df,
-                path,
-                metadata={
-                    "symbol": symbol,
-                    "venue": self.venue,
-                    "interval": self.interval,
-                    "snapshots": len(snapshots),
-                    "depth_levels": len(snapshots[0].bids) if snapshots else 0,
-                },
-            )
-            
+            parts = self.store.partitions.append(symbol, snapshots_to_frame(snapshots))
+            self.store.invalidate(symbol, handles=False)
+            path = self.store.partitions.manifest_path(symbol)
+
             logger.info(
                 f"Saved {len(snapshots)} order book snapshots",
-                extra={"symbol": symbol, "venue": self.venue, "path": str(path)},
+                extra={"symbol": symbol, "venue": self.venue, "path": str(path), "parts": len(parts)},
             )
             
             return {
                 "status": "ok",
                 "snapshots": len(snapshots),
                 "path": str(path),
-                **result,
+                "rows": sum(part.rows for part in parts),
+                "parts": [part.file for part in parts],
             }
         except Exception as exc:
             logger.error(f"Failed to save order book snapshots", extra={"symbol": symbol, "error": str(exc)})
             return {"status": "error", "error": str(exc)}
 
+    def compact(self, symbol: str, *, min_parts: int = 2, partitions: list[str] | None = None) -> dict[str, Any]:
+        """Merge appended parts into one file per partition (see PartitionedOrderBookStorage.compact)."""
+        result = self.store.partitions.compact(symbol, min_parts=min_parts, partitions=partitions)
+        self.store.invalidate(symbol)
+        return result
+
     async def load(
         self,
         symbol: str,
@@ -380,33 +345,16 @@ class OrderBookRepository:
         Returns:
             List of snapshots in time range
         """
-        path = self._get_orderbook_path(symbol)
-        
-        if not path.exists():
+        if not self.has_data(symbol):
             # Use info level for missing files (expected in fresh environments)
             # Only log once per symbol to avoid spam
+            path = self.store.partitions.root(symbol)
             logger.info(f"Orderbook data missing; skipping depth checks", extra={"symbol": symbol, "path": str(path)})
             return []
         
         try:
-            df = pd.read_parquet(path)
-            
-            # Filter by timestamp range
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            mask = (df["timestamp"] >= start) & (df["timestamp"] <= end)
-            df_filtered = df[mask].copy()
-            
-            # Convert to snapshots
-            snapshots = []
-            for _, row in df_filtered.iterrows():
-                snapshot = OrderBookSnapshot(
-                    timestamp=row["timestamp"],
-                    symbol=row["symbol"],
-                    venue=row["venue"],
-                    bids=self._parse_levels(row["bids"]),
-                    asks=self._parse_levels(row["asks"]),
-                )
-                snapshots.append(snapshot)
+            window = self.store.scan(symbol, start, end)
+            snapshots = window.snapshots() if window is not None else []
             
             logger.debug(
                 f"Loaded {len(snapshots)} snapshots",
@@ -418,6 +366,19 @@ class OrderBookRepository:
             logger.error(f"Failed to load order book snapshots", extra={"symbol": symbol, "error": str(exc)})
             return []
 
+    async def scan(
+        self,
+        symbol: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+    ) -> OrderBookArrays | None:
+        """
+        Columnar view of snapshots in [start, end] without building snapshot objects.
+        
+        Returns None if no order book data exists for symbol.
+        """
+        return self.store.scan(symbol, start, end)
+
     async def get_snapshot(
         self,
         symbol: str,
@@ -436,28 +397,16 @@ class OrderBookRepository:
         Returns:
             Closest snapshot or None
         """
-        # Early check: skip if file doesn't exist (graceful fallback)
-        path = self._get_orderbook_path(symbol)
-        if not path.exists():
+        # Early check: skip if no data exists (graceful fallback)
+        if not self.has_data(symbol):
             return None
         
-        start = ts - pd.Timedelta(seconds=tolerance_seconds)
-        end = ts + pd.Timedelta(seconds=tolerance_seconds)
-        
-        snapshots = await self.load(symbol, start, end)
-        
-        if not snapshots:
-            return None
-        
-        # Find closest snapshot
-        closest = min(snapshots, key=lambda s: abs((s.timestamp - ts).total_seconds()))
-        
-        # Check if within tolerance
-        diff_seconds = abs((closest.timestamp - ts).total_seconds())
-        if diff_seconds > tolerance_seconds:
+        try:
+            # Binary search over the memory-mapped indexes of the overlapping partitions only
+            return self.store.get_snapshot(symbol, ts, tolerance_seconds=tolerance_seconds)
+        except Exception as exc:
+            logger.error("Failed to get order book snapshot", extra={"symbol": symbol, "error": str(exc)})
             return None
-        
-        return closest
 
     async def get_spread_depth(
         self,
@@ -521,30 +470,11 @@ class OrderBookRepository:
 
     async def get_latest(self, symbol: str) -> OrderBookSnapshot | None:
         """Get most recent snapshot for symbol."""
-        path = self._get_orderbook_path(symbol)
-        
-        if not path.exists():
+        if not self.has_data(symbol):
             return None
         
         try:
-            df = pd.read_parquet(path)
-            if df.empty:
-                return None
-            
-            # Get latest row
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            latest_row = df.iloc[-1]
-            
-            snapshot = OrderBookSnapshot(
-                timestamp=latest_row["timestamp"],
-                symbol=latest_row["symbol"],
-                venue=latest_row["venue"],
-                bids=self._parse_levels(latest_row["bids"]),
-                asks=self._parse_levels(latest_row["asks"]),
-            )
-            
-            return snapshot
+            return self.store.latest(symbol)
         except Exception as exc:
             logger.error(f"Failed to get latest snapshot", extra={"symbol": symbol, "error": str(exc)})
             return None
-
@@ -0,0 +1,377 @@
+"""Append-only, time-partitioned order book storage with a manifest and compaction."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+from app.core.logging import logger
+from app.data import storage
+from app.data.storage import get_raw_path, write_parquet
+
+try:  # POSIX only; other platforms rely on the in-process lock
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+LEGACY_FILENAME = "orderbook.parquet"
+PARTITION_FORMATS = {"daily": "%Y-%m-%d", "hourly": "%Y-%m-%dT%H"}
+
+_MANIFEST_LOCKS: dict[str, threading.Lock] = {}
+_MANIFEST_LOCKS_GUARD = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PartEntry:
+    """One immutable parquet file registered in the manifest."""
+
+    file: str  # relative to the order book directory
+    partition: str | None  # None for the legacy single-file store (spans many partitions)
+    min_ts: int  # UTC nanoseconds
+    max_ts: int
+    rows: int
+    kind: str = "append"  # append | compacted | legacy
+    checksum: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PartEntry:
+        return cls(
+            file=data["file"],
+            partition=data.get("partition"),
+            min_ts=int(data["min_ts"]),
+            max_ts=int(data["max_ts"]),
+            rows=int(data.get("rows", 0)),
+            kind=data.get("kind", "append"),
+            checksum=data.get("checksum"),
+        )
+
+
+@dataclass
+class OrderBookManifest:
+    """
+    Ordered list of parts. Later parts take precedence for duplicate timestamps,
+    mirroring ``drop_duplicates(keep="last")`` of the old rewrite-on-save path.
+    """
+
+    parts: list[PartEntry]
+    partitioning: str = "daily"
+    version: int = MANIFEST_VERSION
+
+    def overlapping(self, start_ns: int, end_ns: int) -> list[PartEntry]:
+        """Parts whose [min_ts, max_ts] intersects [start_ns, end_ns], in manifest order."""
+        return [p for p in self.parts if p.max_ts >= start_ns and p.min_ts <= end_ns]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "partitioning": self.partitioning,
+            "updated_at": datetime.utcnow().isoformat(),
+            "rows": sum(p.rows for p in self.parts),
+            "parts": [asdict(p) for p in self.parts],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> OrderBookManifest:
+        return cls(
+            parts=[PartEntry.from_dict(p) for p in data.get("parts", [])],
+            partitioning=data.get("partitioning", "daily"),
+            version=int(data.get("version", MANIFEST_VERSION)),
+        )
+
+
+def snapshots_to_frame(snapshots: list[Any]) -> pd.DataFrame:
+    """Row-per-snapshot frame in the parquet layout shared by all order book files."""
+    return pd.DataFrame(
+        [
+            {
+                "timestamp": snapshot.timestamp,
+                "symbol": snapshot.symbol,
+                "venue": snapshot.venue,
+                "best_bid": snapshot.best_bid,
+                "best_ask": snapshot.best_ask,
+                "mid_price": snapshot.mid_price,
+                "spread": snapshot.spread,
+                "spread_pct": snapshot.spread_pct,
+                "bids": snapshot.bids,
+                "asks": snapshot.asks,
+                "bid_levels": len(snapshot.bids),
+                "ask_levels": len(snapshot.asks),
+            }
+            for snapshot in snapshots
+        ]
+    )
+
+
+def partitioned_symbols(interval: str = "orderbook") -> list[tuple[str, str]]:
+    """(venue, symbol) pairs under the raw root that use the partitioned layout."""
+    return sorted(
+        (path.parents[2].name, path.parents[1].name)
+        for path in storage.RAW_ROOT.glob(f"*/*/{interval}/{MANIFEST_NAME}")
+    )
+
+
+def _utc_ns(timestamps: pd.Series) -> np.ndarray:
+    ts = pd.to_datetime(timestamps)
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert("UTC")
+    return np.asarray(ts.array.asi8, dtype=np.int64)
+
+
+class PartitionedOrderBookStorage:
+    """
+    Order book files for one (venue, interval) laid out as::
+
+        {venue}/{symbol}/{interval}/
+            manifest.json
+            parts/{partition}/part-<min_ts>-<id>.parquet
+            orderbook.parquet            # legacy single file, read-only until compacted
+
+    Appends write one small parquet per touched partition and add it to the
+    manifest, so a save costs O(batch) regardless of history. ``compact`` merges
+    the parts of a partition (and migrates the legacy file) into one file.
+    """
+
+    def __init__(self, venue: str = "binance", interval: str = "orderbook", *, partitioning: str = "daily") -> None:
+        if partitioning not in PARTITION_FORMATS:
+            raise ValueError(f"Unsupported partitioning '{partitioning}'")
+        self.venue = venue
+        self.interval = interval
+        self.partitioning = partitioning
+
+    def root(self, symbol: str) -> Path:
+        return get_raw_path(self.venue, symbol, self.interval, filename=LEGACY_FILENAME).parent
+
+    def manifest_path(self, symbol: str) -> Path:
+        return self.root(symbol) / MANIFEST_NAME
+
+    def legacy_path(self, symbol: str) -> Path:
+        return self.root(symbol) / LEGACY_FILENAME
+
+    def has_data(self, symbol: str) -> bool:
+        return self.manifest_path(symbol).exists() or self.legacy_path(symbol).exists()
+
+    def partition_key(self, timestamps: pd.Series) -> pd.Series:
+        ts = pd.to_datetime(timestamps)
+        if ts.dt.tz is not None:
+            ts = ts.dt.tz_convert("UTC")
+        return ts.dt.strftime(PARTITION_FORMATS[self.partitioning])
+
+    # Manifest -----------------------------------------------------------------
+
+    def read_manifest(self, symbol: str) -> OrderBookManifest | None:
+        path = self.manifest_path(symbol)
+        if not path.exists():
+            return None
+        return OrderBookManifest.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+    def _write_manifest(self, symbol: str, manifest: OrderBookManifest) -> None:
+        path = self.manifest_path(symbol)
+        tmp = path.with_name(f".{MANIFEST_NAME}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_text(json.dumps(manifest.to_dict(), indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @contextmanager
+    def _locked(self, symbol: str) -> Iterator[None]:
+        root = self.root(symbol)
+        root.mkdir(parents=True, exist_ok=True)
+        key = str(root.absolute())
+        with _MANIFEST_LOCKS_GUARD:
+            lock = _MANIFEST_LOCKS.setdefault(key, threading.Lock())
+        with lock:
+            if fcntl is None:
+                yield
+                return
+            with (root / "manifest.lock").open("a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _load_or_init_manifest(self, symbol: str) -> OrderBookManifest:
+        manifest = self.read_manifest(symbol)
+        if manifest is not None:
+            return manifest
+        manifest = OrderBookManifest(parts=[], partitioning=self.partitioning)
+        legacy = self.legacy_path(symbol)
+        if legacy.exists():
+            # Register the pre-partitioning file so readers keep seeing its history
+            ts_ns = _utc_ns(pd.read_parquet(legacy, columns=["timestamp"])["timestamp"])
+            if len(ts_ns):
+                manifest.parts.append(
+                    PartEntry(
+                        file=LEGACY_FILENAME,
+                        partition=None,
+                        min_ts=int(ts_ns.min()),
+                        max_ts=int(ts_ns.max()),
+                        rows=len(ts_ns),
+                        kind="legacy",
+                    )
+                )
+        return manifest
+
+    # Writes -------------------------------------------------------------------
+
+    def append(self, symbol: str, df: pd.DataFrame) -> list[PartEntry]:
+        """Write one part per partition touched by ``df`` and register them in the manifest."""
+        if df.empty:
+            return []
+        df = df.drop_duplicates(subset=["timestamp"], keep="last").sort_values("timestamp", kind="stable")
+        keys = self.partition_key(df["timestamp"])
+        staged: list[PartEntry] = []
+        for key, group in df.groupby(keys.to_numpy(), sort=True):
+            staged.append(self._write_part(symbol, str(key), group, kind="append"))
+
+        with self._locked(symbol):
+            manifest = self._load_or_init_manifest(symbol)
+            manifest.parts.extend(staged)
+            self._write_manifest(symbol, manifest)
+        return staged
+
+    def _write_part(self, symbol: str, partition: str, df: pd.DataFrame, *, kind: str) -> PartEntry:
+        ts_ns = _utc_ns(df["timestamp"])
+        prefix = "compacted" if kind == "compacted" else "part"
+        relative = Path("parts") / partition / f"{prefix}-{int(ts_ns.min())}-{uuid.uuid4().hex[:8]}.parquet"
+        result = write_parquet(
+            df.reset_index(drop=True),
+            self.root(symbol) / relative,
+            metadata={
+                "symbol": symbol,
+                "venue": self.venue,
+                "interval": self.interval,
+                "partition": partition,
+                "kind": kind,
+            },
+        )
+        return PartEntry(
+            file=relative.as_posix(),
+            partition=partition,
+            min_ts=int(ts_ns.min()),
+            max_ts=int(ts_ns.max()),
+            rows=len(df),
+            kind=kind,
+            checksum=result.get("checksum"),
+        )
+
+    # Compaction ---------------------------------------------------------------
+
+    def compact(self, symbol: str, *, min_parts: int = 2, partitions: list[str] | None = None) -> dict[str, Any]:
+        """
+        Merge the parts of each partition into a single sorted, de-duplicated file.
+
+        Partitions with fewer than ``min_parts`` parts are left alone unless the
+        legacy single file still holds rows for them, in which case every partition
+        it spans is rewritten and the legacy file is retired. Appends may run
+        concurrently: the manifest is only locked to pick the inputs and to swap
+        them for the compacted parts, which take the position of their oldest input
+        so newer appends keep precedence.
+        """
+        with self._locked(symbol):
+            manifest = self._load_or_init_manifest(symbol)
+            if not manifest.parts:
+                return {"status": "no_data", "symbol": symbol}
+            selected = self._select_for_compaction(manifest, min_parts=min_parts, partitions=partitions)
+        if not selected:
+            return {"status": "noop", "symbol": symbol, "parts": len(manifest.parts)}
+
+        root = self.root(symbol)
+        frames = [pd.read_parquet(root / entry.file) for entry in selected]
+        combined = pd.concat(frames, ignore_index=True)
+        combined = combined.drop_duplicates(subset=["timestamp"], keep="last").sort_values("timestamp", kind="stable")
+        keys = self.partition_key(combined["timestamp"]).to_numpy()
+        compacted: dict[str, PartEntry] = {}
+        for key, group in combined.groupby(keys, sort=True):
+            compacted[str(key)] = self._write_part(symbol, str(key), group, kind="compacted")
+
+        selected_files = {entry.file for entry in selected}
+        with self._locked(symbol):
+            current = self._load_or_init_manifest(symbol)
+            current_files = {entry.file for entry in current.parts}
+            if not selected_files <= current_files:
+                # Another compaction replaced our inputs first; discard our output
+                self._remove_files(symbol, [entry.file for entry in compacted.values()])
+                return {"status": "conflict", "symbol": symbol}
+            parts: list[PartEntry] = []
+            pending = dict(compacted)
+            for entry in current.parts:
+                if entry.file not in selected_files:
+                    parts.append(entry)
+                    continue
+                # Insert compacted output at the position of its oldest input
+                keys_for_entry = [entry.partition] if entry.partition is not None else sorted(pending)
+                for key in keys_for_entry:
+                    if key in pending:
+                        parts.append(pending.pop(key))
+            parts.extend(pending.values())
+            current.parts = parts
+            self._write_manifest(symbol, current)
+
+        self._remove_files(symbol, sorted(selected_files))
+        rows = sum(entry.rows for entry in compacted.values())
+        logger.info(
+            "Compacted order book partitions",
+            extra={
+                "symbol": symbol,
+                "venue": self.venue,
+                "partitions": len(compacted),
+                "parts_removed": len(selected_files),
+                "rows": rows,
+            },
+        )
+        return {
+            "status": "ok",
+            "symbol": symbol,
+            "partitions": sorted(compacted),
+            "parts_removed": len(selected_files),
+            "rows": rows,
+        }
+
+    def _select_for_compaction(
+        self,
+        manifest: OrderBookManifest,
+        *,
+        min_parts: int,
+        partitions: list[str] | None,
+    ) -> list[PartEntry]:
+        legacy = [entry for entry in manifest.parts if entry.partition is None]
+        if legacy:
+            # Legacy rows are split across partitions, so everything is rewritten once
+            return list(manifest.parts)
+        by_partition: dict[str, list[PartEntry]] = {}
+        for entry in manifest.parts:
+            by_partition.setdefault(entry.partition, []).append(entry)  # type: ignore[arg-type]
+        selected: list[PartEntry] = []
+        for key, entries in by_partition.items():
+            if partitions is not None and key not in partitions:
+                continue
+            if len(entries) >= min_parts:
+                selected.extend(entries)
+        return selected
+
+    def _remove_files(self, symbol: str, files: list[str]) -> None:
+        root = self.root(symbol)
+        for relative in files:
+            path = root / relative
+            for candidate in (path, path.with_suffix(".meta.json")):
+                try:
+                    candidate.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as exc:
+                    logger.warning("Failed to remove compacted order book file", extra={"path": str(candidate), "error": str(exc)})
+            index_dir = path.with_suffix(".index")
+            if index_dir.is_dir():
+                for child in index_dir.iterdir():
+                    child.unlink(missing_ok=True)
+                index_dir.rmdir()
@@ -0,0 +1,560 @@
+"""Columnar, memory-mapped order book store with binary-search snapshot lookups."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from app.core.logging import logger
+from app.data.orderbook_partitions import PartitionedOrderBookStorage
+from app.data.storage import get_raw_path
+
+if TYPE_CHECKING:
+    from app.data.orderbook import OrderBookSnapshot
+
+INDEX_VERSION = 2
+INDEX_DIRNAME = "orderbook.index"
+MANIFEST_NAME = "manifest.json"
+ARRAYS_NAME = "arrays.bin"
+ARRAY_FIELDS = ("timestamps", "bid_prices", "bid_qtys", "ask_prices", "ask_qtys", "bid_levels", "ask_levels")
+# Each cached part holds one memory map (one file descriptor); least recently used parts are dropped
+MAX_OPEN_HANDLES = 128
+
+# (mtime_ns, size) of the source parquet the index was built from
+SourceSignature = tuple[int, int]
+
+_HANDLE_CACHE: OrderedDict[str, tuple[SourceSignature, OrderBookArrays]] = OrderedDict()
+_MANIFEST_CACHE: dict[str, tuple[SourceSignature, _ManifestView]] = {}
+_HANDLE_LOCK = threading.Lock()
+
+
+def parse_levels(levels: Any) -> list[tuple[float, float]]:
+    """Parse (price, qty) levels from lists, parquet numpy arrays or JSON strings."""
+    if isinstance(levels, str):
+        try:
+            levels = json.loads(levels)
+        except Exception:
+            return []
+    if isinstance(levels, np.ndarray):
+        levels = list(levels)
+    if not isinstance(levels, (list, tuple)):
+        return []
+    return [(float(level[0]), float(level[1])) for level in levels]
+
+
+def _to_ns(ts: pd.Timestamp) -> int:
+    ts = pd.Timestamp(ts)
+    if ts.tz is not None:
+        ts = ts.tz_convert("UTC")
+    return int(ts.value)
+
+
+@dataclass(frozen=True)
+class OrderBookArrays:
+    """
+    Sorted columnar order book snapshots.
+
+    ``timestamps`` holds int64 nanoseconds (UTC when ``tz`` is set) in ascending order.
+    Price/qty matrices have shape ``(n, depth)``: bids descending, asks ascending,
+    padded with NaN beyond ``bid_levels[i]`` / ``ask_levels[i]``. Arrays may be
+    read-only memory maps; slicing returns views.
+    """
+
+    timestamps: np.ndarray
+    bid_prices: np.ndarray
+    bid_qtys: np.ndarray
+    ask_prices: np.ndarray
+    ask_qtys: np.ndarray
+    bid_levels: np.ndarray
+    ask_levels: np.ndarray
+    symbol: str
+    venue: str
+    tz: str | None = "UTC"
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def depth(self) -> int:
+        return self.bid_prices.shape[1]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, *, symbol: str, venue: str) -> OrderBookArrays:
+        """Build from the parquet layout written by OrderBookRepository (one row per snapshot)."""
+        if df.empty:
+            return cls._empty(symbol, venue)
+        timestamps = pd.to_datetime(df["timestamp"])
+        tz = str(timestamps.dt.tz) if timestamps.dt.tz is not None else None
+        bids = [sorted(parse_levels(v), key=lambda x: x[0], reverse=True) for v in df["bids"]]
+        asks = [sorted(parse_levels(v), key=lambda x: x[0]) for v in df["asks"]]
+        ts_ns = timestamps.dt.tz_convert("UTC").array.asi8 if tz else timestamps.array.asi8
+        return cls._from_levels(np.asarray(ts_ns, dtype=np.int64), bids, asks, symbol=symbol, venue=venue, tz=tz)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: list[OrderBookSnapshot]) -> OrderBookArrays:
+        """Build from snapshot objects (all of the same symbol/venue)."""
+        if not snapshots:
+            return cls._empty("", "")
+        first = snapshots[0]
+        tz = "UTC" if first.timestamp.tz is not None else None
+        ts_ns = np.array([_to_ns(s.timestamp) for s in snapshots], dtype=np.int64)
+        return cls._from_levels(
+            ts_ns,
+            [s.bids for s in snapshots],
+            [s.asks for s in snapshots],
+            symbol=first.symbol,
+            venue=first.venue,
+            tz=tz,
+        )
+
+    @classmethod
+    def _empty(cls, symbol: str, venue: str) -> OrderBookArrays:
+        empty = np.empty((0, 0), dtype=np.float64)
+        counts = np.empty(0, dtype=np.int32)
+        return cls(np.empty(0, dtype=np.int64), empty, empty, empty, empty, counts, counts, symbol, venue)
+
+    @classmethod
+    def _from_levels(
+        cls,
+        ts_ns: np.ndarray,
+        bids: list[list[tuple[float, float]]],
+        asks: list[list[tuple[float, float]]],
+        *,
+        symbol: str,
+        venue: str,
+        tz: str | None,
+    ) -> OrderBookArrays:
+        n = len(ts_ns)
+        depth = max([len(b) for b in bids] + [len(a) for a in asks] + [1])
+        matrices = {name: np.full((n, depth), np.nan) for name in ("bid_prices", "bid_qtys", "ask_prices", "ask_qtys")}
+        bid_levels = np.zeros(n, dtype=np.int32)
+        ask_levels = np.zeros(n, dtype=np.int32)
+        for i, (b, a) in enumerate(zip(bids, asks)):
+            if b:
+                levels = np.asarray(b, dtype=np.float64)
+                matrices["bid_prices"][i, : len(b)] = levels[:, 0]
+                matrices["bid_qtys"][i, : len(b)] = levels[:, 1]
+                bid_levels[i] = len(b)
+            if a:
+                levels = np.asarray(a, dtype=np.float64)
+                matrices["ask_prices"][i, : len(a)] = levels[:, 0]
+                matrices["ask_qtys"][i, : len(a)] = levels[:, 1]
+                ask_levels[i] = len(a)
+        # Stable sort keeps file order for duplicate timestamps (matches the row-scan tie-break)
+        order = np.argsort(ts_ns, kind="stable")
+        return cls(
+            timestamps=np.ascontiguousarray(ts_ns[order]),
+            bid_prices=np.ascontiguousarray(matrices["bid_prices"][order]),
+            bid_qtys=np.ascontiguousarray(matrices["bid_qtys"][order]),
+            ask_prices=np.ascontiguousarray(matrices["ask_prices"][order]),
+            ask_qtys=np.ascontiguousarray(matrices["ask_qtys"][order]),
+            bid_levels=bid_levels[order],
+            ask_levels=ask_levels[order],
+            symbol=symbol,
+            venue=venue,
+            tz=tz,
+        )
+
+    def slice(self, start: int, stop: int) -> OrderBookArrays:
+        """Row range [start, stop) as views."""
+        return OrderBookArrays(
+            timestamps=self.timestamps[start:stop],
+            bid_prices=self.bid_prices[start:stop],
+            bid_qtys=self.bid_qtys[start:stop],
+            ask_prices=self.ask_prices[start:stop],
+            ask_qtys=self.ask_qtys[start:stop],
+            bid_levels=self.bid_levels[start:stop],
+            ask_levels=self.ask_levels[start:stop],
+            symbol=self.symbol,
+            venue=self.venue,
+            tz=self.tz,
+        )
+
+    def _compatible(self, ts: pd.Timestamp) -> bool:
+        # Same rule as comparing against the parquet column: tz-aware vs naive cannot be compared
+        return (pd.Timestamp(ts).tz is not None) == (self.tz is not None)
+
+    def range_bounds(self, start: pd.Timestamp, end: pd.Timestamp) -> tuple[int, int]:
+        """Row bounds of snapshots with start <= timestamp <= end."""
+        if not (self._compatible(start) and self._compatible(end)):
+            raise TypeError("Cannot compare tz-naive and tz-aware order book timestamps")
+        lo = int(np.searchsorted(self.timestamps, _to_ns(start), side="left"))
+        hi = int(np.searchsorted(self.timestamps, _to_ns(end), side="right"))
+        return lo, max(lo, hi)
+
+    def nearest(self, ts: pd.Timestamp, tolerance_seconds: float) -> int | None:
+        """
+        Index of the snapshot closest to ``ts`` within tolerance (earlier wins ties), or None.
+
+        Rows sharing a timestamp resolve to the last one, the row ``_merge`` keeps
+        when the same timestamp was written twice.
+        """
+        n = len(self.timestamps)
+        if n == 0 or not self._compatible(ts):
+            return None
+        target = _to_ns(ts)
+        pos = int(np.searchsorted(self.timestamps, target, side="left"))
+        best: int | None = None
+        best_diff = 0
+        if pos > 0:
+            # Rows before ``pos`` are earlier than ``ts``; pos - 1 is the last of its group
+            best, best_diff = pos - 1, target - int(self.timestamps[pos - 1])
+        if pos < n:
+            diff = int(self.timestamps[pos]) - target
+            if best is None or diff < best_diff:
+                after = int(np.searchsorted(self.timestamps, self.timestamps[pos], side="right")) - 1
+                best, best_diff = after, diff
+        if best is None or best_diff > tolerance_seconds * 1_000_000_000:
+            return None
+        return best
+
+    def timestamp_at(self, idx: int) -> pd.Timestamp:
+        ts = pd.Timestamp(int(self.timestamps[idx]), tz="UTC" if self.tz else None)
+        return ts.tz_convert(self.tz) if self.tz and self.tz != "UTC" else ts
+
+    def snapshot(self, idx: int) -> OrderBookSnapshot:
+        """Materialize a single row as an OrderBookSnapshot."""
+        from app.data.orderbook import OrderBookSnapshot
+
+        nb = int(self.bid_levels[idx])
+        na = int(self.ask_levels[idx])
+        return OrderBookSnapshot(
+            timestamp=self.timestamp_at(idx),
+            symbol=self.symbol,
+            venue=self.venue,
+            bids=list(zip(self.bid_prices[idx, :nb].tolist(), self.bid_qtys[idx, :nb].tolist())),
+            asks=list(zip(self.ask_prices[idx, :na].tolist(), self.ask_qtys[idx, :na].tolist())),
+        )
+
+    def snapshots(self) -> list[OrderBookSnapshot]:
+        return [self.snapshot(i) for i in range(len(self))]
+
+    @property
+    def best_bid(self) -> np.ndarray:
+        return self.bid_prices[:, 0] if self.depth else np.full(len(self), np.nan)
+
+    @property
+    def best_ask(self) -> np.ndarray:
+        return self.ask_prices[:, 0] if self.depth else np.full(len(self), np.nan)
+
+    @property
+    def mid_price(self) -> np.ndarray:
+        return (self.best_bid + self.best_ask) / 2.0
+
+    @property
+    def spread(self) -> np.ndarray:
+        return self.best_ask - self.best_bid
+
+    def cumulative_depth(self, side: str = "bid") -> np.ndarray:
+        """Cumulative quantity per level, shape ``(n, depth)`` (NaN padding counts as 0)."""
+        qtys = self.bid_qtys if side.lower() == "bid" else self.ask_qtys
+        return np.cumsum(np.nan_to_num(qtys, nan=0.0), axis=1)
+
+    def to_index(self) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(self.timestamps.astype("datetime64[ns]"))
+        return index.tz_localize("UTC").tz_convert(self.tz) if self.tz else index
+
+
+class OrderBookStore:
+    """
+    Memory-mapped binary indexes over the order book parquet files of one (venue, interval).
+
+    Data lives in the append-only parts listed by the partition manifest (see
+    ``PartitionedOrderBookStorage``), or in the legacy single ``orderbook.parquet``
+    when no manifest exists yet. Each parquet file gets its own index directory
+    next to it (``<file>.index/``) recording the source signature, so immutable
+    parts are indexed once and the legacy file is re-indexed when it changes.
+    Opened handles are cached per process (least recently used first out beyond
+    ``MAX_OPEN_HANDLES``); lookups only open the parts whose time range overlaps
+    the query and then binary-search them.
+    """
+
+    def __init__(self, venue: str = "binance", interval: str = "orderbook") -> None:
+        self.venue = venue
+        self.interval = interval
+        self.partitions = PartitionedOrderBookStorage(venue=venue, interval=interval)
+
+    def source_path(self, symbol: str) -> Path:
+        """Legacy single-file location (pre-partitioning layout)."""
+        return get_raw_path(self.venue, symbol, self.interval, filename="orderbook.parquet")
+
+    def index_path(self, symbol: str) -> Path:
+        """Index directory of the legacy single file."""
+        return get_raw_path(self.venue, symbol, self.interval, filename=INDEX_DIRNAME)
+
+    @staticmethod
+    def index_dir(source: Path) -> Path:
+        return source.with_suffix(".index")
+
+    @staticmethod
+    def _signature(path: Path) -> SourceSignature | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def has_data(self, symbol: str) -> bool:
+        return self.partitions.has_data(symbol)
+
+    def _manifest(self, symbol: str) -> _ManifestView | None:
+        path = self.partitions.manifest_path(symbol)
+        signature = self._signature(path)
+        if signature is None:
+            return None
+        key = str(path.absolute())
+        with _HANDLE_LOCK:
+            cached = _MANIFEST_CACHE.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+        manifest = self.partitions.read_manifest(symbol)
+        if manifest is None:
+            return None
+        view = _ManifestView(
+            files=[self.partitions.root(symbol) / part.file for part in manifest.parts],
+            min_ts=np.array([part.min_ts for part in manifest.parts], dtype=np.int64),
+            max_ts=np.array([part.max_ts for part in manifest.parts], dtype=np.int64),
+        )
+        with _HANDLE_LOCK:
+            _MANIFEST_CACHE[key] = (signature, view)
+        return view
+
+    def _sources(self, symbol: str, start_ns: int | None = None, end_ns: int | None = None) -> list[Path]:
+        """Parquet files that may hold rows in [start_ns, end_ns], oldest write first."""
+        view = self._manifest(symbol)
+        if view is None:
+            legacy = self.source_path(symbol)
+            return [legacy] if legacy.exists() else []
+        mask = np.ones(len(view.files), dtype=bool)
+        if start_ns is not None:
+            mask &= view.max_ts >= start_ns
+        if end_ns is not None:
+            mask &= view.min_ts <= end_ns
+        return [view.files[i] for i in np.flatnonzero(mask)]
+
+    def open_source(self, source: Path, symbol: str) -> OrderBookArrays | None:
+        """Return the (cached) arrays of one parquet file, building its index if stale."""
+        signature = self._signature(source)
+        if signature is None:
+            return None
+        directory = self.index_dir(source)
+        key = str(directory.absolute())
+        with _HANDLE_LOCK:
+            cached = _HANDLE_CACHE.get(key)
+            if cached is not None and cached[0] == signature:
+                _HANDLE_CACHE.move_to_end(key)
+                return cached[1]
+
+        # Index reads and rebuilds happen outside the lock so other symbols keep hitting the cache
+        arrays = self._read_index(directory, symbol, signature)
+        if arrays is None:
+            arrays = OrderBookArrays.from_frame(pd.read_parquet(source), symbol=symbol, venue=self.venue)
+            try:
+                self.write_index(directory, arrays, signature)
+            except Exception as exc:
+                # Read-only or full volume: serve the in-memory arrays rather than failing the lookup
+                logger.warning("Failed to persist order book index", extra={"path": str(directory), "error": str(exc)})
+            else:
+                arrays = self._read_index(directory, symbol, signature) or arrays
+
+        with _HANDLE_LOCK:
+            _HANDLE_CACHE[key] = (signature, arrays)
+            _HANDLE_CACHE.move_to_end(key)
+            while len(_HANDLE_CACHE) > MAX_OPEN_HANDLES:
+                _HANDLE_CACHE.popitem(last=False)
+        return arrays
+
+    def open(self, symbol: str) -> OrderBookArrays | None:
+        """All snapshots for symbol (a cached memory map when stored in a single file); None if no data."""
+        sources = self._sources(symbol)
+        if not sources:
+            return None
+        return _merge([a for a in (self.open_source(s, symbol) for s in sources) if a is not None], symbol, self.venue)
+
+    def _window(self, symbol: str, start_ns: int, end_ns: int) -> OrderBookArrays | None:
+        windows = []
+        for source in self._sources(symbol, start_ns, end_ns):
+            arrays = self.open_source(source, symbol)
+            if arrays is None:
+                continue
+            lo = int(np.searchsorted(arrays.timestamps, start_ns, side="left"))
+            hi = int(np.searchsorted(arrays.timestamps, end_ns, side="right"))
+            windows.append(arrays.slice(lo, max(lo, hi)))
+        if not windows:
+            return None
+        return _merge(windows, symbol, self.venue)
+
+    def invalidate(self, symbol: str | None = None, *, handles: bool = True) -> None:
+        """
+        Drop cached state for symbol (or for every symbol).
+
+        With ``handles=False`` only the manifest is re-read; part indexes stay
+        cached, which is all an append needs since existing parts never change.
+        """
+        with _HANDLE_LOCK:
+            if symbol is None:
+                _MANIFEST_CACHE.clear()
+                if handles:
+                    _HANDLE_CACHE.clear()
+                return
+            _MANIFEST_CACHE.pop(str(self.partitions.manifest_path(symbol).absolute()), None)
+            if not handles:
+                return
+            prefix = str(self.partitions.root(symbol).absolute()) + os.sep
+            for key in [k for k in _HANDLE_CACHE if k.startswith(prefix)]:
+                del _HANDLE_CACHE[key]
+
+    def write_index(self, directory: Path, arrays: OrderBookArrays, signature: SourceSignature) -> Path:
+        """
+        Persist arrays into a single binary file, so a mapped index costs one file descriptor.
+
+        The manifest records each array's offset, dtype and shape; it is written last
+        and marks the index valid.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        token = uuid.uuid4().hex[:8]
+        layout: dict[str, dict[str, Any]] = {}
+        offset = 0
+        tmp = directory / f".{ARRAYS_NAME}.{token}.tmp"
+        with tmp.open("wb") as fh:
+            for name in ARRAY_FIELDS:
+                values = np.ascontiguousarray(getattr(arrays, name))
+                padding = -offset % 8  # keep every array 8-byte aligned
+                fh.write(b"\0" * padding)
+                offset += padding
+                fh.write(values.tobytes())
+                layout[name] = {"offset": offset, "dtype": values.dtype.str, "shape": list(values.shape)}
+                offset += values.nbytes
+        os.replace(tmp, directory / ARRAYS_NAME)
+        manifest = {
+            "version": INDEX_VERSION,
+            "symbol": arrays.symbol,
+            "venue": self.venue,
+            "tz": arrays.tz,
+            "rows": len(arrays),
+            "depth": arrays.depth,
+            "bytes": offset,
+            "arrays": layout,
+            "source_signature": list(signature),
+        }
+        tmp = directory / f".{MANIFEST_NAME}.{token}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, directory / MANIFEST_NAME)
+        return directory
+
+    def _read_index(self, directory: Path, symbol: str, signature: SourceSignature) -> OrderBookArrays | None:
+        manifest_path = directory / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("version") != INDEX_VERSION or tuple(manifest.get("source_signature", ())) != signature:
+                return None
+            if manifest.get("bytes", 0) > 0:
+                buffer = np.memmap(directory / ARRAYS_NAME, dtype=np.uint8, mode="r")
+            else:
+                buffer = np.empty(0, dtype=np.uint8)  # an empty file cannot be mapped
+            loaded = {}
+            for name in ARRAY_FIELDS:
+                spec = manifest["arrays"][name]
+                dtype = np.dtype(spec["dtype"])
+                shape = tuple(spec["shape"])
+                nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+                loaded[name] = buffer[spec["offset"] : spec["offset"] + nbytes].view(dtype).reshape(shape)
+        except Exception as exc:
+            logger.warning("Order book index unreadable, rebuilding", extra={"path": str(directory), "error": str(exc)})
+            return None
+        return OrderBookArrays(**loaded, symbol=manifest.get("symbol") or symbol, venue=manifest.get("venue", self.venue), tz=manifest.get("tz"))
+
+    def get_snapshot(self, symbol: str, ts: pd.Timestamp, *, tolerance_seconds: float = 5) -> OrderBookSnapshot | None:
+        target = _to_ns(ts)
+        tolerance_ns = int(tolerance_seconds * 1_000_000_000)
+        arrays = self._window(symbol, target - tolerance_ns, target + tolerance_ns)
+        if arrays is None:
+            return None
+        idx = arrays.nearest(ts, tolerance_seconds)
+        return arrays.snapshot(idx) if idx is not None else None
+
+    def scan(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> OrderBookArrays | None:
+        """Snapshots with start <= timestamp <= end as array views (no per-row objects)."""
+        if not self.has_data(symbol):
+            return None
+        arrays = self._window(symbol, _to_ns(start), _to_ns(end))
+        if arrays is None:
+            return OrderBookArrays._empty(symbol, self.venue)
+        lo, hi = arrays.range_bounds(start, end)
+        return arrays.slice(lo, hi)
+
+    def latest(self, symbol: str) -> OrderBookSnapshot | None:
+        view = self._manifest(symbol)
+        if view is None:
+            arrays = self.open(symbol)
+        elif len(view.files) == 0:
+            return None
+        else:
+            # Last-written part holding the newest timestamp wins, as in a full merge
+            candidates = np.flatnonzero(view.max_ts == view.max_ts.max())
+            arrays = self.open_source(view.files[int(candidates[-1])], symbol)
+        if arrays is None or len(arrays) == 0:
+            return None
+        return arrays.snapshot(len(arrays) - 1)
+
+
+@dataclass(frozen=True)
+class _ManifestView:
+    files: list[Path]
+    min_ts: np.ndarray
+    max_ts: np.ndarray
+
+
+def _merge(windows: list[OrderBookArrays], symbol: str, venue: str) -> OrderBookArrays:
+    """
+    Merge per-part windows given in write order into one sorted set of arrays.
+
+    A single window is returned as-is (views stay memory-mapped). Duplicate
+    timestamps keep the row from the most recently written part.
+    """
+    windows = [w for w in windows if len(w)] or windows[:1]
+    if not windows:
+        return OrderBookArrays._empty(symbol, venue)
+    if len(windows) == 1:
+        return windows[0]
+    tz = windows[0].tz
+    if any((w.tz is None) != (tz is None) for w in windows):
+        raise TypeError("Cannot merge tz-naive and tz-aware order book parts")
+    depth = max(w.depth for w in windows)
+
+    def stack(name: str) -> np.ndarray:
+        padded = []
+        for w in windows:
+            values = getattr(w, name)
+            if values.shape[1] < depth:
+                values = np.pad(values, ((0, 0), (0, depth - values.shape[1])), constant_values=np.nan)
+            padded.append(values)
+        return np.concatenate(padded)
+
+    timestamps = np.concatenate([w.timestamps for w in windows])
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = timestamps[order]
+    keep = np.append(timestamps[1:] != timestamps[:-1], True)
+    rows = order[keep]
+    return OrderBookArrays(
+        timestamps=timestamps[keep],
+        bid_prices=stack("bid_prices")[rows],
+        bid_qtys=stack("bid_qtys")[rows],
+        ask_prices=stack("ask_prices")[rows],
+        ask_qtys=stack("ask_qtys")[rows],
+        bid_levels=np.concatenate([w.bid_levels for w in windows])[rows],
+        ask_levels=np.concatenate([w.ask_levels for w in windows])[rows],
+        symbol=symbol,
+        venue=venue,
+        tz=tz,
+    )
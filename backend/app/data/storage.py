@@ -63,8 +63,16 @@ def write_parquet(df: pd.DataFrame, path: Path, *, metadata: dict[str, Any] | No
     }
 
 
-def read_parquet(path: Path) -> pd.DataFrame:
-    return pd.read_parquet(path)
+def read_parquet(
+    path: Path,
+    *,
+    columns: list[str] | None = None,
+    filters: list[tuple[str, str, Any]] | None = None,
+) -> pd.DataFrame:
+    """Read a parquet file; ``filters`` skip row groups by their statistics before decoding."""
+    if columns is None and filters is None:
+        return pd.read_parquet(path)
+    return pd.read_parquet(path, columns=columns, filters=filters)
 
 
 def _checksum(path: Path) -> str:
@@ -2,10 +2,10 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import desc, select
+from sqlalchemy import desc, func, select, update
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
@@ -14,12 +14,14 @@ from sqlalchemy import asc
 from app.core.logging import logger
 
 from app.db.models import (
+    BackfillWindowORM,
     BacktestResultORM,
     CooldownEventORM,
     DataRunORM,
     KnowledgeArticleORM,
     KnowledgeEngagementORM,
     LeverageAlertORM,
+    ProductionRiskAggregateORM,
     RecommendationORM,
     RiskAuditORM,
     RunLogORM,
@@ -134,6 +136,8 @@ def create_recommendation(db: Session, payload: dict) -> RecommendationORM:
 
     market_timestamp = data.get("market_timestamp")
     date_str = _normalise_date_from_market_timestamp(market_timestamp, now)
+    # The upsert below reopens a closed row; its exit must leave the production aggregate
+    reopens_closed = _is_closed_recommendation(db, date_str, market_timestamp)
 
     # Get traceability metadata
     code_commit = get_git_commit_hash()
@@ -226,6 +230,8 @@ def create_recommendation(db: Session, payload: dict) -> RecommendationORM:
                 pk = rec.id
             else:
                 raise ValueError("Failed to retrieve created recommendation")
+        if reopens_closed:
+            rebuild_production_risk_aggregate(db)
         rec = db.get(RecommendationORM, pk)
         if rec:
             db.refresh(rec)
@@ -247,12 +253,26 @@ def create_recommendation(db: Session, payload: dict) -> RecommendationORM:
             if existing:
                 _apply_payload_to_recommendation(existing, data)
                 db.commit()
+                if reopens_closed:
+                    rebuild_production_risk_aggregate(db)
                 db.refresh(existing)
                 db.expunge(existing)
                 return existing
             raise
 
 
+def _is_closed_recommendation(db: Session, date_str: str, market_timestamp: str | None) -> bool:
+    """Whether the row an upsert on (date, market_timestamp) would overwrite is a closed trade."""
+    stmt = (
+        select(RecommendationORM.id)
+        .where(RecommendationORM.date == date_str)
+        .where(RecommendationORM.market_timestamp == market_timestamp)
+        .where(RecommendationORM.status == "closed")
+        .where(RecommendationORM.exit_price.isnot(None))
+    )
+    return db.execute(stmt).first() is not None
+
+
 def get_open_recommendation(db: Session) -> RecommendationORM | None:
     """Get the currently open recommendation, if any."""
     stmt = select(RecommendationORM).where(RecommendationORM.status == "open").where(RecommendationORM.closed_at.is_(None)).order_by(desc(RecommendationORM.created_at)).limit(1)
@@ -311,7 +331,8 @@ def close_recommendation(
     exit_pct: float | None = None,
     user_id: str | UUID | None = None,
 ) -> RecommendationORM:
-    """Close a recommendation and update user risk state."""
+    """Close a recommendation and update the production aggregates and user risk state."""
+    was_closed = rec.status == "closed" and rec.exit_price is not None
     rec.status = "closed"
     rec.exit_price = exit_price
     rec.exit_reason = exit_reason
@@ -345,6 +366,8 @@ def close_recommendation(
             else:
                 outcome_label = "breakeven"
 
+    _apply_closed_trade_to_aggregate(db, rec, was_closed=was_closed)
+
     if user_id:
         from app.db.crud import update_user_risk_state
 
@@ -538,51 +561,236 @@ def record_champion_promotion(db: Session, record: dict[str, Any]) -> StrategyCh
     return champion
 
 
-def calculate_production_drawdown(db: Session) -> dict[str, Any]:
-    """Calculate current production drawdown from closed recommendations."""
-    stmt = (
+PRODUCTION_RISK_SCOPE = "production"
+
+# Aggregate columns compared by verify_production_risk_aggregate
+_RISK_AGGREGATE_FIELDS = (
+    "closed_trades",
+    "equity_trades",
+    "winning_trades",
+    "losing_trades",
+    "current_equity",
+    "peak_equity",
+    "max_drawdown",
+    "current_winning_streak",
+    "current_losing_streak",
+    "longest_winning_streak",
+    "longest_losing_streak",
+    "last_recommendation_id",
+)
+
+
+def _closed_trade_return(rec: RecommendationORM) -> float | None:
+    """Fractional return of a closed trade; None when the entry price is unusable."""
+    entry = float(rec.entry_optimal or 0.0)
+    if entry <= 0:
+        return None
+    exit_price = float(rec.exit_price)
+    if rec.signal == "BUY":
+        return (exit_price - entry) / entry
+    if rec.signal == "SELL":
+        return (entry - exit_price) / entry
+    return 0.0
+
+
+def _is_winning_trade(rec: RecommendationORM) -> bool:
+    if rec.exit_price_pct is not None:
+        return rec.exit_price_pct > 0
+    entry = float(rec.entry_optimal)
+    exit_price = float(rec.exit_price)
+    if rec.signal == "BUY":
+        return exit_price > entry
+    if rec.signal == "SELL":
+        return exit_price < entry
+    return False
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    """Naive UTC timestamp, as stored in the DateTime columns."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _new_risk_aggregate() -> ProductionRiskAggregateORM:
+    return ProductionRiskAggregateORM(
+        scope=PRODUCTION_RISK_SCOPE,
+        closed_trades=0,
+        equity_trades=0,
+        winning_trades=0,
+        losing_trades=0,
+        current_equity=1.0,
+        peak_equity=1.0,
+        max_drawdown=0.0,
+        current_winning_streak=0,
+        current_losing_streak=0,
+        longest_winning_streak=0,
+        longest_losing_streak=0,
+    )
+
+
+def _fold_closed_trade(agg: ProductionRiskAggregateORM, rec: RecommendationORM) -> None:
+    """Advance the running equity, drawdown, streaks and counts by one closed trade."""
+    return_pct = _closed_trade_return(rec)
+    if return_pct is not None:
+        agg.current_equity *= 1 + return_pct
+        agg.peak_equity = max(agg.peak_equity, agg.current_equity)
+        if agg.peak_equity > 0:
+            agg.max_drawdown = max(agg.max_drawdown, 1 - (agg.current_equity / agg.peak_equity))
+        agg.equity_trades += 1
+
+    if _is_winning_trade(rec):
+        agg.winning_trades += 1
+        agg.current_winning_streak += 1
+        agg.current_losing_streak = 0
+        agg.longest_winning_streak = max(agg.longest_winning_streak, agg.current_winning_streak)
+    else:
+        agg.losing_trades += 1
+        agg.current_losing_streak += 1
+        agg.current_winning_streak = 0
+        agg.longest_losing_streak = max(agg.longest_losing_streak, agg.current_losing_streak)
+
+    agg.closed_trades += 1
+    agg.last_closed_at = _naive_utc(rec.closed_at or rec.created_at)
+    agg.last_recommendation_id = rec.id
+
+
+def _closed_trades_query():
+    return (
         select(RecommendationORM)
         .where(RecommendationORM.status == "closed")
         .where(RecommendationORM.exit_price.isnot(None))
-        .order_by(RecommendationORM.closed_at)
+        .order_by(RecommendationORM.closed_at, RecommendationORM.id)
     )
-    trades = list(db.execute(stmt).scalars().all())
 
-    if not trades:
-        return {"max_drawdown_pct": 0.0, "current_drawdown_pct": 0.0, "peak_capital": 1.0, "current_capital": 1.0, "equity_curve": [1.0]}
 
-    capital = 1.0
-    peak = capital
-    max_drawdown = 0.0
-    equity_curve: list[float] = [capital]
+def replay_production_risk(db: Session) -> tuple[ProductionRiskAggregateORM, list[float]]:
+    """Full replay of closed trades: a detached aggregate and the equity curve."""
+    agg = _new_risk_aggregate()
+    equity_curve: list[float] = [agg.current_equity]
+    for rec in db.execute(_closed_trades_query()).scalars():
+        equity_trades = agg.equity_trades
+        _fold_closed_trade(agg, rec)
+        if agg.equity_trades > equity_trades:
+            equity_curve.append(round(agg.current_equity, 6))
+    return agg, equity_curve
+
+
+def rebuild_production_risk_aggregate(db: Session, *, commit: bool = True) -> ProductionRiskAggregateORM:
+    """Recompute the stored aggregate from the full trade history."""
+    replayed, _ = replay_production_risk(db)
+    agg = db.get(ProductionRiskAggregateORM, PRODUCTION_RISK_SCOPE)
+    if agg is None:
+        agg = _new_risk_aggregate()
+        db.add(agg)
+    for field in (*_RISK_AGGREGATE_FIELDS, "last_closed_at"):
+        setattr(agg, field, getattr(replayed, field))
+    agg.updated_at = datetime.utcnow()
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return agg
+
+
+def verify_production_risk_aggregate(db: Session, *, tolerance: float = 1e-9) -> dict[str, tuple[Any, Any]]:
+    """Fields where the stored aggregate differs from a full replay, as (stored, replayed)."""
+    stored = db.get(ProductionRiskAggregateORM, PRODUCTION_RISK_SCOPE)
+    replayed, _ = replay_production_risk(db)
+    if stored is None:
+        stored = _new_risk_aggregate()
+    mismatches: dict[str, tuple[Any, Any]] = {}
+    for field in _RISK_AGGREGATE_FIELDS:
+        stored_value, replayed_value = getattr(stored, field), getattr(replayed, field)
+        if isinstance(replayed_value, float) and stored_value is not None:
+            if abs(stored_value - replayed_value) <= tolerance * max(1.0, abs(replayed_value)):
+                continue
+        elif stored_value == replayed_value:
+            continue
+        mismatches[field] = (stored_value, replayed_value)
+    return mismatches
+
+
+def get_production_risk_aggregate(db: Session) -> ProductionRiskAggregateORM:
+    """Stored running aggregate, built from the trade history on first use."""
+    agg = db.get(ProductionRiskAggregateORM, PRODUCTION_RISK_SCOPE)
+    if agg is None:
+        agg = rebuild_production_risk_aggregate(db)
+    return agg
+
+
+def _apply_closed_trade_to_aggregate(db: Session, rec: RecommendationORM, *, was_closed: bool) -> None:
+    """Fold a newly closed trade into the aggregate; rebuild when it cannot be appended."""
+    db.flush()
+    agg = db.get(ProductionRiskAggregateORM, PRODUCTION_RISK_SCOPE)
+    closed_key = (_naive_utc(rec.closed_at or rec.created_at), rec.id)
+    out_of_order = (
+        agg is not None
+        and agg.last_closed_at is not None
+        and closed_key < (agg.last_closed_at, agg.last_recommendation_id or 0)
+    )
+    if agg is None or was_closed or out_of_order:
+        # Re-closing a trade or back-dating an exit changes history, not just its tail
+        rebuild_production_risk_aggregate(db, commit=False)
+        return
+    _fold_closed_trade(agg, rec)
+    agg.updated_at = datetime.utcnow()
 
-    for rec in trades:
-        entry = float(rec.entry_optimal)
-        exit_price = float(rec.exit_price)
-        if entry <= 0:
+
+def _equity_curve_tail(db: Session, agg: ProductionRiskAggregateORM, trades: int) -> list[float]:
+    """Last points of the per-trade equity curve, walked back from the aggregate over the latest closes."""
+    stmt = (
+        _closed_trades_query()
+        .order_by(None)
+        .order_by(RecommendationORM.closed_at.desc(), RecommendationORM.id.desc())
+        .limit(trades)
+    )
+    equity = agg.current_equity
+    curve = [equity]
+    for rec in db.execute(stmt).scalars():
+        return_pct = _closed_trade_return(rec)
+        if return_pct is None:
             continue
-        if rec.signal == "BUY":
-            return_pct = (exit_price - entry) / entry
-        elif rec.signal == "SELL":
-            return_pct = (entry - exit_price) / entry
-        else:
-            return_pct = 0.0
-        capital *= 1 + return_pct
-        equity_curve.append(round(capital, 6))
-        peak = max(peak, capital)
-        if peak > 0:
-            dd = 1 - (capital / peak)
-            max_drawdown = max(max_drawdown, dd)
-
-    current_drawdown = 1 - (capital / peak) if peak > 0 else 0.0
-
-    return {
-        "max_drawdown_pct": round(max_drawdown * 100.0, 2),
-        "current_drawdown_pct": round(current_drawdown * 100.0, 2),
-        "peak_capital": round(peak, 6),
-        "current_capital": round(capital, 6),
-        "equity_curve": equity_curve,
-    }
+        if 1 + return_pct <= 0:
+            break  # Equity before a total loss cannot be recovered from the product
+        equity /= 1 + return_pct
+        curve.append(equity)
+    return [round(value, 6) for value in reversed(curve)]
+
+
+def calculate_production_drawdown(
+    db: Session,
+    *,
+    include_equity_curve: bool = False,
+    equity_tail: int | None = None,
+) -> dict[str, Any]:
+    """
+    Current production drawdown from the running aggregate over closed recommendations.
+
+    ``include_equity_curve`` replays the full history to return the per-trade
+    equity curve as well. ``equity_tail`` returns only the curve's points over
+    the last ``equity_tail`` closed trades, read from the aggregate and those
+    trades without a replay.
+    """
+    if include_equity_curve:
+        agg, equity_curve = replay_production_risk(db)
+    else:
+        agg = get_production_risk_aggregate(db)
+        equity_curve = _equity_curve_tail(db, agg, equity_tail) if equity_tail is not None else None
+
+    if agg.closed_trades == 0:
+        result = {"max_drawdown_pct": 0.0, "current_drawdown_pct": 0.0, "peak_capital": 1.0, "current_capital": 1.0}
+    else:
+        current_drawdown = 1 - (agg.current_equity / agg.peak_equity) if agg.peak_equity > 0 else 0.0
+        result = {
+            "max_drawdown_pct": round(agg.max_drawdown * 100.0, 2),
+            "current_drawdown_pct": round(current_drawdown * 100.0, 2),
+            "peak_capital": round(agg.peak_equity, 6),
+            "current_capital": round(agg.current_equity, 6),
+        }
+    if equity_curve is not None:
+        result["equity_curve"] = equity_curve
+    return result
 
 
 def create_data_run(
@@ -615,6 +823,68 @@ def create_data_run(
     return record
 
 
+def enqueue_backfill_windows(
+    db: Session,
+    *,
+    job_key: str,
+    symbol: str,
+    interval: str,
+    windows: list[tuple[datetime, datetime, str]],
+) -> int:
+    """
+    Add ``(start, end, partition)`` windows not yet queued for ``job_key`` and
+    requeue interrupted (``running``) and ``failed`` ones. Returns the number
+    of windows added.
+    """
+    existing = set(db.execute(select(BackfillWindowORM.window_start).where(BackfillWindowORM.job_key == job_key)).scalars())
+    added = [
+        BackfillWindowORM(
+            job_key=job_key,
+            symbol=symbol,
+            interval=interval,
+            partition=partition,
+            window_start=start,
+            window_end=end,
+            status="pending",
+            attempts=0,
+            rows=0,
+        )
+        for start, end, partition in windows
+        if start not in existing
+    ]
+    db.add_all(added)
+    db.execute(
+        update(BackfillWindowORM)
+        .where(BackfillWindowORM.job_key == job_key, BackfillWindowORM.status.in_(("running", "failed")))
+        .values(status="pending", attempts=0, error=None)
+    )
+    db.commit()
+    return len(added)
+
+
+def get_backfill_windows(db: Session, job_key: str) -> list[BackfillWindowORM]:
+    stmt = select(BackfillWindowORM).where(BackfillWindowORM.job_key == job_key).order_by(BackfillWindowORM.window_start)
+    return list(db.execute(stmt).scalars().all())
+
+
+def set_backfill_window_status(
+    db: Session,
+    window_id: int,
+    *,
+    status: str,
+    rows: int | None = None,
+    attempts: int | None = None,
+    error: str | None = None,
+) -> None:
+    values: dict[str, Any] = {"status": status, "error": error[:255] if error else None, "updated_at": datetime.utcnow()}
+    if rows is not None:
+        values["rows"] = rows
+    if attempts is not None:
+        values["attempts"] = attempts
+    db.execute(update(BackfillWindowORM).where(BackfillWindowORM.id == window_id).values(**values))
+    db.commit()
+
+
 def get_user_risk_state(db: Session, user_id: str | UUID) -> UserRiskStateORM | None:
     """Get user risk state."""
     from uuid import UUID
@@ -744,17 +1014,11 @@ def update_user_risk_state(
     now = datetime.utcnow()
     last_24h = now - timedelta(hours=24)
     
-    # Get all closed trades for user (for now, we use all trades since there's no user_id in recommendations)
-    # In a multi-user system, you'd filter by user_id
-    stmt = (
-        select(RecommendationORM)
-        .where(RecommendationORM.status == "closed")
-        .where(RecommendationORM.exit_price.isnot(None))
-        .order_by(RecommendationORM.closed_at)
-    )
-    all_trades = list(db.execute(stmt).scalars().all())
-    
-    if not all_trades:
+    # Drawdown, equity and streaks come from the running aggregate over all closed trades
+    # (recommendations carry no user_id yet; in a multi-user system the aggregate would be per user)
+    agg = get_production_risk_aggregate(db)
+
+    if agg.closed_trades == 0:
         # Initialize state with defaults
         return create_or_update_user_risk_state(
             db,
@@ -767,117 +1031,23 @@ def update_user_risk_state(
             trades_last_24h=0,
             avg_exposure_pct=0.0,
         )
-    
-    # Calculate equity curve and drawdown
-    capital = 1.0
-    peak = capital
-    max_drawdown = 0.0
-    equity_curve: list[float] = [capital]
-    
-    for rec in all_trades:
-        entry = float(rec.entry_optimal)
-        exit_price = float(rec.exit_price)
-        if entry <= 0:
-            continue
-        if rec.signal == "BUY":
-            return_pct = (exit_price - entry) / entry
-        elif rec.signal == "SELL":
-            return_pct = (entry - exit_price) / entry
-        else:
-            return_pct = 0.0
-        capital *= 1 + return_pct
-        equity_curve.append(round(capital, 6))
-        peak = max(peak, capital)
-        if peak > 0:
-            dd = 1 - (capital / peak)
-            max_drawdown = max(max_drawdown, dd)
-    
-    current_drawdown_pct = round(max_drawdown * 100.0, 2)
-    
-    # Calculate streaks (from most recent to oldest)
-    sorted_trades = sorted(all_trades, key=lambda r: r.closed_at or r.created_at, reverse=True)
-    
-    # Determine if most recent trade is win or loss
-    current_winning_streak = 0
-    current_losing_streak = 0
-    longest_winning_streak = 0
-    longest_losing_streak = 0
-    
-    if sorted_trades:
-        # Calculate current streak
-        first_trade = sorted_trades[0]
-        if first_trade.exit_price_pct is not None:
-            is_first_win = first_trade.exit_price_pct > 0
-        else:
-            # Calculate from entry/exit
-            entry = float(first_trade.entry_optimal)
-            exit = float(first_trade.exit_price)
-            if first_trade.signal == "BUY":
-                is_first_win = exit > entry
-            elif first_trade.signal == "SELL":
-                is_first_win = exit < entry
-            else:
-                is_first_win = False
-        
-        if is_first_win:
-            current_winning_streak = 1
-            current_losing_streak = 0
-        else:
-            current_winning_streak = 0
-            current_losing_streak = 1
-        
-        # Continue counting streak
-        for trade in sorted_trades[1:]:
-            if trade.exit_price_pct is not None:
-                is_win = trade.exit_price_pct > 0
-            else:
-                entry = float(trade.entry_optimal)
-                exit = float(trade.exit_price)
-                if trade.signal == "BUY":
-                    is_win = exit > entry
-                elif trade.signal == "SELL":
-                    is_win = exit < entry
-                else:
-                    is_win = False
-            
-            if is_first_win and is_win:
-                current_winning_streak += 1
-            elif not is_first_win and not is_win:
-                current_losing_streak += 1
-            else:
-                break
-        
-        # Calculate longest streaks (all trades)
-        current_win = 0
-        current_loss = 0
-        for trade in sorted_trades:
-            if trade.exit_price_pct is not None:
-                is_win = trade.exit_price_pct > 0
-            else:
-                entry = float(trade.entry_optimal)
-                exit = float(trade.exit_price)
-                if trade.signal == "BUY":
-                    is_win = exit > entry
-                elif trade.signal == "SELL":
-                    is_win = exit < entry
-                else:
-                    is_win = False
-            
-            if is_win:
-                current_win += 1
-                current_loss = 0
-                longest_winning_streak = max(longest_winning_streak, current_win)
-            else:
-                current_loss += 1
-                current_win = 0
-                longest_losing_streak = max(longest_losing_streak, current_loss)
-    
-    # Count trades in last 24 hours
-    trades_last_24h = sum(
-        1
-        for rec in all_trades
-        if rec.closed_at and rec.closed_at >= last_24h
+
+    capital = agg.current_equity
+    current_drawdown_pct = round(agg.max_drawdown * 100.0, 2)
+    current_winning_streak = agg.current_winning_streak
+    current_losing_streak = agg.current_losing_streak
+    longest_winning_streak = agg.longest_winning_streak
+    longest_losing_streak = agg.longest_losing_streak
+
+    # Count trades in last 24 hours (indexed range count on closed_at)
+    trades_last_24h_stmt = (
+        select(func.count())
+        .select_from(RecommendationORM)
+        .where(RecommendationORM.status == "closed")
+        .where(RecommendationORM.exit_price.isnot(None))
+        .where(RecommendationORM.closed_at >= last_24h)
     )
+    trades_last_24h = int(db.execute(trades_last_24h_stmt).scalar_one())
     
     # Calculate average exposure (simplified: average of entry prices relative to current equity)
     # For now, we'll use a placeholder calculation
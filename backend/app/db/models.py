@@ -41,7 +41,7 @@ class RecommendationORM(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     status: Mapped[str] = mapped_column(String(16), default="closed", index=True)
     opened_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-    closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
     exit_reason: Mapped[str | None] = mapped_column(String(32), nullable=True)
     exit_price: Mapped[float | None] = mapped_column(Float, nullable=True)
     exit_price_pct: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -163,6 +163,26 @@ class DataRunORM(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class BackfillWindowORM(Base):
+    """One window of a historical backfill job; its status is the job's checkpoint."""
+
+    __tablename__ = "backfill_windows"
+    __table_args__ = (UniqueConstraint("job_key", "window_start", name="uq_backfill_windows_job_start"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_key: Mapped[str] = mapped_column(String(64), index=True)
+    symbol: Mapped[str] = mapped_column(String(32))
+    interval: Mapped[str] = mapped_column(String(16))
+    partition: Mapped[str] = mapped_column(String(16))
+    window_start: Mapped[datetime] = mapped_column(DateTime)
+    window_end: Mapped[datetime] = mapped_column(DateTime)
+    status: Mapped[str] = mapped_column(String(16), default="pending", index=True)  # pending|running|done|failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    rows: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class ExportAuditORM(Base):
     """Audit trail for recommendation exports."""
 
@@ -251,6 +271,33 @@ class UserRiskStateORM(Base):
     last_updated: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 
+class ProductionRiskAggregateORM(Base):
+    """
+    Running aggregates over closed recommendations, folded in as each trade closes.
+
+    Equity is compounded from 1.0 per trade (as in the full replay), so reads of
+    drawdown, equity and streaks do not scan the trade history.
+    """
+
+    __tablename__ = "production_risk_aggregates"
+
+    scope: Mapped[str] = mapped_column(String(32), primary_key=True, default="production")
+    closed_trades: Mapped[int] = mapped_column(Integer, default=0)
+    equity_trades: Mapped[int] = mapped_column(Integer, default=0)  # Closed trades with a valid entry price
+    winning_trades: Mapped[int] = mapped_column(Integer, default=0)
+    losing_trades: Mapped[int] = mapped_column(Integer, default=0)
+    current_equity: Mapped[float] = mapped_column(Float, default=1.0)
+    peak_equity: Mapped[float] = mapped_column(Float, default=1.0)
+    max_drawdown: Mapped[float] = mapped_column(Float, default=0.0)  # Fraction of peak
+    current_winning_streak: Mapped[int] = mapped_column(Integer, default=0)
+    current_losing_streak: Mapped[int] = mapped_column(Integer, default=0)
+    longest_winning_streak: Mapped[int] = mapped_column(Integer, default=0)
+    longest_losing_streak: Mapped[int] = mapped_column(Integer, default=0)
+    last_closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_recommendation_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class CooldownEventORM(Base):
     """Audit trail for cooldown events."""
 
@@ -0,0 +1,217 @@
+"""
+Process-wide LRU cache of indicator series keyed by dataset fingerprint.
+
+One pipeline run hands the same curated frames to the signal engine, the regime
+classifier and the strategies, and each of them used to recompute the same
+EMAs, RSI, ATR and Bollinger bands. Frames loaded through
+``DataCuration.get_latest_curated`` carry their source (curated path and file
+mtime) in ``df.attrs``; together with the row count and the last ``open_time``
+that identifies the dataset, and the indicator name plus its parameters
+identifies the series.
+
+pandas copies ``attrs`` into every slice, copy and arithmetic result, so the tag
+alone does not prove a frame still holds the curated data. Only the frame
+object ``tag_source`` returned is recognised; anything derived from it (per-bar
+prefixes, copies with modified prices) is computed directly like any other
+untagged frame (synthetic data, ad-hoc transforms) and never cached. Tagged
+frames are shared with the cache and must not be modified in place.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+import pandas as pd
+
+from app.observability.metrics import INDICATOR_CACHE_ENTRIES, INDICATOR_CACHE_HITS, INDICATOR_CACHE_MISSES
+
+T = TypeVar("T")
+
+SOURCE_ATTR = "dataset_source"
+TOKEN_ATTR = "dataset_token"
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Tagged frames by token, held weakly so a token never outlives its frame
+_TAGGED: weakref.WeakValueDictionary[int, pd.DataFrame] = weakref.WeakValueDictionary()
+_TOKENS = itertools.count()
+
+
+@dataclass(frozen=True)
+class DatasetFingerprint:
+    """Identity of a curated frame: where it was loaded from and how far it reaches."""
+
+    source: str
+    rows: int
+    last_open_time: str
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> DatasetFingerprint | None:
+        source = df.attrs.get(SOURCE_ATTR)
+        if not source or df.empty:
+            return None
+        # Slices and copies inherit attrs; only the tagged object itself is the dataset
+        if _TAGGED.get(df.attrs.get(TOKEN_ATTR)) is not df:
+            return None
+        if "open_time" in df.columns:
+            last = df["open_time"].iloc[-1]
+        else:
+            last = df.index[-1]
+        return cls(source=str(source), rows=len(df), last_open_time=str(pd.Timestamp(last)))
+
+
+def tag_source(df: pd.DataFrame, path: Path) -> pd.DataFrame:
+    """Record the file a frame was read from so its indicators can be cached."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return df
+    token = next(_TOKENS)
+    df.attrs[SOURCE_ATTR] = f"{path.resolve()}@{mtime_ns}"
+    df.attrs[TOKEN_ATTR] = token
+    _TAGGED[token] = df
+    return df
+
+
+def _spec_key(name: str, params: dict[str, Any]) -> str:
+    return f"{name}:{json.dumps(params, sort_keys=True, default=str)}"
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        usage = value.memory_usage(index=True, deep=False)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    return 64
+
+
+class IndicatorCache:
+    """
+    LRU of computed indicators bounded by entry count and approximate size.
+
+    Cached series are shared between callers and must be treated as read-only;
+    derive new series instead of assigning into them.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[DatasetFingerprint, str], tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, df: pd.DataFrame, name: str, compute: Callable[[], T], **params: Any) -> T:
+        """
+        Return the cached value of indicator ``name`` with ``params`` for ``df``,
+        calling ``compute`` on a miss. ``name`` must identify the formula: two
+        consumers share an entry only when they compute the same thing.
+        """
+        fingerprint = DatasetFingerprint.from_frame(df)
+        if fingerprint is None:
+            return compute()
+
+        key = (fingerprint, _spec_key(name, params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            INDICATOR_CACHE_HITS.labels(indicator=name).inc()
+            return entry[0]
+
+        INDICATOR_CACHE_MISSES.labels(indicator=name).inc()
+        value = compute()
+        size = _nbytes(value)
+        with self._lock:
+            self.misses += 1
+            if size <= self.max_bytes:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._bytes -= previous[1]
+                self._entries[key] = (value, size)
+                self._bytes += size
+                self._evict()
+            INDICATOR_CACHE_ENTRIES.set(len(self._entries))
+        return value
+
+    def indicator(self, df: pd.DataFrame, name: str, **params: Any) -> Any:
+        """Named indicator from the registry (``ema``, ``rsi``, ``atr``, ``bollinger``, ...)."""
+        func = _registry().get(name)
+        if func is None:
+            raise KeyError(f"Unknown indicator '{name}'")
+        return self.get_or_compute(df, name, lambda: func(df, **params), **params)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            INDICATOR_CACHE_ENTRIES.set(0)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+
+_REGISTRY: dict[str, Callable[..., Any]] = {}
+_REGISTRY_LOCK = threading.Lock()
+_BUILTINS_LOADED = False
+
+
+def register_indicator(name: str, func: Callable[..., Any]) -> None:
+    """Expose ``func(df, **params)`` to ``IndicatorCache.indicator`` under ``name``."""
+    with _REGISTRY_LOCK:
+        _REGISTRY[name] = func
+
+
+def _registry() -> dict[str, Callable[..., Any]]:
+    global _BUILTINS_LOADED
+    if not _BUILTINS_LOADED:
+        # Built-ins are the quant indicator functions; imported lazily to avoid a cycle
+        from app.quant import indicators as ind
+
+        with _REGISTRY_LOCK:
+            _BUILTINS_LOADED = True
+            for name, func in (
+                ("ema", ind.ema),
+                ("sma", ind.sma),
+                ("macd", ind.macd),
+                ("rsi", ind.rsi),
+                ("rsi_raw", ind.rsi_raw),
+                ("stoch_rsi", ind.stoch_rsi),
+                ("atr", ind.atr),
+                ("bollinger", ind.bollinger),
+                ("keltner", ind.keltner),
+                ("vwap", ind.vwap),
+                ("realized_volatility", ind.realized_volatility),
+            ):
+                _REGISTRY.setdefault(name, func)
+    return _REGISTRY
+
+
+_CACHE = IndicatorCache()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    return _CACHE
@@ -0,0 +1,126 @@
+"""
+Vectorised rolling-window kernels.
+
+Replacements for ``Series.rolling(...).apply(func)`` hot spots, which call back
+into Python once per window. Windows are read through zero-copy sliding views
+and reduced in fixed-size blocks, so memory stays bounded on long series. Each
+output only depends on the values inside its own window: evaluating the last
+window alone gives the same bits as evaluating the whole series. Valid
+observation counts for ``min_periods`` come from cumulative sums.
+
+Every kernel takes array-likes and returns a float ``np.ndarray`` aligned with
+the input; positions without a complete window (or with too few observations)
+are NaN, matching pandas' ``rolling`` conventions.
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Windows reduced per step; bounds temporaries to BLOCK_ROWS * window floats
+BLOCK_ROWS = 16_384
+
+
+def _as_float(values: object) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def _reduce_windows(values: np.ndarray, window: int, reducer: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """Apply ``reducer`` to every complete window; ``reducer`` maps (rows, window) -> (rows,)."""
+    out = np.full(len(values), np.nan)
+    if window < 1 or len(values) < window:
+        return out
+    view = sliding_window_view(values, window)
+    for start in range(0, len(view), BLOCK_ROWS):
+        block = view[start:start + BLOCK_ROWS]
+        out[window - 1 + start:window - 1 + start + len(block)] = reducer(block)
+    return out
+
+
+def _valid_counts(values: np.ndarray, window: int) -> np.ndarray:
+    """Number of non-NaN observations in the trailing window ending at each position."""
+    hits = np.concatenate(([0], np.cumsum(~np.isnan(values))))
+    positions = np.arange(1, len(values) + 1)
+    return hits[positions] - hits[np.maximum(positions - window, 0)]
+
+
+def rolling_weighted_mean(
+    values: object,
+    weights: object,
+    window: int,
+    *,
+    min_periods: int | None = None,
+) -> np.ndarray:
+    """
+    ``sum(w * x) / sum(w)`` over trailing windows (e.g. a rolling VWAP).
+
+    Equivalent to ``rolling(window, min_periods).apply(np.average(x, weights=w))``:
+    windows with fewer than ``min_periods`` non-NaN values are NaN, a NaN inside a
+    window propagates, and a window whose weights sum to zero is NaN instead of
+    raising ``ZeroDivisionError``.
+    """
+    x = _as_float(values)
+    w = _as_float(weights)
+    if x.shape != w.shape:
+        raise ValueError("values and weights must have the same length")
+    min_periods = window if min_periods is None else min_periods
+    if window < 1 or len(x) == 0:
+        return np.full(len(x), np.nan)
+
+    # Leading zeros give the first window - 1 positions a partial window without changing the sums
+    pad = np.zeros(window - 1)
+    weighted = np.concatenate((pad, x * w))
+    total_weight = np.concatenate((pad, w))
+    numerator = _reduce_windows(weighted, window, lambda block: block.sum(axis=1))[window - 1:]
+    denominator = _reduce_windows(total_weight, window, lambda block: block.sum(axis=1))[window - 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = numerator / denominator
+    out[denominator == 0] = np.nan
+    out[_valid_counts(x, window) < max(min_periods, 1)] = np.nan
+    return out
+
+
+def rolling_slope(values: object, window: int) -> np.ndarray:
+    """
+    OLS slope of ``y`` against ``0..window-1`` for every complete window.
+
+    Same result as ``np.polyfit(np.arange(window), y, 1)[0]`` per window: the
+    slope is a fixed linear combination of the window. Each window is reduced
+    with its own row sum (not a BLAS product, whose summation order depends on
+    the block shape), so a window gives bit-identical results whether it is
+    evaluated alone or as part of a long series.
+    """
+    y = _as_float(values)
+    if window < 2:
+        return np.full(len(y), np.nan)
+    x = np.arange(window, dtype=float)
+    centered = x - x.mean()
+    coefficients = centered / float(centered @ centered)
+    return _reduce_windows(y, window, lambda block: (block * coefficients).sum(axis=1))
+
+
+def rolling_max(values: object, window: int) -> np.ndarray:
+    """Trailing-window maximum; NaN when the window holds a NaN (pandas ``min_periods=window``)."""
+    return _reduce_windows(_as_float(values), window, lambda block: block.max(axis=1))
+
+
+def rolling_min(values: object, window: int) -> np.ndarray:
+    """Trailing-window minimum; NaN when the window holds a NaN (pandas ``min_periods=window``)."""
+    return _reduce_windows(_as_float(values), window, lambda block: block.min(axis=1))
+
+
+def rolling_std(values: object, window: int, *, ddof: int = 1) -> np.ndarray:
+    """
+    Trailing-window standard deviation (two-pass per window, so long trending
+    series do not lose precision the way running sums of squares do).
+    """
+    if window <= ddof:
+        return np.full(len(np.asarray(values)), np.nan)
+
+    def _std(block: np.ndarray) -> np.ndarray:
+        deviations = block - block.mean(axis=1, keepdims=True)
+        return np.sqrt((deviations * deviations).sum(axis=1) / (window - ddof))
+
+    return _reduce_windows(_as_float(values), window, _std)
@@ -4,6 +4,8 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
+from app.indicators.cache import get_indicator_cache
+
 
 class TechnicalIndicators:
     """Calculate technical indicators."""
@@ -95,30 +97,39 @@ class TechnicalIndicators:
 
     @staticmethod
     def calculate_all(df: pd.DataFrame) -> dict[str, Any]:
-        """Calculate all indicators and return as dictionary."""
+        """
+        Calculate all indicators and return as dictionary.
+
+        Series whose formula matches the quant indicators (EMA, SMA, MACD, ATR,
+        Bollinger, Keltner) are shared with them through the indicator cache; the
+        unfilled RSI variants, ADX and momentum are cached under their own names.
+        """
+        cache = get_indicator_cache()
         indicators = {}
-        indicators["ema_9"] = TechnicalIndicators.ema(df, 9)
-        indicators["ema_21"] = TechnicalIndicators.ema(df, 21)
-        indicators["ema_50"] = TechnicalIndicators.ema(df, 50)
-        indicators["sma_100"] = TechnicalIndicators.sma(df, 100)
-        indicators["sma_200"] = TechnicalIndicators.sma(df, 200)
-        macd_data = TechnicalIndicators.macd(df)
+        indicators["ema_9"] = cache.indicator(df, "ema", period=9)
+        indicators["ema_21"] = cache.indicator(df, "ema", period=21)
+        indicators["ema_50"] = cache.indicator(df, "ema", period=50)
+        indicators["sma_100"] = cache.indicator(df, "sma", period=100)
+        indicators["sma_200"] = cache.indicator(df, "sma", period=200)
+        macd_data = cache.indicator(df, "macd")
         indicators["macd"] = macd_data["macd"]
         indicators["macd_signal"] = macd_data["signal"]
         indicators["macd_histogram"] = macd_data["histogram"]
-        indicators["rsi"] = TechnicalIndicators.rsi(df)
-        indicators["stoch_rsi"] = TechnicalIndicators.stoch_rsi(df)
-        bb = TechnicalIndicators.bollinger_bands(df)
+        indicators["rsi"] = cache.get_or_compute(df, "technical.rsi", lambda: TechnicalIndicators.rsi(df), period=14)
+        indicators["stoch_rsi"] = cache.get_or_compute(df, "technical.stoch_rsi", lambda: TechnicalIndicators.stoch_rsi(df))
+        bb = cache.indicator(df, "bollinger", period=20, std_dev=2.0)
         indicators["bb_upper"] = bb["upper"]
         indicators["bb_middle"] = bb["middle"]
         indicators["bb_lower"] = bb["lower"]
-        kc = TechnicalIndicators.keltner_channels(df)
+        kc = cache.indicator(df, "keltner", period=20, mult=2.0)
         indicators["kc_upper"] = kc["upper"]
         indicators["kc_middle"] = kc["middle"]
         indicators["kc_lower"] = kc["lower"]
-        indicators["atr"] = TechnicalIndicators.atr(df)
-        indicators["adx"] = TechnicalIndicators.adx(df)
-        indicators["momentum"] = TechnicalIndicators.momentum(df)
+        indicators["atr"] = cache.indicator(df, "atr", period=14)
+        indicators["adx"] = cache.get_or_compute(df, "technical.adx", lambda: TechnicalIndicators.adx(df), period=14)
+        indicators["momentum"] = cache.get_or_compute(
+            df, "technical.momentum", lambda: TechnicalIndicators.momentum(df), period=10
+        )
         return indicators
 
     @staticmethod
@@ -11,7 +11,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import analytics, diagnostics, execution, export, knowledge, market, observability, operational, orderbook, orders, performance, positions, recommendation, risk, sltp_validation, transparency, user_risk
 from app.services.transparency_service import TransparencyService
 from app.core.config import settings
-from app.core.database import Base, SessionLocal, engine
+from app.core.database import Base, SessionLocal, dispose_async_engine, engine
+from app.data.exchanges.http import close_http_pool
+from app.signals.journal import close_signal_journal
 from app.core.logging import setup_logging
 from app.core.exceptions import RecommendationGenerationError
 from app.data.curation import DataCuration
@@ -487,6 +489,24 @@ async def job_monitor_tracking_errors() -> None:
         logger.error(f"Tracking error monitoring job failed: {exc}", exc_info=True)
 
 
+@scheduler.scheduled_job("cron", hour=0, minute=30, id="compact_orderbook")
+async def job_compact_orderbook() -> None:
+    """Scheduled job to fold appended order book parts into one file per partition."""
+    from app.core.logging import logger, sanitize_log_extra
+    from app.data.orderbook import OrderBookRepository
+    from app.data.orderbook_partitions import partitioned_symbols
+
+    for venue, symbol in partitioned_symbols():
+        try:
+            result = await asyncio.to_thread(OrderBookRepository(venue=venue).compact, symbol)
+            logger.info("Order book compaction finished", extra=sanitize_log_extra({"venue": venue, **result}))
+        except Exception as exc:
+            logger.exception(
+                "Order book compaction failed",
+                extra=sanitize_log_extra({"venue": venue, "symbol": symbol, "error": str(exc)}),
+            )
+
+
 @scheduler.scheduled_job("cron", hour=0, minute=0, id="generate_daily_kpis_report")
 async def job_generate_daily_kpis_report() -> None:
     """Scheduled job to generate and archive daily KPI reports."""
@@ -546,7 +566,9 @@ async def job_check_exposure_alerts() -> None:
         service = ExposureAlertService()
         # For now, single-user system
         user_id = settings.DEFAULT_USER_ID
-        result = service.check_exposure_alerts(
+        # The check runs blocking queries; keep it off the event loop serving the API
+        result = await asyncio.to_thread(
+            service.check_exposure_alerts,
             user_id,
             alert_threshold_pct=settings.EXPOSURE_ALERT_THRESHOLD_PCT,
             persistence_minutes=settings.EXPOSURE_ALERT_PERSISTENCE_MINUTES,
@@ -727,6 +749,9 @@ async def on_startup():
 @app.on_event("shutdown")
 async def on_shutdown():
     scheduler.shutdown(wait=False)
+    await dispose_async_engine()
+    await close_http_pool()
+    await asyncio.to_thread(close_signal_journal)
     if _preflight_task is not None and not _preflight_task.done():
         _preflight_task.cancel()
         with suppress(asyncio.CancelledError):
@@ -35,6 +35,14 @@ DATA_GAPS = Counter(
     "data_gaps_total", "Gaps detectados en datasets", ["timeframe"]
 )
 
+# Historical backfill progress (app/data/backfill_engine.py)
+BACKFILL_WINDOWS = Counter("backfill_windows_total", "Backfill windows processed", ["symbol", "interval", "status"])
+BACKFILL_ROWS = Counter("backfill_rows_total", "Candle rows fetched by backfills", ["symbol", "interval"])
+BACKFILL_WINDOWS_REMAINING = Gauge("backfill_windows_remaining", "Backfill windows left in the queue", ["job"])
+BACKFILL_WINDOWS_PER_SECOND = Gauge("backfill_windows_per_second", "Backfill throughput in windows", ["job"])
+BACKFILL_ROWS_PER_SECOND = Gauge("backfill_rows_per_second", "Backfill throughput in rows", ["job"])
+BACKFILL_ETA_SECONDS = Gauge("backfill_eta_seconds", "Estimated seconds until the backfill finishes", ["job"])
+
 # Binance client metrics
 BINANCE_REQUEST_LATENCY = Histogram(
     "binance_request_latency_seconds",
@@ -52,6 +60,34 @@ ENDPOINT_RESPONSE_TIME = Histogram(
 # Cache metrics
 CACHE_HITS = Counter("cache_hits_total", "Cache hits", ["cache_key"])
 CACHE_MISSES = Counter("cache_misses_total", "Cache misses", ["cache_key"])
+CACHE_STALE_HITS = Counter(
+    "cache_stale_hits_total", "Expired values served while a refresh runs", ["cache_key"]
+)
+CACHE_COALESCED = Counter(
+    "cache_coalesced_total", "Misses that waited on an in-flight computation", ["cache_key"]
+)
+CACHE_EVICTIONS = Counter("cache_evictions_total", "Response cache evictions", ["reason"])
+CACHE_ENTRIES = Gauge("cache_entries", "Entries held in the response cache")
+CACHE_BYTES = Gauge("cache_bytes", "Approximate size of the response cache in bytes")
+INDICATOR_CACHE_HITS = Counter(
+    "indicator_cache_hits_total", "Indicator series served from the shared cache", ["indicator"]
+)
+INDICATOR_CACHE_MISSES = Counter(
+    "indicator_cache_misses_total", "Indicator series computed on a cache miss", ["indicator"]
+)
+INDICATOR_CACHE_ENTRIES = Gauge("indicator_cache_entries", "Indicator series held in the shared cache")
+BACKTEST_CACHE_LOOKUPS = Counter(
+    "backtest_cache_lookups_total", "Pre-publish backtest cache lookups", ["result"]
+)
+BACKTEST_CACHE_EVICTIONS = Counter("backtest_cache_evictions_total", "Backtest cache evictions", ["reason"])
+BACKTEST_CACHE_ENTRIES = Gauge("backtest_cache_entries", "Entries held in the backtest result cache")
+SIGNAL_JOURNAL_FLUSHES = Counter("signal_journal_flushes_total", "Signal journal flushes", ["trigger"])
+SIGNAL_JOURNAL_ROWS = Counter("signal_journal_rows_total", "Signal emissions written by the journal")
+SIGNAL_JOURNAL_FLUSH_FAILURES = Counter("signal_journal_flush_failures_total", "Signal journal flushes that failed")
+SIGNAL_JOURNAL_DROPPED = Counter(
+    "signal_journal_dropped_total", "Signal emissions the journal gave up on", ["reason"]
+)
+SIGNAL_JOURNAL_PENDING = Gauge("signal_journal_pending", "Signal emissions queued in the journal")
 
 
 class RequestMetricsMiddleware(BaseHTTPMiddleware):
@@ -1,18 +1,25 @@
 """Quantitative analysis modules (indicators, factors, strategies, signal engine)."""
-from .factors import cross_timeframe
-from .indicators import calculate_all
-from .narrative import build_narrative
-from .regime import HmmRegimeClassifier, KMeansRegimeClassifier, RegimeClassifier
-from .capital_allocation import CapitalAllocationRules, DynamicCapitalAllocator, KellyAllocation
-from .regime_playbooks import RegimePlaybook, RegimePlaybookManager
-from .regime_transition import RegimeTransitionConfig, RegimeTransitionDetector, RegimeTransitionManager
-from .signal_engine import DailySignalEngine, generate_signal
+from app.core.lazy import lazy_exports
+
+# Submodules are imported when one of their names is first used
+_EXPORTS = {
+    ".factors": ("cross_timeframe",),
+    ".indicators": ("calculate_all",),
+    ".narrative": ("build_narrative",),
+    ".regime": ("HmmRegimeClassifier", "KMeansRegimeClassifier", "RegimeClassifier"),
+    ".capital_allocation": ("CapitalAllocationRules", "DynamicCapitalAllocator", "KellyAllocation"),
+    ".regime_playbooks": ("RegimePlaybook", "RegimePlaybookManager"),
+    ".regime_transition": ("RegimeTransitionConfig", "RegimeTransitionDetector", "RegimeTransitionManager"),
+    ".signal_engine": ("DailySignalEngine", "generate_signal"),
+    ".precomputed_signals": ("PrecomputedSignalEngine",),
+}
 
 __all__ = [
     "calculate_all",
     "cross_timeframe",
     "DailySignalEngine",
     "generate_signal",
+    "PrecomputedSignalEngine",
     "build_narrative",
     "HmmRegimeClassifier",
     "KMeansRegimeClassifier",
@@ -26,3 +33,5 @@ __all__ = [
     "RegimeTransitionDetector",
     "RegimeTransitionManager",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -3,8 +3,10 @@ from __future__ import annotations
 
 import hashlib
 import json
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import yaml
 
@@ -238,3 +240,50 @@ def get_signal_config_version() -> str:
     """Get version of current signal configuration."""
     return get_signal_config_manager().get_version()
 
+
+
+# Per-context parameter overlay; see ``signal_params_override``
+_PARAMS_OVERRIDE: ContextVar[dict[str, Any] | None] = ContextVar("signal_params_override", default=None)
+
+
+def deep_merge(base: dict[str, Any], overrides: dict[str, Any]) -> dict[str, Any]:
+    """Recursively merge ``overrides`` onto a copy of ``base``."""
+    result = base.copy()
+    for key, value in overrides.items():
+        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+            result[key] = deep_merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def active_signal_params() -> dict[str, Any]:
+    """
+    Signal parameters in effect for the current context.
+
+    Strategies and the signal engine read parameters through this function, so
+    an enclosing ``signal_params_override`` changes what they see without
+    touching params.yaml.
+    """
+    override = _PARAMS_OVERRIDE.get()
+    if override is not None:
+        return override
+    return get_signal_params()
+
+
+@contextmanager
+def signal_params_override(overrides: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """
+    Apply ``overrides`` (nested, e.g. ``{"breakout": {"lookback": 25}}``) on top
+    of the active parameters for the duration of the block.
+
+    The overlay lives in a ``ContextVar``: it is visible to code running in this
+    thread or task (and tasks it spawns) only, so concurrent sweeps never see
+    each other's values and nothing is written to disk. Blocks nest.
+    """
+    merged = deep_merge(active_signal_params(), overrides or {})
+    token = _PARAMS_OVERRIDE.set(merged)
+    try:
+        yield merged
+    finally:
+        _PARAMS_OVERRIDE.reset(token)
@@ -6,18 +6,14 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
+from app.indicators.rolling import rolling_max, rolling_min, rolling_slope
+
 
 def slope(series: pd.Series, window: int = 10) -> pd.Series:
     """Compute slope via linear regression over rolling window."""
     if series.empty:
         return series
-    x = np.arange(window)
-    def _sl(y):
-        if len(y) < window:
-            return np.nan
-        b1 = np.polyfit(x, y, 1)[0]
-        return b1
-    return series.rolling(window).apply(lambda y: _sl(np.array(y)), raw=False)
+    return pd.Series(rolling_slope(series.to_numpy(dtype=float), window), index=series.index)
 
 
 def regime_volatility(realized_vol: pd.Series, high: float = 0.5, low: float = 0.2) -> pd.Series:
@@ -39,10 +35,10 @@ def divergence(price: pd.Series, osc: pd.Series, window: int = 14) -> pd.Series:
     Returns: 1 for bullish divergence, -1 for bearish divergence, 0 for none.
     Window: 14 periods default (adjustable based on timeframe).
     """
-    hh_price = price.rolling(window).apply(np.nanmax)
-    hh_osc = osc.rolling(window).apply(np.nanmax)
-    ll_price = price.rolling(window).apply(np.nanmin)
-    ll_osc = osc.rolling(window).apply(np.nanmin)
+    hh_price = pd.Series(rolling_max(price, window), index=price.index)
+    hh_osc = pd.Series(rolling_max(osc, window), index=osc.index)
+    ll_price = pd.Series(rolling_min(price, window), index=price.index)
+    ll_osc = pd.Series(rolling_min(osc, window), index=osc.index)
     bear = ((price >= hh_price) & (osc <= hh_osc.shift(1))).astype(int)
     bull = ((price <= ll_price) & (osc >= ll_osc.shift(1))).astype(int)
     return bull - bear
@@ -57,11 +53,8 @@ def cross_timeframe(df_1h: pd.DataFrame, df_1d: pd.DataFrame, ind_1h: dict[str,
     mom_1h = _safe_momentum(df_1h["close"], horizon=10)
     mom_1d = _safe_momentum(df_1d["close"], horizon=10)
 
-    align_momentum = float(np.sign(mom_1h) == np.sign(mom_1d)) if mom_1h != 0 and mom_1d != 0 else 0.0
-
     slope_1h = float(_safe_last(slope(ind_1h["ema_21"], 20))) if "ema_21" in ind_1h else 0.0
     slope_1d = float(_safe_last(slope(ind_1d["ema_21"], 20))) if "ema_21" in ind_1d else 0.0
-    slope_ratio = slope_1h / slope_1d if slope_1d not in (0.0, np.nan) else 0.0
 
     rsi_div_1h = float(_safe_last(divergence(df_1h["close"], ind_1h["rsi"], 14))) if "rsi" in ind_1h else 0.0
     rsi_div_1d = float(_safe_last(divergence(df_1d["close"], ind_1d["rsi"], 14))) if "rsi" in ind_1d else 0.0
@@ -69,20 +62,59 @@ def cross_timeframe(df_1h: pd.DataFrame, df_1d: pd.DataFrame, ind_1h: dict[str,
     reg_1h = int(regime_volatility(ind_1h["realized_vol"]).iloc[-1]) if "realized_vol" in ind_1h else 1
     reg_1d = int(regime_volatility(ind_1d["realized_vol"]).iloc[-1]) if "realized_vol" in ind_1d else 1
 
+    return combine_factors(mom_1h, mom_1d, slope_1h, slope_1d, rsi_div_1h, rsi_div_1d, reg_1h, reg_1d)
+
+
+def combine_factors(
+    mom_1h: float,
+    mom_1d: float,
+    slope_1h: float,
+    slope_1d: float,
+    divergence_1h: float,
+    divergence_1d: float,
+    vol_regime_1h: int,
+    vol_regime_1d: int,
+) -> dict[str, Any]:
+    """Build the cross-timeframe factor dict from per-timeframe components."""
+    align_momentum = float(np.sign(mom_1h) == np.sign(mom_1d)) if mom_1h != 0 and mom_1d != 0 else 0.0
+    slope_ratio = slope_1h / slope_1d if slope_1d not in (0.0, np.nan) else 0.0
     return {
         "momentum_alignment": align_momentum,
         "slope_1h": slope_1h,
         "slope_1d": slope_1d,
         "slope_ratio": slope_ratio,
-        "divergence_1h": rsi_div_1h,
-        "divergence_1d": rsi_div_1d,
-        "vol_regime_1h": reg_1h,
-        "vol_regime_1d": reg_1d,
+        "divergence_1h": divergence_1h,
+        "divergence_1d": divergence_1d,
+        "vol_regime_1h": vol_regime_1h,
+        "vol_regime_1d": vol_regime_1d,
         "mom_1h": float(mom_1h),
         "mom_1d": float(mom_1d),
     }
 
 
+def latest_slope(series: pd.Series, window: int = 10) -> float:
+    """Last value of ``slope`` (as ``_safe_last``) evaluating only the final window."""
+    return float(_safe_last(slope(series.iloc[-window:], window)))
+
+
+def latest_divergence(price: pd.Series, osc: pd.Series, window: int = 14) -> float:
+    """Last value of ``divergence`` (as ``_safe_last``); it only depends on the final ``window + 1`` rows."""
+    return float(_safe_last(divergence(price.iloc[-(window + 1):], osc.iloc[-(window + 1):], window)))
+
+
+def momentum(close: pd.Series, horizon: int) -> pd.Series:
+    """Vectorized ``_safe_momentum``: value at t equals ``_safe_momentum(close[: t + 1], horizon)``."""
+    values = close.to_numpy()
+    out = np.zeros(len(values), dtype=float)
+    if len(values) > horizon:
+        base = values[:-horizon] if horizon else values
+        last = values[horizon:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = (last - base) / base
+        out[horizon:] = np.where(base == 0, 0.0, ratio)
+    return pd.Series(out, index=close.index)
+
+
 def _safe_momentum(close: pd.Series, horizon: int) -> float:
     if close.empty or len(close) <= horizon:
         return 0.0
@@ -6,6 +6,8 @@ import warnings
 import numpy as np
 import pandas as pd
 
+from app.indicators.cache import get_indicator_cache
+
 # Filter FutureWarnings about deprecated fillna(method=...) to reduce noise
 warnings.filterwarnings("ignore", message=".*fillna with 'method' is deprecated.*", category=FutureWarning)
 
@@ -27,22 +29,34 @@ def macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> d
     return {"macd": macd_line, "signal": signal_line, "histogram": histogram}
 
 
-def rsi(df: pd.DataFrame, period: int = 14, column: str = "close") -> pd.Series:
+def rsi_raw(df: pd.DataFrame, period: int = 14, column: str = "close") -> pd.Series:
+    """RSI before gap filling; causal, so a prefix of the full series equals the series of the prefix."""
     delta = df[column].diff()
     gain = delta.clip(lower=0).rolling(period).mean()
     loss = (-delta.clip(upper=0)).rolling(period).mean()
     rs = gain / loss.replace(0, np.nan)
-    out = 100 - (100 / (1 + rs))
-    return out.bfill().fillna(50)
+    return 100 - (100 / (1 + rs))
 
 
-def stoch_rsi(df: pd.DataFrame, rsi_period: int = 14, stoch_period: int = 14) -> pd.Series:
-    r = rsi(df, rsi_period)
+def fill_rsi(raw: pd.Series) -> pd.Series:
+    """Fill RSI gaps the way ``rsi`` does (back-fill, then neutral 50)."""
+    return raw.bfill().fillna(50)
+
+
+def rsi(df: pd.DataFrame, period: int = 14, column: str = "close") -> pd.Series:
+    return fill_rsi(rsi_raw(df, period, column))
+
+
+def stoch_from_rsi(r: pd.Series, stoch_period: int = 14) -> pd.Series:
     r_min = r.rolling(stoch_period).min()
     r_max = r.rolling(stoch_period).max()
     return ((r - r_min) / (r_max - r_min)).clip(0, 1) * 100
 
 
+def stoch_rsi(df: pd.DataFrame, rsi_period: int = 14, stoch_period: int = 14) -> pd.Series:
+    return stoch_from_rsi(rsi(df, rsi_period), stoch_period)
+
+
 def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     high_low = df["high"] - df["low"]
     high_close = (df["high"] - df["close"].shift()).abs()
@@ -77,18 +91,27 @@ def realized_volatility(df: pd.DataFrame, window: int = 20) -> pd.Series:
     return (returns.rolling(window).std() * np.sqrt(252)).fillna(0)
 
 
+def _cached(df: pd.DataFrame, name: str, **params):
+    return get_indicator_cache().indicator(df, name, **params)
+
+
 def calculate_all(df: pd.DataFrame) -> dict[str, pd.Series]:
-    """Calculate all indicators, using curated columns if available."""
+    """
+    Calculate all indicators, using curated columns if available.
+
+    Computed series go through the shared indicator cache, so a curated frame
+    already processed by another consumer (or an earlier call) is not recomputed.
+    """
     out: dict[str, pd.Series] = {}
 
     # Use curated ema_21 if available, otherwise calculate
     if "ema_21" in df.columns:
         out["ema_21"] = df["ema_21"]
     else:
-        out["ema_21"] = ema(df, 21)
+        out["ema_21"] = _cached(df, "ema", period=21)
 
-    out["ema_9"] = ema(df, 9)
-    out["ema_50"] = ema(df, 50)
+    out["ema_9"] = _cached(df, "ema", period=9)
+    out["ema_50"] = _cached(df, "ema", period=50)
 
     # Use curated sma if available
     if "sma_20" in df.columns:
@@ -96,12 +119,12 @@ def calculate_all(df: pd.DataFrame) -> dict[str, pd.Series]:
     if "sma_50" in df.columns:
         out["sma_50"] = df["sma_50"]
     else:
-        out["sma_50"] = sma(df, 50)
+        out["sma_50"] = _cached(df, "sma", period=50)
 
-    out["sma_100"] = sma(df, 100)
-    out["sma_200"] = sma(df, 200)
+    out["sma_100"] = _cached(df, "sma", period=100)
+    out["sma_200"] = _cached(df, "sma", period=200)
 
-    m = macd(df)
+    m = _cached(df, "macd")
     out["macd"] = m["macd"]
     out["macd_signal"] = m["signal"]
     out["macd_histogram"] = m["histogram"]
@@ -110,9 +133,9 @@ def calculate_all(df: pd.DataFrame) -> dict[str, pd.Series]:
     if "rsi_14" in df.columns:
         out["rsi"] = df["rsi_14"]
     else:
-        out["rsi"] = rsi(df)
+        out["rsi"] = _cached(df, "rsi", period=14)
 
-    out["stoch_rsi"] = stoch_rsi(df)
+    out["stoch_rsi"] = _cached(df, "stoch_rsi")
 
     # Use curated bollinger if available
     if "bollinger_upper" in df.columns and "bollinger_lower" in df.columns:
@@ -120,12 +143,12 @@ def calculate_all(df: pd.DataFrame) -> dict[str, pd.Series]:
         out["bb_middle"] = df["bollinger_mid"]
         out["bb_lower"] = df["bollinger_lower"]
     else:
-        bb = bollinger(df)
+        bb = _cached(df, "bollinger", period=20, std_dev=2.0)
         out["bb_upper"] = bb["upper"]
         out["bb_middle"] = bb["middle"]
         out["bb_lower"] = bb["lower"]
 
-    kc = keltner(df)
+    kc = _cached(df, "keltner", period=20, mult=2.0)
     out["kc_upper"] = kc["upper"]
     out["kc_middle"] = kc["middle"]
     out["kc_lower"] = kc["lower"]
@@ -134,16 +157,14 @@ def calculate_all(df: pd.DataFrame) -> dict[str, pd.Series]:
     if "atr_14" in df.columns:
         out["atr"] = df["atr_14"]
     else:
-        out["atr"] = atr(df)
+        out["atr"] = _cached(df, "atr", period=14)
 
-    out["vwap"] = vwap(df)
+    out["vwap"] = _cached(df, "vwap")
 
     # Use curated volatility_30 if available
     if "volatility_30" in df.columns:
         out["realized_vol"] = df["volatility_30"]
     else:
-        out["realized_vol"] = realized_volatility(df)
+        out["realized_vol"] = _cached(df, "realized_volatility", window=20)
 
     return out
-
-
@@ -0,0 +1,132 @@
+"""Precompute-once signal engine for replaying DailySignalEngine over a history (backtests)."""
+from __future__ import annotations
+
+from typing import Any
+
+import pandas as pd
+
+from app.quant import indicators as ind
+from app.quant.factors import (
+    combine_factors,
+    latest_divergence,
+    latest_slope,
+    momentum,
+    regime_volatility,
+)
+from app.quant.signal_engine import (
+    AggregateConfig,
+    DailyComponents,
+    assemble_signal,
+    build_daily_components,
+    resolve_seed,
+    validate_signal_inputs,
+)
+
+MOMENTUM_HORIZON = 10
+SLOPE_WINDOW = 20
+DIVERGENCE_WINDOW = 14
+
+
+class PrecomputedSignalEngine:
+    """
+    Produce ``generate_signal(df_1h[<= t], df_1d[<= t])`` for many timestamps without
+    recomputing history on every call.
+
+    Indicators, momentum and volatility regimes are computed once over the full
+    frames. All of them are causal (EWM, rolling windows, cumulative sums), so the
+    value at row ``i`` of the full series equals the last value computed on the
+    prefix ending at ``i``. The only non-causal step is the RSI back-fill, which is
+    re-applied on the prefix (daily) or on the final window (hourly divergence).
+    Slopes and divergences only depend on their last window and are evaluated on it.
+
+    Everything derived from the daily frame (strategies, indicator snapshot, regime
+    probabilities, entry/SL/TP and Monte Carlo confidence) is memoized for the
+    current daily candle, since it only changes when a new 1d candle closes. Only
+    one candle is kept: replays move forward in time, and each entry holds
+    O(history) copies, so keeping every day would grow memory quadratically.
+
+    Both frames must have a monotonic increasing DatetimeIndex.
+    """
+
+    def __init__(self, df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int | None = None):
+        df_1h = validate_signal_inputs(df_1h, df_1d)
+        for name, df in (("df_1h", df_1h), ("df_1d", df_1d)):
+            if not isinstance(df.index, pd.DatetimeIndex):
+                raise ValueError(f"{name} must have a DatetimeIndex")
+            if not df.index.is_monotonic_increasing:
+                raise ValueError(f"{name} index must be monotonic increasing")
+
+        self.df_1h = df_1h
+        self.df_1d = df_1d
+        self.mc_trials = mc_trials
+        self._config = AggregateConfig.from_params()
+
+        self._ind_1d = ind.calculate_all(df_1d)
+        self._rsi_raw_1d = ind.rsi_raw(df_1d)
+        self._curated_rsi_1d = "rsi_14" in df_1d.columns
+        self._mom_1d = momentum(df_1d["close"], MOMENTUM_HORIZON).to_numpy()
+        self._regime_1d = regime_volatility(self._ind_1d["realized_vol"]).to_numpy()
+
+        ind_1h = ind.calculate_all(df_1h)
+        self._close_1h = df_1h["close"]
+        self._ema21_1h = ind_1h["ema_21"]
+        # Curated RSI is used as-is; otherwise keep the raw series and fill per window
+        self._rsi_1h = ind_1h["rsi"] if "rsi_14" in df_1h.columns else None
+        self._rsi_raw_1h = ind.rsi_raw(df_1h) if self._rsi_1h is None else None
+        self._mom_1h = momentum(self._close_1h, MOMENTUM_HORIZON).to_numpy()
+        self._regime_1h = regime_volatility(ind_1h["realized_vol"]).to_numpy()
+
+        self._daily: tuple[int, DailyComponents, dict[str, Any]] | None = None
+
+    def locate(self, timestamp: pd.Timestamp) -> tuple[int, int]:
+        """Number of (1h, 1d) rows with index <= timestamp."""
+        n_1h = int(self.df_1h.index.searchsorted(timestamp, side="right"))
+        n_1d = int(self.df_1d.index.searchsorted(timestamp, side="right"))
+        return n_1h, n_1d
+
+    def generate(self, timestamp: pd.Timestamp, seed: int | None = None) -> dict[str, Any] | None:
+        """Signal payload as of ``timestamp``, or None if either frame has no rows yet."""
+        n_1h, n_1d = self.locate(timestamp)
+        if n_1h == 0 or n_1d == 0:
+            return None
+
+        daily, daily_factors = self._daily_components(n_1d)
+        seed = resolve_seed(daily.df_1d, seed)
+        factors = combine_factors(
+            mom_1h=self._mom_1h[n_1h - 1],
+            slope_1h=latest_slope(self._ema21_1h.iloc[:n_1h], SLOPE_WINDOW),
+            divergence_1h=self._hourly_divergence(n_1h),
+            vol_regime_1h=int(self._regime_1h[n_1h - 1]),
+            **daily_factors,
+        )
+        return assemble_signal(daily, factors, self._config, mc_trials=self.mc_trials, seed=seed)
+
+    def _daily_components(self, n_1d: int) -> tuple[DailyComponents, dict[str, Any]]:
+        if self._daily is not None and self._daily[0] == n_1d:
+            return self._daily[1], self._daily[2]
+
+        df_1d = self.df_1d.iloc[:n_1d]
+        ind_1d = {name: series.iloc[:n_1d] for name, series in self._ind_1d.items()}
+        rsi_1d = ind.fill_rsi(self._rsi_raw_1d.iloc[:n_1d])
+        if not self._curated_rsi_1d:
+            ind_1d["rsi"] = rsi_1d
+        ind_1d["stoch_rsi"] = ind.stoch_from_rsi(rsi_1d)
+
+        daily_factors = {
+            "mom_1d": self._mom_1d[n_1d - 1],
+            "slope_1d": latest_slope(ind_1d["ema_21"], SLOPE_WINDOW),
+            "divergence_1d": latest_divergence(df_1d["close"], ind_1d["rsi"], DIVERGENCE_WINDOW),
+            "vol_regime_1d": int(self._regime_1d[n_1d - 1]),
+        }
+        daily = build_daily_components(df_1d, ind_1d, self._config)
+        self._daily = (n_1d, daily, daily_factors)
+        return daily, daily_factors
+
+    def _hourly_divergence(self, n_1h: int) -> float:
+        start = max(0, n_1h - (DIVERGENCE_WINDOW + 1))
+        if self._rsi_1h is not None:
+            osc = self._rsi_1h.iloc[start:n_1h]
+        else:
+            # Back-filling the final window equals the tail of the back-filled prefix
+            osc = ind.fill_rsi(self._rsi_raw_1h.iloc[start:n_1h])
+        return latest_divergence(self._close_1h.iloc[start:n_1h], osc, DIVERGENCE_WINDOW)
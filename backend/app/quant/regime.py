@@ -1,18 +1,21 @@
 """Probabilistic regime classification using HMM and clustering."""
 from __future__ import annotations
 
-from typing import Literal
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Literal
 
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 
-try:
+from app.indicators.cache import get_indicator_cache
+
+if TYPE_CHECKING:
     from hmmlearn import hmm
-    HMM_AVAILABLE = True
-except ImportError:
-    HMM_AVAILABLE = False
+    from sklearn.cluster import KMeans
+    from sklearn.preprocessing import StandardScaler
+
+# sklearn and hmmlearn are imported when a classifier is fitted, not at import time
+HMM_AVAILABLE = find_spec("hmmlearn") is not None
 
 
 class HmmRegimeClassifier:
@@ -30,7 +33,7 @@ class HmmRegimeClassifier:
         self.covariance_type = covariance_type
         self.random_state = random_state
         self.model: hmm.GaussianHMM | None = None
-        self.scaler = StandardScaler()
+        self.scaler: StandardScaler | None = None
         self.feature_names: list[str] = []
         self.regime_names: list[str] = ["calm", "balanced", "stress"]
 
@@ -50,6 +53,10 @@ class HmmRegimeClassifier:
         elif len(self.regime_names) != self.n_components:
             self.regime_names = [f"regime_{i}" for i in range(self.n_components)]
         
+        from hmmlearn import hmm
+        from sklearn.preprocessing import StandardScaler
+
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(features.values)
         self.model = hmm.GaussianHMM(
             n_components=self.n_components,
@@ -98,7 +105,7 @@ class KMeansRegimeClassifier:
         self.n_clusters = n_clusters
         self.random_state = random_state
         self.model: KMeans | None = None
-        self.scaler = StandardScaler()
+        self.scaler: StandardScaler | None = None
         self.feature_names: list[str] = []
         self.regime_names: list[str] = ["calm", "balanced", "stress"]
 
@@ -118,6 +125,10 @@ class KMeansRegimeClassifier:
         elif len(self.regime_names) != self.n_clusters:
             self.regime_names = [f"regime_{i}" for i in range(self.n_clusters)]
         
+        from sklearn.cluster import KMeans
+        from sklearn.preprocessing import StandardScaler
+
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(features.values)
         self.model = KMeans(
             n_clusters=self.n_clusters,
@@ -220,6 +231,16 @@ class RegimeClassifier:
         Returns:
             DataFrame with columns [volatility, skew, volume]
         """
+        return get_indicator_cache().get_or_compute(
+            df,
+            "regime.features",
+            lambda: self._compute_features(df, volatility_col=volatility_col, volume_col=volume_col),
+            volatility_col=volatility_col,
+            volume_col=volume_col,
+        )
+
+    @staticmethod
+    def _compute_features(df: pd.DataFrame, *, volatility_col: str, volume_col: str) -> pd.DataFrame:
         features = {}
         
         if volatility_col in df.columns:
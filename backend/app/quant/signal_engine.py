@@ -1,6 +1,8 @@
 """Signal engine consolidating strategies with SL/TP and confidence."""
 from __future__ import annotations
 
+import math
+from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
@@ -9,13 +11,13 @@ import pandas as pd
 from app.data.signal_data_provider import SignalDataInputs
 from app.quant import indicators as ind
 from app.quant.factors import cross_timeframe
+from app.quant.config_manager import active_signal_params
 from app.quant.regime import RegimeClassifier
 from app.quant.strategies import (
     breakout_strategy,
     mean_reversion_strategy,
     momentum_strategy,
     volatility_strategy,
-    PARAMS as STRATEGY_PARAMS,
 )
 from app.utils.seeding import generate_deterministic_seed
 
@@ -138,20 +140,82 @@ def _mc_confidence(df: pd.DataFrame, entry: float, sl: float, tp: float, trials:
     return float(np.clip(adjusted * 100.0, 5.0, 95.0))
 
 
-def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int | None = None, seed: int | None = None) -> dict[str, Any]:
+@dataclass(frozen=True)
+class AggregateConfig:
+    """Aggregation settings read from the ``aggregate`` section of the strategy params."""
+
+    buy_threshold: float
+    sell_threshold: float
+    risk_reward_floor: float
+    base_conf_multiplier: float
+    default_mc_trials: int
+    momentum_bias_weight: float
+    momentum_alignment_bias: float
+    breakout_slope_weight: float
+    vol_mid_bias: float
+    vol_high_bias: float
+    vol_low_bias: float
+    use_regime_classifier: bool
+    regime_method: str
+    regime_exponential_factor: float
+    slope_scale: float
+    intraday_scale: float
+    ema21_slope_weight: float
+    intraday_momentum_weight: float
+    alignment_shift: float
+
+    @classmethod
+    def from_params(cls, params: dict[str, Any] | None = None) -> AggregateConfig:
+        aggregate_params = (params if params is not None else active_signal_params()).get("aggregate", {})
+        vector_bias_cfg = aggregate_params.get("vector_bias", {})
+        regime_cfg = aggregate_params.get("regime_classifier", {})
+        mtf_cfg = aggregate_params.get("multi_timeframe", {})
+        return cls(
+            buy_threshold=float(aggregate_params.get("buy_threshold", 0.2)),
+            sell_threshold=float(aggregate_params.get("sell_threshold", -0.2)),
+            risk_reward_floor=float(aggregate_params.get("risk_reward_floor", 1.2)),
+            base_conf_multiplier=float(aggregate_params.get("base_conf_multiplier", 140.0)),
+            default_mc_trials=int(aggregate_params.get("mc_trials", 2000)),
+            momentum_bias_weight=float(vector_bias_cfg.get("momentum_bias_weight", 0.2)),
+            momentum_alignment_bias=float(vector_bias_cfg.get("momentum_alignment", 0.1)),
+            breakout_slope_weight=float(vector_bias_cfg.get("breakout_slope_weight", 0.1)),
+            vol_mid_bias=float(vector_bias_cfg.get("volatility_mid_bias", 0.05)),
+            vol_high_bias=float(vector_bias_cfg.get("volatility_high_bias", 0.1)),
+            vol_low_bias=float(vector_bias_cfg.get("volatility_low_bias", -0.05)),
+            use_regime_classifier=regime_cfg.get("enabled", False),
+            regime_method=regime_cfg.get("method", "hmm"),
+            regime_exponential_factor=float(regime_cfg.get("exponential_factor", 2.0)),
+            slope_scale=float(mtf_cfg.get("slope_scale", 80.0)),
+            intraday_scale=float(mtf_cfg.get("intraday_scale", 6.0)),
+            ema21_slope_weight=float(mtf_cfg.get("ema21_slope_weight", 0.2)),
+            intraday_momentum_weight=float(mtf_cfg.get("intraday_momentum_weight", 0.15)),
+            alignment_shift=float(mtf_cfg.get("alignment_shift", 0.05)),
+        )
+
+
+@dataclass
+class DailyComponents:
     """
-    Generate trading signal from 1h and 1d dataframes.
-    
-    Args:
-        df_1h: Hourly dataframe
-        df_1d: Daily dataframe
-        mc_trials: Number of Monte Carlo trials (optional)
-        seed: Random seed for deterministic Monte Carlo (optional, will be auto-generated if None)
-    
-    Returns:
-        Dictionary with signal, confidence, entry_range, stop_loss_take_profit, seed, etc.
+    Signal inputs that only depend on the daily frame.
+
+    They stay constant until a new 1d candle closes, so callers replaying many
+    intraday bars (see ``app.quant.precomputed_signals``) can reuse one instance
+    per daily candle. ``trade_plans`` memoizes entry/SL/TP/Monte Carlo results
+    keyed by ``(signal, mc_trials, seed)``.
     """
-    # Validate inputs
+
+    df_1d: pd.DataFrame
+    price: float
+    signals: list[dict[str, Any]]
+    use_regime_classifier: bool
+    regime_proba: Any
+    indicators: dict[str, float]
+    volatility: float
+    trade_plans: dict[tuple[str, int, int | None], dict[str, Any]] = field(default_factory=dict)
+
+
+def validate_signal_inputs(df_1h: pd.DataFrame | None, df_1d: pd.DataFrame | None) -> pd.DataFrame:
+    """Validate inputs and return the hourly frame to use (falls back to 1d data)."""
     if df_1d is None or df_1d.empty:
         raise ValueError("df_1d is required and cannot be empty")
     if df_1h is None or df_1h.empty:
@@ -164,83 +228,206 @@ def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int
             raise ValueError(f"Missing required column '{col}' in df_1d")
         if col not in df_1h.columns:
             raise ValueError(f"Missing required column '{col}' in df_1h")
-    
-    # Generate deterministic seed if not provided
-    if seed is None:
-        # Extract date from latest candle
-        if "open_time" in df_1d.columns:
-            latest_date = df_1d["open_time"].iloc[-1]
-            if hasattr(latest_date, "date"):
-                seed_date = latest_date.date()
-            elif hasattr(latest_date, "strftime"):
-                seed_date = latest_date
-            else:
-                seed_date = str(latest_date)[:10]
+    return df_1h
+
+
+def resolve_seed(df_1d: pd.DataFrame, seed: int | None) -> int:
+    """Return ``seed`` or derive the deterministic (date, symbol) seed from the latest daily candle."""
+    if seed is not None:
+        return seed
+
+    # Extract date from latest candle
+    if "open_time" in df_1d.columns:
+        latest_date = df_1d["open_time"].iloc[-1]
+        if hasattr(latest_date, "date"):
+            seed_date = latest_date.date()
+        elif hasattr(latest_date, "strftime"):
+            seed_date = latest_date
         else:
-            # Fallback: use current date
-            from datetime import datetime
+            seed_date = str(latest_date)[:10]
+    else:
+        # Fallback: use current date
+        from datetime import datetime
 
-            seed_date = datetime.utcnow().date()
+        seed_date = datetime.utcnow().date()
 
-        # Extract symbol from dataframe if available
-        symbol = "BTCUSDT"  # Default
-        if "symbol" in df_1d.columns:
-            symbol = str(df_1d["symbol"].iloc[-1]) if not df_1d["symbol"].empty else "BTCUSDT"
+    # Extract symbol from dataframe if available
+    symbol = "BTCUSDT"  # Default
+    if "symbol" in df_1d.columns:
+        symbol = str(df_1d["symbol"].iloc[-1]) if not df_1d["symbol"].empty else "BTCUSDT"
 
-        # Deterministic seed per (date, symbol) pair
-        seed = generate_deterministic_seed(seed_date, symbol)
+    # Deterministic seed per (date, symbol) pair
+    return generate_deterministic_seed(seed_date, symbol)
 
-    # Calculate indicators
-    ind_1d = ind.calculate_all(df_1d)
-    ind_1h = ind.calculate_all(df_1h)
-    factors = cross_timeframe(df_1h, df_1d, ind_1h, ind_1d)
 
-    aggregate_params = STRATEGY_PARAMS.get("aggregate", {})
-    buy_threshold = float(aggregate_params.get("buy_threshold", 0.2))
-    sell_threshold = float(aggregate_params.get("sell_threshold", -0.2))
-    risk_reward_floor = float(aggregate_params.get("risk_reward_floor", 1.2))
-    base_conf_multiplier = float(aggregate_params.get("base_conf_multiplier", 140.0))
-    default_mc_trials = int(aggregate_params.get("mc_trials", 2000))
-    mc_trials_effective = default_mc_trials if mc_trials is None else mc_trials
-
-    vector_bias_cfg = aggregate_params.get("vector_bias", {})
-    momentum_bias_weight = float(vector_bias_cfg.get("momentum_bias_weight", 0.2))
-    momentum_alignment_bias = float(vector_bias_cfg.get("momentum_alignment", 0.1))
-    breakout_slope_weight = float(vector_bias_cfg.get("breakout_slope_weight", 0.1))
-    vol_mid_bias = float(vector_bias_cfg.get("volatility_mid_bias", 0.05))
-    vol_high_bias = float(vector_bias_cfg.get("volatility_high_bias", 0.1))
-    vol_low_bias = float(vector_bias_cfg.get("volatility_low_bias", -0.05))
-    
-    regime_cfg = aggregate_params.get("regime_classifier", {})
-    use_regime_classifier = regime_cfg.get("enabled", False)
-    regime_method = regime_cfg.get("method", "hmm")
-    regime_exponential_factor = float(regime_cfg.get("exponential_factor", 2.0))
-
-    mtf_cfg = aggregate_params.get("multi_timeframe", {})
-    slope_scale = float(mtf_cfg.get("slope_scale", 80.0))
-    intraday_scale = float(mtf_cfg.get("intraday_scale", 6.0))
-    ema21_slope_weight = float(mtf_cfg.get("ema21_slope_weight", 0.2))
-    intraday_momentum_weight = float(mtf_cfg.get("intraday_momentum_weight", 0.15))
-    alignment_shift = float(mtf_cfg.get("alignment_shift", 0.05))
-
-    s1 = momentum_strategy(df_1d, ind_1d)
-    s2 = mean_reversion_strategy(df_1d, ind_1d)
-    s3 = breakout_strategy(df_1d, ind_1d)
-    s4 = volatility_strategy(df_1d, ind_1d)
-    signals = [s1, s2, s3, s4]
+def build_daily_components(df_1d: pd.DataFrame, ind_1d: dict[str, pd.Series], config: AggregateConfig) -> DailyComponents:
+    """Evaluate the daily strategies, regime probabilities and indicator snapshot."""
+    signals = [
+        momentum_strategy(df_1d, ind_1d),
+        mean_reversion_strategy(df_1d, ind_1d),
+        breakout_strategy(df_1d, ind_1d),
+        volatility_strategy(df_1d, ind_1d),
+    ]
 
-    strat_labels = ["momentum", "mean_reversion", "breakout", "volatility"]
-    
+    use_regime_classifier = config.use_regime_classifier
     regime_proba = None
     if use_regime_classifier:
         try:
-            regime_classifier = RegimeClassifier(method=regime_method, n_regimes=3)
+            regime_classifier = RegimeClassifier(method=config.regime_method, n_regimes=3)
             regime_proba = regime_classifier.fit_predict_proba(df_1d)
             if not regime_proba.empty:
                 regime_proba = regime_proba.iloc[-1]
         except Exception:
             use_regime_classifier = False
-    
+
+    # Use curated volatility if available, otherwise calculate
+    if "volatility_30" in df_1d.columns and not df_1d["volatility_30"].empty:
+        vol = float(df_1d["volatility_30"].iloc[-1])
+    elif "realized_volatility" in df_1d.columns and not df_1d["realized_volatility"].empty:
+        vol = float(df_1d["realized_volatility"].iloc[-1])
+    else:
+        vol_series = ind.realized_volatility(df_1d)
+        vol = float(vol_series.iloc[-1]) if not vol_series.empty else 0.0
+
+    return DailyComponents(
+        df_1d=df_1d,
+        price=float(df_1d["close"].iloc[-1]),
+        signals=signals,
+        use_regime_classifier=use_regime_classifier,
+        regime_proba=regime_proba,
+        indicators=_indicator_snapshot(df_1d, ind_1d),
+        volatility=vol,
+    )
+
+
+def _indicator_snapshot(df_1d: pd.DataFrame, ind_1d: dict[str, pd.Series]) -> dict[str, float]:
+    # Prepare indicators dict (extract last values from Series, handling NaN)
+    indicators_dict = {}
+    for k, v in ind_1d.items():
+        if isinstance(v, pd.Series) and not v.empty:
+            try:
+                val = float(v.iloc[-1])
+                # Skip NaN and Inf values
+                if not (math.isnan(val) or math.isinf(val)):
+                    indicators_dict[k] = val
+            except (ValueError, IndexError, TypeError):
+                pass
+        elif isinstance(v, (int, float)):
+            val = float(v)
+            if not (math.isnan(val) or math.isinf(val)):
+                indicators_dict[k] = val
+
+    # Add volume to indicators for narrative
+    if "volume" in df_1d.columns and not df_1d["volume"].empty:
+        try:
+            vol_val = float(df_1d["volume"].iloc[-1])
+            if not (math.isnan(vol_val) or math.isinf(vol_val)):
+                indicators_dict["volume"] = vol_val
+        except (ValueError, IndexError, TypeError):
+            pass
+
+    # Alias curated-friendly keys for narrative/analytics
+    if "rsi" in indicators_dict and "rsi_14" not in indicators_dict:
+        indicators_dict["rsi_14"] = indicators_dict["rsi"]
+    if "atr" in indicators_dict and "atr_14" not in indicators_dict:
+        indicators_dict["atr_14"] = indicators_dict["atr"]
+    if "realized_vol" in indicators_dict and "volatility_30" not in indicators_dict:
+        indicators_dict["volatility_30"] = indicators_dict["realized_vol"]
+    return indicators_dict
+
+
+def _trade_plan(daily: DailyComponents, signal: str, config: AggregateConfig, mc_trials: int, seed: int | None) -> dict[str, Any]:
+    """Entry range, SL/TP, risk/reward filter and Monte Carlo confidence for ``signal`` (memoized per day)."""
+    key = (signal, mc_trials, seed)
+    cached = daily.trade_plans.get(key)
+    if cached is not None:
+        return cached
+
+    df_1d = daily.df_1d
+    price = daily.price
+    final_signal = signal
+    entry = _entry_range(df_1d, final_signal, price)
+    levels = _sl_tp(df_1d, final_signal, entry["optimal"])
+
+    support_raw = df_1d["support"].iloc[-1] if "support" in df_1d else np.nan
+    resistance_raw = df_1d["resistance"].iloc[-1] if "resistance" in df_1d else np.nan
+    support = float(support_raw) if not pd.isna(support_raw) else entry["min"]
+    resistance = float(resistance_raw) if not pd.isna(resistance_raw) else entry["max"]
+
+    if final_signal == "BUY":
+        levels["stop_loss"] = max(levels["stop_loss"], support * 0.99)
+        min_tp = max(entry["optimal"] + abs(entry["optimal"] - levels["stop_loss"]) * 1.2, resistance * 0.99)
+        if levels["take_profit"] <= min_tp:
+            levels["take_profit"] = min_tp
+    elif final_signal == "SELL":
+        levels["stop_loss"] = min(levels["stop_loss"], resistance * 1.01)
+        max_tp = min(entry["optimal"] - abs(levels["stop_loss"] - entry["optimal"]) * 1.2, support * 1.01)
+        if levels["take_profit"] >= max_tp:
+            levels["take_profit"] = max_tp
+
+    risk = 0.0
+    reward = 0.0
+    if final_signal == "BUY":
+        risk = entry["optimal"] - levels["stop_loss"]
+        reward = levels["take_profit"] - entry["optimal"]
+    elif final_signal == "SELL":
+        risk = levels["stop_loss"] - entry["optimal"]
+        reward = entry["optimal"] - levels["take_profit"]
+
+    rr_ratio = abs(reward / risk) if risk else 0.0
+    rr_rejected = False
+    if final_signal in {"BUY", "SELL"}:
+        if risk <= 0 or reward <= 0:
+            rr_rejected = True
+        elif rr_ratio < config.risk_reward_floor:
+            rr_rejected = True
+
+    if rr_rejected:
+        final_signal = "HOLD"
+        entry = _entry_range(df_1d, final_signal, price)
+        levels = _sl_tp(df_1d, final_signal, entry["optimal"])
+        risk = 0.0
+        reward = 0.0
+
+    mc_conf = None
+    if final_signal in {"BUY", "SELL"} and mc_trials > 0:
+        mc_conf = _mc_confidence(df_1d, entry["optimal"], levels["stop_loss"], levels["take_profit"], trials=mc_trials, seed=seed)
+
+    plan = {
+        "signal": final_signal,
+        "entry": entry,
+        "levels": levels,
+        "risk": risk,
+        "reward": reward,
+        "rr_ratio": rr_ratio,
+        "rr_rejected": rr_rejected,
+        "mc_confidence": mc_conf,
+    }
+    daily.trade_plans[key] = plan
+    return plan
+
+
+def assemble_signal(
+    daily: DailyComponents,
+    factors: dict[str, Any],
+    config: AggregateConfig,
+    *,
+    mc_trials: int | None,
+    seed: int | None,
+) -> dict[str, Any]:
+    """Combine daily components and cross-timeframe factors into the signal payload."""
+    mc_trials_effective = config.default_mc_trials if mc_trials is None else mc_trials
+    momentum_bias_weight = config.momentum_bias_weight
+    momentum_alignment_bias = config.momentum_alignment_bias
+    vol_mid_bias = config.vol_mid_bias
+    vol_high_bias = config.vol_high_bias
+    vol_low_bias = config.vol_low_bias
+    use_regime_classifier = daily.use_regime_classifier
+    regime_proba = daily.regime_proba
+    signals = [dict(strat) for strat in daily.signals]
+
+    strat_labels = ["momentum", "mean_reversion", "breakout", "volatility"]
+
     signal_vectors = []
     for label, strat in zip(strat_labels, signals):
         direction = {"BUY": 1.0, "SELL": -1.0}.get(strat["signal"], 0.0)
@@ -256,11 +443,11 @@ def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int
         elif label == "mean_reversion":
             bias = -momentum_alignment_bias * alignment_flag
         elif label == "breakout":
-            bias = breakout_slope_weight * np.tanh(factors.get("slope_1d", 0.0) * 50.0)
+            bias = config.breakout_slope_weight * np.tanh(factors.get("slope_1d", 0.0) * 50.0)
             if use_regime_classifier and regime_proba is not None:
                 p_stress = regime_proba.get("stress", 0.0) if isinstance(regime_proba, pd.Series) else 0.0
                 p_high_vol = p_stress
-                adaptive_weight = np.exp(regime_exponential_factor * p_high_vol)
+                adaptive_weight = np.exp(config.regime_exponential_factor * p_high_vol)
                 bias *= adaptive_weight
         elif label == "volatility":
             if use_regime_classifier and regime_proba is not None:
@@ -279,11 +466,12 @@ def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int
         signal_vectors.append(direction * (strength * quality + bias))
 
     multi_bias = 0.0
-    slope_component = ema21_slope_weight * np.tanh(factors.get("slope_1h", 0.0) * slope_scale)
-    ratio_component = 0.5 * ema21_slope_weight * np.tanh(factors.get("slope_ratio", 0.0) * slope_scale / 10.0)
-    intraday_component = intraday_momentum_weight * np.tanh(factors.get("mom_1h", 0.0) * intraday_scale)
-    alignment_component = alignment_shift * (1.0 if factors.get("momentum_alignment", 0.0) >= 0.5 else -1.0)
-    
+    ema21_slope_weight = config.ema21_slope_weight
+    slope_component = ema21_slope_weight * np.tanh(factors.get("slope_1h", 0.0) * config.slope_scale)
+    ratio_component = 0.5 * ema21_slope_weight * np.tanh(factors.get("slope_ratio", 0.0) * config.slope_scale / 10.0)
+    intraday_component = config.intraday_momentum_weight * np.tanh(factors.get("mom_1h", 0.0) * config.intraday_scale)
+    alignment_component = config.alignment_shift * (1.0 if factors.get("momentum_alignment", 0.0) >= 0.5 else -1.0)
+
     if use_regime_classifier and regime_proba is not None:
         p_calm = regime_proba.get("calm", 0.33) if isinstance(regime_proba, pd.Series) else 0.33
         p_balanced = regime_proba.get("balanced", 0.33) if isinstance(regime_proba, pd.Series) else 0.33
@@ -298,90 +486,48 @@ def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int
             vol_component = vol_mid_bias * 0.5
         else:
             vol_component = vol_low_bias * 0.5
-    
+
     multi_bias = slope_component + ratio_component + intraday_component + alignment_component + vol_component
     signal_vectors.append(multi_bias)
     strat_labels.append("multi_timeframe")
 
     aggregate_score = float(np.sum(signal_vectors))
     raw_aggregate_score = float(aggregate_score)
-    if aggregate_score > buy_threshold:
+    if aggregate_score > config.buy_threshold:
         final_signal = "BUY"
-    elif aggregate_score < sell_threshold:
+    elif aggregate_score < config.sell_threshold:
         final_signal = "SELL"
     else:
         final_signal = "HOLD"
 
-    base_conf = min(95.0, abs(aggregate_score) * base_conf_multiplier)
+    base_conf = min(95.0, abs(aggregate_score) * config.base_conf_multiplier)
     agreement = np.clip(np.mean([abs(s) for s in signal_vectors]) * 100.0, 0.0, 100.0)
 
     votes = {"BUY": 0, "SELL": 0, "HOLD": 0}
     for strat in signals:
         votes[strat["signal"]] += 1
 
-    price = float(df_1d["close"].iloc[-1])
-    entry = _entry_range(df_1d, final_signal, price)
-    levels = _sl_tp(df_1d, final_signal, entry["optimal"])
-
-    support_raw = df_1d["support"].iloc[-1] if "support" in df_1d else np.nan
-    resistance_raw = df_1d["resistance"].iloc[-1] if "resistance" in df_1d else np.nan
-    support = float(support_raw) if not pd.isna(support_raw) else entry["min"]
-    resistance = float(resistance_raw) if not pd.isna(resistance_raw) else entry["max"]
-
-    if final_signal == "BUY":
-        levels["stop_loss"] = max(levels["stop_loss"], support * 0.99)
-        min_tp = max(entry["optimal"] + abs(entry["optimal"] - levels["stop_loss"]) * 1.2, resistance * 0.99)
-        if levels["take_profit"] <= min_tp:
-            levels["take_profit"] = min_tp
-    elif final_signal == "SELL":
-        levels["stop_loss"] = min(levels["stop_loss"], resistance * 1.01)
-        max_tp = min(entry["optimal"] - abs(levels["stop_loss"] - entry["optimal"]) * 1.2, support * 1.01)
-        if levels["take_profit"] >= max_tp:
-            levels["take_profit"] = max_tp
-
-    risk = 0.0
-    reward = 0.0
-    if final_signal == "BUY":
-        risk = entry["optimal"] - levels["stop_loss"]
-        reward = levels["take_profit"] - entry["optimal"]
-    elif final_signal == "SELL":
-        risk = levels["stop_loss"] - entry["optimal"]
-        reward = entry["optimal"] - levels["take_profit"]
-
-    rr_ratio = abs(reward / risk) if risk else 0.0
-    rr_rejected = False
-    if final_signal in {"BUY", "SELL"}:
-        if risk <= 0 or reward <= 0:
-            rr_rejected = True
-        elif rr_ratio < risk_reward_floor:
-            rr_rejected = True
+    price = daily.price
+    plan = _trade_plan(daily, final_signal, config, mc_trials_effective, seed)
+    final_signal = plan["signal"]
+    entry = dict(plan["entry"])
+    levels = dict(plan["levels"])
+    risk = plan["risk"]
+    reward = plan["reward"]
+    rr_ratio = plan["rr_ratio"]
+    rr_rejected = plan["rr_rejected"]
 
     if rr_rejected:
-        final_signal = "HOLD"
         aggregate_score = float(np.clip(aggregate_score, -0.05, 0.05))
-        entry = _entry_range(df_1d, final_signal, price)
-        levels = _sl_tp(df_1d, final_signal, entry["optimal"])
-        risk = 0.0
-        reward = 0.0
 
-    if final_signal in {"BUY", "SELL"} and mc_trials_effective > 0:
-        mc_conf = _mc_confidence(df_1d, entry["optimal"], levels["stop_loss"], levels["take_profit"], trials=mc_trials_effective, seed=seed)
-    else:
-        mc_conf = base_conf
+    mc_conf = plan["mc_confidence"] if plan["mc_confidence"] is not None else base_conf
 
     # Calculate risk metrics
     sl_prob = max(0.0, 100.0 - mc_conf)
     tp_prob = np.clip(mc_conf, 0.0, 100.0)
 
     expected_dd = abs(entry["optimal"] - levels["stop_loss"])
-    # Use curated volatility if available, otherwise calculate
-    if "volatility_30" in df_1d.columns and not df_1d["volatility_30"].empty:
-        vol = float(df_1d["volatility_30"].iloc[-1])
-    elif "realized_volatility" in df_1d.columns and not df_1d["realized_volatility"].empty:
-        vol = float(df_1d["realized_volatility"].iloc[-1])
-    else:
-        vol_series = ind.realized_volatility(df_1d)
-        vol = float(vol_series.iloc[-1]) if not vol_series.empty else 0.0
+    vol = daily.volatility
 
     risk_metrics = {
         "risk_reward_ratio": round(rr_ratio, 2),
@@ -391,7 +537,7 @@ def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int
         "volatility": round(vol, 2),
         "risk": round(risk, 2),
         "reward": round(reward, 2),
-        "risk_reward_floor": risk_reward_floor,
+        "risk_reward_floor": config.risk_reward_floor,
     }
     if rr_rejected:
         risk_metrics["risk_reward_ratio"] = round(rr_ratio, 2)
@@ -405,40 +551,6 @@ def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int
     else:
         final_conf = float(np.clip(max(base_conf * 0.6, 5.0), 5.0, 60.0))
 
-    # Prepare indicators dict (extract last values from Series, handling NaN)
-    import math
-    indicators_dict = {}
-    for k, v in ind_1d.items():
-        if isinstance(v, pd.Series) and not v.empty:
-            try:
-                val = float(v.iloc[-1])
-                # Skip NaN and Inf values
-                if not (math.isnan(val) or math.isinf(val)):
-                    indicators_dict[k] = val
-            except (ValueError, IndexError, TypeError):
-                pass
-        elif isinstance(v, (int, float)):
-            val = float(v)
-            if not (math.isnan(val) or math.isinf(val)):
-                indicators_dict[k] = val
-
-    # Add volume to indicators for narrative
-    if "volume" in df_1d.columns and not df_1d["volume"].empty:
-        try:
-            vol_val = float(df_1d["volume"].iloc[-1])
-            if not (math.isnan(vol_val) or math.isinf(vol_val)):
-                indicators_dict["volume"] = vol_val
-        except (ValueError, IndexError, TypeError):
-            pass
-
-    # Alias curated-friendly keys for narrative/analytics
-    if "rsi" in indicators_dict and "rsi_14" not in indicators_dict:
-        indicators_dict["rsi_14"] = indicators_dict["rsi"]
-    if "atr" in indicators_dict and "atr_14" not in indicators_dict:
-        indicators_dict["atr_14"] = indicators_dict["atr"]
-    if "realized_vol" in indicators_dict and "volatility_30" not in indicators_dict:
-        indicators_dict["volatility_30"] = indicators_dict["realized_vol"]
-
     payload = {
         "signal": final_signal,
         "entry_range": entry,
@@ -446,7 +558,7 @@ def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int
         "confidence": round(final_conf, 1),
         "current_price": round(price, 2),
         "factors": factors,
-        "indicators": indicators_dict,
+        "indicators": dict(daily.indicators),
         "risk_metrics": risk_metrics,
         "votes": votes,
         "signals": signals,
@@ -468,6 +580,32 @@ def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int
     return payload
 
 
+def generate_signal(df_1h: pd.DataFrame, df_1d: pd.DataFrame, *, mc_trials: int | None = None, seed: int | None = None) -> dict[str, Any]:
+    """
+    Generate trading signal from 1h and 1d dataframes.
+    
+    Args:
+        df_1h: Hourly dataframe
+        df_1d: Daily dataframe
+        mc_trials: Number of Monte Carlo trials (optional)
+        seed: Random seed for deterministic Monte Carlo (optional, will be auto-generated if None)
+    
+    Returns:
+        Dictionary with signal, confidence, entry_range, stop_loss_take_profit, seed, etc.
+    """
+    df_1h = validate_signal_inputs(df_1h, df_1d)
+    seed = resolve_seed(df_1d, seed)
+
+    # Calculate indicators
+    ind_1d = ind.calculate_all(df_1d)
+    ind_1h = ind.calculate_all(df_1h)
+    factors = cross_timeframe(df_1h, df_1d, ind_1h, ind_1d)
+
+    config = AggregateConfig.from_params()
+    daily = build_daily_components(df_1d, ind_1d, config)
+    return assemble_signal(daily, factors, config, mc_trials=mc_trials, seed=seed)
+
+
 class DailySignalEngine:
     """
     Unified signal engine that consolidates strategies, filters, and guardrails.
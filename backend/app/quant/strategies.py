@@ -5,12 +5,14 @@ from typing import Any, Literal
 
 import pandas as pd
 
-from app.quant.config_manager import get_signal_params
+from app.quant.config_manager import active_signal_params, get_signal_config_manager, get_signal_params
 
 Signal = Literal["BUY", "SELL", "HOLD"]
 
-# Load params using config manager for versioning support
+# Base params as loaded from params.yaml; strategies read active_signal_params()
+# at call time so signal_params_override() applies without reloading this module
 PARAMS = get_signal_params()
+PARAMS_PATH = get_signal_config_manager().config_path
 
 
 def momentum_strategy(df: pd.DataFrame, ind: dict[str, pd.Series]) -> dict[str, Any]:
@@ -27,7 +29,7 @@ def momentum_strategy(df: pd.DataFrame, ind: dict[str, pd.Series]) -> dict[str,
     price = df["close"].iloc[-1]
     buy = price > ema9.iloc[-1] > ema21.iloc[-1] > ema50.iloc[-1] > sma200.iloc[-1] and macd.iloc[-1] > macd_sig.iloc[-1]
     sell = price < ema9.iloc[-1] < ema21.iloc[-1] < ema50.iloc[-1] < sma200.iloc[-1] and macd.iloc[-1] < macd_sig.iloc[-1]
-    momentum_params = PARAMS.get("momentum", {})
+    momentum_params = active_signal_params().get("momentum", {})
     confidence_buy = float(momentum_params.get("confidence_buy", 65.0))
     confidence_sell = float(momentum_params.get("confidence_sell", 65.0))
     confidence_hold = float(momentum_params.get("confidence_hold", 30.0))
@@ -47,7 +49,7 @@ def mean_reversion_strategy(df: pd.DataFrame, ind: dict[str, pd.Series]) -> dict
     if any(s.empty for s in [rsi, bb_u, bb_l]):
         return {"signal": "HOLD", "confidence": 0.0, "reason": "missing_indicators"}
     price = df["close"].iloc[-1]
-    mean_params = PARAMS.get("mean_reversion", {})
+    mean_params = active_signal_params().get("mean_reversion", {})
     rsi_buy = float(mean_params.get("rsi_buy", 30))
     rsi_sell = float(mean_params.get("rsi_sell", 70))
     confidence_buy = float(mean_params.get("confidence_buy", 55.0))
@@ -61,7 +63,7 @@ def mean_reversion_strategy(df: pd.DataFrame, ind: dict[str, pd.Series]) -> dict
 
 
 def breakout_strategy(df: pd.DataFrame, ind: dict[str, pd.Series]) -> dict[str, Any]:
-    breakout_params = PARAMS.get("breakout", {})
+    breakout_params = active_signal_params().get("breakout", {})
     lookback = int(breakout_params.get("lookback", 20))
     volume_multiple = float(breakout_params.get("volume_multiple", 1.5))
     confidence_buy = float(breakout_params.get("confidence_buy", 60.0))
@@ -89,7 +91,7 @@ def volatility_strategy(df: pd.DataFrame, ind: dict[str, pd.Series]) -> dict[str
     a = ind.get("atr", pd.Series())
     if any(s.empty for s in [rv, a]):
         return {"signal": "HOLD", "confidence": 0.0, "reason": "missing_indicators"}
-    vol_params = PARAMS.get("volatility", {})
+    vol_params = active_signal_params().get("volatility", {})
     low_threshold = float(vol_params.get("low_threshold", 0.2))
     high_threshold = float(vol_params.get("high_threshold", 0.5))
     confidence_low = float(vol_params.get("confidence_low", 35.0))
@@ -0,0 +1,165 @@
+"""
+Batched SL/TP grid evaluation.
+
+``StopLossTakeProfitOptimizer`` scores every parameter combination against the
+same trades. Instead of replaying the trades once per combination, the trade
+columns are extracted once into ``TradeArrays`` and ``evaluate_grid`` scores
+the whole grid as a ``(combinations, trades)`` matrix: outcomes in R multiples,
+the cumulative R equity curve and its drawdown, and the summary metrics per
+combination, all with broadcast numpy operations.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+# Defaults used when a combination omits a parameter
+PARAM_DEFAULTS: dict[str, float] = {
+    "atr_multiplier_sl": 1.5,
+    "atr_multiplier_tp": 2.0,
+    "tp_ratio": 2.0,
+    "breakeven_buffer_pct": 0.0,
+}
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray | None:
+    if name not in df.columns:
+        return None
+    return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class TradeArrays:
+    """Per-trade ATR, MAE, MFE and realized PnL, aligned with the source frame rows."""
+
+    atr: np.ndarray
+    mae: np.ndarray
+    mfe: np.ndarray
+    pnl: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> TradeArrays:
+        """
+        Extract the arrays from a trades frame.
+
+        ATR comes from ``atr``, falling back to ``atr_14`` where it is missing or
+        zero; trades without a positive ATR are ignored by ``evaluate_grid``.
+        Missing ``mae``/``mfe`` default to the ATR and missing ``pnl`` to zero.
+        """
+        rows = len(df)
+        atr = _column(df, "atr")
+        fallback = _column(df, "atr_14")
+        if atr is None:
+            atr = fallback if fallback is not None else np.zeros(rows)
+        elif fallback is not None:
+            atr = np.where(np.isnan(atr) | (atr == 0), fallback, atr)
+        atr = np.nan_to_num(atr, nan=0.0)
+
+        mae = _column(df, "mae")
+        mfe = _column(df, "mfe")
+        pnl = _column(df, "pnl")
+        return cls(
+            atr=atr,
+            mae=np.abs(mae) if mae is not None else atr,
+            mfe=np.abs(mfe) if mfe is not None else atr,
+            pnl=pnl if pnl is not None else np.zeros(rows),
+        )
+
+    def __len__(self) -> int:
+        return len(self.atr)
+
+    def subset(self, mask: np.ndarray) -> TradeArrays:
+        """Trades selected by a boolean mask (or index array) over these arrays."""
+        return TradeArrays(atr=self.atr[mask], mae=self.mae[mask], mfe=self.mfe[mask], pnl=self.pnl[mask])
+
+
+@dataclass(frozen=True)
+class GridMetrics:
+    """Metrics per combination (one array element per combination)."""
+
+    calmar: np.ndarray
+    profit_factor: np.ndarray
+    hit_rate: np.ndarray
+    avg_rr: np.ndarray
+    expectancy_r: np.ndarray
+    max_drawdown: np.ndarray
+    rr: np.ndarray  # (combinations, trades) reward/risk per trade
+
+    def __len__(self) -> int:
+        return len(self.calmar)
+
+
+def param_matrix(combos: Sequence[dict[str, float]]) -> dict[str, np.ndarray]:
+    """Column vectors ``(combinations, 1)`` of each parameter, defaults filled in."""
+    return {
+        key: np.array([float(combo.get(key, default)) for combo in combos], dtype=np.float64)[:, None]
+        for key, default in PARAM_DEFAULTS.items()
+    }
+
+
+def evaluate_grid(trades: TradeArrays, combos: Sequence[dict[str, float]], *, rr_floor: float) -> GridMetrics:
+    """
+    Score every combination in ``combos`` against ``trades`` at once.
+
+    A trade that touches both levels counts as whichever it reached relatively
+    further; one that touches neither keeps its realized PnL in R. The equity
+    curve is ``1 + cumulative R``.
+    """
+    params = param_matrix(combos)
+    n_combos = len(combos)
+    trades = trades.subset(trades.atr > 0)
+    if len(trades) == 0:
+        zeros = np.zeros(n_combos)
+        return GridMetrics(zeros, zeros, zeros, zeros, zeros, zeros, np.zeros((n_combos, 0)))
+
+    atr, mae, mfe, pnl = trades.atr[None, :], trades.mae[None, :], trades.mfe[None, :], trades.pnl[None, :]
+    sl = np.maximum(atr * params["atr_multiplier_sl"], 1e-8)
+    reward = np.maximum(atr * params["atr_multiplier_tp"] * params["tp_ratio"], sl * rr_floor)
+    rr = reward / sl
+
+    hit_sl = mae >= sl
+    hit_tp = mfe >= reward
+    sl_first = (mae / sl) <= (mfe / reward)
+    outcome = np.where(
+        hit_sl & hit_tp,
+        np.where(sl_first, -1.0, rr),
+        np.where(hit_sl, -1.0, np.where(hit_tp, rr, pnl / sl)),
+    )
+    buffer = params["breakeven_buffer_pct"]
+    protected = (buffer > 0) & hit_tp & (mfe >= buffer * reward)
+    outcome = np.where(protected, np.maximum(outcome, 0.0), outcome)
+
+    gains = np.where(outcome > 0, outcome, 0.0).sum(axis=1)
+    losses = -np.where(outcome < 0, outcome, 0.0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit_factor = np.where(losses == 0, np.inf, gains / losses)
+
+    equity = 1.0 + np.cumsum(outcome, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        underwater = equity / np.maximum.accumulate(equity, axis=1) - 1.0
+    # fmin skips the NaN of a zero peak, like the pandas min it replaces
+    max_drawdown = np.abs(np.fmin.reduce(underwater, axis=1))
+
+    return GridMetrics(
+        calmar=_calmar(equity, max_drawdown),
+        profit_factor=profit_factor,
+        hit_rate=(outcome > 0).mean(axis=1),
+        avg_rr=rr.mean(axis=1),
+        expectancy_r=outcome.mean(axis=1),
+        max_drawdown=max_drawdown,
+        rr=rr,
+    )
+
+
+def _calmar(equity: np.ndarray, max_drawdown: np.ndarray) -> np.ndarray:
+    n_combos, n_trades = equity.shape
+    if n_trades < 2:
+        return np.zeros(n_combos)
+    years = max(n_trades / 252.0, 1e-6)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        total_return = equity[:, -1] / equity[:, 0] - 1.0
+        cagr = np.where(total_return >= -0.99, np.abs(1.0 + total_return) ** (1.0 / years) - 1.0, -1.0)
+        return np.where(max_drawdown == 0, np.where(cagr > 0, np.inf, 0.0), cagr / max_drawdown)
@@ -11,10 +11,10 @@ from typing import Any, Iterable
 
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import ParameterGrid
 
 from app.core.logging import logger
 from app.quant.regime import RegimeClassifier
+from app.risk.sl_tp_grid import GridMetrics, TradeArrays, evaluate_grid
 
 
 DEFAULT_SEARCH_SPACE: dict[str, list[float]] = {
@@ -133,6 +133,9 @@ class StopLossTakeProfitOptimizer:
                 logger.warning("Regime column missing; defaulting to 'unknown'")
                 df[regime_col] = "unknown"
 
+        space = search_space or DEFAULT_SEARCH_SPACE
+        combos = self._generate_search_combinations(space, method)
+
         configs: dict[str, Any] = {}
         regimes = df[regime_col].dropna().unique()
         for regime in regimes:
@@ -145,20 +148,19 @@ class StopLossTakeProfitOptimizer:
             if not windows:
                 continue
 
-            space = search_space or DEFAULT_SEARCH_SPACE
-            combos = self._generate_search_combinations(space, method)
+            # Trade columns are extracted once; windows select rows by mask
+            trade_arrays = TradeArrays.from_frame(regime_df)
+            timestamps = regime_df[timestamp_col]
 
             window_results: list[WindowConfig] = []
             for window in windows:
-                train_mask = (regime_df[timestamp_col] >= window["train_start"]) & (regime_df[timestamp_col] < window["train_end"])
-                test_mask = (regime_df[timestamp_col] >= window["test_start"]) & (regime_df[timestamp_col] < window["test_end"])
-                train_df = regime_df.loc[train_mask].reset_index(drop=True)
-                test_df = regime_df.loc[test_mask].reset_index(drop=True)
-                if train_df.empty or test_df.empty:
+                train_mask = ((timestamps >= window["train_start"]) & (timestamps < window["train_end"])).to_numpy()
+                test_mask = ((timestamps >= window["test_start"]) & (timestamps < window["test_end"])).to_numpy()
+                if not train_mask.any() or not test_mask.any():
                     continue
 
-                best_params, train_metrics = self._search_params(train_df, combos)
-                test_metrics = self._evaluate_params(test_df, best_params)
+                best_params, train_metrics = self._search_params(trade_arrays.subset(train_mask), combos)
+                test_metrics = self._evaluate_params(trade_arrays.subset(test_mask), best_params)
                 window_results.append(
                     WindowConfig(
                         index=window["index"],
@@ -294,6 +296,8 @@ class StopLossTakeProfitOptimizer:
     def _generate_search_combinations(self, space: dict[str, Iterable[float]], method: str) -> list[dict[str, float]]:
         """Generate hyperparameter combinations."""
         if method == "grid":
+            from sklearn.model_selection import ParameterGrid
+
             grid = list(ParameterGrid(space))
             return [self._sanitize_params(combo) for combo in grid]
         # Simple adaptive random search acting as Bayesian-lite fallback
@@ -310,119 +314,40 @@ class StopLossTakeProfitOptimizer:
     def _sanitize_params(params: dict[str, Any]) -> dict[str, float]:
         return {k: float(v) for k, v in params.items()}
 
-    def _search_params(self, df: pd.DataFrame, combos: list[dict[str, float]]) -> tuple[dict[str, float], OptimizationMetrics]:
-        """Search over parameter combinations and pick the best by score."""
-        best_score = -np.inf
-        best_params: dict[str, float] = {}
-        best_metrics: OptimizationMetrics | None = None
-        for params in combos:
-            metrics = self._evaluate_params(df, params)
-            score = self._score(metrics)
-            if score > best_score:
-                best_score = score
-                best_params = params
-                best_metrics = metrics
-        if best_metrics is None:
+    def _search_params(
+        self, trades: TradeArrays, combos: list[dict[str, float]]
+    ) -> tuple[dict[str, float], OptimizationMetrics]:
+        """Score every parameter combination at once and pick the best by score."""
+        if not combos:
             raise RuntimeError("Failed to evaluate any parameter combination")
-        return best_params, best_metrics
+        grid = evaluate_grid(trades, combos, rr_floor=self.rr_floor)
+        scores = self._score(grid)
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        best = int(np.argmax(scores))
+        if scores[best] == -np.inf:
+            raise RuntimeError("Failed to evaluate any parameter combination")
+        return combos[best], self._grid_metrics(grid, best)
 
-    def _evaluate_params(self, df: pd.DataFrame, params: dict[str, float]) -> OptimizationMetrics:
+    def _evaluate_params(self, trades: TradeArrays, params: dict[str, float]) -> OptimizationMetrics:
         """Evaluate performance of a parameter combination."""
-        pnl_r: list[float] = []
-        rr_values: list[float] = []
-        drawdown_curve: list[float] = []
-
-        for _, row in df.iterrows():
-            atr = float(row.get("atr") or row.get("atr_14") or 0.0)
-            if atr <= 0:
-                continue
-            entry_price = float(row.get("entry_price") or row.get("entry"))
-            direction = str(row.get("direction") or row.get("side") or "BUY").upper()
-            mae = abs(float(row.get("mae", atr)))
-            mfe = abs(float(row.get("mfe", atr)))
-            pnl_realized = float(row.get("pnl", 0.0))
-
-            sl_distance = max(atr * params.get("atr_multiplier_sl", 1.5), 1e-8)
-            tp_distance = atr * params.get("atr_multiplier_tp", 2.0)
-            tp_ratio = params.get("tp_ratio", 2.0)
-            reward_distance = max(tp_distance * tp_ratio, sl_distance * self.rr_floor)
-
-            breakeven_buffer = params.get("breakeven_buffer_pct", 0.0)
-            rr = reward_distance / sl_distance if sl_distance else 0.0
-            rr_values.append(rr)
-
-            hit_sl = mae >= sl_distance
-            hit_tp = mfe >= reward_distance
-
-            outcome_r: float
-            if hit_sl and hit_tp:
-                mae_ratio = mae / sl_distance
-                mfe_ratio = mfe / reward_distance
-                outcome_r = -1.0 if mae_ratio <= mfe_ratio else rr
-            elif hit_sl:
-                outcome_r = -1.0
-            elif hit_tp:
-                outcome_r = rr
-            else:
-                outcome_r = (pnl_realized / sl_distance) if sl_distance else 0.0
-
-            if breakeven_buffer > 0 and hit_tp and mfe >= breakeven_buffer * reward_distance:
-                outcome_r = max(outcome_r, 0.0)
-
-            pnl_r.append(outcome_r)
-            equity = 1.0 + float(np.sum(pnl_r))
-            drawdown_curve.append(equity)
+        return self._grid_metrics(evaluate_grid(trades, [params], rr_floor=self.rr_floor), 0)
 
-        if not pnl_r:
+    @staticmethod
+    def _grid_metrics(grid: GridMetrics, index: int) -> OptimizationMetrics:
+        if grid.rr.shape[1] == 0:
             return OptimizationMetrics(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, [])
-
-        hit_rate = float(np.mean([1.0 if x > 0 else 0.0 for x in pnl_r]))
-        expectancy = float(np.mean(pnl_r))
-        profit_factor = self._profit_factor(pnl_r)
-        calmar = self._calmar_ratio(drawdown_curve)
-        max_dd = self._max_drawdown(drawdown_curve)
-
         return OptimizationMetrics(
-            calmar=calmar,
-            profit_factor=profit_factor,
-            hit_rate=hit_rate,
-            avg_rr=float(np.mean(rr_values)) if rr_values else 0.0,
-            expectancy_r=expectancy,
-            max_drawdown=max_dd,
-            rr_distribution=rr_values,
+            calmar=float(grid.calmar[index]),
+            profit_factor=float(grid.profit_factor[index]),
+            hit_rate=float(grid.hit_rate[index]),
+            avg_rr=float(grid.avg_rr[index]),
+            expectancy_r=float(grid.expectancy_r[index]),
+            max_drawdown=float(grid.max_drawdown[index]),
+            rr_distribution=grid.rr[index].tolist(),
         )
 
     @staticmethod
-    def _profit_factor(pnl: list[float]) -> float:
-        profits = sum(x for x in pnl if x > 0)
-        losses = -sum(x for x in pnl if x < 0)
-        if losses == 0:
-            return float("inf")
-        return profits / losses if losses else 0.0
-
-    @staticmethod
-    def _max_drawdown(curve: list[float]) -> float:
-        if not curve:
-            return 0.0
-        series = pd.Series(curve)
-        running_max = series.cummax()
-        drawdowns = (series / running_max) - 1.0
-        return abs(float(drawdowns.min()))
-
-    def _calmar_ratio(self, curve: list[float]) -> float:
-        if len(curve) < 2:
-            return 0.0
-        series = pd.Series(curve)
-        total_return = series.iloc[-1] / series.iloc[0] - 1.0
-        years = max(len(series) / 252.0, 1e-6)
-        cagr = (1.0 + total_return) ** (1.0 / years) - 1.0 if total_return >= -0.99 else -1.0
-        max_dd = self._max_drawdown(curve)
-        if max_dd == 0:
-            return float("inf") if cagr > 0 else 0.0
-        return float(cagr / max_dd)
-
-    @staticmethod
-    def _score(metrics: OptimizationMetrics) -> float:
+    def _score(metrics: OptimizationMetrics | GridMetrics) -> float | np.ndarray:
         calmar_component = metrics.calmar
         pf_component = metrics.profit_factor
         expectancy_component = metrics.expectancy_r * 2.0
@@ -18,7 +18,7 @@ def main(interval: str, since: datetime | None, until: datetime | None) -> None:
     curation = DataCuration()
 
     async def _run() -> None:
-        await ingestion.ingest_timeframe(interval, start=since, end=until)
+        await ingestion.ingest_timeframe(interval, start=since, end=until, paginate=True)
         curation.curate_interval(interval)
 
     asyncio.run(_run())
@@ -0,0 +1,50 @@
+"""CLI script for compacting partitioned order book snapshots."""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.logging import logger  # noqa: E402
+from app.data.orderbook import OrderBookRepository  # noqa: E402
+from app.data.orderbook_partitions import partitioned_symbols  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compact appended order book parts into one file per partition")
+    parser.add_argument("--venue", default=None, help="Only compact this venue (default: all)")
+    parser.add_argument("--symbol", default=None, help="Only compact this symbol (default: all)")
+    parser.add_argument("--partition", action="append", dest="partitions", help="Partition key to compact (repeatable)")
+    parser.add_argument("--min-parts", type=int, default=2, help="Skip partitions with fewer parts (default: 2)")
+    args = parser.parse_args()
+
+    targets = [
+        (venue, symbol)
+        for venue, symbol in partitioned_symbols()
+        if (args.venue is None or venue == args.venue) and (args.symbol is None or symbol == args.symbol)
+    ]
+    if not targets:
+        logger.info("No partitioned order book data found")
+        return 0
+
+    failures = 0
+    for venue, symbol in targets:
+        try:
+            result = OrderBookRepository(venue=venue).compact(symbol, min_parts=args.min_parts, partitions=args.partitions)
+        except Exception as exc:
+            failures += 1
+            logger.error(f"✗ Failed to compact {venue}/{symbol}: {exc}")
+            continue
+        if result.get("status") == "ok":
+            logger.info(
+                f"✓ Compacted {venue}/{symbol}: {result['parts_removed']} parts -> "
+                f"{len(result['partitions'])} partitions ({result['rows']} rows)"
+            )
+        else:
+            logger.info(f"{venue}/{symbol}: {result.get('status')}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""CLI script for rebuilding and verifying the production risk aggregates."""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.logging import logger  # noqa: E402
+from app.db.crud import rebuild_production_risk_aggregate, verify_production_risk_aggregate  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Verify the running drawdown/streak aggregates against a full replay of closed trades and rebuild them"
+    )
+    parser.add_argument("--check", action="store_true", help="Only verify; exit 1 on mismatch without rewriting")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        mismatches = verify_production_risk_aggregate(db)
+        for field, (stored, replayed) in mismatches.items():
+            logger.warning(f"✗ {field}: stored={stored} replayed={replayed}")
+        if not mismatches:
+            logger.info("✓ Production risk aggregates match the full replay")
+        if args.check:
+            return 1 if mismatches else 0
+
+        agg = rebuild_production_risk_aggregate(db)
+        logger.info(
+            f"✓ Rebuilt production risk aggregates: {agg.closed_trades} trades, "
+            f"equity={agg.current_equity:.6f}, peak={agg.peak_equity:.6f}, max_dd={agg.max_drawdown * 100:.2f}%"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,7 +11,7 @@ import pandas as pd
 from app.core.logging import setup_logging
 from app.data.curation import DataCuration
 from app.quant.signal_engine import generate_signal
-from app.quant.strategies import PARAMS as STRATEGY_PARAMS
+from app.quant.config_manager import active_signal_params
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -56,7 +56,7 @@ def run_diagnostics(lookback_days: int, band: float) -> dict[str, Any]:
     df_daily = _load_curated(curation, "1d", days=lookback_days + 30)
     df_hourly = _load_curated(curation, "1h", days=lookback_days + 30)
 
-    aggregate_params = STRATEGY_PARAMS.get("aggregate", {})
+    aggregate_params = active_signal_params().get("aggregate", {})
     rr_floor = float(aggregate_params.get("risk_reward_floor", 1.2))
 
     records: list[dict[str, Any]] = []
@@ -321,7 +321,7 @@ class ContinuousMonitoringService:
             rolling_window_days = te_config.get("rolling_window_days", 30)
             min_data_days = te_config.get("min_data_days", 7)
             
-            production_dd = crud.calculate_production_drawdown(db)
+            production_dd = crud.calculate_production_drawdown(db, include_equity_curve=True)
             production_equity = production_dd.get("equity_curve", [])
             production_recs = crud.get_recommendation_history(db, limit=500)
             
@@ -3,10 +3,6 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import pandas as pd
 import yaml
 
@@ -17,6 +13,7 @@ from app.backtesting.metrics import calculate_metrics
 from app.backtesting.report import build_campaign_report
 from app.core.config import settings
 from app.core.database import SessionLocal
+from app.core.lazy import pyplot
 from app.core.logging import logger, sanitize_log_extra
 from app.db.crud import get_latest_backtest_result, save_backtest_result
 from app.data.signal_data_provider import SignalDataProvider
@@ -153,6 +150,7 @@ class PerformanceService:
                 df_1h=inputs.df_1h,
                 df_1d=inputs.df_1d,
                 symbol=inputs.symbol,
+                precompute=True,
             )
 
         raise StrategyConfigurationError(
@@ -760,6 +758,7 @@ class PerformanceService:
         )
 
     def _generate_charts(self, backtest_result: dict[str, Any]) -> tuple[dict[str, str], list[str]]:
+        plt = pyplot()
         charts: dict[str, str] = {}
         banners: list[str] = []
         equity_curve_records = backtest_result.get("equity_curve", [])
@@ -8,6 +8,7 @@ import io
 import os
 from datetime import date, datetime, time, timedelta
 from pathlib import Path
+from time import perf_counter
 from typing import Any, Optional
 from urllib.parse import urlencode
 
@@ -20,10 +21,12 @@ from app.core.database import SessionLocal
 from app.core.exceptions import DataFreshnessError, DataGapError, RecommendationGenerationError, RiskValidationError
 from sqlalchemy import and_, case, desc, func, or_, select
 from app.backtesting.auto_shutdown import AutoShutdownManager, AutoShutdownPolicy, StrategyMetrics
+from app.backtesting.barriers import STOP_LOSS, first_barrier_touch, get_exit_tracker
 from app.backtesting.daily_strategy_adapter import DailyStrategyAdapter
 from app.backtesting.engine import BacktestEngine
 from app.backtesting.metrics import calculate_metrics
 from app.backtesting.persistence import save_backtest_result
+from app.backtesting.result_cache import BacktestCacheKey, get_backtest_result_cache
 from app.backtesting.risk_sizing import RiskSizer
 from app.backtesting.tracking_error import TrackingErrorCalculator, calculate_tracking_error
 from app.backtesting.unified_risk_manager import UnifiedRiskManager
@@ -40,6 +43,8 @@ from app.db.crud import (
 from app.data.curation import DataCuration
 from app.data.signal_data_provider import SignalDataProvider
 from app.db.models import RecommendationORM
+from app.utils.dataset_metadata import get_dataset_version_hash, get_params_digest
+from app.utils.hashing import get_git_commit_hash
 from app.quant.signal_engine import DailySignalEngine
 from app.services.alert_service import AlertService
 from app.services.strategy_service import StrategyService
@@ -47,7 +52,8 @@ from app.services.user_portfolio_service import UserPortfolioService
 from app.services.user_risk_profile_service import UserRiskProfileService, UserRiskContext
 from app.services.exposure_ledger_service import ExposureLedgerService
 from app.services.trade_activity_ledger import TradeActivityLedger
-from app.signals.loggers import SignalLogRecord, log_signal_event
+from app.signals.journal import get_signal_journal
+from app.signals.loggers import SignalLogRecord
 from app.confidence.service import ConfidenceService
 from app.services.preflight_audit_service import PreflightAuditService
 from app.observability.risk_metrics import (
@@ -175,8 +181,12 @@ class RecommendationService:
                 outcome="open",
                 horizon_minutes=horizon_minutes,
             )
-            log_id = log_signal_event(record, session=self.session)
-            return log_id
+            # The response carries the row id, so the journal is flushed at request end
+            journal = get_signal_journal()
+            entry = journal.log(record)
+            if entry.id is None:
+                journal.flush(session=self.session, trigger="request")
+            return entry.id
         except Exception as exc:
             logger.warning(
                 "Failed to log signal emission",
@@ -1083,7 +1093,10 @@ class RecommendationService:
         db = self.session or SessionLocal()
         try:
             # Get production drawdown
-            dd_info = calculate_production_drawdown(db)
+            # Running aggregate plus the equity curve over the policy's lookback window only
+            dd_info = calculate_production_drawdown(
+                db, equity_tail=self.shutdown_manager.policy.lookback_trades
+            )
             current_dd_pct = dd_info.get("max_drawdown_pct", 0.0)
             equity_curve = dd_info.get("equity_curve", [1.0])
             
@@ -1107,8 +1120,8 @@ class RecommendationService:
                     })
             
             # Create strategy metrics
-            current_equity = equity_curve[-1] if equity_curve else 1.0
-            peak_equity = max(equity_curve) if equity_curve else 1.0
+            current_equity = dd_info.get("current_capital", 1.0)
+            peak_equity = dd_info.get("peak_capital", 1.0)
             
             strategy_metrics = StrategyMetrics(
                 current_drawdown_pct=current_dd_pct,
@@ -1866,32 +1879,25 @@ class RecommendationService:
                     else:
                         start_date = start_date.tz_convert("UTC")
                 
-                # Create strategy adapter
-                strategy_adapter = DailyStrategyAdapter(
-                    signal_engine=self.signal_engine,
-                    df_1h=latest_hourly,
-                    df_1d=latest_daily,
-                    seed=signal.get("seed"),
-                )
-                
-                # Run backtest
-                backtest_engine = BacktestEngine()
-                backtest_result = await backtest_engine.run_backtest(
-                    start_date=start_date,
-                    end_date=end_date,
-                    instrument="BTCUSDT",
-                    timeframe="1h",
-                    strategy=strategy_adapter,
-                    initial_capital=10000.0,
-                    commission_rate=settings.BACKTEST_COMMISSION_RATE,
-                    fixed_slippage_bps=settings.BACKTEST_SLIPPAGE_BPS,
-                    slippage_model="fixed",
-                    risk_manager=self._default_risk_manager,
-                    seed=signal.get("seed"),
-                )
-                
-                # Calculate metrics
-                metrics = calculate_metrics(backtest_result)
+                cache = get_backtest_result_cache() if settings.BACKTEST_CACHE_ENABLED else None
+                cache_key = self._backtest_cache_key(signal, start_date, end_date)
+                cached = cache.get(cache_key) if cache is not None else None
+                backtest_result: dict[str, Any] | None = None
+                compute_seconds: float | None = None
+                if cached is not None:
+                    metrics = cached.metrics
+                    execution_metrics = cached.execution_stats
+                    logger.info(
+                        "Backtest validation served from cache",
+                        extra={"run_id": cached.run_id, "cached_at": cached.created_at, "key": cache_key.digest()},
+                    )
+                else:
+                    started = perf_counter()
+                    backtest_result, metrics = await self._run_validation_backtest(
+                        signal, latest_hourly, latest_daily, start_date, end_date
+                    )
+                    compute_seconds = perf_counter() - started
+                    execution_metrics = backtest_result.get("execution_stats", {})
                 
                 # Validate backtest results
                 sharpe = metrics.get("sharpe", 0.0)
@@ -1902,6 +1908,8 @@ class RecommendationService:
                         f"Backtest validation failed: Sharpe {sharpe:.2f} < {settings.BACKTEST_MIN_SHARPE}",
                         extra={"sharpe": sharpe, "max_drawdown": max_dd, "metrics": metrics},
                     )
+                    if cache is not None and cached is None:
+                        cache.put(cache_key, metrics=metrics, execution_stats=execution_metrics, compute_seconds=compute_seconds)
                     return {
                         "status": "backtest_failed",
                         "reason": f"Backtest Sharpe ratio {sharpe:.2f} below minimum {settings.BACKTEST_MIN_SHARPE}",
@@ -1913,15 +1921,34 @@ class RecommendationService:
                         f"Backtest validation failed: Max DD {max_dd:.2f}% > {settings.BACKTEST_MAX_DRAWDOWN_PCT}%",
                         extra={"sharpe": sharpe, "max_drawdown": max_dd, "metrics": metrics},
                     )
+                    if cache is not None and cached is None:
+                        cache.put(cache_key, metrics=metrics, execution_stats=execution_metrics, compute_seconds=compute_seconds)
                     return {
                         "status": "backtest_failed",
                         "reason": f"Backtest max drawdown {max_dd:.2f}% exceeds limit {settings.BACKTEST_MAX_DRAWDOWN_PCT}%",
                         "backtest_metrics": metrics,
                     }
                 
-                # Save backtest result and get run_id
-                saved_result = save_backtest_result(backtest_result)
-                backtest_run_id = saved_result.get("run_id")
+                if cached is not None and cached.run_id:
+                    backtest_run_id = cached.run_id
+                else:
+                    if backtest_result is None:
+                        # Cached as failed under stricter thresholds: the full result was never saved
+                        backtest_result, metrics = await self._run_validation_backtest(
+                            signal, latest_hourly, latest_daily, start_date, end_date
+                        )
+                        execution_metrics = backtest_result.get("execution_stats", {})
+                    # Save backtest result and get run_id
+                    saved_result = save_backtest_result(backtest_result)
+                    backtest_run_id = saved_result.get("run_id")
+                    if cache is not None:
+                        cache.put(
+                            cache_key,
+                            metrics=metrics,
+                            execution_stats=execution_metrics,
+                            run_id=backtest_run_id,
+                            compute_seconds=compute_seconds,
+                        )
                 
                 logger.info(
                     f"Backtest validation passed: Sharpe={sharpe:.2f}, Max DD={max_dd:.2f}%, run_id={backtest_run_id}",
@@ -1947,7 +1974,6 @@ class RecommendationService:
                     signal["backtest_risk_reward_ratio"] = None
                 
                 # Extract slippage from execution metrics if available
-                execution_metrics = backtest_result.get("execution_stats", {})
                 if execution_metrics and "avg_slippage_bps" in execution_metrics:
                     signal["backtest_slippage_bps"] = execution_metrics.get("avg_slippage_bps")
                 else:
@@ -2555,6 +2581,56 @@ class RecommendationService:
 
         raise ValueError(f"Unsupported export format: {export_format}")
 
+    def _backtest_cache_key(self, signal: dict[str, Any], start_date, end_date) -> BacktestCacheKey:
+        """Inputs that determine the validation backtest result."""
+        return BacktestCacheKey(
+            dataset_version=get_dataset_version_hash(include_both=True),
+            params_digest=get_params_digest(),
+            code_commit=get_git_commit_hash(),
+            seed=signal.get("seed"),
+            start=pd.Timestamp(start_date).isoformat(),
+            end=pd.Timestamp(end_date).isoformat(),
+            settings={
+                "instrument": "BTCUSDT",
+                "timeframe": "1h",
+                "initial_capital": 10000.0,
+                "commission_rate": settings.BACKTEST_COMMISSION_RATE,
+                "slippage_bps": settings.BACKTEST_SLIPPAGE_BPS,
+            },
+        )
+
+    async def _run_validation_backtest(
+        self,
+        signal: dict[str, Any],
+        latest_hourly: pd.DataFrame,
+        latest_daily: pd.DataFrame,
+        start_date,
+        end_date,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Run the pre-publish backtest; returns the raw result and its metrics."""
+        strategy_adapter = DailyStrategyAdapter(
+            signal_engine=self.signal_engine,
+            df_1h=latest_hourly,
+            df_1d=latest_daily,
+            seed=signal.get("seed"),
+            precompute=True,
+        )
+        backtest_engine = BacktestEngine()
+        backtest_result = await backtest_engine.run_backtest(
+            start_date=start_date,
+            end_date=end_date,
+            instrument="BTCUSDT",
+            timeframe="1h",
+            strategy=strategy_adapter,
+            initial_capital=10000.0,
+            commission_rate=settings.BACKTEST_COMMISSION_RATE,
+            fixed_slippage_bps=settings.BACKTEST_SLIPPAGE_BPS,
+            slippage_model="fixed",
+            risk_manager=self._default_risk_manager,
+            seed=signal.get("seed"),
+        )
+        return backtest_result, calculate_metrics(backtest_result)
+
     async def get_signal_performance(
         self,
         *,
@@ -2609,11 +2685,17 @@ class RecommendationService:
                 payload["champion_config"] = self._champion_cache
             return payload
 
-        df_prices = df_prices.copy()
-        df_prices["date"] = pd.to_datetime(df_prices["open_time"]).dt.date
-        df_prices.set_index("date", inplace=True)
+        # Columnar view of the price history; each trade scans a slice of it
+        price_dates = pd.Index(pd.to_datetime(df_prices["open_time"]).dt.date)
+        positions = pd.Series(range(len(price_dates)), index=price_dates)
+        positions = positions[~positions.index.duplicated(keep="first")]
+        lows = df_prices["low"].to_numpy(dtype=float)
+        highs = df_prices["high"].to_numpy(dtype=float)
+        closes = df_prices["close"].to_numpy(dtype=float)
 
         capital = 1.0
+        capital_theoretical = capital
+        capital_realistic = capital
         equity_curve = [round(capital, 4)]  # Theoretical (no frictions)
         equity_theoretical = [round(capital, 4)]
         equity_realistic = [round(capital, 4)]
@@ -2631,58 +2713,38 @@ class RecommendationService:
 
         for rec in sorted_recs:
             rec_date = datetime.strptime(rec.date, "%Y-%m-%d").date()
-            if rec_date not in df_prices.index:
-                continue
-
-            future_slice = df_prices.loc[rec_date:]
-            if future_slice.empty or len(future_slice) < 2:
+            if rec_date not in positions.index:
                 continue
 
-            window = future_slice.iloc[1 : lookahead_days + 1]
-            if window.empty:
+            # Bars after the signal day, up to ``lookahead_days``
+            first = int(positions[rec_date]) + 1
+            last = min(first + lookahead_days, len(price_dates))
+            if first >= last:
                 continue
 
-            exit_price = float(window.iloc[-1]["close"])
+            exit_price = float(closes[last - 1])
             exit_reason = "EXIT"
-            hit_date = window.index[-1]
+            hit_date = price_dates[last - 1]
             entry_price = float(rec.entry_optimal)
             
             # Estimate volatility for slippage calculation
-            price_row = window.iloc[-1]
             vol_estimate = 0.02  # Default 2% volatility
-            if "close" in price_row and price_row["close"] > 0:
+            if closes[last - 1] > 0:
                 # Estimate from price range
-                price_range = abs(float(price_row.get("high", 0)) - float(price_row.get("low", 0)))
-                vol_estimate = min(price_range / price_row["close"], 0.05)  # Cap at 5%
-
-            if rec.signal == "BUY":
-                for idx, row in window.iterrows():
-                    low = float(row["low"])
-                    high = float(row["high"])
-                    if low <= rec.stop_loss:
-                        exit_price = float(rec.stop_loss)
-                        exit_reason = "SL"
-                        hit_date = idx
-                        break
-                    if high >= rec.take_profit:
-                        exit_price = float(rec.take_profit)
-                        exit_reason = "TP"
-                        hit_date = idx
-                        break
-            elif rec.signal == "SELL":
-                for idx, row in window.iterrows():
-                    high = float(row["high"])
-                    low = float(row["low"])
-                    if high >= rec.stop_loss:
-                        exit_price = float(rec.stop_loss)
-                        exit_reason = "SL"
-                        hit_date = idx
-                        break
-                    if low <= rec.take_profit:
-                        exit_price = float(rec.take_profit)
-                        exit_reason = "TP"
-                        hit_date = idx
-                        break
+                price_range = abs(float(highs[last - 1]) - float(lows[last - 1]))
+                vol_estimate = min(price_range / closes[last - 1], 0.05)  # Cap at 5%
+
+            hit = first_barrier_touch(
+                rec.signal,
+                lows[first:last],
+                highs[first:last],
+                stop_loss=float(rec.stop_loss),
+                take_profit=float(rec.take_profit),
+            )
+            if hit is not None:
+                exit_price = hit.price
+                exit_reason = hit.reason
+                hit_date = price_dates[first + hit.index]
 
             # Theoretical execution (no frictions)
             if rec.signal == "BUY":
@@ -2770,7 +2832,7 @@ class RecommendationService:
                     "exit_price": round(exit_price, 2),
                     "exit_price_realistic": round(realistic_exit, 2),
                     "level_hit": exit_reason,
-                    "holding_days": len(window),
+                    "holding_days": last - first,
                     "return_pct": round(return_pct, 2),
                     "return_pct_realistic": round(realistic_return_pct, 2),
                     "tracking_error": round(tracking_error, 2),
@@ -2839,19 +2901,62 @@ class RecommendationService:
 
     async def auto_close_open_trade(self) -> None:
         """Check if the open trade hit TP/SL and close it automatically."""
+        # Session work is blocking; run it off the event loop shared with the API
+        closed = await asyncio.to_thread(self._close_open_trade_if_hit)
+        if closed is None:
+            return
+        updated_rec, exit_price, exit_reason, exit_pct = closed
+
+        self._reset_cache()
+
+        if updated_rec:
+            # Check if tracking error exceeds threshold and send alert
+            if updated_rec.tracking_error_bps is not None:
+                from app.core.config import settings
+                if updated_rec.tracking_error_bps > settings.TRACKING_ERROR_THRESHOLD_BPS:
+                    try:
+                        await self.alerts.send_alert(
+                            level="warning",
+                            title="Tracking Error Threshold Exceeded",
+                            message=f"Recommendation {updated_rec.id} ({updated_rec.date}) has tracking error of {updated_rec.tracking_error_bps:.2f} bps, exceeding threshold of {settings.TRACKING_ERROR_THRESHOLD_BPS} bps",
+                            metadata={
+                                "recommendation_id": updated_rec.id,
+                                "date": updated_rec.date,
+                                "signal": updated_rec.signal,
+                                "exit_reason": exit_reason,
+                                "tracking_error_bps": updated_rec.tracking_error_bps,
+                                "threshold_bps": settings.TRACKING_ERROR_THRESHOLD_BPS,
+                                "target_price": updated_rec.take_profit if exit_reason.upper() in ("TP", "TAKE_PROFIT") else updated_rec.stop_loss,
+                                "actual_exit_price": exit_price,
+                            },
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to send tracking error alert: {e}", exc_info=True)
+            
+            logger.info(
+                "Closed recommendation %s (%s) at %.2f due to %s (%.2f%%) [tracking_error: %s bps]",
+                updated_rec.id,
+                updated_rec.signal,
+                exit_price,
+                exit_reason,
+                exit_pct if exit_pct is not None else 0.0,
+                f"{updated_rec.tracking_error_bps:.2f}" if updated_rec.tracking_error_bps is not None else "N/A",
+            )
+
+    def _close_open_trade_if_hit(self) -> tuple[Any, float, str, float] | None:
+        """Close the open recommendation when TP/SL was hit; returns it with the exit details."""
         updated_rec = None
         exit_price = exit_reason = None
-        exit_at = None
         exit_pct = None
 
         with SessionLocal() as db:
             try:
                 rec = get_open_recommendation(db)
                 if rec is None:
-                    return
+                    return None
                 evaluation = self._evaluate_exit_conditions(rec)
                 if evaluation is None:
-                    return
+                    return None
                 exit_price, exit_reason, exit_at, exit_pct = evaluation
                 # Get default user_id (for single-user system, use a default UUID)
                 # In multi-user system, this would come from session/auth
@@ -2880,101 +2985,54 @@ class RecommendationService:
             finally:
                 db.close()
 
-        self._reset_cache()
-
-        if updated_rec:
-            # Check if tracking error exceeds threshold and send alert
-            if updated_rec.tracking_error_bps is not None:
-                from app.core.config import settings
-                if updated_rec.tracking_error_bps > settings.TRACKING_ERROR_THRESHOLD_BPS:
-                    try:
-                        await self.alerts.send_alert(
-                            level="warning",
-                            title="Tracking Error Threshold Exceeded",
-                            message=f"Recommendation {updated_rec.id} ({updated_rec.date}) has tracking error of {updated_rec.tracking_error_bps:.2f} bps, exceeding threshold of {settings.TRACKING_ERROR_THRESHOLD_BPS} bps",
-                            metadata={
-                                "recommendation_id": updated_rec.id,
-                                "date": updated_rec.date,
-                                "signal": updated_rec.signal,
-                                "exit_reason": exit_reason,
-                                "tracking_error_bps": updated_rec.tracking_error_bps,
-                                "threshold_bps": settings.TRACKING_ERROR_THRESHOLD_BPS,
-                                "target_price": updated_rec.take_profit if exit_reason.upper() in ("TP", "TAKE_PROFIT") else updated_rec.stop_loss,
-                                "actual_exit_price": exit_price,
-                            },
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to send tracking error alert: {e}", exc_info=True)
-            
-            logger.info(
-                "Closed recommendation %s (%s) at %.2f due to %s (%.2f%%) [tracking_error: %s bps]",
-                updated_rec.id,
-                updated_rec.signal,
-                exit_price,
-                exit_reason,
-                exit_pct if exit_pct is not None else 0.0,
-                f"{updated_rec.tracking_error_bps:.2f}" if updated_rec.tracking_error_bps is not None else "N/A",
-            )
+        if updated_rec is None:
+            return None
+        return updated_rec, exit_price, exit_reason, exit_pct
 
     def _evaluate_exit_conditions(self, rec) -> tuple[float, str, datetime, float] | None:
-        """Determine if the open trade has hit TP or SL based on curated data."""
+        """
+        Determine if the open trade has hit TP or SL based on curated data.
+
+        Only bars not yet checked for this trade are read (see ``BarrierTracker``).
+        """
         if rec.signal not in {"BUY", "SELL"}:
             return None
 
+        opened_at = rec.opened_at or rec.created_at
+        if opened_at is None:
+            return None
+
+        tracker = get_exit_tracker()
+        levels = {"stop_loss": float(rec.stop_loss), "take_profit": float(rec.take_profit)}
+        since = tracker.scan_from(rec.id, rec.signal, opened_at=opened_at, **levels)
         try:
-            df = self.curation.get_latest_curated("1h")
+            df = self.curation.get_curated_since("1h", since, columns=["low", "high"])
         except FileNotFoundError:
             logger.debug("Cannot evaluate exit: 1h curated data missing")
             return None
 
-        if df is None or df.empty or "open_time" not in df.columns:
+        if df is None or df.empty:
             return None
 
-        opened_at = rec.opened_at or rec.created_at
-        if opened_at is None:
+        result = tracker.scan(
+            rec.id,
+            rec.signal,
+            opened_at=opened_at,
+            open_time=df["open_time"],
+            low=df["low"].to_numpy(dtype=float),
+            high=df["high"].to_numpy(dtype=float),
+            **levels,
+        )
+        if result is None:
             return None
-
-        start_ts = pd.Timestamp(opened_at)
-        if start_ts.tzinfo is None:
-            start_ts = start_ts.tz_localize("UTC")
+        hit, bar_time = result
+        exit_price = hit.price
+        if rec.signal == "BUY":
+            pnl_pct = ((exit_price - rec.entry_optimal) / rec.entry_optimal) * 100
         else:
-            start_ts = start_ts.tz_convert("UTC")
-
-        df = df[df["open_time"] >= start_ts]
-        if df.empty:
-            return None
-
-        for _, row in df.iterrows():
-            timestamp = row["open_time"]
-            if not isinstance(timestamp, pd.Timestamp):
-                timestamp = pd.Timestamp(timestamp)
-            if timestamp.tzinfo is None:
-                timestamp = timestamp.tz_localize("UTC")
-            exit_at = timestamp.to_pydatetime()
-
-            low = float(row["low"])
-            high = float(row["high"])
-
-            if rec.signal == "BUY":
-                if low <= rec.stop_loss:
-                    exit_price = float(rec.stop_loss)
-                    pnl_pct = ((exit_price - rec.entry_optimal) / rec.entry_optimal) * 100
-                    return exit_price, "stop_loss", exit_at, pnl_pct
-                if high >= rec.take_profit:
-                    exit_price = float(rec.take_profit)
-                    pnl_pct = ((exit_price - rec.entry_optimal) / rec.entry_optimal) * 100
-                    return exit_price, "take_profit", exit_at, pnl_pct
-            elif rec.signal == "SELL":
-                if high >= rec.stop_loss:
-                    exit_price = float(rec.stop_loss)
-                    pnl_pct = ((rec.entry_optimal - exit_price) / rec.entry_optimal) * 100
-                    return exit_price, "stop_loss", exit_at, pnl_pct
-                if low <= rec.take_profit:
-                    exit_price = float(rec.take_profit)
-                    pnl_pct = ((rec.entry_optimal - exit_price) / rec.entry_optimal) * 100
-                    return exit_price, "take_profit", exit_at, pnl_pct
-
-        return None
+            pnl_pct = ((rec.entry_optimal - exit_price) / rec.entry_optimal) * 100
+        exit_reason = "stop_loss" if hit.reason == STOP_LOSS else "take_profit"
+        return exit_price, exit_reason, bar_time.to_pydatetime(), pnl_pct
 
     def _from_orm(self, r) -> dict[str, Any]:
         """Convert ORM model to API response dict."""
@@ -1,9 +1,11 @@
 """Signal observability helpers."""
 
+from .journal import SignalJournal, SignalJournalEntry, close_signal_journal, get_signal_journal  # noqa: F401
 from .loggers import (  # noqa: F401
     SignalLogRecord,
     log_signal_event,
+    log_signal_events,
     update_signal_outcome,
     update_signal_outcome_for_recommendation,
+    update_signal_outcomes,
 )
-
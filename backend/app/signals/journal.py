@@ -0,0 +1,252 @@
+"""
+Buffered journal for signal emissions.
+
+``log_signal_event`` opens a transaction per emission. ``SignalJournal``
+queues emissions in memory and writes whatever is pending in one
+transaction with a single multi-row INSERT, filling in the ``id`` of each
+queued entry. A flush happens when ``max_batch`` emissions are pending,
+every ``flush_interval`` seconds from a background thread, when the caller
+needs the ids (the end of a recommendation request) and on shutdown
+(application shutdown hook and interpreter exit).
+
+Row values are built when an emission is queued, so a malformed record fails
+its own ``log`` call instead of every later flush. When the database rejects
+the bulk insert because of its data, the batch is retried one row per
+transaction and the rows still rejected are dropped. Any other failure
+(database unavailable, locked) puts the batch back at the head of the queue
+for the next attempt; the queue is capped at ``max_pending`` and the oldest
+emissions are dropped beyond it.
+"""
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.exc import InterfaceError, OperationalError, StatementError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.observability.metrics import (
+    SIGNAL_JOURNAL_DROPPED,
+    SIGNAL_JOURNAL_FLUSH_FAILURES,
+    SIGNAL_JOURNAL_FLUSHES,
+    SIGNAL_JOURNAL_PENDING,
+    SIGNAL_JOURNAL_ROWS,
+)
+from app.signals.loggers import SignalLogRecord, insert_signal_values, signal_row_values
+
+
+@dataclass(slots=True)
+class SignalJournalEntry:
+    """A queued emission; ``id`` is set once it has been written."""
+
+    record: SignalLogRecord
+    values: dict[str, Any]
+    id: int | None = None
+
+
+class SignalJournal:
+    """In-memory queue of signal emissions flushed with bulk inserts."""
+
+    def __init__(
+        self,
+        *,
+        max_batch: int | None = None,
+        flush_interval: float | None = None,
+        session_factory: Callable[[], Session] | None = None,
+        background: bool = True,
+        max_pending: int | None = None,
+    ) -> None:
+        self.max_batch = settings.SIGNAL_JOURNAL_BATCH_SIZE if max_batch is None else max_batch
+        self.flush_interval = settings.SIGNAL_JOURNAL_FLUSH_SECONDS if flush_interval is None else flush_interval
+        self.max_pending = settings.SIGNAL_JOURNAL_MAX_PENDING if max_pending is None else max_pending
+        self._session_factory = session_factory or SessionLocal
+        self._background = background
+        self._pending: list[SignalJournalEntry] = []
+        self._lock = threading.Lock()
+        # Serialises flushes so emissions are written in the order they were queued
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def log(self, record: SignalLogRecord) -> SignalJournalEntry:
+        """Queue an emission; it is written by a later flush.
+
+        Raises:
+            TypeError, ValueError: ``record`` cannot be converted to a row (nothing is queued)
+        """
+        entry = SignalJournalEntry(record, signal_row_values(record))
+        with self._lock:
+            self._pending.append(entry)
+            overflow = self._trim_locked()
+            pending = len(self._pending)
+        self._drop(overflow, reason="overflow")
+        SIGNAL_JOURNAL_PENDING.set(pending)
+        if pending >= self.max_batch:
+            self.flush(trigger="size")
+        elif time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush(trigger="interval")
+        else:
+            self._ensure_flusher()
+        return entry
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, *, session: Session | None = None, trigger: str = "explicit") -> int:
+        """Write every pending emission in one transaction.
+
+        Args:
+            session: Optional caller-managed DB session (committed, not closed)
+            trigger: Why the flush happened, for metrics (size, interval, request, shutdown)
+
+        Returns:
+            Number of emissions written (rows the database rejected are dropped, not counted)
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            if not batch:
+                return 0
+
+            # Ids are set before releasing the lock: a caller waiting on it for its entry's id must find it set
+            db = session
+            unwritten = batch
+            written = 0
+            try:
+                if db is None:
+                    db = self._session_factory()
+                try:
+                    ids = insert_signal_values(db, [entry.values for entry in batch])
+                    db.commit()
+                except StatementError as exc:
+                    if _is_transient(exc):
+                        raise
+                    # One bad row fails the whole statement: retry row by row and drop the rejects
+                    db.rollback()
+                    logger.warning(
+                        "Signal journal batch rejected, retrying row by row",
+                        extra={"rows": len(batch), "trigger": trigger, "error": str(exc)},
+                    )
+                    for position, entry in enumerate(batch):
+                        unwritten = batch[position:]
+                        try:
+                            (entry.id,) = insert_signal_values(db, [entry.values])
+                            db.commit()
+                        except StatementError as row_exc:
+                            if _is_transient(row_exc):
+                                raise
+                            db.rollback()
+                            entry.id = None
+                            self._drop([entry], reason="rejected", error=row_exc)
+                        else:
+                            written += 1
+                else:
+                    for entry, row_id in zip(batch, ids):
+                        entry.id = row_id
+                    written = len(batch)
+                unwritten = []
+            except Exception:
+                if db is not None:
+                    db.rollback()
+                with self._lock:
+                    self._pending[:0] = unwritten
+                    overflow = self._trim_locked()
+                    pending = len(self._pending)
+                self._drop(overflow, reason="overflow")
+                SIGNAL_JOURNAL_PENDING.set(pending)
+                SIGNAL_JOURNAL_FLUSH_FAILURES.inc()
+                logger.exception("Signal journal flush failed", extra={"rows": len(unwritten), "trigger": trigger})
+                raise
+            finally:
+                if session is None and db is not None:
+                    db.close()
+        SIGNAL_JOURNAL_FLUSHES.labels(trigger=trigger).inc()
+        SIGNAL_JOURNAL_ROWS.inc(written)
+        SIGNAL_JOURNAL_PENDING.set(self.pending())
+        return written
+
+    def close(self) -> None:
+        """Stop the background flusher and write anything still pending."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self._thread = None
+        try:
+            self.flush(trigger="shutdown")
+        except Exception:
+            logger.error("Signal emissions lost on shutdown", extra={"rows": self.pending()})
+
+    def _trim_locked(self) -> list[SignalJournalEntry]:
+        """Remove and return the oldest emissions beyond ``max_pending`` (caller holds ``_lock``)."""
+        overflow = len(self._pending) - self.max_pending
+        if overflow <= 0:
+            return []
+        dropped = self._pending[:overflow]
+        del self._pending[:overflow]
+        return dropped
+
+    @staticmethod
+    def _drop(entries: list[SignalJournalEntry], *, reason: str, error: Exception | None = None) -> None:
+        if not entries:
+            return
+        SIGNAL_JOURNAL_DROPPED.labels(reason=reason).inc(len(entries))
+        logger.error(
+            "Signal emissions dropped",
+            extra={
+                "rows": len(entries),
+                "reason": reason,
+                "recommendation_ids": [entry.record.recommendation_id for entry in entries[:10]],
+                "error": str(error) if error is not None else None,
+            },
+        )
+
+    def _ensure_flusher(self) -> None:
+        if not self._background or self._stop.is_set():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="signal-journal", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            if not self.pending():
+                continue
+            try:
+                self.flush(trigger="interval")
+            except Exception:
+                pass  # Logged by flush; the batch stays queued for the next tick
+
+
+def _is_transient(exc: StatementError) -> bool:
+    """Failures of the database itself rather than of the rows sent to it."""
+    return isinstance(exc, (OperationalError, InterfaceError))
+
+
+_journal: SignalJournal | None = None
+
+
+def get_signal_journal() -> SignalJournal:
+    """Process-wide journal, flushed at interpreter exit."""
+    global _journal
+    if _journal is None:
+        _journal = SignalJournal()
+        atexit.register(_journal.close)
+    return _journal
+
+
+def close_signal_journal() -> None:
+    """Flush pending emissions (on application shutdown)."""
+    if _journal is not None:
+        _journal.close()
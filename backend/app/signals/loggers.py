@@ -1,11 +1,12 @@
 """Logging helpers for signal emissions and realised outcomes."""
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Literal
 
-from sqlalchemy import select
+from sqlalchemy import case, func, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
@@ -59,47 +60,95 @@ def _ensure_serializable(payload: dict[str, Any]) -> dict[str, Any]:
     return {key: _sanitize_value(value) for key, value in payload.items()}
 
 
-def log_signal_event(record: SignalLogRecord, *, session: Session | None = None) -> int:
-    """Persist a signal emission into the signal_outcomes table.
+def signal_row_values(record: SignalLogRecord) -> dict[str, Any]:
+    """Column values of the signal_outcomes row for ``record``."""
+    return {
+        "strategy_id": record.strategy_id,
+        "signal": record.signal,
+        "decision_timestamp": record.decision_timestamp,
+        "confidence_raw": float(record.confidence_raw),
+        "confidence_calibrated": float(record.confidence_calibrated) if record.confidence_calibrated is not None else None,
+        "recommendation_id": record.recommendation_id,
+        "market_regime": record.market_regime,
+        "vol_bucket": record.vol_bucket,
+        "features_regimen": _ensure_serializable(record.features_regimen),
+        "context_metadata": _ensure_serializable(record.metadata),
+        "outcome": record.outcome,
+        "pnl_pct": float(record.pnl_pct) if record.pnl_pct is not None else None,
+        "horizon_minutes": record.horizon_minutes,
+    }
+
+
+def insert_signal_rows(db: Session, records: Sequence[SignalLogRecord]) -> list[int]:
+    """Insert ``records`` in one multi-row statement (no commit); ids in input order."""
+    return insert_signal_values(db, [signal_row_values(record) for record in records])
+
+
+def insert_signal_values(db: Session, rows: Sequence[dict[str, Any]]) -> list[int]:
+    """Insert rows built by ``signal_row_values`` in one multi-row statement (no commit)."""
+    if not rows:
+        return []
+    stmt = insert(SignalOutcomeORM).returning(SignalOutcomeORM.id, sort_by_parameter_order=True)
+    return list(db.scalars(stmt, list(rows)))
+
+
+def apply_signal_outcomes(db: Session, outcomes: Mapping[int, tuple[OutcomeLabel, float | None]]) -> int:
+    """Set the outcome of the latest row of each recommendation in one UPDATE (no commit).
 
     Args:
-        record: Structured data to persist
-        session: Optional caller-managed DB session
+        db: Session to execute in
+        outcomes: ``recommendation_id -> (outcome, pnl_pct)``; a ``None`` pnl keeps the stored value
 
     Returns:
-        Primary key of the stored row
+        Number of rows updated
     """
+    if not outcomes:
+        return 0
+    recommendation_ids = list(outcomes)
+    latest = (
+        select(func.max(SignalOutcomeORM.id))
+        .where(SignalOutcomeORM.recommendation_id.in_(recommendation_ids))
+        .group_by(SignalOutcomeORM.recommendation_id)
+    )
+    values: dict[str, Any] = {
+        "outcome": case(
+            {rec_id: outcome for rec_id, (outcome, _) in outcomes.items()},
+            value=SignalOutcomeORM.recommendation_id,
+        )
+    }
+    pnl = {rec_id: float(pnl_pct) for rec_id, (_, pnl_pct) in outcomes.items() if pnl_pct is not None}
+    if pnl:
+        values["pnl_pct"] = case(pnl, value=SignalOutcomeORM.recommendation_id, else_=SignalOutcomeORM.pnl_pct)
+    stmt = (
+        update(SignalOutcomeORM)
+        .where(SignalOutcomeORM.recommendation_id.in_(recommendation_ids), SignalOutcomeORM.id.in_(latest))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
+
+
+def log_signal_events(records: Sequence[SignalLogRecord], *, session: Session | None = None) -> list[int]:
+    """Persist several signal emissions with a single INSERT and commit.
 
+    Args:
+        records: Structured data to persist
+        session: Optional caller-managed DB session
+
+    Returns:
+        Primary keys of the stored rows, in the order of ``records``
+    """
     db = session or SessionLocal()
     owns_session = session is None
     try:
-        orm = SignalOutcomeORM(
-            strategy_id=record.strategy_id,
-            signal=record.signal,
-            decision_timestamp=record.decision_timestamp,
-            confidence_raw=float(record.confidence_raw),
-            confidence_calibrated=float(record.confidence_calibrated) if record.confidence_calibrated is not None else None,
-            recommendation_id=record.recommendation_id,
-            market_regime=record.market_regime,
-            vol_bucket=record.vol_bucket,
-            features_regimen=_ensure_serializable(record.features_regimen),
-            context_metadata=_ensure_serializable(record.metadata),
-            outcome=record.outcome,
-            pnl_pct=float(record.pnl_pct) if record.pnl_pct is not None else None,
-            horizon_minutes=record.horizon_minutes,
-        )
-        db.add(orm)
+        ids = insert_signal_rows(db, records)
         db.commit()
-        db.refresh(orm)
-        return orm.id
+        return ids
     except Exception:
         db.rollback()
         logger.exception(
-            "Failed to persist signal emission",
-            extra={
-                "strategy_id": record.strategy_id,
-                "signal": record.signal,
-            },
+            "Failed to persist signal emissions",
+            extra={"count": len(records), "strategy_ids": sorted({record.strategy_id for record in records})},
         )
         raise
     finally:
@@ -107,6 +156,19 @@ def log_signal_event(record: SignalLogRecord, *, session: Session | None = None)
             db.close()
 
 
+def log_signal_event(record: SignalLogRecord, *, session: Session | None = None) -> int:
+    """Persist a signal emission into the signal_outcomes table.
+
+    Args:
+        record: Structured data to persist
+        session: Optional caller-managed DB session
+
+    Returns:
+        Primary key of the stored row
+    """
+    return log_signal_events([record], session=session)[0]
+
+
 def update_signal_outcome(
     record_id: int,
     *,
@@ -134,38 +196,42 @@ def update_signal_outcome(
             db.close()
 
 
-def update_signal_outcome_for_recommendation(
-    recommendation_id: int,
+def update_signal_outcomes(
+    outcomes: Mapping[int, tuple[OutcomeLabel, float | None]],
     *,
-    outcome: OutcomeLabel,
-    pnl_pct: float | None = None,
     session: Session | None = None,
-) -> None:
-    """Update a signal record tied to a recommendation."""
+) -> int:
+    """Record realised outcomes for many recommendations with one set-based UPDATE.
+
+    Returns:
+        Number of signal rows updated (recommendations without a row are skipped)
+    """
     db = session or SessionLocal()
     owns_session = session is None
     try:
-        stmt = (
-            select(SignalOutcomeORM)
-            .where(SignalOutcomeORM.recommendation_id == recommendation_id)
-            .order_by(SignalOutcomeORM.id.desc())
-            .limit(1)
-        )
-        row = db.execute(stmt).scalars().first()
-        if not row:
-            raise ValueError(f"No signal_outcomes row linked to recommendation {recommendation_id}")
-        row.outcome = outcome
-        if pnl_pct is not None:
-            row.pnl_pct = float(pnl_pct)
+        updated = apply_signal_outcomes(db, outcomes)
         db.commit()
+        return updated
     except Exception:
         db.rollback()
         logger.exception(
-            "Failed to update signal outcome for recommendation",
-            extra={"recommendation_id": recommendation_id},
+            "Failed to update signal outcomes",
+            extra={"recommendation_ids": sorted(outcomes)},
         )
         raise
     finally:
         if owns_session:
             db.close()
 
+
+def update_signal_outcome_for_recommendation(
+    recommendation_id: int,
+    *,
+    outcome: OutcomeLabel,
+    pnl_pct: float | None = None,
+    session: Session | None = None,
+) -> None:
+    """Update a signal record tied to a recommendation."""
+    updated = update_signal_outcomes({recommendation_id: (outcome, pnl_pct)}, session=session)
+    if not updated:
+        raise ValueError(f"No signal_outcomes row linked to recommendation {recommendation_id}")
@@ -0,0 +1,148 @@
+"""
+Set-based reads of ``signal_outcomes`` for training and calibration datasets.
+
+Rows are selected as plain column tuples straight into a DataFrame, without
+materialising ORM objects, and the sibling strategy signals of many
+recommendations are fetched with a few ``recommendation_id IN (...)``
+queries instead of one query per row.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import SignalOutcomeORM
+
+# Recommendation ids per IN (...) clause; well below SQLite's bound-parameter limit
+RECOMMENDATION_CHUNK = 5000
+
+OUTCOME_COLUMNS = (
+    SignalOutcomeORM.id,
+    SignalOutcomeORM.recommendation_id,
+    SignalOutcomeORM.strategy_id,
+    SignalOutcomeORM.signal,
+    SignalOutcomeORM.decision_timestamp,
+    SignalOutcomeORM.confidence_raw,
+    SignalOutcomeORM.confidence_calibrated,
+    SignalOutcomeORM.market_regime,
+    SignalOutcomeORM.vol_bucket,
+    SignalOutcomeORM.features_regimen,
+    SignalOutcomeORM.context_metadata,
+    SignalOutcomeORM.outcome,
+    SignalOutcomeORM.pnl_pct,
+    SignalOutcomeORM.horizon_minutes,
+)
+# DataFrame column names (``context_metadata`` is stored in the ``metadata`` column)
+OUTCOME_FIELDS = tuple("metadata" if col.key == "context_metadata" else col.key for col in OUTCOME_COLUMNS)
+RELATED_FIELDS = ("id", "recommendation_id", "strategy_id", "signal", "confidence_raw")
+
+
+def load_signal_outcomes(
+    session: Session,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    market_regimes: Sequence[str] | None = None,
+    vol_buckets: Sequence[str] | None = None,
+    closed_only: bool = False,
+) -> pd.DataFrame:
+    """Signal rows matching the filters, oldest decision first, in one query.
+
+    Args:
+        session: Database session
+        since: Inclusive lower bound on ``decision_timestamp``
+        until: Inclusive upper bound on ``decision_timestamp``
+        market_regimes: Keep only these regimes
+        vol_buckets: Keep only these volatility buckets
+        closed_only: Keep only rows with a realised outcome and pnl
+
+    Returns:
+        DataFrame with ``OUTCOME_FIELDS`` columns
+    """
+    stmt = select(*OUTCOME_COLUMNS)
+    if since is not None:
+        stmt = stmt.where(SignalOutcomeORM.decision_timestamp >= since)
+    if until is not None:
+        stmt = stmt.where(SignalOutcomeORM.decision_timestamp <= until)
+    if market_regimes:
+        stmt = stmt.where(SignalOutcomeORM.market_regime.in_(list(market_regimes)))
+    if vol_buckets:
+        stmt = stmt.where(SignalOutcomeORM.vol_bucket.in_(list(vol_buckets)))
+    if closed_only:
+        stmt = stmt.where(
+            SignalOutcomeORM.outcome.isnot(None),
+            SignalOutcomeORM.outcome != "open",
+            SignalOutcomeORM.pnl_pct.isnot(None),
+        )
+    stmt = stmt.order_by(SignalOutcomeORM.decision_timestamp, SignalOutcomeORM.id)
+    return pd.DataFrame.from_records(session.execute(stmt).all(), columns=list(OUTCOME_FIELDS))
+
+
+def load_recommendation_signals(
+    session: Session,
+    recommendation_ids: Iterable[Any],
+    *,
+    chunk_size: int = RECOMMENDATION_CHUNK,
+) -> pd.DataFrame:
+    """Every strategy signal logged for ``recommendation_ids``, grouped by recommendation.
+
+    Returns:
+        DataFrame with ``RELATED_FIELDS`` columns, ordered by recommendation and id
+    """
+    ids = sorted({int(rec_id) for rec_id in recommendation_ids if rec_id is not None and not pd.isna(rec_id)})
+    columns = [getattr(SignalOutcomeORM, name) for name in RELATED_FIELDS]
+    rows: list[Any] = []
+    for start in range(0, len(ids), chunk_size):
+        stmt = (
+            select(*columns)
+            .where(SignalOutcomeORM.recommendation_id.in_(ids[start : start + chunk_size]))
+            .order_by(SignalOutcomeORM.recommendation_id, SignalOutcomeORM.id)
+        )
+        rows.extend(session.execute(stmt).all())
+    return pd.DataFrame.from_records(rows, columns=list(RELATED_FIELDS))
+
+
+def outcomes_frame(rows: Iterable[SignalOutcomeORM]) -> pd.DataFrame:
+    """``load_signal_outcomes``-shaped DataFrame from ORM rows already in memory."""
+    return pd.DataFrame.from_records(
+        [tuple(getattr(row, col.key) for col in OUTCOME_COLUMNS) for row in rows],
+        columns=list(OUTCOME_FIELDS),
+    )
+
+
+def json_fields(values: pd.Series, defaults: Mapping[str, Any]) -> pd.DataFrame:
+    """Expand a column of JSON objects into one column per key of ``defaults``.
+
+    Missing keys, null values and non-object entries take the default.
+    """
+    records = [value if isinstance(value, dict) else {} for value in values]
+    frame = pd.DataFrame.from_records(records, columns=list(defaults))
+    frame.index = values.index
+    return frame.fillna(dict(defaults)).infer_objects()
+
+
+def write_partitioned(df: pd.DataFrame, base_dir: Path, partition_cols: Sequence[str]) -> Path:
+    """Write ``df`` as Parquet under ``col=value/`` directories, one file per partition.
+
+    Partition columns stay in the files, so readers that do not parse the
+    directory names still see them; every file shares one schema.
+    """
+    base_dir.mkdir(parents=True, exist_ok=True)
+    if df.empty:
+        return base_dir
+    df = df.reset_index(drop=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for key, positions in df.groupby(list(partition_cols), sort=True, dropna=False).indices.items():
+        values = key if isinstance(key, tuple) else (key,)
+        target = base_dir.joinpath(*(f"{col}={value}" for col, value in zip(partition_cols, values)))
+        target.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table.take(positions), target / "part-0.parquet")
+    return base_dir
@@ -7,15 +7,6 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import (
-    roc_auc_score,
-    brier_score_loss,
-    calibration_curve,
-    log_loss,
-)
-from sklearn.preprocessing import StandardScaler
 
 from app.core.logging import logger
 
@@ -23,6 +14,10 @@ from app.core.logging import logger
 class MetaLearner:
     """Meta-learner that learns to combine strategy signals optimally."""
 
+    STRATEGY_NAMES = ("momentum_trend", "mean_reversion", "breakout")
+    REGIMES = ("bull", "bear", "range", "neutral")
+    VOL_BUCKETS = ("low", "balanced", "high")
+
     def __init__(
         self,
         model_type: str = "logistic",
@@ -35,6 +30,8 @@ class MetaLearner:
             model_type: Model type ("logistic" or "gradient_boosting")
             regime: Market regime this model is trained for (None for general)
         """
+        from sklearn.preprocessing import StandardScaler
+
         self.model_type = model_type
         self.regime = regime
         self.model = self._create_model()
@@ -45,6 +42,9 @@ class MetaLearner:
 
     def _create_model(self):
         """Create model based on model_type."""
+        from sklearn.ensemble import GradientBoostingClassifier
+        from sklearn.linear_model import LogisticRegression
+
         if self.model_type == "logistic":
             return LogisticRegression(
                 max_iter=1000,
@@ -84,8 +84,7 @@ class MetaLearner:
         features = []
 
         # Strategy signals: one-hot encode signal type and include confidence
-        strategy_names = ["momentum_trend", "mean_reversion", "breakout"]
-        for strategy_name in strategy_names:
+        for strategy_name in self.STRATEGY_NAMES:
             # Find signal for this strategy
             signal_data = next(
                 (s for s in strategy_signals if s.get("strategy") == strategy_name),
@@ -159,6 +158,72 @@ class MetaLearner:
 
         return np.array(features, dtype=np.float32)
 
+    @classmethod
+    def build_feature_matrix(
+        cls,
+        outcomes: pd.DataFrame,
+        related: pd.DataFrame | None = None,
+    ) -> np.ndarray:
+        """
+        Build the ``build_features`` vector for many signal_outcomes rows at once.
+
+        Args:
+            outcomes: Rows as returned by ``app.signals.outcomes.load_signal_outcomes``
+            related: Strategy signals of the same recommendations
+                (``load_recommendation_signals``); rows without a recommendation
+                use their own signal
+
+        Returns:
+            Feature matrix with one row per outcome, equal to stacking
+            ``build_features`` over each row and its recommendation's signals
+        """
+        from app.signals.outcomes import json_fields
+
+        n_rows = len(outcomes)
+        position = np.arange(n_rows)
+        linked = outcomes["recommendation_id"].notna().to_numpy()
+        own = outcomes.loc[~linked, ["id", "strategy_id", "signal", "confidence_raw"]].assign(row=position[~linked])
+        sources = [own]
+        if related is not None and linked.any():
+            keys = pd.DataFrame(
+                {"row": position[linked], "recommendation_id": outcomes["recommendation_id"].to_numpy()[linked]}
+            )
+            sources.append(keys.merge(related, on="recommendation_id"))
+        # First signal (lowest id) of each strategy per row, as build_features picks it
+        signals = (
+            pd.concat(sources, ignore_index=True)
+            .sort_values(["row", "id"], kind="mergesort")
+            .drop_duplicates(["row", "strategy_id"])
+        )
+
+        columns: list[np.ndarray] = []
+        for strategy_name in cls.STRATEGY_NAMES:
+            block = np.zeros((n_rows, 4))
+            strategy = signals[signals["strategy_id"] == strategy_name]
+            rows = strategy["row"].to_numpy(dtype=int)
+            signal = strategy["signal"].fillna("HOLD").to_numpy()
+            block[rows, 0] = signal == "BUY"
+            block[rows, 1] = signal == "SELL"
+            block[rows, 2] = signal == "HOLD"
+            block[rows, 3] = strategy["confidence_raw"].to_numpy(dtype=float) / 100.0
+            columns.extend(block.T)
+
+        regime = outcomes["market_regime"].fillna("").replace("", "neutral").to_numpy()
+        vol_bucket = outcomes["vol_bucket"].fillna("").replace("", "unknown").to_numpy()
+        columns.extend((regime == name).astype(float) for name in cls.REGIMES)
+        columns.extend((vol_bucket == name).astype(float) for name in cls.VOL_BUCKETS)
+
+        context = json_fields(
+            outcomes["features_regimen"],
+            {"volatility_30": 0.0, "atr_14": 0.0, "mom_1d": 0.0, "rsi": 50.0},
+        ).apply(pd.to_numeric, errors="coerce")
+        columns.append(context["volatility_30"].to_numpy(dtype=float))
+        columns.append(context["atr_14"].to_numpy(dtype=float))
+        columns.append(context["mom_1d"].to_numpy(dtype=float))
+        columns.append(context["rsi"].to_numpy(dtype=float) / 100.0)
+
+        return np.column_stack(columns).astype(np.float32)
+
     def fit(
         self,
         X: np.ndarray | pd.DataFrame,
@@ -188,6 +253,13 @@ class MetaLearner:
         self.is_fitted = True
 
         # Calculate training metrics
+        from sklearn.metrics import (
+            roc_auc_score,
+            brier_score_loss,
+            calibration_curve,
+            log_loss,
+        )
+
         y_pred_proba = self.model.predict_proba(X_scaled)[:, 1]
         y_pred = self.model.predict(X_scaled)
 
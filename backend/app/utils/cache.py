@@ -1,145 +1,475 @@
 """
-Simple in-memory cache with TTL for API responses.
+In-process response cache with TTLs, LRU bounds and request coalescing.
 
-This provides a lightweight caching solution for expensive operations
-without requiring external dependencies like Redis.
+Entries are bounded by count and approximate size (least recently used first
+out) and expire after a per-prefix TTL (``RESPONSE_CACHE_TTL_SECONDS``).
+Prefixes with a stale window (``RESPONSE_CACHE_STALE_SECONDS``) keep serving the
+expired value while a single background refresh recomputes it. Concurrent
+misses on the same key share one computation through ``get_or_compute`` /
+``aget_or_compute`` instead of all recomputing.
+
+With ``RESPONSE_CACHE_BACKEND_URL`` set (``redis://...``) JSON-serialisable
+values are also written to a shared backend, so other workers can serve them
+on a local miss. The in-process tier is always consulted first.
 """
 from __future__ import annotations
 
-import hashlib
+import asyncio
 import json
+import sys
+import threading
 import time
-from typing import Any, Callable, TypeVar
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Any, Hashable, Protocol, TypeVar
 
+from app.core.config import settings
 from app.core.logging import logger
-from app.observability.metrics import CACHE_HITS, CACHE_MISSES
+from app.observability.metrics import (
+    CACHE_BYTES,
+    CACHE_COALESCED,
+    CACHE_ENTRIES,
+    CACHE_EVICTIONS,
+    CACHE_HITS,
+    CACHE_MISSES,
+    CACHE_STALE_HITS,
+)
 
 T = TypeVar("T")
 
-# Global cache storage
-_cache: dict[str, tuple[Any, float]] = {}
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Freshness of a prefix: ``ttl_seconds`` fresh, then ``stale_seconds`` served while refreshing."""
+
+    ttl_seconds: float
+    stale_seconds: float = 0.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    stored_at: float
+    expires_at: float
+    stale_until: float
+
+
+class CacheBackend(Protocol):
+    """Shared store used behind the in-process tier (one per deployment, not per worker)."""
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, data: bytes, ttl_seconds: float) -> None: ...
+
+    def delete_prefix(self, prefix: str | None) -> None: ...
+
+
+class RedisCacheBackend:
+    """``CacheBackend`` on Redis; requires the optional ``redis`` package."""
+
+    namespace = "response_cache"
+
+    def __init__(self, url: str) -> None:
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ImportError("RESPONSE_CACHE_BACKEND_URL requires the 'redis' package") from exc
+        self._client = redis.Redis.from_url(url)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(self._key(key))
+
+    def set(self, key: str, data: bytes, ttl_seconds: float) -> None:
+        self._client.set(self._key(key), data, px=max(1, int(ttl_seconds * 1000)))
+
+    def delete_prefix(self, prefix: str | None) -> None:
+        pattern = self._key(f"{prefix}:*" if prefix else "*")
+        keys = list(self._client.scan_iter(match=pattern, count=500))
+        if keys:
+            self._client.delete(*keys)
+
+
+def _approx_size(value: Any, _depth: int = 0) -> int:
+    """Rough deep size in bytes; only used to bound the cache, not for accounting."""
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value, 64)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(_approx_size(k, _depth + 1) + _approx_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_approx_size(item, _depth + 1) for item in value)
+    return size
 
 
-def _make_cache_key(prefix: str, *args: Any, **kwargs: Any) -> str:
-    """Generate a cache key from prefix, args, and kwargs."""
-    key_data = {
-        "prefix": prefix,
-        "args": args,
-        "kwargs": sorted(kwargs.items()) if kwargs else [],
-    }
-    key_str = json.dumps(key_data, sort_keys=True, default=str)
-    return f"{prefix}:{hashlib.sha256(key_str.encode()).hexdigest()[:16]}"
+def _make_cache_key(prefix: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+    """Hashable key from the call arguments; JSON is only the fallback for unhashable ones."""
+    key = (prefix, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        return (prefix, json.dumps([args, sorted(kwargs.items())], sort_keys=True, default=str))
 
 
-def get_cached(prefix: str, ttl_seconds: float, *args: Any, **kwargs: Any) -> Any | None:
+def _shared_key(key: Hashable) -> str:
+    prefix = key[0]  # type: ignore[index]
+    digest = json.dumps(key[1:], sort_keys=True, default=str)  # type: ignore[index]
+    return f"{prefix}:{digest}"
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache keyed by ``(prefix, args, kwargs)``.
+
+    Thread-safe; values are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 2048,
+        max_bytes: int = 128 * 1024 * 1024,
+        default_ttl_seconds: float = 300.0,
+        ttls: dict[str, float] | None = None,
+        stale_seconds: dict[str, float] | None = None,
+        backend: CacheBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl_seconds = default_ttl_seconds
+        self.backend = backend
+        self._clock = clock
+        self._policies: dict[str, CachePolicy] = {}
+        for prefix in set(ttls or {}) | set(stale_seconds or {}):
+            self.configure(
+                prefix,
+                ttl_seconds=(ttls or {}).get(prefix, default_ttl_seconds),
+                stale_seconds=(stale_seconds or {}).get(prefix, 0.0),
+            )
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._inflight: dict[Hashable, Future] = {}
+        self._background: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    def configure(self, prefix: str, *, ttl_seconds: float, stale_seconds: float = 0.0) -> None:
+        """Set the TTL and stale window for ``prefix``."""
+        self._policies[prefix] = CachePolicy(ttl_seconds=ttl_seconds, stale_seconds=stale_seconds)
+
+    def policy(self, prefix: str) -> CachePolicy:
+        return self._policies.get(prefix) or CachePolicy(ttl_seconds=self.default_ttl_seconds)
+
+    # -- lookups ---------------------------------------------------------------
+
+    def get(self, prefix: str, *args: Any, **kwargs: Any) -> Any | None:
+        """Fresh cached value or ``None``; stale values are not returned here."""
+        value, fresh = self._lookup(prefix, _make_cache_key(prefix, args, kwargs))
+        if value is _MISSING or not fresh:
+            CACHE_MISSES.labels(cache_key=prefix).inc()
+            return None
+        CACHE_HITS.labels(cache_key=prefix).inc()
+        return value
+
+    def set(self, prefix: str, value: Any, *args: Any, ttl_seconds: float | None = None, **kwargs: Any) -> None:
+        """Store ``value``; ``ttl_seconds`` overrides the prefix TTL for this entry."""
+        self._store(prefix, _make_cache_key(prefix, args, kwargs), value, ttl_seconds)
+
+    def get_or_compute(self, prefix: str, compute: Callable[[], T], *args: Any, **kwargs: Any) -> T:
+        """
+        Cached value for the key, or ``compute()`` run once for all concurrent
+        callers. Within the stale window the old value is returned and one
+        background thread refreshes it.
+        """
+        key = _make_cache_key(prefix, args, kwargs)
+        value, fresh = self._lookup(prefix, key)
+        if value is not _MISSING:
+            if not fresh:
+                CACHE_STALE_HITS.labels(cache_key=prefix).inc()
+                future, leader = self._claim(key)
+                if leader:
+                    threading.Thread(
+                        target=self._run_sync, args=(prefix, key, compute, future), daemon=True
+                    ).start()
+                return value
+            CACHE_HITS.labels(cache_key=prefix).inc()
+            return value
+
+        CACHE_MISSES.labels(cache_key=prefix).inc()
+        future, leader = self._claim(key)
+        if leader:
+            self._run_sync(prefix, key, compute, future)
+        else:
+            CACHE_COALESCED.labels(cache_key=prefix).inc()
+        return future.result()
+
+    async def aget_or_compute(self, prefix: str, compute: Callable[[], Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Async ``get_or_compute``; the stale refresh runs as a task on the current loop."""
+        key = _make_cache_key(prefix, args, kwargs)
+        value, fresh = self._lookup(prefix, key)
+        if value is not _MISSING:
+            if not fresh:
+                CACHE_STALE_HITS.labels(cache_key=prefix).inc()
+                future, leader = self._claim(key)
+                if leader:
+                    task = asyncio.get_running_loop().create_task(self._run_async(prefix, key, compute, future))
+                    self._background.add(task)
+                    task.add_done_callback(self._background.discard)
+                return value
+            CACHE_HITS.labels(cache_key=prefix).inc()
+            return value
+
+        CACHE_MISSES.labels(cache_key=prefix).inc()
+        future, leader = self._claim(key)
+        if leader:
+            await self._run_async(prefix, key, compute, future)
+        else:
+            CACHE_COALESCED.labels(cache_key=prefix).inc()
+        return await asyncio.wrap_future(future)
+
+    # -- maintenance -----------------------------------------------------------
+
+    def clear(self, prefix: str | None = None) -> int:
+        """Drop all entries, or those of ``prefix``; returns the number removed locally."""
+        with self._lock:
+            if prefix is None:
+                keys = list(self._entries)
+            else:
+                keys = [key for key in self._entries if key[0] == prefix]  # type: ignore[index]
+            for key in keys:
+                self._bytes -= self._entries.pop(key).size
+            self._update_gauges()
+        if self.backend is not None:
+            try:
+                self.backend.delete_prefix(prefix)
+            except Exception as exc:
+                logger.warning(f"Shared cache clear failed: {exc}")
+        return len(keys)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "inflight": len(self._inflight),
+            }
+
+    # -- internals -------------------------------------------------------------
+
+    def _lookup(self, prefix: str, key: Hashable) -> tuple[Any, bool]:
+        """``(value, fresh)``; ``value`` is ``_MISSING`` on a miss or past the stale window."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now < entry.stale_until:
+                    self._entries.move_to_end(key)
+                    return entry.value, now < entry.expires_at
+                self._bytes -= self._entries.pop(key).size
+                CACHE_EVICTIONS.labels(reason="expired").inc()
+                self._update_gauges()
+        if self.backend is None:
+            return _MISSING, False
+        return self._lookup_shared(prefix, key, now)
+
+    def _lookup_shared(self, prefix: str, key: Hashable, now: float) -> tuple[Any, bool]:
+        try:
+            data = self.backend.get(_shared_key(key))  # type: ignore[union-attr]
+            if data is None:
+                return _MISSING, False
+            payload = json.loads(data)
+        except Exception as exc:
+            logger.warning(f"Shared cache read failed for {prefix}: {exc}")
+            return _MISSING, False
+        entry = self._entry(payload["value"], payload["stored_at"], payload["ttl_seconds"], prefix)
+        if now >= entry.stale_until:
+            return _MISSING, False
+        self._insert(key, entry)
+        return entry.value, now < entry.expires_at
+
+    def _entry(self, value: Any, stored_at: float, ttl_seconds: float, prefix: str) -> _Entry:
+        expires_at = stored_at + ttl_seconds
+        return _Entry(
+            value=value,
+            size=_approx_size(value),
+            stored_at=stored_at,
+            expires_at=expires_at,
+            stale_until=expires_at + self.policy(prefix).stale_seconds,
+        )
+
+    def _store(self, prefix: str, key: Hashable, value: Any, ttl_seconds: float | None) -> None:
+        ttl = self.policy(prefix).ttl_seconds if ttl_seconds is None else ttl_seconds
+        entry = self._entry(value, self._clock(), ttl, prefix)
+        self._insert(key, entry)
+        if self.backend is not None:
+            try:
+                data = json.dumps({"value": value, "stored_at": entry.stored_at, "ttl_seconds": ttl})
+            except (TypeError, ValueError):
+                # Only JSON-serialisable values are shared between workers
+                return
+            try:
+                self.backend.set(_shared_key(key), data.encode(), ttl + self.policy(prefix).stale_seconds)
+            except Exception as exc:
+                logger.warning(f"Shared cache write failed for {prefix}: {exc}")
+
+    def _insert(self, key: Hashable, entry: _Entry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                CACHE_EVICTIONS.labels(reason="capacity").inc()
+            self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        CACHE_ENTRIES.set(len(self._entries))
+        CACHE_BYTES.set(self._bytes)
+
+    def _claim(self, key: Hashable) -> tuple[Future, bool]:
+        """In-flight future for ``key`` and whether the caller must compute it."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _release(self, key: Hashable) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _run_sync(self, prefix: str, key: Hashable, compute: Callable[[], Any], future: Future) -> None:
+        try:
+            value = compute()
+        except BaseException as exc:
+            self._release(key)
+            future.set_exception(exc)
+            return
+        self._store(prefix, key, value, None)
+        self._release(key)
+        future.set_result(value)
+
+    async def _run_async(self, prefix: str, key: Hashable, compute: Callable[[], Awaitable[Any]], future: Future) -> None:
+        try:
+            value = await compute()
+        except BaseException as exc:
+            self._release(key)
+            future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        self._store(prefix, key, value, None)
+        self._release(key)
+        future.set_result(value)
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache configured from settings."""
+    backend = RedisCacheBackend(settings.RESPONSE_CACHE_BACKEND_URL) if settings.RESPONSE_CACHE_BACKEND_URL else None
+    return ResponseCache(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+        default_ttl_seconds=settings.RESPONSE_CACHE_DEFAULT_TTL_SECONDS,
+        ttls=settings.RESPONSE_CACHE_TTL_SECONDS,
+        stale_seconds=settings.RESPONSE_CACHE_STALE_SECONDS,
+        backend=backend,
+    )
+
+
+def get_cached(prefix: str, *args: Any, ttl_seconds: float | None = None, **kwargs: Any) -> Any | None:
     """
     Get cached value if it exists and hasn't expired.
-    
+
     Args:
         prefix: Cache key prefix
-        ttl_seconds: Time-to-live in seconds
+        ttl_seconds: Ignored; freshness is fixed when the value is stored
         *args, **kwargs: Arguments used to generate cache key
-    
+
     Returns:
         Cached value or None if not found/expired
     """
-    cache_key = _make_cache_key(prefix, *args, **kwargs)
-    if cache_key in _cache:
-        value, expiry = _cache[cache_key]
-        if time.time() < expiry:
-            logger.debug(f"Cache hit: {prefix}")
-            CACHE_HITS.labels(cache_key=prefix).inc()
-            return value
-        else:
-            # Expired, remove it
-            del _cache[cache_key]
-            logger.debug(f"Cache expired: {prefix}")
-    CACHE_MISSES.labels(cache_key=prefix).inc()
-    return None
+    return get_response_cache().get(prefix, *args, **kwargs)
 
 
-def set_cached(prefix: str, value: Any, ttl_seconds: float, *args: Any, **kwargs: Any) -> None:
+def set_cached(prefix: str, value: Any, *args: Any, ttl_seconds: float | None = None, **kwargs: Any) -> None:
     """
     Set a cached value with TTL.
-    
+
     Args:
         prefix: Cache key prefix
         value: Value to cache
-        ttl_seconds: Time-to-live in seconds
+        ttl_seconds: Time-to-live in seconds (default: the prefix TTL)
         *args, **kwargs: Arguments used to generate cache key
     """
-    cache_key = _make_cache_key(prefix, *args, **kwargs)
-    expiry = time.time() + ttl_seconds
-    _cache[cache_key] = (value, expiry)
-    logger.debug(f"Cache set: {prefix} (TTL: {ttl_seconds}s)")
+    get_response_cache().set(prefix, value, *args, ttl_seconds=ttl_seconds, **kwargs)
+    logger.debug(f"Cache set: {prefix}")
 
 
 def clear_cache(prefix: str | None = None) -> int:
     """
     Clear cache entries.
-    
+
     Args:
         prefix: If provided, only clear entries with this prefix. Otherwise clear all.
-    
+
     Returns:
         Number of entries cleared
     """
-    if prefix is None:
-        count = len(_cache)
-        _cache.clear()
-        logger.info(f"Cache cleared: {count} entries")
-        return count
-    
-    # Clear entries with matching prefix
-    keys_to_remove = [k for k in _cache.keys() if k.startswith(f"{prefix}:")]
-    for key in keys_to_remove:
-        del _cache[key]
-    logger.info(f"Cache cleared: {len(keys_to_remove)} entries with prefix '{prefix}'")
-    return len(keys_to_remove)
-
-
-def cached(prefix: str, ttl_seconds: float = 300.0):
+    count = get_response_cache().clear(prefix)
+    logger.info(f"Cache cleared: {count} entries" + (f" with prefix '{prefix}'" if prefix else ""))
+    return count
+
+
+def cached(prefix: str, ttl_seconds: float | None = None):
     """
-    Decorator to cache function results.
-    
+    Decorator to cache function results, coalescing concurrent misses.
+
     Args:
         prefix: Cache key prefix
-        ttl_seconds: Time-to-live in seconds (default: 5 minutes)
-    
+        ttl_seconds: Overrides the prefix TTL for this prefix
+
     Example:
         @cached("market_data", ttl_seconds=60.0)
         async def get_market_data(interval: str):
             ...
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        async def async_wrapper(*args: Any, **kwargs: Any) -> T:
-            # Check cache
-            cached_value = get_cached(prefix, ttl_seconds, *args, **kwargs)
-            if cached_value is not None:
-                return cached_value
-            
-            # Call function and cache result
-            result = await func(*args, **kwargs)
-            set_cached(prefix, result, ttl_seconds, *args, **kwargs)
-            return result
-        
-        def sync_wrapper(*args: Any, **kwargs: Any) -> T:
-            # Check cache
-            cached_value = get_cached(prefix, ttl_seconds, *args, **kwargs)
-            if cached_value is not None:
-                return cached_value
-            
-            # Call function and cache result
-            result = func(*args, **kwargs)
-            set_cached(prefix, result, ttl_seconds, *args, **kwargs)
-            return result
-        
-        # Return appropriate wrapper based on whether function is async
-        import asyncio
+        cache = get_response_cache()
+        if ttl_seconds is not None:
+            cache.configure(prefix, ttl_seconds=ttl_seconds, stale_seconds=cache.policy(prefix).stale_seconds)
+
         if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> T:
+                return await cache.aget_or_compute(prefix, lambda: func(*args, **kwargs), *args, **kwargs)
+
             return async_wrapper  # type: ignore
-        else:
-            return sync_wrapper  # type: ignore
-    
-    return decorator
 
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> T:
+            return cache.get_or_compute(prefix, lambda: func(*args, **kwargs), *args, **kwargs)
+
+        return sync_wrapper
+
+    return decorator
@@ -70,3 +70,19 @@ def generate_deterministic_seed(date_value: str | datetime | DateType, symbol: s
     seed = int(hash_hex, 16) % (2**31 - 1)
 
     return seed
+
+
+def derive_task_seed(*parts: object) -> int:
+    """Deterministic seed for one task of a batch (e.g. a campaign candidate or walk-forward window).
+
+    The seed depends only on the string form of ``parts``, never on execution
+    order or on which process runs the task, so serial and parallel runs of the
+    same batch draw the same random numbers.
+
+    Returns:
+        Integer seed value (0 to 2^31-1)
+    """
+
+    seed_string = "|".join(str(part) for part in parts)
+    hash_hex = hashlib.sha256(seed_string.encode("utf-8")).hexdigest()[:8]
+    return int(hash_hex, 16) % (2**31 - 1)
@@ -66,23 +66,18 @@ async def test_binance_client_metrics():
     mock_response.elapsed.total_seconds.return_value = 0.5
     mock_response.raise_for_status = MagicMock()
     
-    with patch("app.data.binance_client.httpx.AsyncClient") as mock_client_class:
-        mock_client = AsyncMock()
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client_class.return_value = mock_client
+    with patch("app.data.binance_client.get_http_pool") as mock_get_pool:
+        mock_get_pool.return_value.request = AsyncMock(return_value=mock_response)
         
-        with patch("app.data.binance_client._rate_limiter.acquire", new_callable=AsyncMock):
-            try:
-                await client.get_klines("BTCUSDT", "1h")
-                print("  ✓ get_klines completa sin errores de métricas")
-                return 0
-            except ValueError as e:
-                if "missing label" in str(e).lower():
-                    print(f"  ❌ ERROR: get_klines falló por labels faltantes: {e}")
-                    return 1
-                raise
+        try:
+            await client.get_klines("BTCUSDT", "1h")
+            print("  ✓ get_klines completa sin errores de métricas")
+            return 0
+        except ValueError as e:
+            if "missing label" in str(e).lower():
+                print(f"  ❌ ERROR: get_klines falló por labels faltantes: {e}")
+                return 1
+            raise
 
 
 async def test_preflight_resilience():
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+from datetime import datetime, timedelta
+
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import export as export_module
+from app.core.database import Base, create_db_engine
+from app.db.models import ExportAuditORM, RecommendationORM
+from app.main import app
+
+client = TestClient(app)
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_db_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(export_module, "SessionLocal", factory)
+    # Several pages per export
+    monkeypatch.setattr(export_module, "EXPORT_BATCH_SIZE", 7)
+    yield factory
+    engine.dispose()
+
+
+def _seed(factory, count: int) -> None:
+    with factory() as db:
+        for i in range(count):
+            # Pairs share created_at so the keyset has to break ties on id
+            created_at = START + timedelta(hours=i // 2)
+            db.add(
+                RecommendationORM(
+                    date=(START + timedelta(days=i)).strftime("%Y-%m-%d"),
+                    market_timestamp=str(i),
+                    signal="BUY" if i % 3 else "SELL",
+                    entry_min=100.0,
+                    entry_max=100.0,
+                    entry_optimal=100.0,
+                    stop_loss=95.0,
+                    take_profit=105.0,
+                    stop_loss_pct=5.0,
+                    take_profit_pct=5.0,
+                    confidence=50.0 + i % 10,
+                    current_price=100.0,
+                    analysis="",
+                    status="closed",
+                    exit_reason="TP",
+                    exit_price=105.0,
+                    exit_price_pct=1.0,
+                    code_commit="abc123",
+                    indicators={"rsi": i},
+                    snapshot_json={"execution_stats": {"orderbook_fallback_count": 2}} if i % 2 else None,
+                    created_at=created_at,
+                )
+            )
+        db.commit()
+
+
+def _audit(factory, audit_id: int) -> ExportAuditORM:
+    with factory() as db:
+        return db.get(ExportAuditORM, audit_id)
+
+
+def test_csv_export_streams_every_row_in_keyset_order(session_factory):
+    _seed(session_factory, 23)
+
+    response = client.get("/api/v1/recommendation/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 23
+    ids = [int(row["id"]) for row in rows]
+    assert ids == sorted(ids, reverse=True)
+    assert rows[0]["indicators"] == '{"rsi": 22}'
+    assert float(rows[-1]["equity_realistic"]) == pytest.approx(1.01**23, rel=1e-5)
+
+    audit = _audit(session_factory, int(response.headers["X-Export-Audit-Id"]))
+    assert audit.record_count == 23
+    assert audit.file_size_bytes == len(response.content)
+    assert audit.file_hash == hashlib.sha256(response.content).hexdigest()
+    assert audit.export_params["status"] == "complete"
+    assert audit.export_params["md5"] == hashlib.md5(response.content).hexdigest()
+    assert audit.export_params["commit_hash"] == "abc123"
+    assert audit.export_params["has_execution_metrics"] == 11
+
+
+def test_parquet_export_writes_one_row_group_per_batch(session_factory):
+    _seed(session_factory, 20)
+
+    response = client.get(
+        "/api/v1/recommendation/export", params={"format": "parquet", "signal": "BUY", "limit": 10}
+    )
+
+    assert response.status_code == 200
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_rows == 10
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert set(table.column("signal").to_pylist()) == {"BUY"}
+    assert table.schema == export_module.EXPORT_PARQUET_SCHEMA
+
+    audit = _audit(session_factory, int(response.headers["X-Export-Audit-Id"]))
+    assert audit.record_count == 10
+    assert audit.file_hash == hashlib.sha256(response.content).hexdigest()
+
+
+def test_export_without_matches_returns_404(session_factory):
+    response = client.get("/api/v1/recommendation/export", params={"signal": "HOLD"})
+
+    assert response.status_code == 404
+    with session_factory() as db:
+        assert db.query(ExportAuditORM).count() == 0
@@ -0,0 +1,91 @@
+"""First-touch TP/SL detection and the incremental tracker used by auto-close."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtesting.barriers import STOP_LOSS, TAKE_PROFIT, BarrierTracker, first_barrier_touch
+
+
+def _loop_first_touch(signal, low, high, stop_loss, take_profit):
+    """Bar-by-bar reference, as the service evaluated exits before."""
+    for i, (lo, hi) in enumerate(zip(low, high)):
+        if signal == "BUY":
+            if lo <= stop_loss:
+                return i, STOP_LOSS
+            if hi >= take_profit:
+                return i, TAKE_PROFIT
+        else:
+            if hi >= stop_loss:
+                return i, STOP_LOSS
+            if lo <= take_profit:
+                return i, TAKE_PROFIT
+    return None
+
+
+def _bars(n: int, seed: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.8, n))
+    return close - spread, close + spread
+
+
+@pytest.mark.parametrize("signal", ["BUY", "SELL"])
+def test_matches_bar_by_bar_loop(signal):
+    low, high = _bars(500)
+    for stop, target in [(95, 106), (97, 103), (90, 120), (99.5, 100.5)]:
+        if signal == "SELL":
+            stop, target = 200 - stop, 200 - target
+        hit = first_barrier_touch(signal, low, high, stop_loss=stop, take_profit=target)
+        expected = _loop_first_touch(signal, low, high, stop, target)
+        assert (None if hit is None else (hit.index, hit.reason)) == expected
+
+
+def test_stop_loss_wins_when_one_bar_touches_both():
+    hit = first_barrier_touch("BUY", [99.0, 90.0], [101.0, 120.0], stop_loss=95.0, take_profit=110.0)
+    assert (hit.index, hit.reason, hit.price) == (1, STOP_LOSS, 95.0)
+    assert first_barrier_touch("HOLD", [1.0], [2.0], stop_loss=0.5, take_profit=3.0) is None
+    assert first_barrier_touch("BUY", [], [], stop_loss=0.5, take_profit=3.0) is None
+
+
+def test_tracker_scans_only_new_bars():
+    times = pd.date_range("2024-01-01", periods=48, freq="h", tz="UTC")
+    low = np.full(48, 99.0)
+    high = np.full(48, 101.0)
+    tracker = BarrierTracker()
+    levels = {"stop_loss": 95.0, "take_profit": 110.0, "opened_at": times[0]}
+
+    assert tracker.scan(1, "BUY", open_time=times[:24], low=low[:24], high=high[:24], **levels) is None
+    # The newest bar is checked again: it may still have been forming
+    assert tracker.scan_from(1, "BUY", **levels) == times[23]
+
+    high[30] = 111.0
+    hit, bar_time = tracker.scan(1, "BUY", open_time=times[23:], low=low[23:], high=high[23:], **levels)
+    assert (hit.reason, bar_time) == (TAKE_PROFIT, times[30])
+    assert hit.index == 7
+    # Closed trades are forgotten
+    assert tracker.scan_from(1, "BUY", **levels) == times[0]
+
+
+def test_tracker_rescans_when_levels_change():
+    times = pd.date_range("2024-01-01", periods=10, freq="h", tz="UTC")
+    low = np.array([99.0, 97.0] + [99.0] * 8)
+    high = np.full(10, 101.0)
+    tracker = BarrierTracker()
+
+    assert tracker.scan(1, "BUY", stop_loss=95.0, take_profit=110.0, opened_at=times[0], open_time=times, low=low, high=high) is None
+    # A tighter stop is checked from the open again
+    since = tracker.scan_from(1, "BUY", stop_loss=98.0, take_profit=110.0, opened_at=times[0])
+    assert since == times[0]
+    hit, bar_time = tracker.scan(1, "BUY", stop_loss=98.0, take_profit=110.0, opened_at=times[0], open_time=times, low=low, high=high)
+    assert (hit.reason, bar_time) == (STOP_LOSS, times[1])
+
+
+def test_tracker_is_bounded():
+    times = pd.date_range("2024-01-01", periods=3, freq="h", tz="UTC")
+    tracker = BarrierTracker(max_trades=2)
+    for key in range(3):
+        tracker.scan(key, "BUY", stop_loss=1.0, take_profit=1e9, opened_at=times[0], open_time=times, low=np.full(3, 5.0), high=np.full(3, 6.0))
+    assert tracker.scan_from(0, "BUY", stop_loss=1.0, take_profit=1e9, opened_at=times[0]) == times[0]
+    assert tracker.scan_from(2, "BUY", stop_loss=1.0, take_profit=1e9, opened_at=times[0]) == times[2]
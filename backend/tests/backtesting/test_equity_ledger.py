@@ -0,0 +1,105 @@
+"""Tests for the array-backed equity ledger used by BacktestState."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtesting.engine import BacktestEngine, BacktestState
+from app.backtesting.equity_ledger import EquityLedger
+from app.backtesting.tracking_error import ExpandingTrackingError, TrackingErrorCalculator
+
+
+def _ledger(timestamps, chunk_size=4):
+    ledger = EquityLedger(chunk_size=chunk_size)
+    for i, ts in enumerate(timestamps):
+        ledger.append(pd.Timestamp(ts, tz="UTC"), 10_000.0 + i, 9_990.0 + i, -0.1)
+    return ledger
+
+
+def test_append_grows_past_chunk_size():
+    timestamps = pd.date_range("2020-01-01", periods=11, freq="D")
+    ledger = _ledger(timestamps, chunk_size=4)
+
+    assert len(ledger) == 11
+    np.testing.assert_array_equal(ledger.theoretical, 10_000.0 + np.arange(11))
+    latest = ledger.latest()
+    assert latest.timestamp == pd.Timestamp("2020-01-11", tz="UTC")
+    assert latest.equity_realistic == 10_000.0
+
+
+def test_at_or_before_matches_dataframe_filter():
+    timestamps = ["2020-01-01", "2020-01-02", "2020-01-02", "2020-01-05", "2020-01-09"]
+    ledger = _ledger(timestamps)
+    frame = ledger.to_frame()
+
+    for target in pd.date_range("2019-12-31", "2020-01-10", freq="12h", tz="UTC"):
+        filtered = frame[frame["timestamp"] <= target]
+        expected = None if filtered.empty else float(filtered.iloc[-1]["equity_realistic"])
+        assert ledger.realistic_at_or_before(target) == expected
+
+
+def test_to_frame_has_canonical_columns():
+    ledger = _ledger(["2020-01-01", "2020-01-02"])
+    frame = ledger.to_frame()
+
+    assert list(frame.columns) == ["timestamp", "equity_theoretical", "equity_realistic", "equity_divergence_pct"]
+    assert str(frame["timestamp"].dt.tz) == "UTC"
+    assert frame["equity_divergence_pct"].tolist() == [-0.1, -0.1]
+
+
+def test_column_views_are_read_only():
+    ledger = _ledger(["2020-01-01"])
+    with pytest.raises(ValueError):
+        ledger.realistic[0] = 0.0
+
+
+def test_backtest_state_accepts_legacy_dataframe():
+    frame = pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(["2020-01-01", "2020-01-02"], utc=True),
+            "equity_theoretical": [10_000.0, 10_100.0],
+            "equity_realistic": [10_000.0, 10_050.0],
+            "equity_divergence_pct": [0.0, -0.5],
+        }
+    )
+    state = BacktestState(
+        equity_theoretical=10_100.0,
+        equity_realistic=10_050.0,
+        peak_equity=10_050.0,
+        current_drawdown=0.0,
+        position=None,
+        open_trades=[],
+        closed_trades=[],
+        partial_fills=[],
+        rejected_orders=[],
+        active_orders=[],
+        equity_curve=frame,
+        returns_daily=[],
+        returns_weekly=[],
+        returns_monthly=[],
+    )
+    engine = BacktestEngine(use_orderbook=False)
+
+    assert isinstance(state.equity_curve, EquityLedger)
+    assert engine._get_equity_at_or_before(pd.Timestamp("2020-01-03", tz="UTC"), state) == 10_050.0
+    assert engine._get_equity_at_or_before(pd.Timestamp("2019-12-31", tz="UTC"), state) is None
+    assert engine._get_equity_at_or_before(pd.NaT, state) is None
+
+    state.update_equity(10_200.0, 10_150.0, pd.Timestamp("2020-01-03", tz="UTC"))
+    pd.testing.assert_frame_equal(
+        state.equity_curve.to_frame().iloc[:2],
+        frame,
+    )
+    assert len(state.equity_curve) == 3
+
+
+def test_expanding_tracking_error_matches_full_rescan():
+    rng = np.random.default_rng(4)
+    theoretical = 10_000.0 + np.cumsum(rng.normal(0, 25, 300))
+    realistic = theoretical - np.cumsum(rng.uniform(0, 2, 300))
+    realistic[:20] = theoretical[:20]  # constant-zero tracking error prefix
+
+    tracker = ExpandingTrackingError(bars_per_year=365 * 24)
+    for i in range(300):
+        tracker.update(theoretical[i], realistic[i])
+        expected = TrackingErrorCalculator.from_curves(theoretical[: i + 1], realistic[: i + 1], bars_per_year=365 * 24)
+        assert tracker.stats().to_dict() == pytest.approx(expected.to_dict(), rel=1e-9, abs=1e-9)
@@ -0,0 +1,117 @@
+"""Tests for BacktestEngine fast mode (columnar bar arrays)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtesting.engine import (
+    BacktestEngine,
+    BarView,
+    CandleSeries,
+    SeriesBarStrategyAdapter,
+    as_bar_view_strategy,
+)
+
+
+def _build_frame(n: int = 300) -> pd.DataFrame:
+    idx = pd.date_range("2021-01-01", periods=n, freq="1h", tz="UTC")
+    rng = np.random.default_rng(7)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame(
+        {
+            "open": close * 0.999,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": np.full(n, 1_000.0),
+            "atr": close * 0.02,
+        },
+        index=idx,
+    )
+
+
+class _FixtureEngine(BacktestEngine):
+    def __init__(self, frame: pd.DataFrame, **kwargs):
+        super().__init__(**kwargs)
+        self._frame = frame
+
+    def _load_candle_series(self, request):
+        return CandleSeries(symbol=request.instrument, timeframe=request.timeframe, data=self._frame.copy())
+
+
+class SeriesStrategy:
+    """Legacy strategy relying on pd.Series behaviour."""
+
+    def __init__(self):
+        self.bar_types = set()
+
+    def on_bar(self, ctx):
+        bar = ctx["bar"]
+        self.bar_types.add(type(bar))
+        hour = bar.name.hour
+        if hour == 2 and ctx["position"] is None:
+            price = float(bar["close"])
+            return {"action": "enter", "side": "BUY", "entry_price": price, "stop_loss": price * 0.98}
+        if hour == 20 and ctx["position"] is not None:
+            return {"action": "exit"}
+        return {"action": "hold"}
+
+
+class ViewStrategy(SeriesStrategy):
+    supports_bar_view = True
+
+
+async def _run(engine, frame, strategy, fast_mode):
+    return await engine.run_backtest(
+        frame.index[0],
+        frame.index[-1],
+        strategy=strategy,
+        fast_mode=fast_mode,
+    )
+
+
+def test_candle_arrays_are_contiguous_float64():
+    series = CandleSeries(symbol="BTCUSDT", timeframe="1h", data=_build_frame(10))
+    arrays = series.to_arrays()
+
+    assert len(arrays) == 10
+    assert arrays.column("close").dtype == np.float64
+    assert arrays.column("close").flags["C_CONTIGUOUS"]
+    assert series.to_arrays() is arrays
+
+
+def test_bar_view_matches_iterrows_row():
+    series = CandleSeries(symbol="BTCUSDT", timeframe="1h", data=_build_frame(5))
+
+    for row, view in zip(series.stream(), series.stream_views()):
+        assert isinstance(view, BarView)
+        assert view.name == row.name
+        assert view.to_dict() == row.to_dict()
+        assert view["close"] == row["close"]
+        assert view.get("missing", 1.5) == 1.5
+        pd.testing.assert_series_equal(view.to_series(), row)
+
+
+def test_legacy_strategy_is_wrapped():
+    legacy = SeriesStrategy()
+    assert isinstance(as_bar_view_strategy(legacy), SeriesBarStrategyAdapter)
+    view_strategy = ViewStrategy()
+    assert as_bar_view_strategy(view_strategy) is view_strategy
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy_cls", [SeriesStrategy, ViewStrategy])
+async def test_fast_mode_matches_legacy_loop(strategy_cls):
+    frame = _build_frame()
+    kwargs = {"use_orderbook": False, "slippage_model": "none", "commission_rate": 0.001}
+
+    legacy = await _run(_FixtureEngine(frame, **kwargs), frame, strategy_cls(), fast_mode=False)
+    fast_strategy = strategy_cls()
+    fast = await _run(_FixtureEngine(frame, **kwargs), frame, fast_strategy, fast_mode=True)
+
+    assert fast["trades"], "fixture strategy should trade"
+    assert fast["trades"] == legacy["trades"]
+    assert fast["equity_curve"] == legacy["equity_curve"]
+    assert fast["returns_per_period"] == legacy["returns_per_period"]
+    assert fast["metadata"]["fast_mode"] is True
+    expected_bar_type = BarView if strategy_cls is ViewStrategy else pd.Series
+    assert fast_strategy.bar_types == {expected_bar_type}
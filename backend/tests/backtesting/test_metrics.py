@@ -1,6 +1,13 @@
 """Tests for backtesting metrics calculation."""
+import json
+import math
+from pathlib import Path
+
+import numpy as np
 import pytest
-from app.backtesting.metrics import calculate_metrics
+from app.backtesting.metrics import MetricsEngine, calculate_metrics
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
 
 
 def test_metrics_calculation():
@@ -48,3 +55,106 @@ def test_metrics_empty_trades():
     assert metrics["total_trades"] == 0
     assert metrics["win_rate"] == 0.0
 
+
+def _sample_result() -> dict:
+    return {
+        "trades": [
+            {"pnl": 100, "return_pct": 1.0},
+            {"pnl": -50, "return_pct": -0.5},
+            {"pnl": -20, "return_pct": -0.2},
+            {"pnl": 150, "return_pct": 1.5},
+        ],
+        "equity_curve": [10000 + 5 * i for i in range(200)],
+        "initial_capital": 10000.0,
+        "final_capital": 10180.0,
+        "start_date": "2020-01-01T00:00:00",
+        "end_date": "2020-07-01T00:00:00",
+        "returns_per_period": {"daily": [0.01, -0.005, 0.002, 0.004, -0.001] * 20},
+        "seed": 7,
+    }
+
+
+def _rich_result() -> dict:
+    """Many trades, a drawdown, monthly returns and tracking error: exercises every full-tier section."""
+    rng = np.random.default_rng(11)
+    returns = rng.normal(0.3, 2.0, 80)
+    equity = 10000 * np.cumprod(1 + rng.normal(0.0004, 0.01, 365))
+    return {
+        "trades": [
+            {
+                "pnl": float(r * 100),
+                "return_pct": float(r),
+                "entry_time": f"2021-{1 + i // 8:02d}-{1 + i % 8 * 3:02d}",
+                "exit_time": f"2021-{1 + i // 8:02d}-{2 + i % 8 * 3:02d}",
+            }
+            for i, r in enumerate(returns)
+        ],
+        "equity_curve": [float(e) for e in equity],
+        "initial_capital": 10000.0,
+        "final_capital": float(equity[-1]),
+        "start_date": "2021-01-01T00:00:00",
+        "end_date": "2021-12-31T00:00:00",
+        "returns_per_period": {"monthly": [float(x) for x in rng.normal(0.01, 0.04, 12)]},
+        "tracking_error": {"mean_deviation": 0.4, "rmse": 0.7, "correlation": 0.98},
+        "seed": 3,
+    }
+
+
+def _assert_close(actual, expected, path="metrics"):
+    if isinstance(expected, dict):
+        assert sorted(map(str, actual)) == sorted(expected), path
+        for key, value in actual.items():
+            _assert_close(value, expected[str(key)], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for i, (left, right) in enumerate(zip(actual, expected)):
+            _assert_close(left, right, f"{path}[{i}]")
+    elif expected is None and isinstance(actual, float):
+        assert math.isnan(actual), path
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-12), path
+    else:
+        assert actual == expected, path
+
+
+@pytest.mark.parametrize("case, result", [("sample", _sample_result), ("rich", _rich_result)])
+def test_full_tier_matches_pre_engine_output(case, result, monkeypatch):
+    """The default tier reproduces what calculate_metrics returned before MetricsEngine (golden file)."""
+    # The risk-profile Monte Carlo draws from unseeded generators; the golden file used seed 0
+    default_rng = np.random.default_rng
+    monkeypatch.setattr(np.random, "default_rng", lambda seed=None: default_rng(0 if seed is None else seed))
+    golden = json.loads((GOLDEN_DIR / "metrics_full_tier.json").read_text())[case]
+    _assert_close(calculate_metrics(result()), golden)
+
+
+def test_minimal_tier_skips_expensive_sections():
+    """The minimal tier returns the headline stats of the full tier and nothing else."""
+    full = calculate_metrics(_sample_result())
+    minimal = calculate_metrics(_sample_result(), tier="minimal")
+
+    for key in ("risk_of_ruin", "ruin_simulation", "rolling_monthly", "periodic_returns_approx", "confidence_intervals"):
+        assert key in full
+        assert key not in minimal
+    for key in ("cagr", "sharpe", "sortino", "max_drawdown", "calmar", "total_trades", "longest_losing_streak"):
+        assert minimal[key] == full[key]
+    assert minimal["longest_losing_streak"] == 2
+
+
+def test_minimal_tier_with_extra_sections():
+    metrics = calculate_metrics(_sample_result(), tier="minimal", sections=("ruin",))
+    assert 0 <= metrics["risk_of_ruin"] <= 1
+    assert "rolling_monthly" not in metrics
+
+
+def test_unknown_tier_or_section_rejected():
+    with pytest.raises(ValueError):
+        calculate_metrics(_sample_result(), tier="medium")
+    with pytest.raises(ValueError):
+        calculate_metrics(_sample_result(), sections=("ruin", "greeks"))
+
+
+def test_metrics_engine_caches_sections():
+    engine = MetricsEngine(_sample_result())
+    periodic = engine.section("periodic")
+    assert engine.section("periodic") is periodic
+    assert len(periodic["periodic_returns_approx"]["monthly"]) == 6
@@ -0,0 +1,129 @@
+"""The batched Monte Carlo kernel reproduces the path-by-path simulations for a fixed seed."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtesting.advanced_metrics import MetricsReport
+from app.backtesting.monte_carlo import bootstrap_sampler, simulate_paths
+from app.backtesting.risk import RuinSimulator
+from app.backtesting.ruin_simulation import monte_carlo_ruin
+
+
+def _loop_ruin(returns, *, equity, ruin_threshold, n_paths, horizon, seed, n_sample_paths):
+    """Path-by-path reference: the loop ``monte_carlo_ruin`` used to run."""
+    returns = pd.Series(returns)
+    threshold_equity = equity * ruin_threshold
+    rng = np.random.default_rng(seed)
+    finals, paths, ruined = [], [], 0
+    for path_idx in range(n_paths):
+        path_returns = returns.iloc[rng.integers(0, len(returns), size=horizon)].values
+        path = [equity]
+        for ret in path_returns:
+            path.append(path[-1] * (1 + ret))
+            if path[-1] <= threshold_equity:
+                ruined += 1
+                break
+        finals.append(path[-1])
+        if path_idx < n_sample_paths:
+            paths.append(path)
+    return ruined / n_paths, finals, paths
+
+
+def _loop_bootstrap(returns, *, with_equity_curve, initial_capital, trials, seed):
+    """Per-trial reference for ``MetricsReport._bootstrap_confidence_intervals``."""
+    rng = np.random.default_rng(seed)
+    n = len(returns)
+    samples = {"cagr": [], "sharpe": [], "calmar": []}
+    for _ in range(trials):
+        sample = returns.iloc[rng.integers(0, n, size=n)]
+        total_return = (1 + sample).prod() - 1
+        years = n / 252.0
+        cagr = ((1 + total_return) ** (1 / years) - 1) * 100 if total_return > -1 else 0.0
+        std = sample.std(ddof=1)
+        annual_vol = std * np.sqrt(252) if std > 0 else 0.0
+        sharpe = (sample.mean() * 252 / annual_vol) if annual_vol > 0 else 0.0
+        if with_equity_curve:
+            equity = [initial_capital]
+            for ret in sample:
+                equity.append(equity[-1] * (1 + ret))
+            series = pd.Series(equity)
+            peak = series.expanding().max()
+            max_dd = abs(((series - peak) / peak).min()) * 100
+        else:
+            max_dd = abs(sample.min()) * 100
+        samples["cagr"].append(cagr)
+        samples["sharpe"].append(sharpe)
+        samples["calmar"].append(cagr / max_dd if max_dd > 0 else 0.0)
+    return {
+        name: {f"p{q}": float(np.percentile(values, q)) for q in (5, 50, 95)}
+        for name, values in samples.items()
+    }
+
+
+RETURNS = np.random.default_rng(0).normal(0.001, 0.05, 120)
+
+
+@pytest.mark.parametrize("seed", [1, 7])
+def test_monte_carlo_ruin_matches_path_loop(seed):
+    probability, finals, paths = _loop_ruin(
+        RETURNS, equity=10_000.0, ruin_threshold=0.5, n_paths=400, horizon=250, seed=seed, n_sample_paths=25
+    )
+    result = monte_carlo_ruin(
+        list(RETURNS),
+        ruin_threshold=0.5,
+        n_paths=400,
+        horizon_trades=250,
+        seed=seed,
+        store_sample_paths=True,
+        n_sample_paths=25,
+    )
+
+    assert 0.0 < probability < 1.0
+    assert result.ruin_probability == probability
+    assert result.distribution == finals
+    assert result.paths == paths
+
+
+@pytest.mark.parametrize("with_equity_curve", [True, False])
+def test_bootstrap_intervals_match_trial_loop(with_equity_curve):
+    returns = pd.Series(RETURNS[:60])
+    expected = _loop_bootstrap(
+        returns, with_equity_curve=with_equity_curve, initial_capital=10_000.0, trials=300, seed=3
+    )
+    actual = MetricsReport._bootstrap_confidence_intervals(
+        returns,
+        equity_curve=[10_000.0, 10_100.0] if with_equity_curve else None,
+        initial_capital=10_000.0,
+        trials=300,
+        seed=3,
+    )
+    assert actual == expected
+
+
+def test_block_size_does_not_change_results():
+    sample = bootstrap_sampler(RETURNS)
+    kwargs = dict(initial=1.0, ruin_level=0.6, drawdown=True, periods_per_year=252.0, n_sample_paths=5)
+    whole = simulate_paths(sample, 300, 50, rng=np.random.default_rng(9), **kwargs)
+    blocked = simulate_paths(sample, 300, 50, rng=np.random.default_rng(9), chunk_bytes=1, **kwargs)
+
+    for name in ("final", "min_level", "ruin_step", "max_drawdown", "worst_step", "cagr", "sharpe", "calmar"):
+        np.testing.assert_array_equal(getattr(blocked, name), getattr(whole, name))
+    assert blocked.sample_paths == whole.sample_paths
+    # Ruin is absorbing: ruined paths end at their first passage
+    ruined = whole.ruined
+    assert ruined.any()
+    assert (whole.final[ruined] <= 0.6).all()
+    np.testing.assert_array_equal(whole.final[ruined], whole.min_level[ruined])
+
+
+def test_ruin_simulator_seeded_and_consistent_across_thresholds():
+    outcomes = np.where(np.random.default_rng(4).random((2_000, 250)) < 0.4, 1.2, -1.0)
+    expected = float(round((outcomes.cumsum(axis=1).min(axis=1) <= np.log(0.5)).mean(), 4))
+
+    simulator = RuinSimulator(seed=4)
+    assert simulator.estimate(0.4, 1.2, threshold=0.5, trials=2_000) == expected
+
+    by_threshold = simulator.estimate_with_multiple_thresholds(0.4, 1.2, trials=2_000)
+    assert by_threshold["ruin_prob_50pct"] == expected
+    probabilities = list(by_threshold.values())
+    assert probabilities == sorted(probabilities, reverse=True)
@@ -0,0 +1,137 @@
+"""Process-pool campaign and walk-forward runs reproduce the serial results and order."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtesting.engine import BacktestEngine, BacktestRunRequest, CandleSeries
+from app.backtesting.optimizer import CampaignOptimizer
+from app.backtesting.validation import CampaignAbort
+from app.backtesting.walk_forward import WalkForwardPipeline
+
+
+def _build_frame(n: int = 24 * 30) -> pd.DataFrame:
+    idx = pd.date_range("2021-01-01", periods=n, freq="1h", tz="UTC")
+    rng = np.random.default_rng(5)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame(
+        {
+            "open": close * 0.999,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": np.full(n, 1_000.0),
+        },
+        index=idx,
+    )
+
+
+FRAME = _build_frame()
+
+
+class FixtureEngine(BacktestEngine):
+    def __init__(self, abort: bool = False, **kwargs):
+        kwargs.setdefault("use_orderbook", False)
+        super().__init__(**kwargs)
+        self.abort = abort
+
+    def _load_candle_series(self, request):
+        start, end = pd.Timestamp(request.start_date), pd.Timestamp(request.end_date)
+        window = FRAME[(FRAME.index >= start) & (FRAME.index <= end)]
+        return CandleSeries(symbol=request.instrument, timeframe=request.timeframe, data=window.copy())
+
+    async def run_backtest(self, *args, **kwargs):
+        if self.abort:
+            raise CampaignAbort("guardrail fired")
+        return await super().run_backtest(*args, **kwargs)
+
+
+class RandomEntryStrategy:
+    """Draws from the global RNG, so results depend on the per-task seed."""
+
+    def __init__(self, entry_prob: float = 0.05):
+        self.entry_prob = entry_prob
+
+    def on_bar(self, ctx):
+        draw = np.random.random()
+        price = float(ctx["bar"]["close"])
+        if ctx["position"] is None and draw < self.entry_prob:
+            return {"action": "enter", "side": "BUY", "entry_price": price, "stop_loss": price * 0.97}
+        if ctx["position"] is not None and draw > 0.9:
+            return {"action": "exit"}
+        return {"action": "hold"}
+
+
+def _variants(abort_at=None):
+    return [
+        {
+            "id": f"v{i}",
+            "engine_args": {"strategy": RandomEntryStrategy(0.05 + 0.02 * i)},
+            "execution_overrides": {"abort": i == abort_at},
+        }
+        for i in range(5)
+    ]
+
+
+async def _campaign(workers, variants):
+    records = []
+    optimizer = CampaignOptimizer(
+        persist_fn=records.append,
+        enable_validation=False,
+        enable_guardrails=False,
+        max_annualized_tracking_error_pct=1e9,
+        engine_factory=FixtureEngine,
+    )
+    # Under ten days keeps calculate_metrics off its bootstrap path
+    results = await optimizer.evaluate(
+        start=FRAME.index[0],
+        end=FRAME.index[0] + pd.Timedelta(days=8),
+        params_variants=variants,
+        workers=workers,
+    )
+    return results, records
+
+
+@pytest.mark.asyncio
+async def test_parallel_campaign_persists_serial_records_in_order():
+    serial, serial_records = await _campaign(1, _variants())
+    parallel, parallel_records = await _campaign(3, _variants())
+
+    assert [c.params_id for c in serial] == ["v0", "v1", "v2", "v3", "v4"]
+    assert [r["params_id"] for r in parallel_records] == [r["params_id"] for r in serial_records]
+    assert [c.metrics["total_trades"] for c in parallel] == [c.metrics["total_trades"] for c in serial]
+    assert [c.score for c in parallel] == [c.score for c in serial]
+    assert [c.status for c in parallel] == [c.status for c in serial]
+    # Seeds come from the variant id, so the random strategies differ per variant
+    assert len({c.engine_args["seed"] for c in serial}) == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [1, 2])
+async def test_campaign_abort_stops_remaining_candidates(workers):
+    results, records = await _campaign(workers, _variants(abort_at=2))
+    assert [c.params_id for c in results] == ["v0", "v1"]
+    assert [r["params_id"] for r in records] == ["v0", "v1"]
+
+
+@pytest.mark.asyncio
+async def test_parallel_walk_forward_matches_serial():
+    pipeline = WalkForwardPipeline(walk_forward_train_days=6, walk_forward_test_days=4, oos_days=4)
+    request = BacktestRunRequest(
+        instrument="BTCUSDT",
+        timeframe="1h",
+        start_date=FRAME.index[0],
+        end_date=FRAME.index[-1],
+        strategy=RandomEntryStrategy(0.05),
+    )
+
+    def scorer(metrics):
+        return metrics.get("total_trades", 0) + metrics.get("total_return", 0.0)
+
+    serial = await pipeline.run_walk_forward(FixtureEngine(), request, scorer, dd_limit=1.0)
+    parallel = await pipeline.run_walk_forward(FixtureEngine(), request, scorer, dd_limit=1.0, workers=3)
+
+    assert len(serial.windows) >= 3
+    assert len(serial.test_scores) == len(serial.windows)
+    assert parallel.train_scores == serial.train_scores
+    assert parallel.test_scores == serial.test_scores
+    assert [r["final_capital"] for r in parallel.test_results] == [r["final_capital"] for r in serial.test_results]
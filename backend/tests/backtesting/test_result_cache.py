@@ -0,0 +1,99 @@
+"""Content-addressed cache of the pre-publish validation backtest."""
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from app.backtesting.result_cache import BacktestCacheKey, BacktestResultCache
+
+METRICS = {"sharpe": 1.4, "max_drawdown": 12.0, "cagr": 30.0}
+
+
+def _key(**overrides) -> BacktestCacheKey:
+    key = BacktestCacheKey(
+        dataset_version="d" * 64,
+        params_digest="p" * 64,
+        code_commit="c" * 40,
+        seed=42,
+        start="2024-01-01T00:00:00+00:00",
+        end="2024-04-01T00:00:00+00:00",
+        settings={"commission_rate": 0.001, "slippage_bps": 5.0},
+    )
+    return replace(key, **overrides)
+
+
+@pytest.fixture
+def cache(tmp_path) -> BacktestResultCache:
+    return BacktestResultCache(tmp_path / "cache", max_entries=3, max_age=timedelta(days=1))
+
+
+def test_identical_inputs_are_served_from_disk(cache, tmp_path):
+    assert cache.get(_key()) is None
+    cache.put(_key(), metrics=METRICS, execution_stats={"avg_slippage_bps": 4.2}, run_id="abc123", compute_seconds=8.5)
+
+    # A new process sees the same entry
+    entry = BacktestResultCache(tmp_path / "cache").get(_key())
+    assert entry.metrics == METRICS
+    assert entry.run_id == "abc123"
+    assert entry.execution_stats == {"avg_slippage_bps": 4.2}
+    assert entry.key["code_commit"] == "c" * 40 and entry.compute_seconds == 8.5
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 1
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"dataset_version": "e" * 64},
+        {"params_digest": "q" * 64},
+        {"code_commit": "f" * 40},
+        {"seed": 7},
+        {"end": "2024-04-02T00:00:00+00:00"},
+        {"settings": {"commission_rate": 0.002, "slippage_bps": 5.0}},
+    ],
+)
+def test_any_input_change_misses(cache, change):
+    cache.put(_key(), metrics=METRICS, run_id="abc123")
+    assert cache.get(_key(**change)) is None
+    assert cache.get(_key()) is not None
+
+
+def test_unknown_versions_bypass_the_cache(cache):
+    key = _key(code_commit="unknown")
+    assert cache.put(key, metrics=METRICS) is None
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_eviction_by_capacity_keeps_recently_used(cache):
+    keys = [_key(seed=seed) for seed in range(4)]
+    for age, key in enumerate(keys[:3]):
+        cache.put(key, metrics=METRICS)
+        path = cache.base_path / f"{key.digest()}.json"
+        os.utime(path, (time.time() - 100 + age, time.time() - 100 + age))
+    cache.get(keys[0])  # touched: no longer the least recently used
+
+    cache.put(keys[3], metrics=METRICS)
+
+    assert cache.get(keys[1]) is None
+    assert all(cache.get(key) is not None for key in (keys[0], keys[2], keys[3]))
+    assert cache.stats()["evictions"] == {"capacity": 1}
+
+
+def test_expired_and_corrupt_entries_are_evicted(cache):
+    cache.put(_key(seed=1), metrics=METRICS)
+    path = cache.base_path / f"{_key(seed=1).digest()}.json"
+    data = json.loads(path.read_text())
+    data["created_at"] = "2000-01-01T00:00:00"
+    path.write_text(json.dumps(data))
+    assert cache.get(_key(seed=1)) is None
+    assert not path.exists()
+
+    cache.put(_key(seed=2), metrics=METRICS)
+    (cache.base_path / f"{_key(seed=2).digest()}.json").write_text("{not json")
+    assert cache.get(_key(seed=2)) is None
+    assert cache.stats()["evictions"] == {"age": 1, "corrupt": 1}
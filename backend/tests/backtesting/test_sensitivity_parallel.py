@@ -0,0 +1,116 @@
+"""Parameter sweeps use in-memory overrides and can run on a process pool."""
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtesting.engine import BacktestEngine, CandleSeries
+from app.backtesting.sensitivity import SensitivityRunner
+from app.backtesting.sweep import SharedCandles
+from app.quant.config_manager import active_signal_params, get_signal_config_manager, signal_params_override
+from app.quant.strategies import momentum_strategy
+
+
+def _build_frame(n: int = 240) -> pd.DataFrame:
+    idx = pd.date_range("2021-01-01", periods=n, freq="1h", tz="UTC")
+    rng = np.random.default_rng(11)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame(
+        {
+            "open": close * 0.999,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": np.full(n, 1_000.0),
+            "trades": np.arange(n, dtype=np.int64),
+        },
+        index=idx,
+    )
+
+
+FRAME = _build_frame()
+
+
+class FixtureEngine(BacktestEngine):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("use_orderbook", False)
+        super().__init__(**kwargs)
+
+    def _load_candle_series(self, request):
+        return CandleSeries(symbol=request.instrument, timeframe=request.timeframe, data=FRAME.copy())
+
+
+class HourStrategy:
+    """Enters at the hour given by ``breakout.lookback`` and exits six hours later."""
+
+    def on_bar(self, ctx):
+        bar = ctx["bar"]
+        entry_hour = int(active_signal_params()["breakout"]["lookback"]) % 24
+        if bar.name.hour == entry_hour and ctx["position"] is None:
+            price = float(bar["close"])
+            return {"action": "enter", "side": "BUY", "entry_price": price, "stop_loss": price * 0.98}
+        if bar.name.hour == (entry_hour + 6) % 24 and ctx["position"] is not None:
+            return {"action": "exit"}
+        return {"action": "hold"}
+
+
+def _params_file_digest() -> str:
+    return hashlib.sha256(get_signal_config_manager().config_path.read_bytes()).hexdigest()
+
+
+def test_override_is_scoped_nested_and_never_written():
+    digest = _params_file_digest()
+    base = active_signal_params()
+
+    with signal_params_override({"momentum": {"confidence_buy": 99.0}}) as outer:
+        assert outer["momentum"]["confidence_buy"] == 99.0
+        assert outer["breakout"] == base["breakout"]
+        with signal_params_override({"breakout": {"lookback": 3}}):
+            inner = active_signal_params()
+            assert inner["breakout"]["lookback"] == 3
+            assert inner["momentum"]["confidence_buy"] == 99.0
+        assert active_signal_params()["breakout"] == base["breakout"]
+
+        # Strategies read the overlay at call time
+        close = pd.Series(np.linspace(100, 200, 250))
+        df = pd.DataFrame({"close": close})
+        ind = {
+            "ema_9": close - 1,
+            "ema_21": close - 2,
+            "ema_50": close - 3,
+            "sma_200": close - 4,
+            "macd": pd.Series(np.ones(250)),
+            "macd_signal": pd.Series(np.zeros(250)),
+        }
+        assert momentum_strategy(df, ind)["confidence"] == 99.0
+
+    assert active_signal_params() == base
+    assert _params_file_digest() == digest
+
+
+def test_shared_candles_round_trip_read_only(tmp_path):
+    series = CandleSeries(symbol="BTCUSDT", timeframe="1h", data=FRAME.copy())
+    shared = SharedCandles.export(series, tmp_path)
+    loaded = shared.load()
+
+    pd.testing.assert_frame_equal(loaded, series.data, check_freq=False)
+    with pytest.raises(ValueError):
+        loaded["close"].to_numpy()[0] = 0.0
+
+
+def test_parallel_sweep_matches_serial_in_grid_order():
+    digest = _params_file_digest()
+    grid = {"breakout.lookback": [1, 2, 3, 4, 5, 6]}
+    base = {"engine_args": {"strategy": HourStrategy()}}
+    runner = SensitivityRunner(engine_factory=FixtureEngine)
+    kwargs = dict(start_date=FRAME.index[0], end_date=FRAME.index[-1], base_params=base)
+
+    serial = runner.run(grid, workers=1, **kwargs)
+    parallel = runner.run(grid, workers=3, **kwargs)
+
+    assert list(parallel["breakout.lookback"]) == grid["breakout.lookback"]
+    assert serial["total_trades"].gt(0).all()
+    assert serial["sharpe"].nunique() > 1
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert _params_file_digest() == digest
@@ -0,0 +1,13 @@
+"""Shared test fixtures."""
+import pytest
+
+from app.data import storage
+
+
+@pytest.fixture
+def isolated_data_root(tmp_path, monkeypatch):
+    """Point the raw and curated data roots at a per-test temporary directory."""
+    monkeypatch.setattr(storage, "DATA_ROOT", tmp_path / "data")
+    monkeypatch.setattr(storage, "RAW_ROOT", tmp_path / "data" / "raw")
+    monkeypatch.setattr(storage, "CURATED_ROOT", tmp_path / "data" / "curated")
+    return tmp_path
@@ -0,0 +1,119 @@
+"""Shared indicator cache keyed by curated dataset fingerprint."""
+import numpy as np
+import pandas as pd
+import pytest
+from prometheus_client import REGISTRY
+
+from app.indicators.cache import DatasetFingerprint, IndicatorCache, get_indicator_cache, tag_source
+from app.indicators.technical import TechnicalIndicators
+from app.quant import indicators as ind
+from app.quant.regime import RegimeClassifier
+
+
+def _curated(tmp_path, n=400, name="latest.parquet"):
+    rng = np.random.default_rng(5)
+    close = 30_000 + np.cumsum(rng.normal(0, 50, n))
+    df = pd.DataFrame(
+        {
+            "open_time": pd.date_range("2024-01-01", periods=n, freq="1h", tz="UTC"),
+            "open": close,
+            "high": close + 20,
+            "low": close - 20,
+            "close": close,
+            "volume": rng.uniform(1, 10, n),
+        }
+    )
+    path = tmp_path / name
+    df.to_parquet(path, index=False)
+    return tag_source(pd.read_parquet(path), path)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    get_indicator_cache().clear()
+    yield
+    get_indicator_cache().clear()
+
+
+def _hits(name):
+    return REGISTRY.get_sample_value("indicator_cache_hits_total", {"indicator": name}) or 0.0
+
+
+def test_consumers_share_series_for_the_same_curated_frame(tmp_path):
+    df = _curated(tmp_path)
+    cache = get_indicator_cache()
+
+    first = ind.calculate_all(df)
+    misses = cache.stats()["misses"]
+    hits_before = _hits("ema")
+
+    second = ind.calculate_all(df)
+    assert cache.stats()["misses"] == misses
+    assert second["ema_9"] is first["ema_9"]
+    pd.testing.assert_series_equal(first["ema_50"], ind.ema(df, 50))
+
+    # TechnicalIndicators uses the same EMA/ATR/Bollinger formulas and reuses them
+    technical = TechnicalIndicators.calculate_all(df)
+    assert technical["ema_21"] is cache.indicator(df, "ema", period=21)
+    assert technical["atr"] is cache.indicator(df, "atr", period=14)
+    assert _hits("ema") > hits_before
+
+    features = RegimeClassifier(method="kmeans").extract_features(df)
+    assert RegimeClassifier(method="kmeans").extract_features(df) is features
+
+
+def test_fingerprint_tracks_loads_and_rewrites(tmp_path):
+    df = _curated(tmp_path)
+    fingerprint = DatasetFingerprint.from_frame(df)
+    assert fingerprint is not None
+    # A second load of the same file shares entries; slices and copies are not the dataset
+    assert DatasetFingerprint.from_frame(tag_source(df.copy(), tmp_path / "latest.parquet")) == fingerprint
+    assert DatasetFingerprint.from_frame(df.iloc[:-1]) is None
+    assert DatasetFingerprint.from_frame(df.copy()) is None
+
+    rewritten = _curated(tmp_path, n=400)
+    if rewritten.attrs["dataset_source"] == df.attrs["dataset_source"]:
+        pytest.skip("filesystem mtime resolution too coarse")
+    assert DatasetFingerprint.from_frame(rewritten) != fingerprint
+
+
+def test_derived_frames_are_computed_not_served_from_the_cache(tmp_path):
+    df = _curated(tmp_path)
+    original = ind.calculate_all(df)["ema_21"]
+
+    doubled = df.copy()
+    doubled["close"] *= 2
+    pd.testing.assert_series_equal(ind.calculate_all(doubled)["ema_21"], original * 2)
+
+    # Per-bar prefixes, as the non-precomputed DailyStrategyAdapter passes them
+    stats = get_indicator_cache().stats()
+    for end in range(300, 350):
+        prefix = df.iloc[:end].copy()
+        pd.testing.assert_series_equal(ind.calculate_all(prefix)["ema_21"], original.iloc[:end])
+        TechnicalIndicators.calculate_all(df.iloc[:end])
+    assert get_indicator_cache().stats() == stats
+
+
+def test_untagged_frames_bypass_the_cache(tmp_path):
+    df = _curated(tmp_path)
+    df.attrs.clear()
+    ind.calculate_all(df)
+    assert get_indicator_cache().stats() == {"entries": 0, "bytes": 0, "hits": 0, "misses": 0}
+
+
+def test_lru_eviction_by_entries_and_bytes(tmp_path):
+    df = _curated(tmp_path)
+    cache = IndicatorCache(max_entries=3)
+    for period in (5, 10, 20, 40):
+        cache.indicator(df, "ema", period=period)
+    assert cache.stats()["entries"] == 3
+    cache.indicator(df, "ema", period=10)  # refresh 10, then 20 is the oldest
+    cache.indicator(df, "ema", period=80)
+    calls = []
+    cache.get_or_compute(df, "ema", lambda: calls.append(1) or ind.ema(df, 10), period=10)
+    assert not calls
+
+    small = IndicatorCache(max_bytes=ind.ema(df, 5).memory_usage(index=True) + 1)
+    small.indicator(df, "ema", period=5)
+    small.indicator(df, "ema", period=6)
+    assert small.stats()["entries"] == 1
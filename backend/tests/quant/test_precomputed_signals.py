@@ -0,0 +1,107 @@
+"""Precomputed signal engine must reproduce generate_signal on every history prefix."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtesting.daily_strategy_adapter import DailyStrategyAdapter
+from app.quant import indicators as ind
+from app.quant.precomputed_signals import PrecomputedSignalEngine
+from app.quant.signal_engine import DailySignalEngine, generate_signal
+
+
+def _frames(days: int = 220, hourly_days: int = 12, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2023-01-01", periods=days * 24, freq="1h", tz="UTC")
+    # Alternating 40-day up/down regimes so the fixture produces BUY and SELL signals
+    drift = np.where(np.arange(len(idx)) // (24 * 40) % 2 == 0, 0.0008, -0.0006)
+    close = 30_000 * np.exp(np.cumsum(drift + rng.normal(0, 0.004, len(idx))))
+    # Flat stretch inside the hourly window -> RSI gaps that get back-filled
+    close[-150:-125] = close[-151]
+    df_1h = pd.DataFrame(
+        {
+            "open": close * (1 + rng.normal(0, 0.001, len(close))),
+            "high": close * 1.003,
+            "low": close * 0.997,
+            "close": close,
+            "volume": rng.uniform(10, 100, len(close)),
+        },
+        index=idx,
+    )
+    df_1d = df_1h.resample("1D").agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+    df_1d["volume"] *= np.where(np.arange(len(df_1d)) % 17 == 0, 3.0, 1.0)
+    df_1d["open_time"] = df_1d.index
+    return df_1h.iloc[-hourly_days * 24:].copy(), df_1d
+
+
+def _prefix_signal(df_1h, df_1d, ts, **kwargs):
+    return generate_signal(df_1h[df_1h.index <= ts], df_1d[df_1d.index <= ts], **kwargs)
+
+
+@pytest.mark.parametrize("curated", [False, True])
+def test_payload_matches_generate_signal(curated):
+    df_1h, df_1d = _frames()
+    if curated:
+        df_1d["rsi_14"] = ind.rsi_raw(df_1d)
+        df_1d["atr_14"] = ind.atr(df_1d)
+        df_1h["rsi_14"] = ind.rsi_raw(df_1h)
+    engine = PrecomputedSignalEngine(df_1h, df_1d, mc_trials=200)
+
+    timestamps = list(df_1h.index[-120::5]) + [df_1h.index[0]]
+    signals = set()
+    for ts in timestamps:
+        expected = _prefix_signal(df_1h, df_1d, ts, mc_trials=200)
+        actual = engine.generate(ts)
+        assert actual == expected, ts
+        signals.add(actual["signal"])
+    assert {"BUY", "SELL"} & signals
+
+    assert engine.generate(df_1h.index[0] - pd.Timedelta(hours=1)) is None
+
+
+def test_cached_daily_plan_is_not_mutated_by_callers():
+    df_1h, df_1d = _frames()
+    engine = PrecomputedSignalEngine(df_1h, df_1d, mc_trials=50)
+    ts = df_1h.index[-3]
+
+    first = engine.generate(ts, seed=7)
+    first["entry_range"]["optimal"] = -1.0
+    first["signals"][0]["signal"] = "corrupted"
+
+    assert engine.generate(ts, seed=7) == _prefix_signal(df_1h, df_1d, ts, mc_trials=50, seed=7)
+
+
+def test_adapter_precompute_matches_per_bar_adapter():
+    df_1h, df_1d = _frames()
+    signal_engine = DailySignalEngine(mc_trials=50)
+    legacy = DailyStrategyAdapter(signal_engine, df_1h, df_1d)
+    fast = DailyStrategyAdapter(signal_engine, df_1h, df_1d, precompute=True)
+    assert fast._precomputed is not None
+
+    # Crosses a daily close so both the memoized and the fresh daily path are exercised
+    for ts in df_1h.index[-30:-10]:
+        ctx = {"bar": pd.Series({"close": df_1h.at[ts, "close"]}, name=ts)}
+        assert fast.on_bar(ctx) == legacy.on_bar(ctx)
+
+
+def test_adapter_falls_back_when_history_cannot_be_precomputed():
+    df_1h, df_1d = _frames(days=60, hourly_days=3)
+    shuffled = df_1h.sample(frac=1.0, random_state=0)
+
+    adapter = DailyStrategyAdapter(DailySignalEngine(), shuffled, df_1d, precompute=True)
+    assert adapter._precomputed is None
+
+    class CustomEngine(DailySignalEngine):
+        def generate(self, df_1h, df_1d, seed=None):
+            return {"signal": "HOLD"}
+
+    adapter = DailyStrategyAdapter(CustomEngine(), df_1h, df_1d, precompute=True)
+    assert adapter._precomputed is None
+
+
+def test_only_the_current_daily_candle_is_memoized():
+    df_1h, df_1d = _frames()
+    engine = PrecomputedSignalEngine(df_1h, df_1d, mc_trials=50)
+
+    for ts in df_1h.index[-60:]:
+        engine.generate(ts)
+        assert engine._daily[0] == engine.locate(ts)[1]
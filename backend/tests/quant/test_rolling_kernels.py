@@ -0,0 +1,56 @@
+"""Vectorised rolling kernels must match the rolling.apply implementations they replace."""
+import numpy as np
+import pandas as pd
+
+from app.indicators.rolling import rolling_max, rolling_min, rolling_slope, rolling_std, rolling_weighted_mean
+from app.quant.factors import divergence, slope
+
+
+def _series(n=600, seed=7):
+    rng = np.random.default_rng(seed)
+    price = pd.Series(30_000 + np.cumsum(rng.normal(0, 50, n)))
+    price.iloc[[3, 250, 251]] = np.nan
+    volume = pd.Series(rng.uniform(0, 10, n))
+    return price, volume
+
+
+def test_weighted_mean_matches_np_average_windows():
+    price, volume = _series()
+    expected = price.rolling(55, min_periods=30).apply(lambda x: np.average(x, weights=volume.loc[x.index]))
+    actual = rolling_weighted_mean(price, volume, 55, min_periods=30)
+    np.testing.assert_allclose(actual, expected.to_numpy(), rtol=1e-12)
+    # Zero total weight is NaN rather than ZeroDivisionError
+    assert np.isnan(rolling_weighted_mean([1.0, 2.0], [0.0, 0.0], 2, min_periods=1)).all()
+
+
+def test_min_max_std_match_pandas():
+    price, _ = _series()
+    np.testing.assert_array_equal(rolling_max(price, 14), price.rolling(14).apply(np.nanmax).to_numpy())
+    np.testing.assert_array_equal(rolling_min(price, 14), price.rolling(14).apply(np.nanmin).to_numpy())
+    np.testing.assert_allclose(rolling_std(price, 30), price.rolling(30).std().to_numpy(), rtol=1e-9)
+    assert np.isnan(rolling_max(price.iloc[:5], 14)).all()
+
+
+def test_factors_slope_and_divergence_match_legacy():
+    price, _ = _series()
+    x = np.arange(20)
+    legacy_slope = price.rolling(20).apply(lambda y: np.polyfit(x, np.array(y), 1)[0], raw=False)
+    np.testing.assert_allclose(slope(price, 20).to_numpy(), legacy_slope.to_numpy(), rtol=1e-7, atol=1e-9)
+    np.testing.assert_allclose(rolling_slope(np.arange(10.0) * 3.0, 5)[4:], 3.0)
+
+    rng = np.random.default_rng(3)
+    osc = pd.Series(rng.uniform(0, 100, len(price)))
+    hh_price, hh_osc = price.rolling(14).apply(np.nanmax), osc.rolling(14).apply(np.nanmax)
+    ll_price, ll_osc = price.rolling(14).apply(np.nanmin), osc.rolling(14).apply(np.nanmin)
+    bear = ((price >= hh_price) & (osc <= hh_osc.shift(1))).astype(int)
+    bull = ((price <= ll_price) & (osc >= ll_osc.shift(1))).astype(int)
+    pd.testing.assert_series_equal(divergence(price, osc, 14), bull - bear)
+
+
+def test_last_window_alone_gives_identical_bits():
+    price, volume = _series(n=5_000, seed=11)
+    price, volume = price.ffill().to_numpy(), volume.to_numpy()
+    assert rolling_slope(price, 20)[-1] == rolling_slope(price[-20:], 20)[-1]
+    assert rolling_std(price, 90)[-1] == rolling_std(price[-90:], 90)[-1]
+    full = rolling_weighted_mean(price, volume, 55, min_periods=30)[-1]
+    assert full == rolling_weighted_mean(price[-55:], volume[-55:], 55, min_periods=30)[-1]
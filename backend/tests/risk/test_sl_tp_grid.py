@@ -0,0 +1,94 @@
+"""The batched SL/TP grid evaluator matches a trade-by-trade replay of every combination."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.risk import StopLossTakeProfitOptimizer
+from app.risk.sl_tp_grid import TradeArrays, evaluate_grid
+from app.risk.sl_tp_optimizer import DEFAULT_SEARCH_SPACE
+
+
+def _replay(df: pd.DataFrame, params: dict[str, float], rr_floor: float) -> dict[str, float]:
+    """Row-by-row reference of the optimizer's evaluation."""
+    pnl_r, rr_values, curve = [], [], []
+    for _, row in df.iterrows():
+        atr = float(row.get("atr") or row.get("atr_14") or 0.0)
+        if atr <= 0:
+            continue
+        mae, mfe = abs(float(row["mae"])), abs(float(row["mfe"]))
+        sl = max(atr * params["atr_multiplier_sl"], 1e-8)
+        reward = max(atr * params["atr_multiplier_tp"] * params["tp_ratio"], sl * rr_floor)
+        rr = reward / sl
+        rr_values.append(rr)
+        hit_sl, hit_tp = mae >= sl, mfe >= reward
+        if hit_sl and hit_tp:
+            outcome = -1.0 if mae / sl <= mfe / reward else rr
+        elif hit_sl:
+            outcome = -1.0
+        elif hit_tp:
+            outcome = rr
+        else:
+            outcome = float(row["pnl"]) / sl
+        buffer = params["breakeven_buffer_pct"]
+        if buffer > 0 and hit_tp and mfe >= buffer * reward:
+            outcome = max(outcome, 0.0)
+        pnl_r.append(outcome)
+        curve.append(1.0 + sum(pnl_r))
+
+    series = pd.Series(curve)
+    max_dd = abs(float((series / series.cummax() - 1.0).min()))
+    total_return = series.iloc[-1] / series.iloc[0] - 1.0
+    years = max(len(series) / 252.0, 1e-6)
+    cagr = (1.0 + total_return) ** (1.0 / years) - 1.0 if total_return >= -0.99 else -1.0
+    losses = -sum(x for x in pnl_r if x < 0)
+    return {
+        "calmar": (float("inf") if cagr > 0 else 0.0) if max_dd == 0 else cagr / max_dd,
+        "profit_factor": float("inf") if losses == 0 else sum(x for x in pnl_r if x > 0) / losses,
+        "hit_rate": float(np.mean([x > 0 for x in pnl_r])),
+        "avg_rr": float(np.mean(rr_values)),
+        "expectancy_r": float(np.mean(pnl_r)),
+        "max_drawdown": max_dd,
+    }
+
+
+def _random_trades(n: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    atr = rng.uniform(100, 300, n)
+    atr[::17] = 0.0  # no ATR: skipped
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=n, freq="D", tz="UTC"),
+            "atr": atr,
+            "atr_14": rng.uniform(100, 300, n),
+            "mae": rng.uniform(0, 600, n),
+            "mfe": rng.uniform(0, 1500, n),
+            "pnl": rng.normal(20, 150, n),
+        }
+    )
+
+
+def test_grid_matches_replay_for_every_combination(tmp_path):
+    trades = _random_trades(120)
+    optimizer = StopLossTakeProfitOptimizer(artifacts_dir=tmp_path / "sl_tp")
+    combos = optimizer._generate_search_combinations(DEFAULT_SEARCH_SPACE, "grid")
+    grid = evaluate_grid(TradeArrays.from_frame(trades), combos, rr_floor=1.2)
+
+    assert len(grid) == len(combos) == 180
+    for index in range(0, len(combos), 7):
+        expected = _replay(trades, combos[index], rr_floor=1.2)
+        for name, value in expected.items():
+            assert getattr(grid, name)[index] == pytest.approx(value, rel=1e-9), (name, combos[index])
+
+
+def test_search_picks_highest_score_and_optimize_runs(tmp_path):
+    trades = _random_trades(200)
+    optimizer = StopLossTakeProfitOptimizer(artifacts_dir=tmp_path / "sl_tp", train_days=60, test_days=20)
+    combos = optimizer._generate_search_combinations(DEFAULT_SEARCH_SPACE, "grid")
+
+    best_params, metrics = optimizer._search_params(TradeArrays.from_frame(trades), combos)
+    scores = [optimizer._score(optimizer._evaluate_params(TradeArrays.from_frame(trades), c)) for c in combos]
+    assert best_params == combos[int(np.argmax(scores))]
+    assert optimizer._score(metrics) == pytest.approx(max(scores))
+
+    configs = optimizer.optimize(trades.assign(symbol="BTCUSDT", regime="trend"), symbol="BTCUSDT")
+    assert len(configs["trend"]["windows"]) >= 3
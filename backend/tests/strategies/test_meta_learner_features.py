@@ -0,0 +1,115 @@
+"""Set-based signal_outcomes reads and the vectorized meta-learner feature matrix."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.db.models import SignalOutcomeORM
+from app.signals.outcomes import json_fields, load_recommendation_signals, load_signal_outcomes
+from app.strategies.meta_learner import MetaLearner
+
+STRATEGIES = ["momentum_trend", "mean_reversion", "breakout", "other"]
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'outcomes.db'}")
+    Base.metadata.create_all(bind=engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with sessionmaker(bind=engine)() as db:
+        db.info["statements"] = statements
+        yield db
+    engine.dispose()
+
+
+def _seed(db, rows: int = 240, seed: int = 3) -> None:
+    rng = np.random.default_rng(seed)
+    start = datetime.utcnow() - timedelta(days=30)
+    for i in range(rows):
+        features = {"volatility_30": float(rng.random()), "atr_14": float(rng.random() * 50), "rsi": float(rng.random() * 100)}
+        db.add(
+            SignalOutcomeORM(
+                recommendation_id=int(rng.integers(1, 40)) if rng.random() < 0.8 else None,
+                strategy_id=str(rng.choice(STRATEGIES)),
+                signal=str(rng.choice(["BUY", "SELL", "HOLD"])),
+                decision_timestamp=start + timedelta(hours=i),
+                confidence_raw=float(rng.random() * 100),
+                market_regime=rng.choice(["bull", "bear", "range", "neutral", None]),
+                vol_bucket=rng.choice(["low", "balanced", "high", None]),
+                features_regimen=features if rng.random() < 0.7 else {},
+                outcome=str(rng.choice(["win", "loss", "open"])),
+                pnl_pct=float(rng.normal()),
+            )
+        )
+    db.commit()
+
+
+def _row_by_row(db, outcomes) -> np.ndarray:
+    """Features as the training script built them: one query and one MetaLearner per row."""
+    vectors = []
+    for row in db.query(SignalOutcomeORM).filter(SignalOutcomeORM.id.in_(outcomes["id"].tolist())).order_by(
+        SignalOutcomeORM.decision_timestamp, SignalOutcomeORM.id
+    ):
+        related = (
+            db.query(SignalOutcomeORM).filter(SignalOutcomeORM.recommendation_id == row.recommendation_id).all()
+            if row.recommendation_id
+            else [row]
+        )
+        signals = [{"strategy": sig.strategy_id, "signal": sig.signal, "confidence": sig.confidence_raw} for sig in related]
+        regime = {
+            "regime": row.market_regime or "neutral",
+            "vol_bucket": row.vol_bucket or "unknown",
+            "features_regimen": row.features_regimen or {},
+        }
+        volatility = {}
+        if row.features_regimen:
+            volatility = {
+                "volatility": row.features_regimen.get("volatility_30", 0.0),
+                "atr": row.features_regimen.get("atr_14", 0.0),
+            }
+        vectors.append(MetaLearner().build_features(signals, regime, volatility))
+    return np.vstack(vectors)
+
+
+def test_feature_matrix_matches_build_features(session):
+    _seed(session)
+    session.info["statements"].clear()
+
+    outcomes = load_signal_outcomes(session, closed_only=True)
+    related = load_recommendation_signals(session, outcomes["recommendation_id"])
+    assert len(session.info["statements"]) == 2
+
+    matrix = MetaLearner.build_feature_matrix(outcomes, related)
+    assert set(outcomes["outcome"]) <= {"win", "loss"}
+    assert matrix.dtype == np.float32
+    np.testing.assert_array_equal(matrix, _row_by_row(session, outcomes))
+
+
+def test_loaders_filter_and_chunk(session):
+    _seed(session)
+    session.info["statements"].clear()
+
+    outcomes = load_signal_outcomes(session, market_regimes=["bull"], vol_buckets=["low", "high"])
+    assert set(outcomes["market_regime"]) == {"bull"} and set(outcomes["vol_bucket"]) <= {"low", "high"}
+    assert outcomes["decision_timestamp"].is_monotonic_increasing
+
+    related = load_recommendation_signals(session, range(1, 40), chunk_size=10)
+    assert len(session.info["statements"]) == 1 + 4
+    assert related.equals(related.sort_values(["recommendation_id", "id"]))
+    assert MetaLearner.build_feature_matrix(outcomes.iloc[:0], related.iloc[:0]).shape == (0, 23)
+
+
+def test_json_fields_defaults():
+    import pandas as pd
+
+    values = pd.Series([{"a": None, "b": 2}, None, "not a dict", {"a": 3}], index=[5, 6, 7, 8])
+    frame = json_fields(values, {"a": 0.0, "b": 1})
+    assert list(frame.index) == [5, 6, 7, 8]
+    assert frame["a"].tolist() == [0.0, 0.0, 0.0, 3.0]
+    assert frame["b"].tolist() == [2, 1, 1, 1]
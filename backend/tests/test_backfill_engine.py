@@ -0,0 +1,148 @@
+"""Resumable, concurrent historical backfill into the monthly KlineStore partitions."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.data.backfill_engine import STAGING_DIR, BackfillEngine
+from app.data.curation import DataCuration
+from app.data.exchanges.base import Candle
+from app.data.kline_store import KlineStore
+from app.db import crud
+
+START = datetime(2024, 1, 30, tzinfo=timezone.utc)
+END = datetime(2024, 2, 2, tzinfo=timezone.utc)
+
+
+class FakeSource:
+    """Hourly candles for any window; fails the windows listed in ``fail_starts``."""
+
+    def __init__(self, venue: str, fail_starts: set[datetime] | None = None) -> None:
+        self.venue = venue
+        self.fail_starts = fail_starts or set()
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_candles(self, symbol, interval, start=None, end=None, limit=1000):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.005)
+        finally:
+            self.in_flight -= 1
+        if start in self.fail_starts:
+            raise ConnectionError("venue down")
+        candles = []
+        cursor = start
+        # Inclusive end, like the venues: adjacent windows share a candle
+        while cursor <= end:
+            price = 100.0 + (int(cursor.timestamp()) // 3600 % 24) * 0.1
+            extras = {"quote_volume": 10.0 * price, "trades": 5.0, "taker_buy_base": 4.0, "taker_buy_quote": 4.0 * price}
+            candles.append(
+                Candle(
+                    cursor, cursor + timedelta(minutes=59), price, price + 0.5, price - 0.5, price + 0.1, 10.0,
+                    self.venue, symbol, extras,
+                )
+            )
+            cursor += timedelta(hours=1)
+        return candles
+
+
+@pytest.fixture
+def session_factory(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    # A file database: workers checkpoint from several threads at once
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _engine(sources, session_factory, **kwargs) -> BackfillEngine:
+    return BackfillEngine(sources, session_factory=session_factory, retry_backoff_seconds=0.0, **kwargs)
+
+
+def test_windows_split_at_month_boundaries():
+    engine = BackfillEngine([FakeSource("coinbase")])
+    job = engine.job("BTCUSDT", "1h", START, END, candles_per_window=24)
+
+    windows = job.windows()
+    assert [(start.day, end.day, partition) for start, end, partition in windows] == [
+        (30, 31, "2024-01"),
+        (31, 1, "2024-01"),
+        (1, 2, "2024-02"),
+    ]
+    assert job.key == engine.job("BTCUSDT", "1h", START, END, candles_per_window=24).key
+
+
+def test_run_coalesces_monthly_partitions(session_factory):
+    sources = [FakeSource("coinbase"), FakeSource("bitstamp")]
+    engine = _engine(sources, session_factory, workers=3)
+    job = engine.job("BTCUSDT", "1h", START, END, candles_per_window=6)
+
+    summary = asyncio.run(engine.run([job]))[job.key]
+
+    assert summary["done_windows"] == 12 and summary["failed_windows"] == 0
+    assert summary["remaining_windows"] == 0
+    assert sorted(summary["partitions_coalesced"]) == ["2024-01", "2024-02"]
+    assert 1 < sources[0].max_in_flight <= 3
+    for source in sources:
+        january = pd.read_parquet(KlineStore(source.venue, "BTCUSDT", "1h").partition_path("2024-01"))
+        # 30 Jan 00:00 .. 31 Jan 23:00: the 1 Feb 00:00 candle belongs to February only
+        assert len(january) == 48
+        assert january["open_time"].max() == datetime(2024, 1, 31, 23, tzinfo=timezone.utc)
+        february = pd.read_parquet(KlineStore(source.venue, "BTCUSDT", "1h").partition_path("2024-02"))
+        assert len(february) == 24
+        assert january["open_time"].is_monotonic_increasing
+        assert (january["relative_volume"] == 0.5).all()
+        assert not list(KlineStore(source.venue, "BTCUSDT", "1h").directory.glob(f"{STAGING_DIR}/*/*.parquet"))
+
+
+def test_interrupted_run_resumes_only_unfinished_windows(session_factory):
+    failing = datetime(2024, 1, 31, 12, tzinfo=timezone.utc)
+    source = FakeSource("coinbase", fail_starts={failing})
+    engine = _engine([source], session_factory, workers=2, max_retries=2)
+    job = engine.job("BTCUSDT", "1h", START, END, candles_per_window=12)
+
+    first = asyncio.run(engine.run([job]))[job.key]
+    assert first["done_windows"] == 5 and first["failed_windows"] == 1
+    # February is complete; January waits for its failed window
+    assert first["partitions_coalesced"] == ["2024-02"]
+    assert not KlineStore("coinbase", "BTCUSDT", "1h").partition_path("2024-01").exists()
+    with session_factory() as db:
+        failed = [w for w in crud.get_backfill_windows(db, job.key) if w.status == "failed"]
+    assert len(failed) == 1 and failed[0].attempts == 2 and "venue down" in failed[0].error
+
+    source.fail_starts.clear()
+    calls_before = source.calls
+    second = asyncio.run(engine.run([job]))[job.key]
+
+    assert source.calls - calls_before == 1
+    assert second["resumed_windows"] == 5 and second["done_windows"] == 1
+    assert second["partitions_coalesced"] == ["2024-01"]
+    january = pd.read_parquet(KlineStore("coinbase", "BTCUSDT", "1h").partition_path("2024-01"))
+    assert len(january) == 48
+
+
+def test_backfill_feeds_curation_and_high_water_mark(session_factory):
+    source = FakeSource("binance")
+    engine = _engine([source], session_factory, workers=2)
+    job = engine.job("BTCUSDT", "1h", datetime(2024, 1, 1, tzinfo=timezone.utc), END, candles_per_window=200)
+    asyncio.run(engine.run([job]))
+
+    store = KlineStore("binance", "BTCUSDT", "1h")
+    assert [path.name for path in store.partitions()] == ["klines-2024-01.parquet", "klines-2024-02.parquet"]
+    assert store.high_water_mark() == pd.Timestamp("2024-02-01 23:00", tz="UTC")
+
+    result = DataCuration().curate_interval("1h", venue="binance", symbol="BTCUSDT")
+    assert result["status"] == "success", result
+    open_times = pd.to_datetime(pd.read_parquet(result["path"])["open_time"], utc=True)
+    # Both backfilled months reach the curated dataset
+    assert open_times.min().month == 1 and open_times.max().month == 2
@@ -18,27 +18,26 @@ async def test_get_klines():
     mock_klines = [
         [1609459200000, "29000", "29500", "28800", "29300", "100.5", 1609462799999, "2930000", 100, "50.5", "1475000", "0"],
     ]
-    with patch("app.data.binance_client.httpx.AsyncClient") as mock_client_class:
+    with patch("app.data.binance_client.get_http_pool") as mock_get_pool:
         mock_response = Mock()
         mock_response.json.return_value = mock_klines
         mock_response.raise_for_status = Mock()
         # Mock elapsed for latency calculation
         mock_response.elapsed.total_seconds.return_value = 0.5
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get = AsyncMock(return_value=mock_response)
-        mock_client_class.return_value.__aenter__ = AsyncMock(return_value=mock_client_instance)
-        mock_client_class.return_value.__aexit__ = AsyncMock(return_value=None)
-        with patch("app.data.binance_client._rate_limiter.acquire", new_callable=AsyncMock):
-            # This should not raise ValueError about missing labels
-            try:
-                data, meta = await client.get_klines("BTCUSDT", "1h", limit=1)
-            except ValueError as e:
-                if "missing label values" in str(e) or "histogram metric is missing label" in str(e):
-                    pytest.fail(f"get_klines raised ValueError about missing labels: {e}")
-                raise
+        mock_get_pool.return_value.request = AsyncMock(return_value=mock_response)
+        # This should not raise ValueError about missing labels
+        try:
+            data, meta = await client.get_klines("BTCUSDT", "1h", limit=1)
+        except ValueError as e:
+            if "missing label values" in str(e) or "histogram metric is missing label" in str(e):
+                pytest.fail(f"get_klines raised ValueError about missing labels: {e}")
+            raise
         assert isinstance(data, list)
         assert len(data) == 1
         assert data[0][0] == 1609459200000
         assert "symbol" in meta
         assert meta["symbol"] == "BTCUSDT"
+        # One rate-limit bucket per venue: klines go through the pool's "binance" limiter
+        venue, method, url = mock_get_pool.return_value.request.call_args.args
+        assert (venue, method) == ("binance", "GET") and url.endswith("/api/v3/klines")
 
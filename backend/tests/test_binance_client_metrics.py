@@ -19,30 +19,24 @@ async def test_get_klines_records_metrics_with_labels():
     mock_response.elapsed.total_seconds.return_value = 0.5
     mock_response.raise_for_status = MagicMock()
     
-    # Mock httpx.AsyncClient
-    with patch("app.data.binance_client.httpx.AsyncClient") as mock_client_class:
-        mock_client = AsyncMock()
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client_class.return_value = mock_client
+    # Mock the shared connection pool (it applies the binance rate limit)
+    with patch("app.data.binance_client.get_http_pool") as mock_get_pool:
+        mock_get_pool.return_value.request = AsyncMock(return_value=mock_response)
         
-        # Mock the rate limiter to avoid waiting
-        with patch("app.data.binance_client._rate_limiter.acquire", new_callable=AsyncMock):
-            # Call get_klines
-            symbol = "BTCUSDT"
-            interval = "1h"
-            await client.get_klines(symbol=symbol, interval=interval)
+        # Call get_klines
+        symbol = "BTCUSDT"
+        interval = "1h"
+        await client.get_klines(symbol=symbol, interval=interval)
             
-            # Verify that BINANCE_REQUEST_LATENCY was called with labels
-            # We can't directly verify the call, but we can verify it doesn't raise ValueError
-            # by checking that the metric exists and can be called with labels
-            try:
-                # This should not raise ValueError if labels are provided correctly
-                metric = BINANCE_REQUEST_LATENCY.labels(symbol=symbol, interval=interval)
-                assert metric is not None
-            except ValueError as e:
-                pytest.fail(f"BINANCE_REQUEST_LATENCY.labels() raised ValueError: {e}")
+        # Verify that BINANCE_REQUEST_LATENCY was called with labels
+        # We can't directly verify the call, but we can verify it doesn't raise ValueError
+        # by checking that the metric exists and can be called with labels
+        try:
+            # This should not raise ValueError if labels are provided correctly
+            metric = BINANCE_REQUEST_LATENCY.labels(symbol=symbol, interval=interval)
+            assert metric is not None
+        except ValueError as e:
+            pytest.fail(f"BINANCE_REQUEST_LATENCY.labels() raised ValueError: {e}")
 
 
 @pytest.mark.asyncio
@@ -56,26 +50,20 @@ async def test_get_klines_does_not_raise_valueerror_on_observe():
     mock_response.elapsed.total_seconds.return_value = 0.5
     mock_response.raise_for_status = MagicMock()
     
-    # Mock httpx.AsyncClient
-    with patch("app.data.binance_client.httpx.AsyncClient") as mock_client_class:
-        mock_client = AsyncMock()
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_client.get = AsyncMock(return_value=mock_response)
-        mock_client_class.return_value = mock_client
+    # Mock the shared connection pool (it applies the binance rate limit)
+    with patch("app.data.binance_client.get_http_pool") as mock_get_pool:
+        mock_get_pool.return_value.request = AsyncMock(return_value=mock_response)
         
-        # Mock the rate limiter to avoid waiting
-        with patch("app.data.binance_client._rate_limiter.acquire", new_callable=AsyncMock):
-            # This should not raise ValueError about missing labels
-            try:
-                symbol = "BTCUSDT"
-                interval = "1h"
-                await client.get_klines(symbol=symbol, interval=interval)
-            except ValueError as e:
-                if "missing label values" in str(e) or "histogram metric is missing label" in str(e):
-                    pytest.fail(f"get_klines raised ValueError about missing labels: {e}")
-                # Re-raise if it's a different ValueError
-                raise
+        # This should not raise ValueError about missing labels
+        try:
+            symbol = "BTCUSDT"
+            interval = "1h"
+            await client.get_klines(symbol=symbol, interval=interval)
+        except ValueError as e:
+            if "missing label values" in str(e) or "histogram metric is missing label" in str(e):
+                pytest.fail(f"get_klines raised ValueError about missing labels: {e}")
+            # Re-raise if it's a different ValueError
+            raise
 
 
 def test_binance_request_latency_requires_labels():
@@ -0,0 +1,96 @@
+"""Incremental curation of the consolidated KlineStore must match a full recompute."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data import storage
+from app.data.curation import CONSOLIDATED_FILENAME, DataCuration
+from app.data.kline_store import KlineStore
+
+
+def _klines(rng, open_times, start_price):
+    n = len(open_times)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    # Occasional spikes so the quality pipeline actually flags and clips bars
+    spikes = rng.random(n) < 0.01
+    close = np.where(spikes, close * rng.choice([0.7, 1.4], n), close)
+    volume = rng.lognormal(2.0, 0.5, n)
+    volume = np.where(rng.random(n) < 0.01, volume * 50, volume)
+    spread = np.abs(rng.normal(0, 0.004, n))
+    return pd.DataFrame(
+        {
+            "open_time": open_times,
+            "open": close * (1 + rng.normal(0, 0.002, n)),
+            "high": close * (1 + spread),
+            "low": close * (1 - spread),
+            "close": close,
+            "volume": volume,
+            "close_time": open_times + pd.Timedelta(hours=1) - pd.Timedelta(milliseconds=1),
+            "quote_asset_volume": volume * close,
+            "number_of_trades": rng.integers(1, 500, n),
+            "taker_buy_base": volume * rng.uniform(0.2, 0.8, n),
+            "taker_buy_quote": volume * close * 0.5,
+            "venue": "binance",
+            "symbol": "BTCUSDT",
+        }
+    )
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_curation_matches_full_recompute(isolated_data_root, seed):
+    rng = np.random.default_rng(seed)
+    total = int(rng.integers(300, 500))
+    open_times = pd.date_range("2024-01-20", periods=total, freq="1h", tz="UTC")
+    klines = _klines(rng, open_times, start_price=float(rng.uniform(100, 50_000)))
+    store = KlineStore("binance", "BTCUSDT", "1h")
+    curation = DataCuration()
+
+    cursor = int(rng.integers(150, 250))
+    store.append(klines.iloc[:cursor])
+    modes = []
+    while cursor < total:
+        step = min(total - cursor, int(rng.integers(20, 120)))
+        batch = klines.iloc[cursor - 1:cursor + step].copy()
+        # The last stored candle was still open: its final values differ
+        batch.iloc[0, batch.columns.get_loc("close")] *= 1 + rng.normal(0, 0.003)
+        store.append(batch)
+        cursor += step
+
+        result = curation.curate_interval("1h", venue="binance", symbol="BTCUSDT")
+        assert result["status"] == "success"
+        modes.append(result["mode"])
+        incremental = curation.get_latest_curated("1h", venue="binance", symbol="BTCUSDT")
+
+        full = DataCuration().curate_interval("1h", venue="binance", symbol="BTCUSDT", incremental=False)
+        assert full["mode"] == "full"
+        expected = curation.get_latest_curated("1h", venue="binance", symbol="BTCUSDT")
+        pd.testing.assert_frame_equal(incremental, expected, check_exact=False, rtol=1e-9, atol=1e-12)
+
+    assert modes[0] == "full"
+    assert all(mode == "incremental" for mode in modes[1:])
+
+
+def test_incremental_curation_recomputes_only_the_tail(isolated_data_root):
+    rng = np.random.default_rng(42)
+    open_times = pd.date_range("2024-01-01", periods=1_200, freq="1h", tz="UTC")
+    klines = _klines(rng, open_times, start_price=30_000.0)
+    # No outliers: winsor bounds stay put, so only new bars and their lookback change
+    klines["close"] = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.001, len(klines))))
+    klines["high"] = klines["close"] * 1.001
+    klines["low"] = klines["close"] * 0.999
+    klines["volume"] = 5.0
+    store = KlineStore("binance", "BTCUSDT", "1h")
+    curation = DataCuration(quality_config={"winsor_limits": [0.0, 1.0]})
+
+    store.append(klines.iloc[:1_190])
+    first = curation.curate_interval("1h", venue="binance", symbol="BTCUSDT")
+    assert first["rows_recomputed"] == 1_190
+
+    store.append(klines.iloc[1_189:])
+    second = curation.curate_interval("1h", venue="binance", symbol="BTCUSDT")
+    assert second["mode"] == "incremental"
+    assert second["rows_recomputed"] <= 11 + 90
+
+    idle = curation.curate_interval("1h", venue="binance", symbol="BTCUSDT")
+    assert idle.get("unchanged") is True and idle["rows_recomputed"] == 0
+    assert storage.get_curated_path("binance", "BTCUSDT", "1h", filename=CONSOLIDATED_FILENAME).exists()
@@ -0,0 +1,65 @@
+"""Tests for the database performance profile."""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.core.database import async_database_url, create_async_db_engine, create_db_engine
+
+
+def test_sqlite_engine_applies_pragmas(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'trading.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+    assert engine.pool.size() == 10
+    engine.dispose()
+
+
+def test_memory_sqlite_shares_one_connection():
+    engine = create_db_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 0
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("sqlite:///./data/trading.db", "sqlite+aiosqlite:///./data/trading.db"),
+        ("postgresql://u:p@db/trading", "postgresql+asyncpg://u:p@db/trading"),
+        ("sqlite+aiosqlite:///x.db", "sqlite+aiosqlite:///x.db"),
+    ],
+)
+def test_async_database_url(url, expected):
+    assert async_database_url(url) == expected
+
+
+def test_async_database_url_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        async_database_url("mssql://u:p@db/trading")
+
+
+def test_async_engine_reads_wal_database(tmp_path):
+    pytest.importorskip("aiosqlite")
+    url = f"sqlite:///{tmp_path / 'trading.db'}"
+    sync_engine = create_db_engine(url)
+    with sync_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1), (2)"))
+
+    async def read() -> tuple[str, int]:
+        engine = create_async_db_engine(url)
+        try:
+            async with engine.connect() as conn:
+                mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+                count = (await conn.execute(text("SELECT count(*) FROM t"))).scalar()
+        finally:
+            await engine.dispose()
+        return mode, count
+
+    assert asyncio.run(read()) == ("wal", 2)
+    sync_engine.dispose()
@@ -1,8 +1,11 @@
 """Tests for data ingestion."""
+import pandas as pd
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, patch
+from app.data.binance_client import BinanceClient
 from app.data.ingestion import DataIngestion
+from app.data.kline_store import KlineStore
 
 
 @pytest.mark.asyncio
@@ -21,3 +24,97 @@ async def test_ingest_timeframe():
         assert result["status"] in ["success", "no_data", "empty", "error"]
         assert result["interval"] == "1h"
 
+
+
+class _FakeExchange(BinanceClient):
+    """Serves 1h klines from an in-memory series, honouring startTime/endTime/limit like Binance."""
+
+    def __init__(self, open_times):
+        super().__init__()
+        self.open_times = list(open_times)
+        self.calls = []
+
+    def kline(self, ts):
+        ms = int(ts.timestamp() * 1000)
+        price = str(30_000 + ms // 3_600_000 % 500)
+        return [ms, price, price, price, price, "1.0", ms + 3_599_999, "1", 1, "0.5", "1", "0"]
+
+    async def get_klines(self, symbol, interval, start=None, end=None, limit=1000):
+        self.calls.append((start, end, limit))
+        times = [t for t in self.open_times if (start is None or t >= start) and (end is None or t <= end)]
+        times = times[:limit] if start is not None else times[-limit:]
+        return [self.kline(t) for t in times], {"fetched_at": datetime.utcnow().isoformat(), "latency_ms": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_incremental_ingestion_only_fetches_and_writes_new_candles(isolated_data_root):
+    times = pd.date_range("2024-01-29", periods=120, freq="1h", tz="UTC")
+    exchange = _FakeExchange(times[:100])
+    ingestion = DataIngestion(client=exchange)
+
+    first = await ingestion.ingest_incremental("1h", bootstrap_limit=50)
+    assert first["status"] == "success" and first["new_rows"] == 50
+
+    # Nothing new: one request for the last stored candle, nothing rewritten
+    idle = await ingestion.ingest_incremental("1h")
+    assert idle["requests"] == 1 and idle["rows"] == 1
+    assert idle["new_rows"] == 0 and idle["bytes_written"] == 0
+
+    exchange.open_times = list(times)
+    update = await ingestion.ingest_incremental("1h")
+    assert update["new_rows"] == 20
+    assert exchange.calls[-1][0] == times[99].to_pydatetime()
+
+    store = KlineStore("binance", "BTCUSDT", "1h")
+    stored = store.read()
+    assert list(stored["open_time"]) == list(times[50:])
+    assert [p.name for p in store.partitions()] == ["klines-2024-01.parquet", "klines-2024-02.parquet"]
+    assert store.high_water_mark() == times[-1]
+
+
+class _LiveExchange(_FakeExchange):
+    """Like _FakeExchange, with one still-open candle whose price moves on every request."""
+
+    def __init__(self, open_times, live):
+        super().__init__(open_times)
+        self.live = live
+
+    def kline(self, ts):
+        row = super().kline(ts)
+        if ts == self.live:
+            price = str(31_000 + len(self.calls))
+            row[1:5] = [price] * 4
+        return row
+
+
+@pytest.mark.asyncio
+async def test_open_candle_is_not_stored_or_rewritten(isolated_data_root):
+    # Closed history, then a candle that cannot close before the test ends
+    now = pd.Timestamp.now(tz="UTC").floor("1h")
+    closed = pd.date_range(end=now - pd.Timedelta(hours=1), periods=48, freq="1h")
+    live = now + pd.Timedelta(hours=1)
+    exchange = _LiveExchange([*closed, live], live)
+    ingestion = DataIngestion(client=exchange)
+    store = KlineStore("binance", "BTCUSDT", "1h")
+
+    first = await ingestion.ingest_incremental("1h")
+    assert first["new_rows"] == 48 and store.high_water_mark() == closed[-1]
+
+    for _ in range(3):
+        tick = await ingestion.ingest_incremental("1h")
+        assert tick["new_rows"] == 0 and tick["bytes_written"] == 0
+    assert list(store.read()["open_time"]) == list(closed)
+
+
+@pytest.mark.asyncio
+async def test_klines_range_paginates_across_gaps():
+    times = pd.date_range("2024-01-01", periods=2_500, freq="1h", tz="UTC")
+    times = times.delete(slice(1_000, 1_100))  # exchange outage
+    exchange = _FakeExchange(times)
+
+    klines, meta = await exchange.get_klines_range(
+        "BTCUSDT", "1h", times[0].to_pydatetime(), times[-1].to_pydatetime(), page_limit=1_000
+    )
+
+    assert meta["pages"] == 3
+    assert [row[0] for row in klines] == [int(t.timestamp() * 1000) for t in times]
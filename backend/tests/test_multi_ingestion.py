@@ -0,0 +1,179 @@
+"""Concurrent multi-venue ingestion against a local stub exchange."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from app.data.exchanges import (
+    AsyncRateLimiter,
+    BinanceFuturesUSDTDataSource,
+    BitstampDataSource,
+    BybitPerpetualDataSource,
+    CoinbaseDataSource,
+    HTTPConnectionPool,
+)
+from app.data.multi_ingestion import MultiVenueIngestion
+
+LATENCY = 0.05
+OPEN_MS = 1_700_000_000_000
+
+
+def _stub_payload(path: str):
+    if path == "/fapi/v1/klines":
+        return [[OPEN_MS, "1", "2", "0.5", "1.5", "10", OPEN_MS + 59_999, "15", 3, "5", "7"]]
+    if path == "/fapi/v1/depth":
+        return {"T": OPEN_MS, "bids": [["1.4", "2"]], "asks": [["1.6", "3"]]}
+    if path.endswith("/candles"):
+        return [[OPEN_MS // 1000, 0.5, 2, 1, 1.5, 20]]
+    if path.endswith("/book"):
+        return {"bids": [["1.4", "2", 1]], "asks": [["1.6", "3", 1]]}
+    if "/v2/ohlc/" in path:
+        return {"data": {"ohlc": [{"timestamp": OPEN_MS // 1000, "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 30}]}}
+    if "/v2/order_book/" in path:
+        return {"timestamp": OPEN_MS // 1000, "bids": [["1.4", "2"]], "asks": [["1.6", "3"]]}
+    if path == "/v5/market/kline":
+        return {"result": {"list": [[OPEN_MS, "1", "2", "0.5", "1.5", "40", OPEN_MS + 59_999, "60"]]}}
+    if path == "/v5/market/orderbook":
+        return {"result": {"ts": OPEN_MS, "b": [["1.4", "2"]], "a": [["1.6", "3"]]}}
+    return None
+
+
+class StubExchange:
+    """Answers every venue's candle and order-book endpoints after ``LATENCY`` seconds."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(LATENCY)
+        finally:
+            self.in_flight -= 1
+        payload = _stub_payload(request.url.path)
+        if payload is None:
+            return httpx.Response(404)
+        return httpx.Response(200, json=payload)
+
+
+def _sources(pool: HTTPConnectionPool):
+    return [
+        BinanceFuturesUSDTDataSource(pool=pool),
+        CoinbaseDataSource(pool=pool),
+        BitstampDataSource(pool=pool),
+        BybitPerpetualDataSource(pool=pool),
+    ]
+
+
+def _writer(frame, path, metadata):
+    return {"checksum": f"{metadata['venue']}:{len(frame)}"}
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    exchange = StubExchange()
+    pool = HTTPConnectionPool(transport=httpx.MockTransport(exchange), rate_limits={})
+    return exchange, pool
+
+
+def test_ingest_interval_fetches_all_venues_concurrently(stub):
+    exchange, pool = stub
+    ingestion = MultiVenueIngestion(sources=_sources(pool), writer=_writer, max_concurrency=8)
+
+    started = time.perf_counter()
+    result = asyncio.run(ingestion.ingest_interval("BTCUSDT", "1m"))
+    elapsed = time.perf_counter() - started
+
+    assert exchange.requests == 8
+    # Sequential fetching would take 8 * LATENCY
+    assert elapsed < 4 * LATENCY
+    assert [venue["status"] for venue in result["venues"]] == ["stored"] * 4
+    assert {venue["venue"] for venue in result["venues"]} == {"binance_futures", "coinbase", "bitstamp", "bybit_perp"}
+
+
+def test_universe_refresh_respects_concurrency_bound(stub):
+    exchange, pool = stub
+    ingestion = MultiVenueIngestion(sources=_sources(pool), writer=_writer, max_concurrency=4)
+
+    started = time.perf_counter()
+    results = asyncio.run(ingestion.ingest_universe(["BTCUSDT", "ETHUSDT"], ["1m", "1h"]))
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == 4 and all(result["status"] == "success" for result in results)
+    assert exchange.requests == 32
+    assert exchange.max_in_flight == 4
+    assert elapsed < 16 * LATENCY
+
+
+def test_universe_reports_failed_pairs_without_aborting(stub):
+    exchange, pool = stub
+
+    class BrokenSource(CoinbaseDataSource):
+        async def fetch_candles(self, symbol, *args, **kwargs):
+            if symbol == "ETHUSDT":
+                raise httpx.ConnectError("venue down")
+            return await super().fetch_candles(symbol, *args, **kwargs)
+
+    ingestion = MultiVenueIngestion(sources=[BrokenSource(pool=pool)], writer=_writer)
+    results = asyncio.run(ingestion.ingest_universe(["BTCUSDT", "ETHUSDT"], ["1h"]))
+
+    assert [result["status"] for result in results] == ["success", "error"]
+    assert "venue down" in results[1]["error"]
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(ingestion.ingest_interval("ETHUSDT", "1h"))
+
+
+def test_pool_reuses_one_client_per_event_loop():
+    pool = HTTPConnectionPool(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+
+    async def clients():
+        first = pool.client()
+        await pool.request("coinbase", "GET", "http://stub/products/BTC-USD/book")
+        return first, pool.client()
+
+    first, second = asyncio.run(clients())
+    assert first is second
+    # Closed with its loop, not left holding sockets of a dead loop
+    assert first.is_closed
+    third, _ = asyncio.run(clients())
+    assert third is not first and third.is_closed
+
+
+def test_pool_keeps_concurrent_loops_apart():
+    pool = HTTPConnectionPool(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+    started = threading.Barrier(2)
+
+    async def use_pool():
+        client = pool.client()
+        started.wait(5)
+        await pool.request("coinbase", "GET", "http://stub/products/BTC-USD/book")
+        assert pool.client() is client
+        await pool.aclose()
+        return client
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        clients = list(executor.map(lambda _: asyncio.run(use_pool()), range(2)))
+    assert clients[0] is not clients[1]
+    assert all(client.is_closed for client in clients)
+
+
+def test_rate_limiter_spaces_requests_beyond_the_burst():
+    limiter = AsyncRateLimiter(max_requests=5, window=0.25)
+
+    async def burst():
+        started = time.perf_counter()
+        await asyncio.gather(*(limiter.acquire() for _ in range(10)))
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(burst())
+    # 5 immediately, the next 5 at 20 requests/second
+    assert 0.2 <= elapsed < 0.5
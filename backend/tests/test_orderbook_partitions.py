@@ -0,0 +1,138 @@
+"""Tests for the append-only partitioned order book layout, its manifest and compaction."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data import storage
+from app.data.orderbook import OrderBookRepository, OrderBookSnapshot
+from app.data.orderbook_partitions import partitioned_symbols, snapshots_to_frame
+from app.data.orderbook_store import OrderBookStore
+
+
+@pytest.fixture(autouse=True)
+def fresh_orderbook_store(isolated_data_root):
+    OrderBookStore().invalidate()
+    yield
+    OrderBookStore().invalidate()
+
+
+def _snapshots(n, start, step_minutes=30, offset=0.0):
+    out = []
+    for i, ts in enumerate(pd.date_range(start, periods=n, freq=f"{step_minutes}min", tz="UTC")):
+        mid = 40_000 + i + offset
+        out.append(
+            OrderBookSnapshot(
+                timestamp=ts,
+                symbol="BTCUSDT",
+                venue="binance",
+                bids=[(mid - 1 - k, 1.0 + k) for k in range(2 + i % 2)],
+                asks=[(mid + 1 + k, 1.0 + k) for k in range(2)],
+            )
+        )
+    return out
+
+
+def _expected(*batches):
+    """Reference semantics of the old read-concat-rewrite path."""
+    merged = {}
+    for batch in batches:
+        for snapshot in batch:
+            merged[snapshot.timestamp] = snapshot
+    return [merged[ts] for ts in sorted(merged)]
+
+
+@pytest.mark.asyncio
+async def test_appends_write_new_parts_without_rewriting_existing_ones():
+    repo = OrderBookRepository()
+    first = _snapshots(60, "2024-01-01")  # spans two daily partitions
+    await repo.save_snapshots("BTCUSDT", first)
+    manifest = repo.store.partitions.read_manifest("BTCUSDT")
+    assert [p.partition for p in manifest.parts] == ["2024-01-01", "2024-01-02"]
+    root = repo.store.partitions.root("BTCUSDT")
+    before = {p.file: (root / p.file).stat().st_mtime_ns for p in manifest.parts}
+
+    second = _snapshots(4, "2024-01-02 12:00", offset=0.5)  # overlaps the tail of the first batch
+    result = await repo.save_snapshots("BTCUSDT", second)
+
+    assert result["status"] == "ok" and result["rows"] == 4
+    manifest = repo.store.partitions.read_manifest("BTCUSDT")
+    assert len(manifest.parts) == 3
+    assert {f: (root / f).stat().st_mtime_ns for f in before} == before
+    assert not repo.store.source_path("BTCUSDT").exists()
+
+    expected = _expected(first, second)
+    assert await repo.load("BTCUSDT", expected[0].timestamp, expected[-1].timestamp) == expected
+    assert await repo.get_latest("BTCUSDT") == expected[-1]
+    # Latest write wins for duplicate timestamps
+    assert await repo.get_snapshot("BTCUSDT", second[0].timestamp, tolerance_seconds=1) == second[0]
+
+
+@pytest.mark.asyncio
+async def test_readers_only_open_overlapping_partitions():
+    repo = OrderBookRepository()
+    await repo.save_snapshots("BTCUSDT", _snapshots(48 * 3, "2024-01-01"))
+    opened = []
+    original = repo.store.open_source
+
+    def tracking(source, symbol):
+        opened.append(source.parent.name)
+        return original(source, symbol)
+
+    repo.store.open_source = tracking
+    ts = pd.Timestamp("2024-01-02 10:00", tz="UTC")
+    snapshot = await repo.get_snapshot("BTCUSDT", ts, tolerance_seconds=60)
+    depth = await repo.get_spread_depth("BTCUSDT", ts, notional=1_000.0, tolerance_seconds=60)
+
+    assert snapshot.timestamp == ts and depth["timestamp"] == ts.isoformat()
+    assert set(opened) == {"2024-01-02"}
+
+    opened.clear()
+    await repo.get_latest("BTCUSDT")
+    assert opened == ["2024-01-03"]
+
+
+@pytest.mark.asyncio
+async def test_compaction_preserves_reads_and_migrates_legacy_file():
+    repo = OrderBookRepository()
+    legacy = _snapshots(30, "2023-12-31 12:00")
+    storage.write_parquet(snapshots_to_frame(legacy), repo.store.source_path("BTCUSDT"))
+    assert await repo.get_latest("BTCUSDT") == legacy[-1]  # no manifest yet: legacy single file
+
+    batches = [_snapshots(5, "2024-01-01 01:00", offset=0.25 * k) for k in range(3)]
+    for batch in batches:
+        await repo.save_snapshots("BTCUSDT", batch)
+    manifest = repo.store.partitions.read_manifest("BTCUSDT")
+    assert manifest.parts[0].kind == "legacy"
+
+    expected = _expected(legacy, *batches)
+    start, end = expected[0].timestamp, expected[-1].timestamp
+    assert await repo.load("BTCUSDT", start, end) == expected
+
+    result = repo.compact("BTCUSDT")
+
+    assert result["status"] == "ok"
+    assert result["partitions"] == ["2023-12-31", "2024-01-01"]
+    manifest = repo.store.partitions.read_manifest("BTCUSDT")
+    assert [p.kind for p in manifest.parts] == ["compacted", "compacted"]
+    assert not repo.store.source_path("BTCUSDT").exists()
+    assert not repo.store.index_path("BTCUSDT").exists()
+    assert await repo.load("BTCUSDT", start, end) == expected
+    assert repo.compact("BTCUSDT")["status"] == "noop"
+    assert partitioned_symbols() == [("binance", "BTCUSDT")]
+
+
+@pytest.mark.asyncio
+async def test_appends_after_compaction_keep_precedence():
+    repo = OrderBookRepository()
+    old = _snapshots(4, "2024-01-01")
+    await repo.save_snapshots("BTCUSDT", old)
+    await repo.save_snapshots("BTCUSDT", _snapshots(4, "2024-01-01 06:00"))
+    repo.compact("BTCUSDT")
+
+    newer = _snapshots(2, "2024-01-01", offset=0.75)
+    await repo.save_snapshots("BTCUSDT", newer)
+
+    window = await repo.scan("BTCUSDT", old[0].timestamp, old[-1].timestamp)
+    np.testing.assert_array_equal(window.best_bid[:2], [s.best_bid for s in newer])
+    assert repo.compact("BTCUSDT")["parts_removed"] == 2
+    assert (await repo.load("BTCUSDT", old[0].timestamp, old[1].timestamp)) == newer
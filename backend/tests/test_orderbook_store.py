@@ -0,0 +1,153 @@
+"""Tests for the memory-mapped order book store and OrderBookRepository lookups."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data import orderbook_store
+from app.data.orderbook import OrderBookRepository, OrderBookSnapshot
+from app.data.orderbook_store import OrderBookArrays, OrderBookStore
+
+
+@pytest.fixture(autouse=True)
+def fresh_orderbook_store(isolated_data_root):
+    OrderBookStore().invalidate()
+    yield
+    OrderBookStore().invalidate()
+
+
+def _snapshots(n=50, start="2024-01-01 00:00:00", step_seconds=10):
+    rng = np.random.default_rng(1)
+    out = []
+    for i, ts in enumerate(pd.date_range(start, periods=n, freq=f"{step_seconds}s", tz="UTC")):
+        mid = 40_000 + i
+        depth = 3 + i % 3
+        bids = [(mid - 1 - k, float(rng.uniform(0.1, 2.0))) for k in range(depth)]
+        asks = [(mid + 1 + k, float(rng.uniform(0.1, 2.0))) for k in range(depth)]
+        out.append(OrderBookSnapshot(timestamp=ts, symbol="BTCUSDT", venue="binance", bids=bids, asks=asks))
+    return out
+
+
+def _naive_nearest(snapshots, ts, tolerance):
+    window = [s for s in snapshots if ts - pd.Timedelta(seconds=tolerance) <= s.timestamp <= ts + pd.Timedelta(seconds=tolerance)]
+    if not window:
+        return None
+    closest = min(window, key=lambda s: abs((s.timestamp - ts).total_seconds()))
+    return closest if abs((closest.timestamp - ts).total_seconds()) <= tolerance else None
+
+
+def test_nearest_matches_linear_scan():
+    snapshots = _snapshots()
+    arrays = OrderBookArrays.from_snapshots(snapshots)
+
+    targets = pd.date_range("2023-12-31 23:59:40", "2024-01-01 00:08:40", freq="3s", tz="UTC")
+    for ts in targets:
+        idx = arrays.nearest(ts, tolerance_seconds=4)
+        expected = _naive_nearest(snapshots, ts, 4)
+        if expected is None:
+            assert idx is None
+        else:
+            assert arrays.snapshot(idx) == expected
+
+
+def test_nearest_prefers_earlier_snapshot_on_ties_and_rejects_naive_timestamps():
+    arrays = OrderBookArrays.from_snapshots(_snapshots(n=3))
+
+    assert arrays.nearest(pd.Timestamp("2024-01-01 00:00:05", tz="UTC"), 5) == 0
+    assert arrays.nearest(pd.Timestamp("2024-01-01 00:00:05"), 5) is None
+
+
+def test_duplicate_timestamps_resolve_to_last_row():
+    snapshots = _snapshots(n=3)
+    rewritten = OrderBookSnapshot(
+        timestamp=snapshots[1].timestamp, symbol="BTCUSDT", venue="binance", bids=[(1.0, 1.0)], asks=[(2.0, 1.0)]
+    )
+    # A single part holding both writes of 00:00:10, in write order
+    arrays = OrderBookArrays.from_snapshots([snapshots[0], snapshots[1], rewritten, snapshots[2]])
+
+    for ts in ("2024-01-01 00:00:10", "2024-01-01 00:00:09", "2024-01-01 00:00:12"):
+        assert arrays.nearest(pd.Timestamp(ts, tz="UTC"), 4) == 2
+    assert arrays.snapshot(2) == rewritten
+
+    merged = orderbook_store._merge(
+        [OrderBookArrays.from_snapshots(snapshots), OrderBookArrays.from_snapshots([rewritten])], "BTCUSDT", "binance"
+    )
+    assert merged.snapshot(merged.nearest(snapshots[1].timestamp, 0)) == rewritten
+
+
+def test_range_scan_returns_views():
+    arrays = OrderBookArrays.from_snapshots(_snapshots())
+    lo, hi = arrays.range_bounds(pd.Timestamp("2024-01-01 00:01:00", tz="UTC"), pd.Timestamp("2024-01-01 00:02:00", tz="UTC"))
+    window = arrays.slice(lo, hi)
+
+    assert len(window) == 7
+    assert np.shares_memory(window.bid_prices, arrays.bid_prices)
+    np.testing.assert_array_equal(window.spread, np.full(7, 2.0))
+    assert window.to_index()[0] == pd.Timestamp("2024-01-01 00:01:00", tz="UTC")
+
+
+@pytest.mark.asyncio
+async def test_repository_serves_lookups_from_mmap_index():
+    repo = OrderBookRepository()
+    snapshots = _snapshots()
+    await repo.save_snapshots("BTCUSDT", snapshots[:30])
+
+    ts = pd.Timestamp("2024-01-01 00:02:02", tz="UTC")
+    snapshot = await repo.get_snapshot("BTCUSDT", ts, tolerance_seconds=5)
+    assert snapshot == snapshots[12]
+
+    arrays = repo.store.open("BTCUSDT")
+    assert isinstance(arrays.timestamps, np.memmap)
+    assert repo.store.open("BTCUSDT") is arrays
+    (part,) = repo.store.partitions.read_manifest("BTCUSDT").parts
+    part_path = repo.store.partitions.root("BTCUSDT") / part.file
+    assert (repo.store.index_dir(part_path) / "manifest.json").exists()
+
+    # New data lands in a new part; existing part indexes stay valid
+    await repo.save_snapshots("BTCUSDT", snapshots[30:])
+    latest = await repo.get_latest("BTCUSDT")
+    assert latest == snapshots[-1]
+
+    loaded = await repo.load("BTCUSDT", snapshots[5].timestamp, snapshots[9].timestamp)
+    assert loaded == snapshots[5:10]
+
+    window = await repo.scan("BTCUSDT", snapshots[5].timestamp, snapshots[9].timestamp)
+    assert len(window) == 5
+
+
+@pytest.mark.asyncio
+async def test_repository_returns_none_without_data():
+    repo = OrderBookRepository()
+    assert await repo.get_snapshot("ETHUSDT", pd.Timestamp("2024-01-01", tz="UTC")) is None
+    assert await repo.get_latest("ETHUSDT") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to count descriptors")
+async def test_handle_cache_bounds_open_file_descriptors(monkeypatch):
+    monkeypatch.setattr(orderbook_store, "MAX_OPEN_HANDLES", 16)
+    repo = OrderBookRepository()
+    snapshots = _snapshots(n=60, step_seconds=86_400)  # one daily part per snapshot
+    await repo.save_snapshots("BTCUSDT", snapshots)
+    before = len(os.listdir("/proc/self/fd"))
+
+    for snapshot in snapshots:
+        assert await repo.get_snapshot("BTCUSDT", snapshot.timestamp, tolerance_seconds=1) == snapshot
+
+    assert len(orderbook_store._HANDLE_CACHE) == 16
+    assert len(os.listdir("/proc/self/fd")) - before <= 16
+
+
+@pytest.mark.asyncio
+async def test_lookups_survive_unwritable_index(monkeypatch):
+    repo = OrderBookRepository()
+    snapshots = _snapshots(n=10)
+    await repo.save_snapshots("BTCUSDT", snapshots)
+
+    def read_only(*args, **kwargs):
+        raise OSError(30, "Read-only file system")
+
+    monkeypatch.setattr(OrderBookStore, "write_index", read_only)
+    assert await repo.get_snapshot("BTCUSDT", snapshots[3].timestamp, tolerance_seconds=1) == snapshots[3]
+    assert await repo.load("BTCUSDT", snapshots[0].timestamp, snapshots[-1].timestamp) == snapshots
@@ -0,0 +1,178 @@
+"""Tests for the running production risk aggregates."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base, create_db_engine
+from app.db import crud
+from app.db.models import ProductionRiskAggregateORM, RecommendationORM
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db():
+    engine = create_db_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _open(db, day: int, signal: str = "BUY", entry: float = 100.0) -> RecommendationORM:
+    rec = RecommendationORM(
+        date=(START + timedelta(days=day)).strftime("%Y-%m-%d"),
+        market_timestamp=str(day),
+        signal=signal,
+        entry_min=entry,
+        entry_max=entry,
+        entry_optimal=entry,
+        stop_loss=entry * 0.95,
+        take_profit=entry * 1.05,
+        stop_loss_pct=5.0,
+        take_profit_pct=5.0,
+        confidence=60.0,
+        current_price=entry,
+        analysis="",
+        status="open",
+    )
+    db.add(rec)
+    db.commit()
+    return rec
+
+
+def _close(db, rec: RecommendationORM, exit_price: float, day: int) -> None:
+    crud.close_recommendation(
+        db,
+        rec,
+        exit_price=exit_price,
+        exit_reason="TP",
+        exit_at=START + timedelta(days=day),
+        user_id=settings.DEFAULT_USER_ID,
+    )
+
+
+def _legacy_drawdown(exits: list[tuple[str, float]]) -> dict[str, float]:
+    """The per-call replay calculate_production_drawdown used to run."""
+    capital = peak = 1.0
+    max_dd = 0.0
+    for signal, exit_price in exits:
+        ret = (exit_price - 100.0) / 100.0 if signal == "BUY" else (100.0 - exit_price) / 100.0
+        capital *= 1 + ret
+        peak = max(peak, capital)
+        max_dd = max(max_dd, 1 - capital / peak)
+    return {
+        "max_drawdown_pct": round(max_dd * 100.0, 2),
+        "current_drawdown_pct": round((1 - capital / peak) * 100.0, 2),
+        "peak_capital": round(peak, 6),
+        "current_capital": round(capital, 6),
+    }
+
+
+def test_incremental_aggregate_matches_full_replay(db):
+    exits = [("BUY", 104.0), ("BUY", 97.0), ("SELL", 103.0), ("SELL", 95.0), ("BUY", 99.0), ("BUY", 110.0)]
+    for day, (signal, exit_price) in enumerate(exits):
+        _close(db, _open(db, day, signal), exit_price, day)
+
+    assert crud.verify_production_risk_aggregate(db) == {}
+    agg = db.get(ProductionRiskAggregateORM, crud.PRODUCTION_RISK_SCOPE)
+    assert agg.closed_trades == 6
+    assert (agg.longest_losing_streak, agg.current_winning_streak) == (2, 1)
+    assert crud.calculate_production_drawdown(db) == _legacy_drawdown(exits)
+    state = crud.get_user_risk_state(db, settings.DEFAULT_USER_ID)
+    assert (state.longest_losing_streak, state.current_winning_streak) == (2, 1)
+
+    with_curve = crud.calculate_production_drawdown(db, include_equity_curve=True)
+    assert len(with_curve["equity_curve"]) == 7
+    assert with_curve["current_capital"] == with_curve["equity_curve"][-1]
+
+
+def test_equity_tail_matches_replayed_curve_without_a_replay(db, monkeypatch):
+    exits = [("BUY", 104.0), ("BUY", 97.0), ("SELL", 103.0), ("SELL", 95.0), ("BUY", 99.0), ("BUY", 110.0)]
+    for day, (signal, exit_price) in enumerate(exits):
+        _close(db, _open(db, day, signal), exit_price, day)
+    full = crud.calculate_production_drawdown(db, include_equity_curve=True)
+
+    def no_replay(_db):
+        raise AssertionError("the shutdown check must not replay the trade history")
+
+    monkeypatch.setattr(crud, "replay_production_risk", no_replay)
+    tail = crud.calculate_production_drawdown(db, equity_tail=3)
+    assert tail["equity_curve"] == pytest.approx(full["equity_curve"][-4:])
+    assert {key: tail[key] for key in full if key != "equity_curve"} == _legacy_drawdown(exits)
+    assert crud.calculate_production_drawdown(db, equity_tail=50)["equity_curve"] == pytest.approx(full["equity_curve"])
+
+
+def test_backdated_close_rebuilds(db):
+    first, second, late = _open(db, 0), _open(db, 1), _open(db, 2)
+    _close(db, first, 110.0, 5)
+    _close(db, second, 90.0, 6)
+    # Closed before the previous exits: the aggregate is rebuilt in closed_at order
+    _close(db, late, 95.0, 3)
+
+    assert crud.verify_production_risk_aggregate(db) == {}
+    assert crud.calculate_production_drawdown(db) == _legacy_drawdown([("BUY", 95.0), ("BUY", 110.0), ("BUY", 90.0)])
+
+
+def _upsert(db, day: int, entry: float = 100.0) -> RecommendationORM:
+    """Recommendation written through create_recommendation, keyed by (date, market_timestamp)."""
+    return crud.create_recommendation(
+        db,
+        {
+            "signal": "BUY",
+            "entry_range": {"min": entry, "max": entry, "optimal": entry},
+            "stop_loss_take_profit": {
+                "stop_loss": entry * 0.95,
+                "take_profit": entry * 1.05,
+                "stop_loss_pct": 5.0,
+                "take_profit_pct": 5.0,
+            },
+            "confidence": 60.0,
+            "current_price": entry,
+            "market_timestamp": (START + timedelta(days=day)).isoformat(),
+            "risk_metrics": {},
+            "analysis": "test",
+        },
+    )
+
+
+def test_reopened_recommendation_is_not_folded_twice(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path))
+    _close(db, _open(db, 0), 110.0, 1)
+    rec = _upsert(db, 2)
+    _close(db, db.get(RecommendationORM, rec.id), 95.0, 3)
+
+    # Same (date, market_timestamp): the upsert reopens the closed row
+    reopened = _upsert(db, 2)
+    assert reopened.id == rec.id and reopened.status == "open"
+    assert crud.verify_production_risk_aggregate(db) == {}
+    assert db.get(ProductionRiskAggregateORM, crud.PRODUCTION_RISK_SCOPE).closed_trades == 1
+
+    _close(db, db.get(RecommendationORM, rec.id), 104.5, 4)
+    assert crud.verify_production_risk_aggregate(db) == {}
+    assert db.get(ProductionRiskAggregateORM, crud.PRODUCTION_RISK_SCOPE).closed_trades == 2
+    assert crud.calculate_production_drawdown(db) == _legacy_drawdown([("BUY", 110.0), ("BUY", 104.5)])
+
+
+def test_missing_aggregate_built_on_first_read(db):
+    _close(db, _open(db, 0), 90.0, 1)
+    db.query(ProductionRiskAggregateORM).delete()
+    db.commit()
+
+    assert crud.calculate_production_drawdown(db)["max_drawdown_pct"] == 10.0
+    assert crud.verify_production_risk_aggregate(db) == {}
+
+
+def test_empty_history(db):
+    assert crud.calculate_production_drawdown(db, include_equity_curve=True) == {
+        "max_drawdown_pct": 0.0,
+        "current_drawdown_pct": 0.0,
+        "peak_capital": 1.0,
+        "current_capital": 1.0,
+        "equity_curve": [1.0],
+    }
@@ -0,0 +1,185 @@
+"""Buffered signal-emission journal and set-based outcome updates."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.db.models import SignalOutcomeORM
+from app.signals import journal as journal_module
+from app.signals.journal import SignalJournal
+from app.signals.loggers import (
+    SignalLogRecord,
+    insert_signal_values,
+    log_signal_event,
+    update_signal_outcome_for_recommendation,
+    update_signal_outcomes,
+)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # A file database: the background flusher writes from its own thread
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'signals.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _record(recommendation_id: int | None = None, **overrides) -> SignalLogRecord:
+    values = {
+        "strategy_id": "ensemble_core",
+        "signal": "BUY",
+        "confidence_raw": 0.62,
+        "recommendation_id": recommendation_id,
+        "features_regimen": {"vol": 0.4},
+        "metadata": {"votes": [1, 0]},
+        "outcome": "open",
+    }
+    return SignalLogRecord(**{**values, **overrides})
+
+
+def _rows(session_factory) -> list[SignalOutcomeORM]:
+    with session_factory() as db:
+        return list(db.scalars(select(SignalOutcomeORM).order_by(SignalOutcomeORM.id)))
+
+
+def test_flush_writes_queued_emissions_in_order(session_factory):
+    journal = SignalJournal(max_batch=100, flush_interval=60, session_factory=session_factory, background=False)
+    entries = [journal.log(_record(rec_id, confidence_raw=rec_id / 10)) for rec_id in range(1, 6)]
+    assert journal.pending() == 5 and _rows(session_factory) == []
+
+    assert journal.flush() == 5
+
+    rows = _rows(session_factory)
+    assert [entry.id for entry in entries] == [row.id for row in rows]
+    assert [row.recommendation_id for row in rows] == [1, 2, 3, 4, 5]
+    assert rows[0].context_metadata == {"votes": [1, 0]} and rows[0].created_at is not None
+    assert journal.flush() == 0
+
+
+def test_size_threshold_and_background_flush(session_factory):
+    journal = SignalJournal(max_batch=3, flush_interval=0.05, session_factory=session_factory)
+    first = [journal.log(_record(i)) for i in range(3)]
+    assert all(entry.id is not None for entry in first)
+
+    late = journal.log(_record(99))
+    deadline = time.monotonic() + 5
+    while late.id is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    # Written by the background flusher, not by close()
+    assert late.id is not None
+    journal.close()
+    assert len(_rows(session_factory)) == 4
+
+
+def test_failed_flush_keeps_emissions_for_close(session_factory):
+    calls = {"n": 0}
+
+    def flaky_factory():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise ConnectionError("database unavailable")
+        return session_factory()
+
+    journal = SignalJournal(max_batch=100, flush_interval=60, session_factory=flaky_factory, background=False)
+    journal.log(_record(1))
+    with pytest.raises(ConnectionError):
+        journal.flush()
+    journal.log(_record(2))
+    assert journal.pending() == 2
+
+    journal.close()
+    assert [row.recommendation_id for row in _rows(session_factory)] == [1, 2]
+
+
+def test_bad_records_do_not_block_the_queue(session_factory):
+    journal = SignalJournal(max_batch=100, flush_interval=60, session_factory=session_factory, background=False)
+    with pytest.raises(TypeError):
+        journal.log(_record(1, confidence_raw=None))
+    assert journal.pending() == 0
+
+    # Converts fine but violates NOT NULL: only that row is dropped
+    entries = [journal.log(_record(2)), journal.log(_record(3, strategy_id=None)), journal.log(_record(4))]
+    assert journal.flush() == 2
+    assert [entry.id is not None for entry in entries] == [True, False, True]
+    assert journal.pending() == 0
+
+    journal.log(_record(5))
+    assert journal.flush() == 1
+    assert [row.recommendation_id for row in _rows(session_factory)] == [2, 4, 5]
+
+
+def test_pending_queue_is_capped_while_the_database_is_down(session_factory):
+    available = {"db": False}
+
+    def factory():
+        if not available["db"]:
+            raise ConnectionError("database unavailable")
+        return session_factory()
+
+    journal = SignalJournal(
+        max_batch=100, flush_interval=60, session_factory=factory, background=False, max_pending=3
+    )
+    for rec_id in range(1, 5):
+        journal.log(_record(rec_id))
+    assert journal.pending() == 3
+    with pytest.raises(ConnectionError):
+        journal.flush()
+    journal.log(_record(5))
+    assert journal.pending() == 3
+
+    available["db"] = True
+    assert journal.flush() == 3
+    assert [row.recommendation_id for row in _rows(session_factory)] == [3, 4, 5]
+
+
+def test_flush_waits_for_in_flight_batch(session_factory, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    class PausedIds(list):
+        """Row ids whose hand-out blocks until released, pausing the flusher there."""
+
+        def __iter__(self):
+            started.set()
+            release.wait(5)
+            return super().__iter__()
+
+    monkeypatch.setattr(
+        journal_module, "insert_signal_values", lambda db, rows: PausedIds(insert_signal_values(db, rows))
+    )
+    journal = SignalJournal(max_batch=100, flush_interval=60, session_factory=session_factory, background=False)
+    entry = journal.log(_record(1))
+    flusher = threading.Thread(target=journal.flush, kwargs={"trigger": "interval"})
+    flusher.start()
+    assert started.wait(5)
+
+    # The request path finds the batch already taken by the flusher and must wait for its ids
+    threading.Timer(0.2, release.set).start()
+    journal.flush(trigger="request")
+    assert entry.id is not None
+    flusher.join(5)
+
+
+def test_outcomes_update_latest_row_per_recommendation(session_factory):
+    with session_factory() as db:
+        for rec_id in (1, 1, 2, 3):
+            log_signal_event(_record(rec_id, pnl_pct=0.5), session=db)
+
+        updated = update_signal_outcomes({1: ("win", 2.5), 2: ("loss", None), 7: ("win", 1.0)}, session=db)
+        assert updated == 2
+        update_signal_outcome_for_recommendation(3, outcome="breakeven", pnl_pct=0.0, session=db)
+        with pytest.raises(ValueError):
+            update_signal_outcome_for_recommendation(8, outcome="win", session=db)
+
+    rows = _rows(session_factory)
+    assert [(row.recommendation_id, row.outcome, row.pnl_pct) for row in rows] == [
+        (1, "open", 0.5),
+        (1, "win", 2.5),
+        (2, "loss", 0.5),
+        (3, "breakeven", 0.0),
+    ]
@@ -0,0 +1,34 @@
+"""Startup imports stay light: heavy libraries load only where they are used."""
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parents[1]
+HEAVY = ("matplotlib", "sklearn", "scipy", "hmmlearn")
+
+
+def _loaded_after(statement: str) -> dict[str, bool]:
+    code = f"import json, sys\n{statement}\nprint(json.dumps({{m: m in sys.modules for m in {HEAVY!r}}}))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=BACKEND, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["app.main", "app.backtesting", "app.quant", "app.data"])
+def test_import_does_not_load_heavy_libraries(module):
+    assert _loaded_after(f"import {module}") == dict.fromkeys(HEAVY, False)
+
+
+def test_lazy_exports_resolve_on_access():
+    from app import backtesting
+    from app.backtesting.engine import BacktestEngine
+
+    assert backtesting.BacktestEngine is BacktestEngine
+    assert "BacktestEngine" in vars(backtesting)
+    assert set(backtesting.__all__) <= set(dir(backtesting))
+    with pytest.raises(AttributeError):
+        _ = backtesting.DoesNotExist
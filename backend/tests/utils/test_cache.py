@@ -0,0 +1,174 @@
+"""Tests for the response cache (LRU, TTLs, coalescing, stale-while-revalidate)."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.utils.cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class DictBackend:
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    def set(self, key: str, data: bytes, ttl_seconds: float) -> None:
+        self.data[key] = data
+
+    def delete_prefix(self, prefix: str | None) -> None:
+        self.data = {k: v for k, v in self.data.items() if prefix and not k.startswith(f"{prefix}:")}
+
+
+def test_per_prefix_ttl_and_unhashable_arguments():
+    clock = FakeClock()
+    cache = ResponseCache(ttls={"fast": 10.0}, default_ttl_seconds=100.0, clock=clock)
+    cache.set("fast", "a", [1, 2], interval="1h")
+    cache.set("slow", "b", [1, 2], interval="1h")
+
+    clock.now += 11
+    assert cache.get("fast", [1, 2], interval="1h") is None
+    assert cache.get("slow", [1, 2], interval="1h") == "b"
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=2)
+    cache.set("p", 1, "a")
+    cache.set("p", 2, "b")
+    assert cache.get("p", "a") == 1  # "b" becomes least recently used
+    cache.set("p", 3, "c")
+    assert cache.get("p", "b") is None
+    assert cache.stats()["entries"] == 2
+
+    small = ResponseCache(max_bytes=10_000)
+    small.set("p", "x" * 6_000, "big1")
+    small.set("p", "y" * 6_000, "big2")
+    assert small.get("p", "big1") is None
+    assert small.get("p", "big2") is not None
+    small.set("p", "z" * 20_000, "too_big")
+    assert small.get("p", "too_big") is None
+
+
+def test_concurrent_sync_misses_compute_once():
+    cache = ResponseCache()
+    calls = 0
+    release = threading.Event()
+
+    def compute():
+        nonlocal calls
+        calls += 1
+        release.wait(2)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("p", compute, "k"))) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == 1
+    assert results == ["value"] * 8
+
+
+def test_concurrent_async_misses_compute_once_and_share_errors():
+    cache = ResponseCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"n": calls}
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run():
+        values = await asyncio.gather(*(cache.aget_or_compute("p", compute, "k") for _ in range(10)))
+        errors = await asyncio.gather(*(cache.aget_or_compute("p", failing, "err") for _ in range(3)), return_exceptions=True)
+        return values, errors
+
+    values, errors = asyncio.run(run())
+    assert calls == 1
+    assert all(value == {"n": 1} for value in values)
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    # Failures are not cached
+    assert cache.get("p", "err") is None
+
+
+def test_stale_value_served_while_one_refresh_runs():
+    clock = FakeClock()
+    cache = ResponseCache(ttls={"p": 10.0}, stale_seconds={"p": 5.0}, clock=clock)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run():
+        assert await cache.aget_or_compute("p", compute) == 1
+        clock.now += 12  # expired, within the stale window
+        stale = await asyncio.gather(*(cache.aget_or_compute("p", compute) for _ in range(5)))
+        await asyncio.sleep(0.05)
+        return stale, await cache.aget_or_compute("p", compute)
+
+    stale, refreshed = asyncio.run(run())
+    assert stale == [1] * 5
+    assert refreshed == 2
+    assert calls == 2
+
+    clock.now += 100  # past the stale window: recomputed inline
+    assert asyncio.run(cache.aget_or_compute("p", compute)) == 3
+
+
+def test_shared_backend_serves_other_workers():
+    backend = DictBackend()
+    worker_a = ResponseCache(backend=backend)
+    worker_b = ResponseCache(backend=backend)
+
+    worker_a.set("market_data", {"price": 1.5}, interval="1h")
+    assert worker_b.get("market_data", interval="1h") == {"price": 1.5}
+
+    # Values that cannot be shared stay local
+    worker_a.set("local", object())
+    assert worker_b.get("local") is None
+
+    worker_a.clear("market_data")
+    assert ResponseCache(backend=backend).get("market_data", interval="1h") is None
+
+
+def test_clear_by_prefix():
+    cache = ResponseCache()
+    cache.set("a", 1, 1)
+    cache.set("a", 2, 2)
+    cache.set("b", 3, 1)
+    assert cache.clear("a") == 2
+    assert cache.get("b", 1) == 3
+    assert cache.clear() == 1
+
+
+@pytest.mark.parametrize("value", [0, "", []])
+def test_falsy_values_are_cached(value):
+    cache = ResponseCache()
+    calls = []
+    for _ in range(2):
+        assert cache.get_or_compute("p", lambda: calls.append(1) or value) == value
+    assert len(calls) == 1
@@ -117,6 +117,12 @@ def main():
     parser.add_argument("--output-dir", type=str, default="artifacts/sensitivity", help="Output directory")
     parser.add_argument("--campaign-id", type=str, help="Campaign ID (auto-generated if not provided)")
     parser.add_argument("--critical-params", nargs="+", help="Override critical parameters list")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for the sweep (default: one per core, 1 = serial)",
+    )
     args = parser.parse_args()
     
     # Load base parameters
@@ -158,6 +164,7 @@ def main():
         end_date=end_dt,
         base_params=base_params,
         use_nested_override=True,
+        workers=args.workers,
     )
     
     # Add campaign metadata
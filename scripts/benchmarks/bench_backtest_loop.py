@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Benchmark BacktestEngine bar throughput: iterrows streaming vs fast mode (columnar arrays)."""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.backtesting.engine import (  # noqa: E402
+    BacktestEngine,
+    BacktestState,
+    CandleSeries,
+    as_bar_view_strategy,
+)
+
+
+def build_synthetic_series(n_bars: int, seed: int = 42) -> pd.DataFrame:
+    """Geometric random-walk 1h OHLCV series."""
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2019-01-01", periods=n_bars, freq="1h", tz="UTC")
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n_bars)))
+    spread = np.abs(rng.normal(0.0, 0.004, n_bars))
+    return pd.DataFrame(
+        {
+            "open": close * (1 - spread / 2),
+            "high": close * (1 + spread),
+            "low": close * (1 - spread),
+            "close": close,
+            "volume": rng.uniform(50.0, 500.0, n_bars),
+            "atr": close * 0.01,
+        },
+        index=idx,
+    )
+
+
+class CrossoverStrategy:
+    """Cheap stateful strategy so the benchmark measures engine overhead, not signal logic."""
+
+    supports_bar_view = True
+
+    def __init__(self, fast: int = 12, slow: int = 48) -> None:
+        self.fast_alpha = 2.0 / (fast + 1)
+        self.slow_alpha = 2.0 / (slow + 1)
+        self.fast_ema: float | None = None
+        self.slow_ema: float | None = None
+
+    def on_bar(self, ctx):
+        close = float(ctx["bar"]["close"])
+        if self.fast_ema is None:
+            self.fast_ema = self.slow_ema = close
+            return {"action": "hold"}
+        prev_diff = self.fast_ema - self.slow_ema
+        self.fast_ema += self.fast_alpha * (close - self.fast_ema)
+        self.slow_ema += self.slow_alpha * (close - self.slow_ema)
+        diff = self.fast_ema - self.slow_ema
+        if prev_diff <= 0 < diff and ctx["position"] is None:
+            return {"action": "enter", "side": "BUY", "entry_price": close, "stop_loss": close * 0.97}
+        if prev_diff >= 0 > diff and ctx["position"] is not None:
+            return {"action": "exit"}
+        return {"action": "hold"}
+
+
+class LegacyCrossoverStrategy(CrossoverStrategy):
+    """Same logic without BarView support (exercises SeriesBarStrategyAdapter)."""
+
+    supports_bar_view = False
+
+
+class SyntheticEngine(BacktestEngine):
+    """Engine that serves the synthetic frame instead of curated parquet."""
+
+    def __init__(self, frame: pd.DataFrame, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._frame = frame
+
+    def _load_candle_series(self, request):
+        return CandleSeries(symbol=request.instrument, timeframe=request.timeframe, data=self._frame.copy())
+
+
+def _empty_state() -> BacktestState:
+    return BacktestState(
+        equity_theoretical=10_000.0,
+        equity_realistic=10_000.0,
+        peak_equity=10_000.0,
+        current_drawdown=0.0,
+        position=None,
+        open_trades=[],
+        closed_trades=[],
+        partial_fills=[],
+        rejected_orders=[],
+        active_orders=[],
+        equity_curve=pd.DataFrame(),
+        returns_daily=[],
+        returns_weekly=[],
+        returns_monthly=[],
+    )
+
+
+def bench_feed(frame: pd.DataFrame, *, fast: bool, strategy_cls: type) -> float:
+    """Bars/sec for bar iteration + context build + strategy call only."""
+    series = CandleSeries(symbol="BTCUSDT", timeframe="1h", data=frame.copy())
+    state = _empty_state()
+    strategy = strategy_cls()
+    start = time.perf_counter()
+    if fast:
+        strategy = as_bar_view_strategy(strategy)
+        bars = series.stream_views()
+    else:
+        bars = series.stream()
+    for bar in bars:
+        strategy.on_bar(state.build_context(bar))
+    return len(frame) / (time.perf_counter() - start)
+
+
+def bench_full_run(frame: pd.DataFrame, *, fast: bool, strategy_cls: type) -> float:
+    """Bars/sec for a complete run_backtest (no order book, no frictions)."""
+    engine = SyntheticEngine(frame, use_orderbook=False, slippage_model="none")
+    start = time.perf_counter()
+    asyncio.run(
+        engine.run_backtest(
+            frame.index[0],
+            frame.index[-1],
+            strategy=strategy_cls(),
+            fast_mode=fast,
+        )
+    )
+    return len(frame) / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark BacktestEngine fast mode")
+    parser.add_argument("--bars", type=int, default=50_000, help="Synthetic series length (default: 50000)")
+    parser.add_argument(
+        "--full-run-bars",
+        type=int,
+        default=None,
+        help="Bars used for the full run_backtest comparison (default: same as --bars)",
+    )
+    parser.add_argument("--skip-full-run", action="store_true", help="Only benchmark the bar feed")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    frame = build_synthetic_series(args.bars, seed=args.seed)
+    rows = [
+        ("feed", "iterrows", bench_feed(frame, fast=False, strategy_cls=CrossoverStrategy)),
+        ("feed", "fast (adapter)", bench_feed(frame, fast=True, strategy_cls=LegacyCrossoverStrategy)),
+        ("feed", "fast (BarView)", bench_feed(frame, fast=True, strategy_cls=CrossoverStrategy)),
+    ]
+
+    if not args.skip_full_run:
+        full_frame = frame.iloc[: args.full_run_bars] if args.full_run_bars else frame
+        rows.append(("run_backtest", "iterrows", bench_full_run(full_frame, fast=False, strategy_cls=CrossoverStrategy)))
+        rows.append(("run_backtest", "fast (BarView)", bench_full_run(full_frame, fast=True, strategy_cls=CrossoverStrategy)))
+
+    print(f"\nBacktest loop benchmark ({args.bars} synthetic 1h bars)")
+    print(f"{'phase':<14}{'mode':<18}{'bars/sec':>14}")
+    baseline: dict[str, float] = {}
+    for phase, mode, rate in rows:
+        baseline.setdefault(phase, rate)
+        speedup = rate / baseline[phase]
+        print(f"{phase:<14}{mode:<18}{rate:>14,.0f}  ({speedup:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
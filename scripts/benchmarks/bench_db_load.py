@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Load test: API read latency on SQLite while a scheduler-like writer commits in the background."""
+import argparse
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import create_engine, text
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.core.database import create_async_db_engine, create_db_engine  # noqa: E402
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY, ts REAL, payload TEXT)"
+READ_QUERY = text("SELECT id, ts, payload FROM events ORDER BY id DESC LIMIT 50")
+
+
+def seed_database(path: Path, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+        conn.execute(
+            text("INSERT INTO events (ts, payload) VALUES (:ts, :payload)"),
+            [{"ts": float(i), "payload": "x" * 200} for i in range(rows)],
+        )
+    engine.dispose()
+
+
+def writer_loop(engine, stop: threading.Event, batch: int, pause: float, stats: dict[str, int]) -> None:
+    """Commit batches like the scheduler jobs do (auto-close, exposure alerts, ingestion logs)."""
+    while not stop.is_set():
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    text("INSERT INTO events (ts, payload) VALUES (:ts, :payload)"),
+                    [{"ts": time.time(), "payload": "w" * 200} for _ in range(batch)],
+                )
+                # Hold the write transaction briefly, as a job doing several statements would
+                time.sleep(pause / 4)
+            stats["writes"] += 1
+        except Exception:
+            stats["write_errors"] += 1
+        time.sleep(pause)
+
+
+async def run_readers(read_once, *, clients: int, requests: int) -> tuple[np.ndarray, int]:
+    latencies: list[float] = []
+    errors = 0
+
+    async def client() -> None:
+        nonlocal errors
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                await read_once()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            # Yield like an event loop serving other requests between queries
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return np.asarray(latencies), errors
+
+
+def measure(mode: str, path: Path, args: argparse.Namespace) -> dict[str, float]:
+    url = f"sqlite:///{path}"
+    if mode == "legacy":
+        # Previous setup: default rollback journal, no busy timeout, sync session on the loop
+        sync_engine = create_engine(url, connect_args={"check_same_thread": False})
+    else:
+        sync_engine = create_db_engine(url)
+    async_engine = create_async_db_engine(url) if mode == "async" else None
+
+    async def read_sync() -> None:
+        with sync_engine.connect() as conn:
+            conn.execute(READ_QUERY).fetchall()
+
+    async def read_async() -> None:
+        async with async_engine.connect() as conn:
+            (await conn.execute(READ_QUERY)).fetchall()
+
+    stop = threading.Event()
+    stats = {"writes": 0, "write_errors": 0}
+    writer = threading.Thread(
+        target=writer_loop, args=(sync_engine, stop, args.write_batch, args.write_pause, stats), daemon=True
+    )
+    writer.start()
+    started = time.perf_counter()
+    try:
+        latencies, errors = asyncio.run(
+            run_readers(read_async if async_engine else read_sync, clients=args.clients, requests=args.requests)
+        )
+    finally:
+        stop.set()
+        writer.join()
+        if async_engine is not None:
+            asyncio.run(async_engine.dispose())
+        sync_engine.dispose()
+    elapsed = time.perf_counter() - started
+
+    if latencies.size == 0:
+        latencies = np.array([float("nan")])
+    return {
+        "p50": float(np.percentile(latencies, 50)),
+        "p95": float(np.percentile(latencies, 95)),
+        "p99": float(np.percentile(latencies, 99)),
+        "throughput": latencies.size / elapsed,
+        "read_errors": errors,
+        "writes": stats["writes"],
+        "write_errors": stats["write_errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--write-batch", type=int, default=200)
+    parser.add_argument("--write-pause", type=float, default=0.02)
+    parser.add_argument("--modes", nargs="+", default=["legacy", "wal", "async"], choices=["legacy", "wal", "async"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'reads/s':>9} {'r.err':>6} {'writes':>7} {'w.err':>6}")
+    for mode in args.modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "load.db"
+            seed_database(path, args.rows)
+            row = measure(mode, path, args)
+        print(
+            f"{mode:<8} {row['p50']:>9.2f} {row['p95']:>9.2f} {row['p99']:>9.2f} {row['throughput']:>9.0f} "
+            f"{row['read_errors']:>6} {row['writes']:>7} {row['write_errors']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
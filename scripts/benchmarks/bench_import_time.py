@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Cold-start import time of the API and the main scripts, with a per-module breakdown."""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[2] / "backend"
+TARGETS = ["app.main", "app.scripts.curate", "app.scripts.backfill", "app.scripts.check_gaps"]
+# Heavy optional libraries that only specific endpoints and jobs need
+HEAVY = ["matplotlib", "sklearn", "scipy", "hmmlearn"]
+
+
+def profile_import(module: str) -> tuple[float, list[tuple[int, int, str]]]:
+    """Import ``module`` in a fresh interpreter; wall seconds and ``-X importtime`` rows."""
+    env = {**os.environ, "PYTHONPATH": str(BACKEND), "PYTHONDONTWRITEBYTECODE": "1"}
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return wall, rows
+
+
+def by_package(rows: list[tuple[int, int, str]]) -> dict[str, int]:
+    """Self time summed per top-level package (``app`` split one level deeper)."""
+    totals: dict[str, int] = defaultdict(int)
+    for self_us, _, name in rows:
+        parts = name.split(".")
+        key = ".".join(parts[:2]) if parts[0] == "app" and len(parts) > 1 else parts[0]
+        totals[key] += self_us
+    return dict(totals)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--targets", nargs="+", default=TARGETS, help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold imports per target; the best is reported")
+    parser.add_argument("--top", type=int, default=15, help="Modules and packages listed per target")
+    parser.add_argument("--budget", type=float, default=None, help="Fail when a target's best wall time exceeds it (seconds)")
+    parser.add_argument("--forbid", nargs="*", default=HEAVY, help="Fail when a target imports any of these packages")
+    args = parser.parse_args()
+
+    failures = []
+    summary = []
+    for target in args.targets:
+        runs = [profile_import(target) for _ in range(args.repeat)]
+        wall, rows = min(runs, key=lambda run: run[0])
+        summary.append((target, wall, len(rows)))
+
+        print(f"\n== {target}: {wall:.2f}s wall, {len(rows)} modules")
+        print(f"{'self ms':>9} {'cum ms':>9}  module")
+        for self_us, cumulative_us, name in sorted(rows, reverse=True)[: args.top]:
+            print(f"{self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}  {name}")
+        print(f"{'self ms':>9}  package")
+        for package, self_us in sorted(by_package(rows).items(), key=lambda item: -item[1])[: args.top]:
+            print(f"{self_us / 1000:>9.1f}  {package}")
+
+        loaded = {name.split(".")[0] for _, _, name in rows}
+        heavy = sorted(loaded & set(args.forbid))
+        if heavy:
+            failures.append(f"{target} imports {', '.join(heavy)} at startup")
+        if args.budget is not None and wall > args.budget:
+            failures.append(f"{target} took {wall:.2f}s (budget {args.budget:.2f}s)")
+
+    print(f"\n{'target':<24} {'seconds':>8} {'modules':>8}")
+    for target, wall, modules in summary:
+        print(f"{target:<24} {wall:>8.2f} {modules:>8}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
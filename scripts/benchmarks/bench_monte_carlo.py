@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark the batched Monte Carlo kernel against the path-by-path loops it replaces."""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.backtesting.advanced_metrics import MetricsReport  # noqa: E402
+from app.backtesting.ruin_simulation import monte_carlo_ruin  # noqa: E402
+
+
+def legacy_ruin(returns: pd.Series, *, n_paths: int, horizon: int, seed: int) -> tuple[float, list[float]]:
+    """Previous monte_carlo_ruin loop (equity 10000, ruin at 50%)."""
+    equity, threshold = 10_000.0, 5_000.0
+    rng = np.random.default_rng(seed)
+    finals, ruined = [], 0
+    for _ in range(n_paths):
+        path_returns = returns.iloc[rng.integers(0, len(returns), size=horizon)].values
+        path = [equity]
+        for ret in path_returns:
+            path.append(path[-1] * (1 + ret))
+            if path[-1] <= threshold:
+                ruined += 1
+                break
+        finals.append(path[-1])
+    return ruined / n_paths, finals
+
+
+def legacy_bootstrap(returns: pd.Series, *, trials: int, seed: int) -> dict[str, dict[str, float]]:
+    """Previous MetricsReport._bootstrap_confidence_intervals loop (with equity curve)."""
+    rng = np.random.default_rng(seed)
+    n = len(returns)
+    samples: dict[str, list[float]] = {"cagr": [], "sharpe": [], "calmar": []}
+    for _ in range(trials):
+        sample = returns.iloc[rng.integers(0, n, size=n)]
+        total_return = (1 + sample).prod() - 1
+        years = n / 252.0
+        cagr = ((1 + total_return) ** (1 / years) - 1) * 100 if total_return > -1 else 0.0
+        std = sample.std(ddof=1)
+        annual_vol = std * np.sqrt(252) if std > 0 else 0.0
+        sharpe = (sample.mean() * 252 / annual_vol) if annual_vol > 0 else 0.0
+        equity = [10_000.0]
+        for ret in sample:
+            equity.append(equity[-1] * (1 + ret))
+        series = pd.Series(equity)
+        peak = series.expanding().max()
+        max_dd = abs(((series - peak) / peak).min()) * 100
+        samples["cagr"].append(cagr)
+        samples["sharpe"].append(sharpe)
+        samples["calmar"].append(cagr / max_dd if max_dd > 0 else 0.0)
+    return {
+        name: {f"p{q}": float(np.percentile(values, q)) for q in (5, 50, 95)}
+        for name, values in samples.items()
+    }
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the batched Monte Carlo kernel")
+    parser.add_argument("--paths", type=int, default=10_000, help="Paths / bootstrap trials (default: 10000)")
+    parser.add_argument("--horizon", type=int, default=250, help="Steps per path (default: 250)")
+    parser.add_argument("--trades", type=int, default=300, help="Size of the synthetic return sample (default: 300)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per kernel; the best time is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    returns = pd.Series(np.random.default_rng(args.seed).normal(0.003, 0.02, args.trades))
+    bootstrap_returns = returns.iloc[: args.horizon].reset_index(drop=True)
+
+    def kernel_ruin() -> tuple[float, list[float]]:
+        result = monte_carlo_ruin(returns, n_paths=args.paths, horizon_trades=args.horizon, seed=args.seed)
+        return result.ruin_probability, result.distribution
+
+    def kernel_bootstrap() -> dict[str, dict[str, float]]:
+        return MetricsReport._bootstrap_confidence_intervals(
+            bootstrap_returns,
+            equity_curve=[10_000.0],
+            initial_capital=10_000.0,
+            trials=args.paths,
+            seed=args.seed,
+        )
+
+    cases = [
+        (
+            "monte_carlo_ruin",
+            lambda: legacy_ruin(returns, n_paths=args.paths, horizon=args.horizon, seed=args.seed),
+            kernel_ruin,
+        ),
+        (
+            "bootstrap CIs",
+            lambda: legacy_bootstrap(bootstrap_returns, trials=args.paths, seed=args.seed),
+            kernel_bootstrap,
+        ),
+    ]
+
+    print(f"\nMonte Carlo benchmark ({args.paths} paths x {args.horizon} steps)")
+    print(f"{'simulation':<20}{'loop':>12}{'kernel':>12}{'speedup':>10}{'identical':>11}")
+    for name, legacy, kernel in cases:
+        legacy_time, expected = time_call(legacy, 1)
+        kernel_time, actual = time_call(kernel, args.repeat)
+        identical = actual == expected
+        print(
+            f"{name:<20}{legacy_time * 1000:>10.0f}ms{kernel_time * 1000:>10.1f}ms"
+            f"{legacy_time / kernel_time:>9.0f}x{'yes' if identical else 'NO':>11}"
+        )
+        if not identical:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
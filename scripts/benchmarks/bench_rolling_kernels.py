@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark vectorised rolling kernels against the rolling.apply implementations they replace."""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.indicators.rolling import (  # noqa: E402
+    rolling_max,
+    rolling_min,
+    rolling_slope,
+    rolling_std,
+    rolling_weighted_mean,
+)
+
+
+def build_synthetic_series(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Random-walk typical price and volume."""
+    rng = np.random.default_rng(seed)
+    price = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.004, n_rows)))
+    return pd.DataFrame({"price": price, "volume": rng.uniform(50.0, 500.0, n_rows)})
+
+
+def legacy_vwap(frame: pd.DataFrame) -> np.ndarray:
+    """Previous DataCuration rolling_vwap_anchored."""
+    return (
+        frame["price"]
+        .rolling(window=55, min_periods=30)
+        .apply(lambda x: np.average(x, weights=frame["volume"].loc[x.index]))
+        .to_numpy()
+    )
+
+
+def legacy_slope(frame: pd.DataFrame, window: int = 20) -> np.ndarray:
+    """Previous factors.slope (np.polyfit per window)."""
+    x = np.arange(window)
+    return frame["price"].rolling(window).apply(lambda y: np.polyfit(x, np.array(y), 1)[0], raw=False).to_numpy()
+
+
+def time_call(func: Callable[[], np.ndarray], repeat: int) -> tuple[float, np.ndarray]:
+    best = float("inf")
+    result = np.empty(0)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark vectorised rolling kernels")
+    parser.add_argument("--rows", type=int, default=100_000, help="Series length (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per kernel; the best time is reported")
+    parser.add_argument("--legacy-repeat", type=int, default=1, help="Runs per rolling.apply baseline")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    frame = build_synthetic_series(args.rows, seed=args.seed)
+    price = frame["price"].to_numpy()
+    volume = frame["volume"].to_numpy()
+
+    cases = [
+        (
+            "weighted VWAP (55/30)",
+            lambda: legacy_vwap(frame),
+            lambda: rolling_weighted_mean(price, volume, 55, min_periods=30),
+        ),
+        (
+            "OLS slope (20)",
+            lambda: legacy_slope(frame),
+            lambda: rolling_slope(price, 20),
+        ),
+        (
+            "max (14)",
+            lambda: frame["price"].rolling(14).apply(np.nanmax).to_numpy(),
+            lambda: rolling_max(price, 14),
+        ),
+        (
+            "min (14)",
+            lambda: frame["price"].rolling(14).apply(np.nanmin).to_numpy(),
+            lambda: rolling_min(price, 14),
+        ),
+        (
+            "std (90)",
+            lambda: frame["price"].rolling(90).apply(lambda y: np.std(y, ddof=1), raw=True).to_numpy(),
+            lambda: rolling_std(price, 90),
+        ),
+    ]
+
+    print(f"\nRolling kernel benchmark ({args.rows} rows)")
+    print(f"{'kernel':<24}{'rolling.apply':>16}{'vectorised':>14}{'speedup':>10}{'max rel err':>14}")
+    for name, legacy, kernel in cases:
+        legacy_time, expected = time_call(legacy, args.legacy_repeat)
+        kernel_time, actual = time_call(kernel, args.repeat)
+        mask = ~np.isnan(expected)
+        if not np.array_equal(mask, ~np.isnan(actual)):
+            print(f"{name:<24} NaN layout differs from the baseline")
+            return 1
+        scale = np.maximum(np.abs(expected[mask]), 1e-12)
+        error = float(np.max(np.abs(actual[mask] - expected[mask]) / scale)) if mask.any() else 0.0
+        print(
+            f"{name:<24}{legacy_time * 1000:>14.1f}ms{kernel_time * 1000:>12.1f}ms"
+            f"{legacy_time / kernel_time:>9.0f}x{error:>14.2e}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
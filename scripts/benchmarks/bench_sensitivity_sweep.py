@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark SensitivityRunner sweeps: serial vs process pool over shared memory-mapped candles."""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.backtesting.engine import BacktestEngine, CandleSeries  # noqa: E402
+from app.backtesting.sensitivity import SensitivityRunner  # noqa: E402
+from app.backtesting.sweep import default_workers  # noqa: E402
+from app.quant.config_manager import active_signal_params  # noqa: E402
+
+# Built in main(); workers inherit it, but only the parent reads it (workers get the mmap export)
+FRAME: pd.DataFrame | None = None
+
+
+def build_synthetic_series(n_bars: int, seed: int = 42) -> pd.DataFrame:
+    """Geometric random-walk 1h OHLCV series."""
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2019-01-01", periods=n_bars, freq="1h", tz="UTC")
+    close = 30_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.006, n_bars)))
+    spread = np.abs(rng.normal(0.0, 0.004, n_bars))
+    return pd.DataFrame(
+        {
+            "open": close * (1 - spread / 2),
+            "high": close * (1 + spread),
+            "low": close * (1 - spread),
+            "close": close,
+            "volume": rng.uniform(50.0, 500.0, n_bars),
+            "atr": close * 0.01,
+        },
+        index=idx,
+    )
+
+
+class BreakoutStrategy:
+    """Channel breakout whose lookback comes from the active signal params."""
+
+    supports_bar_view = True
+
+    def __init__(self) -> None:
+        self.highs: list[float] = []
+
+    def on_bar(self, ctx):
+        lookback = int(active_signal_params().get("breakout", {}).get("lookback", 20))
+        bar = ctx["bar"]
+        close = float(bar["close"])
+        window = self.highs[-lookback:]
+        self.highs.append(float(bar["high"]))
+        if len(window) < lookback:
+            return {"action": "hold"}
+        if close > max(window) and ctx["position"] is None:
+            return {"action": "enter", "side": "BUY", "entry_price": close, "stop_loss": close * 0.97}
+        if close < min(window) and ctx["position"] is not None:
+            return {"action": "exit"}
+        return {"action": "hold"}
+
+
+class SyntheticEngine(BacktestEngine):
+    """Engine that serves the synthetic frame instead of curated parquet."""
+
+    def __init__(self, **kwargs) -> None:
+        kwargs.setdefault("use_orderbook", False)
+        kwargs.setdefault("slippage_model", "none")
+        super().__init__(**kwargs)
+
+    def _load_candle_series(self, request):
+        return CandleSeries(symbol=request.instrument, timeframe=request.timeframe, data=FRAME.copy())
+
+
+def main() -> int:
+    global FRAME
+    parser = argparse.ArgumentParser(description="Benchmark parallel sensitivity sweeps")
+    parser.add_argument("--bars", type=int, default=5_000, help="Synthetic series length (default: 5000)")
+    parser.add_argument("--grid", type=int, default=16, help="Number of breakout.lookback values (default: 16)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Worker counts to compare (default: 1, 2, 4, ... up to the core count)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    FRAME = build_synthetic_series(args.bars, seed=args.seed)
+    cores = default_workers()
+    worker_counts = args.workers or sorted({1, *[2 ** k for k in range(1, 8) if 2 ** k <= cores], cores})
+    grid = {"breakout.lookback": list(range(10, 10 + 2 * args.grid, 2))}
+    runner = SensitivityRunner(engine_factory=SyntheticEngine)
+
+    print(f"\nSensitivity sweep benchmark ({args.grid} runs x {args.bars} bars, {cores} cores)")
+    print(f"{'workers':>8}{'seconds':>12}{'runs/sec':>12}{'speedup':>10}")
+    baseline = None
+    reference = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = runner.run(
+            grid,
+            start_date=FRAME.index[0],
+            end_date=FRAME.index[-1],
+            base_params={"engine_args": {"strategy": BreakoutStrategy(), "fast_mode": True}},
+            workers=workers,
+        )
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        if reference is None:
+            reference = results
+        elif not results.equals(reference):
+            print(f"{workers:>8} results differ from the first run")
+            return 1
+        print(f"{workers:>8}{elapsed:>12.2f}{args.grid / elapsed:>12.2f}{baseline / elapsed:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
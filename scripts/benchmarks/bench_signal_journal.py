@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Signal-outcome logging throughput: per-event commits vs the buffered journal and set-based updates."""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, String, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.core.database import create_db_engine  # noqa: E402
+from app.db.models import RecommendationORM, SignalOutcomeORM  # noqa: E402
+from app.signals.journal import SignalJournal  # noqa: E402
+from app.signals.loggers import SignalLogRecord, signal_row_values, update_signal_outcomes  # noqa: E402
+
+BENCH_SCHEMA = "bench_signal_journal"
+FILLERS = {String: "x", Float: 1.0, Integer: 1, Boolean: False, DateTime: datetime(2024, 1, 1)}
+
+
+def make_session_factory(url: str):
+    """Engine on a scratch database (SQLite) or a throwaway schema (Postgres)."""
+    engine = create_db_engine(url)
+    tables = [RecommendationORM.__table__, SignalOutcomeORM.__table__]
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+            conn.execute(text(f"CREATE SCHEMA {BENCH_SCHEMA}"))
+        engine = engine.execution_options(schema_translate_map={None: BENCH_SCHEMA})
+    RecommendationORM.metadata.create_all(engine, tables=tables)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def drop_scratch(engine) -> None:
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def seed_recommendations(session_factory, count: int) -> list[int]:
+    """Minimal recommendation rows, so outcome updates have real foreign keys."""
+    row = {}
+    for column in RecommendationORM.__table__.columns:
+        if column.primary_key or column.nullable or column.default is not None:
+            continue
+        row[column.key] = next((value for kind, value in FILLERS.items() if isinstance(column.type, kind)), "x")
+    with session_factory() as db:
+        ids = list(db.scalars(insert(RecommendationORM).returning(RecommendationORM.id), [row] * count))
+        db.commit()
+    return ids
+
+
+def make_records(recommendation_ids: list[int], events: int) -> list[SignalLogRecord]:
+    return [
+        SignalLogRecord(
+            strategy_id=f"strategy_{i % 8}",
+            signal="BUY" if i % 2 else "SELL",
+            confidence_raw=0.5 + (i % 40) / 100,
+            recommendation_id=recommendation_ids[i % len(recommendation_ids)],
+            market_regime="balanced",
+            vol_bucket="low",
+            features_regimen={"volatility": 0.4, "skew": -0.1, "volume": 1.2},
+            metadata={"votes": {"trend": 1, "breakout": 0}, "entry_range": {"min": 1.0, "max": 2.0}},
+            outcome="open",
+            horizon_minutes=1440,
+        )
+        for i in range(events)
+    ]
+
+
+def legacy_insert(session_factory, records: list[SignalLogRecord]) -> None:
+    """One session, INSERT, commit and refresh per emission (previous ``log_signal_event``)."""
+    for record in records:
+        db = session_factory()
+        try:
+            orm = SignalOutcomeORM(**signal_row_values(record))
+            db.add(orm)
+            db.commit()
+            db.refresh(orm)
+        finally:
+            db.close()
+
+
+def journal_insert(session_factory, records: list[SignalLogRecord], batch: int) -> None:
+    journal = SignalJournal(max_batch=batch, flush_interval=3600, session_factory=session_factory, background=False)
+    for record in records:
+        journal.log(record)
+    journal.close()
+
+
+def legacy_outcomes(session_factory, outcomes: dict[int, tuple[str, float]]) -> None:
+    """SELECT the latest row, update it and commit, per recommendation (previous behaviour)."""
+    for recommendation_id, (outcome, pnl_pct) in outcomes.items():
+        with session_factory() as db:
+            row = db.scalars(
+                select(SignalOutcomeORM)
+                .where(SignalOutcomeORM.recommendation_id == recommendation_id)
+                .order_by(SignalOutcomeORM.id.desc())
+                .limit(1)
+            ).first()
+            row.outcome = outcome
+            row.pnl_pct = pnl_pct
+            db.commit()
+
+
+def set_based_outcomes(session_factory, outcomes: dict[int, tuple[str, float]], chunk: int) -> None:
+    items = list(outcomes.items())
+    with session_factory() as db:
+        for start in range(0, len(items), chunk):
+            update_signal_outcomes(dict(items[start : start + chunk]), session=db)
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def bench_backend(label: str, url: str, args) -> None:
+    engine, session_factory = make_session_factory(url)
+    try:
+        recommendation_ids = seed_recommendations(session_factory, args.recommendations)
+        records = make_records(recommendation_ids, args.events)
+        outcomes = {rec_id: ("win" if rec_id % 3 else "loss", (rec_id % 17) / 10) for rec_id in recommendation_ids}
+
+        print(f"\n== {label}: {args.events} emissions, {len(outcomes)} outcome updates")
+        print(f"{'mode':<22} {'seconds':>9} {'rows/s':>10} {'speedup':>8}")
+        runs = [("insert per-event", timed(legacy_insert, session_factory, records))]
+        for batch in args.batches:
+            runs.append((f"insert journal b={batch}", timed(journal_insert, session_factory, records, batch)))
+        runs.append(("update per-row", timed(legacy_outcomes, session_factory, outcomes)))
+        runs.append(("update set-based", timed(set_based_outcomes, session_factory, outcomes, args.update_chunk)))
+
+        for name, seconds in runs:
+            baseline = runs[0][1] if name.startswith("insert") else runs[-2][1]
+            rows = args.events if name.startswith("insert") else len(outcomes)
+            print(f"{name:<22} {seconds:>9.3f} {rows / seconds:>10.0f} {baseline / seconds:>7.1f}x")
+    finally:
+        drop_scratch(engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000, help="Signal emissions to write per mode")
+    parser.add_argument("--recommendations", type=int, default=1000, help="Recommendations the emissions and outcomes refer to")
+    parser.add_argument("--batches", type=int, nargs="+", default=[50, 500], help="Journal batch sizes to compare")
+    parser.add_argument("--update-chunk", type=int, default=500, help="Recommendations per set-based UPDATE")
+    parser.add_argument("--postgres-url", default=None, help="Also run against this database (in a throwaway schema)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_backend("sqlite", f"sqlite:///{Path(tmp) / 'signals.db'}", args)
+    if args.postgres_url:
+        bench_backend("postgresql", args.postgres_url, args)
+
+
+if __name__ == "__main__":
+    main()
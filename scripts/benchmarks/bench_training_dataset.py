@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Training-set build time: per-row queries and MetaLearner calls vs set-based reads and vectorized features."""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+# Add backend and repository root to path
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "backend"))
+sys.path.insert(0, str(ROOT))
+
+from app.core.database import create_db_engine  # noqa: E402
+from app.db.models import SignalOutcomeORM  # noqa: E402
+from app.strategies.meta_learner import MetaLearner  # noqa: E402
+from scripts.confidence.build_dataset import ConfidenceDatasetBuilder, DatasetFilters  # noqa: E402
+from scripts.strategies.train_meta_learner import build_training_set, write_training_set  # noqa: E402
+
+STRATEGIES = [*MetaLearner.STRATEGY_NAMES, "funding_carry"]
+
+
+def seed_outcomes(session_factory, recommendations: int, per_recommendation: int, seed: int) -> int:
+    """A year of closed recommendations, each with one row per voting strategy."""
+    rng = np.random.default_rng(seed)
+    start = datetime.utcnow() - timedelta(days=364)
+    step = timedelta(days=364) / recommendations
+    rows = []
+    for rec_id in range(1, recommendations + 1):
+        decided = start + step * rec_id
+        regime = str(rng.choice(MetaLearner.REGIMES))
+        vol_bucket = str(rng.choice(MetaLearner.VOL_BUCKETS))
+        features = {"volatility_30": float(rng.random()), "atr_14": float(rng.random() * 400), "rsi": float(rng.random() * 100)}
+        outcome = str(rng.choice(["win", "loss"]))
+        for strategy in rng.choice(STRATEGIES, size=per_recommendation, replace=False):
+            rows.append(
+                {
+                    "recommendation_id": rec_id,
+                    "strategy_id": str(strategy),
+                    "signal": str(rng.choice(["BUY", "SELL", "HOLD"])),
+                    "decision_timestamp": decided,
+                    "confidence_raw": float(rng.random() * 100),
+                    "market_regime": regime,
+                    "vol_bucket": vol_bucket,
+                    "features_regimen": features,
+                    "context_metadata": {"votes": {"trend": 1}},
+                    "outcome": outcome,
+                    "pnl_pct": float(rng.normal()),
+                    "horizon_minutes": 1440,
+                }
+            )
+    with session_factory() as db:
+        db.execute(insert(SignalOutcomeORM), rows)
+        db.commit()
+    return len(rows)
+
+
+def legacy_meta_learner(session_factory, regime: str | None) -> int:
+    """Previous ``load_training_data``: one query and one MetaLearner per outcome row."""
+    cutoff = datetime.utcnow() - timedelta(days=365)
+    with session_factory() as db:
+        stmt = select(SignalOutcomeORM).where(
+            SignalOutcomeORM.decision_timestamp >= cutoff,
+            SignalOutcomeORM.outcome.isnot(None),
+            SignalOutcomeORM.outcome != "open",
+            SignalOutcomeORM.pnl_pct.isnot(None),
+        )
+        if regime:
+            stmt = stmt.where(SignalOutcomeORM.market_regime == regime)
+        records = []
+        for row in db.scalars(stmt.order_by(SignalOutcomeORM.decision_timestamp)).all():
+            related = (
+                db.scalars(select(SignalOutcomeORM).where(SignalOutcomeORM.recommendation_id == row.recommendation_id)).all()
+                if row.recommendation_id
+                else [row]
+            )
+            signals = [{"strategy": sig.strategy_id, "signal": sig.signal, "confidence": sig.confidence_raw} for sig in related]
+            regime_features = {
+                "regime": row.market_regime or "neutral",
+                "vol_bucket": row.vol_bucket or "unknown",
+                "features_regimen": row.features_regimen or {},
+            }
+            volatility = {}
+            if row.features_regimen:
+                volatility = {
+                    "volatility": row.features_regimen.get("volatility_30", 0.0),
+                    "atr": row.features_regimen.get("atr_14", 0.0),
+                }
+            records.append(MetaLearner().build_features(signals, regime_features, volatility))
+    return len(records)
+
+
+def bulk_meta_learner(session_factory, regime: str | None, out_dir: Path) -> int:
+    with session_factory() as db:
+        frame = build_training_set(db, regime=regime)
+    write_training_set(frame, out_dir / "meta_learner")
+    return len(frame)
+
+
+def confidence_dataset(session_factory, out_dir: Path) -> int:
+    with session_factory() as db:
+        builder = ConfidenceDatasetBuilder(db, output_dir=out_dir / "confidence", manifest_path=out_dir / "manifest.json")
+        return builder.build(DatasetFilters())["rows"]
+
+
+def timed(fn, *args) -> tuple[float, int]:
+    start = time.perf_counter()
+    rows = fn(*args)
+    return time.perf_counter() - start, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recommendations", type=int, default=3000, help="Closed recommendations spread over one year")
+    parser.add_argument("--per-recommendation", type=int, default=4, help="Strategy rows logged per recommendation")
+    parser.add_argument("--regime", default=None, help="Restrict the meta-learner builds to one regime")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the set-based builders")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        engine = create_db_engine(f"sqlite:///{tmp_dir / 'outcomes.db'}")
+        SignalOutcomeORM.metadata.create_all(engine, tables=[SignalOutcomeORM.__table__])
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        try:
+            total = seed_outcomes(session_factory, args.recommendations, args.per_recommendation, args.seed)
+            print(f"\n== {total} signal_outcomes rows ({args.recommendations} recommendations, one year)")
+            print(f"{'mode':<24} {'seconds':>9} {'rows':>8} {'rows/s':>10} {'speedup':>8}")
+            runs = []
+            if not args.skip_legacy:
+                runs.append(("meta-learner per-row", *timed(legacy_meta_learner, session_factory, args.regime)))
+            runs.append(("meta-learner set-based", *timed(bulk_meta_learner, session_factory, args.regime, tmp_dir)))
+            runs.append(("confidence dataset", *timed(confidence_dataset, session_factory, tmp_dir)))
+
+            baseline = runs[0][1]
+            for name, seconds, rows in runs:
+                speedup = f"{baseline / seconds:>7.1f}x" if name.startswith("meta-learner") else f"{'-':>8}"
+                print(f"{name:<24} {seconds:>9.3f} {rows:>8} {rows / seconds:>10.0f} {speedup}")
+        finally:
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
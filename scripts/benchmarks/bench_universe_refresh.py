@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Wall-clock time of a full universe refresh against a local stub exchange server."""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+import httpx
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from app.data.exchanges import (  # noqa: E402
+    BinanceFuturesUSDTDataSource,
+    BitstampDataSource,
+    BybitPerpetualDataSource,
+    CoinbaseDataSource,
+    HTTPConnectionPool,
+)
+from app.data.multi_ingestion import MultiVenueIngestion  # noqa: E402
+
+OPEN_MS = 1_700_000_000_000
+SOURCES = (BinanceFuturesUSDTDataSource, CoinbaseDataSource, BitstampDataSource, BybitPerpetualDataSource)
+
+
+def stub_payload(path: str, candles: int):
+    """Response bodies in each venue's format, with ``candles`` one-minute rows."""
+    rows = range(candles)
+    if path == "/fapi/v1/klines":
+        return [
+            [OPEN_MS + i * 60_000, "1", "2", "0.5", "1.5", "10", OPEN_MS + i * 60_000 + 59_999, "15", 3, "5", "7"]
+            for i in rows
+        ]
+    if path == "/fapi/v1/depth":
+        return {"T": OPEN_MS, "bids": [["1.4", "2"]] * 50, "asks": [["1.6", "3"]] * 50}
+    if path.endswith("/candles"):
+        return [[OPEN_MS // 1000 + i * 60, 0.5, 2, 1, 1.5, 20] for i in rows]
+    if path.endswith("/book"):
+        return {"bids": [["1.4", "2", 1]] * 50, "asks": [["1.6", "3", 1]] * 50}
+    if "/v2/ohlc/" in path:
+        ohlc = [
+            {"timestamp": OPEN_MS // 1000 + i * 60, "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 30}
+            for i in rows
+        ]
+        return {"data": {"ohlc": ohlc}}
+    if "/v2/order_book/" in path:
+        return {"timestamp": OPEN_MS // 1000, "bids": [["1.4", "2"]] * 50, "asks": [["1.6", "3"]] * 50}
+    if path == "/v5/market/kline":
+        return {
+            "result": {
+                "list": [
+                    [OPEN_MS + i * 60_000, "1", "2", "0.5", "1.5", "40", OPEN_MS + i * 60_000 + 59_999, "60"]
+                    for i in rows
+                ]
+            }
+        }
+    if path == "/v5/market/orderbook":
+        return {"result": {"ts": OPEN_MS, "b": [["1.4", "2"]] * 50, "a": [["1.6", "3"]] * 50}}
+    return None
+
+
+def start_stub_server(latency: float, connect_latency: float, candles: int) -> tuple[ThreadingHTTPServer, dict]:
+    """Keep-alive HTTP/1.1 server; ``connect_latency`` is paid once per connection (TCP + TLS setup)."""
+    stats = {"connections": 0, "requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            with lock:
+                stats["connections"] += 1
+            time.sleep(connect_latency)
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            with lock:
+                stats["requests"] += 1
+            time.sleep(latency)
+            payload = stub_payload(urlparse(self.path).path, candles)
+            body = json.dumps(payload).encode() if payload is not None else b"{}"
+            self.send_response(200 if payload is not None else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+class FreshConnectionPool(HTTPConnectionPool):
+    """Previous behaviour: a new ``httpx.AsyncClient`` (new connection) per request."""
+
+    async def request(self, venue, method, url, *, params=None, headers=None, timeout=None):
+        async with httpx.AsyncClient(timeout=timeout or 10.0) as client:
+            response = await client.request(method, url, params=params, headers=headers)
+            response.raise_for_status()
+            return response
+
+
+def build_sources(pool: HTTPConnectionPool, base_url: str):
+    sources = []
+    for source_cls in SOURCES:
+        source = source_cls(pool=pool)
+        # Bitstamp paths live under /api on the real venue
+        source.base_url = f"{base_url}/api" if source_cls is BitstampDataSource else base_url
+        sources.append(source)
+    return sources
+
+
+def noop_writer(frame, path, metadata):
+    return {"checksum": None}
+
+
+async def refresh(mode: str, base_url: str, symbols: list[str], intervals: list[str], concurrency: int) -> int:
+    pool = FreshConnectionPool(rate_limits={}) if mode == "legacy" else HTTPConnectionPool(rate_limits={})
+    ingestion = MultiVenueIngestion(
+        sources=build_sources(pool, base_url),
+        writer=noop_writer,
+        max_concurrency=concurrency if mode == "concurrent" else 1,
+    )
+    try:
+        if mode == "concurrent":
+            results = await ingestion.ingest_universe(symbols, intervals)
+        else:
+            # One request at a time, symbol by symbol, as before
+            results = [await ingestion.ingest_interval(symbol, interval) for symbol in symbols for interval in intervals]
+    finally:
+        await pool.aclose()
+    return sum(1 for result in results if result["status"] == "success")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--intervals", nargs="+", default=["1m", "15m", "1h", "4h"])
+    parser.add_argument("--latency", type=float, default=0.03, help="Server time per request, in seconds")
+    parser.add_argument("--connect-latency", type=float, default=0.02, help="Setup cost per new connection")
+    parser.add_argument("--candles", type=int, default=200, help="Rows per candle response")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--modes", nargs="+", default=["legacy", "pooled", "concurrent"], choices=["legacy", "pooled", "concurrent"]
+    )
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    pairs = len(symbols) * len(args.intervals)
+    print(f"{pairs} symbol/interval pairs x {len(SOURCES)} venues x 2 requests = {pairs * len(SOURCES) * 2} requests")
+    print(f"{'mode':<11} {'seconds':>9} {'pairs ok':>9} {'conns':>7} {'req/s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Ingestion creates data/raw partitions relative to the working directory
+        os.chdir(tmp)
+        for mode in args.modes:
+            server, stats = start_stub_server(args.latency, args.connect_latency, args.candles)
+            base_url = f"http://127.0.0.1:{server.server_address[1]}"
+            started = time.perf_counter()
+            ok = asyncio.run(refresh(mode, base_url, symbols, args.intervals, args.concurrency))
+            elapsed = time.perf_counter() - started
+            server.shutdown()
+            server.server_close()
+            print(
+                f"{mode:<11} {elapsed:>9.2f} {ok:>9} {stats['connections']:>7} {stats['requests'] / elapsed:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
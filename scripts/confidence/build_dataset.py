@@ -13,9 +13,6 @@ from typing import Iterable, Sequence
 
 import click
 import pandas as pd
-import pyarrow as pa
-import pyarrow.dataset as ds
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -25,12 +22,22 @@ if str(BACKEND_PATH) not in sys.path:
 
 from app.core.database import SessionLocal, Base  # noqa: E402
 from app.db.models import SignalOutcomeORM  # noqa: E402
+from app.signals.outcomes import json_fields, load_signal_outcomes, outcomes_frame, write_partitioned  # noqa: E402
 from app.utils.hashing import get_git_commit_hash  # noqa: E402
 
 
 DEFAULT_ARTIFACT_DIR = REPO_ROOT / "artifacts" / "confidence"
 DEFAULT_OUTPUT_DIR = DEFAULT_ARTIFACT_DIR / "datasets"
 MANIFEST_PATH = DEFAULT_ARTIFACT_DIR / "datasets.json"
+REGIME_FEATURE_DEFAULTS = {
+    "momentum_alignment": 0.0,
+    "vol_regime_1h": 1,
+    "vol_regime_4h": 1,
+    "vol_regime_1d": 1,
+    "slope_1h": 0.0,
+    "slope_ratio": 0.0,
+    "mom_1h": 0.0,
+}
 
 
 @dataclass
@@ -59,59 +66,50 @@ class ConfidenceDatasetBuilder:
 
     def build(self, filters: DatasetFilters) -> dict:
         rows = self._fetch_rows(filters)
-        if not rows:
+        if rows.empty:
             raise click.ClickException("No se encontraron señales con los filtros proporcionados.")
         df = self._normalize_dataframe(rows)
         dataset_path = self._write_partitioned(df)
         metadata = self._persist_manifest(df, dataset_path, filters)
         return metadata
 
-    def _fetch_rows(self, filters: DatasetFilters) -> list[SignalOutcomeORM]:
-        stmt = select(SignalOutcomeORM)
-        if filters.start_date:
-            stmt = stmt.where(SignalOutcomeORM.decision_timestamp >= filters.start_date)
-        if filters.end_date:
-            stmt = stmt.where(SignalOutcomeORM.decision_timestamp <= filters.end_date)
-        if filters.market_regimes:
-            stmt = stmt.where(SignalOutcomeORM.market_regime.in_(filters.market_regimes))
-        if filters.vol_buckets:
-            stmt = stmt.where(SignalOutcomeORM.vol_bucket.in_(filters.vol_buckets))
-        stmt = stmt.order_by(SignalOutcomeORM.decision_timestamp.asc())
-        result = self.session.execute(stmt)
-        return list(result.scalars().all())
+    def _fetch_rows(self, filters: DatasetFilters) -> pd.DataFrame:
+        return load_signal_outcomes(
+            self.session,
+            since=filters.start_date,
+            until=filters.end_date,
+            market_regimes=filters.market_regimes,
+            vol_buckets=filters.vol_buckets,
+        )
 
-    def _normalize_dataframe(self, rows: Sequence[SignalOutcomeORM]) -> pd.DataFrame:
-        records: list[dict] = []
-        for row in rows:
-            records.append(
-                {
-                    "signal_id": row.id,
-                    "strategy_id": row.strategy_id,
-                    "recommendation_id": row.recommendation_id,
-                    "decision_timestamp": row.decision_timestamp,
-                    "confidence_raw": float(row.confidence_raw or 0.0),
-                    "confidence_calibrated": float(row.confidence_calibrated)
-                    if row.confidence_calibrated is not None
-                    else None,
-                    "market_regime": (row.market_regime or "unknown").lower(),
-                    "vol_bucket": (row.vol_bucket or "unknown").lower(),
-                    "horizon_minutes": int(row.horizon_minutes or 0),
-                    "pnl_pct": float(row.pnl_pct) if row.pnl_pct is not None else None,
-                    "outcome": (row.outcome or "open").lower(),
-                    "features_regimen": row.features_regimen or {},
-                    "metadata": row.metadata or {},
-                }
-            )
-        df = pd.DataFrame.from_records(records)
-        if df.empty:
-            return df
+    def _normalize_dataframe(self, rows: pd.DataFrame | Sequence[SignalOutcomeORM]) -> pd.DataFrame:
+        source = rows if isinstance(rows, pd.DataFrame) else outcomes_frame(rows)
+        if source.empty:
+            return pd.DataFrame()
+        source = source.reset_index(drop=True)
+        df = pd.DataFrame(
+            {
+                "signal_id": source["id"],
+                "strategy_id": source["strategy_id"],
+                "recommendation_id": source["recommendation_id"],
+                "decision_timestamp": source["decision_timestamp"],
+                "confidence_raw": pd.to_numeric(source["confidence_raw"]).fillna(0.0).astype(float),
+                "confidence_calibrated": pd.to_numeric(source["confidence_calibrated"]).astype(float),
+                "market_regime": _label(source["market_regime"], "unknown"),
+                "vol_bucket": _label(source["vol_bucket"], "unknown"),
+                "horizon_minutes": pd.to_numeric(source["horizon_minutes"]).fillna(0).astype(int),
+                "pnl_pct": pd.to_numeric(source["pnl_pct"]).astype(float),
+                "outcome": _label(source["outcome"], "open"),
+                "features_regimen": source["features_regimen"].map(lambda val: val or {}),
+                "metadata": source["metadata"].map(lambda val: val or {}),
+            }
+        )
         df["confidence_raw"] = df["confidence_raw"].clip(lower=0.0, upper=100.0)
         df["confidence_calibrated"] = df["confidence_calibrated"].fillna(df["confidence_raw"]).clip(lower=0.0, upper=100.0)
         df["confidence_norm"] = df["confidence_raw"] / 100.0
         df["confidence_calibrated_norm"] = df["confidence_calibrated"] / 100.0
         df["pnl_pct"] = df["pnl_pct"].fillna(0.0)
         df["pnl_decimal"] = df["pnl_pct"] / 100.0
-        df["horizon_minutes"] = df["horizon_minutes"].astype(int)
         df["horizon_hours"] = (df["horizon_minutes"] / 60.0).round(3)
         df["hit"] = ((df["outcome"] == "win") | (df["pnl_pct"] >= 0.0)).astype(int)
         df["horizon_return_pct"] = df["pnl_pct"]
@@ -121,7 +119,7 @@ class ConfidenceDatasetBuilder:
         df = self._compute_aggregated_features(df)
         
         df["features_regimen"] = df["features_regimen"].apply(lambda val: json.dumps(val, sort_keys=True))
-        df["metadata"] = df["metadata"].apply(lambda val: json.dumps(val, sort_keys=True))
+        df["metadata"] = df["metadata"].apply(lambda val: json.dumps(val, sort_keys=True, default=str))
         return df
     
     def _compute_aggregated_features(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -129,60 +127,21 @@ class ConfidenceDatasetBuilder:
         if df.empty:
             return df
         
-        # Agregar features de régimen desde features_regimen
-        def extract_regime_features(features_dict: dict) -> dict:
-            if not isinstance(features_dict, dict):
-                return {}
-            return {
-                "momentum_alignment": features_dict.get("momentum_alignment", 0.0),
-                "vol_regime_1h": features_dict.get("vol_regime_1h", 1),
-                "vol_regime_4h": features_dict.get("vol_regime_4h", 1),
-                "vol_regime_1d": features_dict.get("vol_regime_1d", 1),
-                "slope_1h": features_dict.get("slope_1h", 0.0),
-                "slope_ratio": features_dict.get("slope_ratio", 0.0),
-                "mom_1h": features_dict.get("mom_1h", 0.0),
-            }
-        
-        # Extraer features del JSON string si es necesario
-        if df["features_regimen"].dtype == "object":
-            try:
-                features_list = df["features_regimen"].apply(
-                    lambda x: extract_regime_features(json.loads(x) if isinstance(x, str) else (x if isinstance(x, dict) else {}))
-                )
-                for key in ["momentum_alignment", "vol_regime_1h", "vol_regime_4h", "vol_regime_1d", "slope_1h", "slope_ratio", "mom_1h"]:
-                    df[f"feature_{key}"] = features_list.apply(lambda d: d.get(key, 0.0))
-            except Exception:
-                pass
-        
-        # Features agregadas por régimen y vol_bucket (rolling window)
-        df = df.sort_values("decision_timestamp")
-        for regime in df["market_regime"].unique():
-            regime_mask = df["market_regime"] == regime
-            for vol_bucket in df["vol_bucket"].unique():
-                bucket_mask = df["vol_bucket"] == vol_bucket
-                combined_mask = regime_mask & bucket_mask
-                if not combined_mask.any():
-                    continue
-                
-                # Rolling hit rate (últimas 50 señales)
-                df.loc[combined_mask, "rolling_hit_rate_50"] = (
-                    df.loc[combined_mask, "hit"].rolling(window=50, min_periods=1).mean()
-                )
-                
-                # Rolling confidence promedio
-                df.loc[combined_mask, "rolling_confidence_mean_50"] = (
-                    df.loc[combined_mask, "confidence_norm"].rolling(window=50, min_periods=1).mean()
-                )
-                
-                # Rolling PnL promedio
-                df.loc[combined_mask, "rolling_pnl_mean_50"] = (
-                    df.loc[combined_mask, "pnl_decimal"].rolling(window=50, min_periods=1).mean()
-                )
+        # Features de régimen desde features_regimen (una columna por clave)
+        regime_features = json_fields(df["features_regimen"], REGIME_FEATURE_DEFAULTS)
+        for key in REGIME_FEATURE_DEFAULTS:
+            df[f"feature_{key}"] = regime_features[key]
         
-        # Fill NaN con valores por defecto
-        for col in ["rolling_hit_rate_50", "rolling_confidence_mean_50", "rolling_pnl_mean_50"]:
-            if col in df.columns:
-                df[col] = df[col].fillna(0.0)
+        # Features agregadas por régimen y vol_bucket (ventana móvil de 50 señales)
+        df = df.sort_values("decision_timestamp", kind="mergesort")
+        groups = df.groupby(["market_regime", "vol_bucket"], sort=False)
+        for column, source in (
+            ("rolling_hit_rate_50", "hit"),
+            ("rolling_confidence_mean_50", "confidence_norm"),
+            ("rolling_pnl_mean_50", "pnl_decimal"),
+        ):
+            rolling = groups[source].rolling(window=50, min_periods=1).mean()
+            df[column] = rolling.reset_index(level=[0, 1], drop=True).fillna(0.0)
         
         return df
 
@@ -191,14 +150,7 @@ class ConfidenceDatasetBuilder:
         timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         target_dir = self.output_dir / f"{timestamp}_{dataset_id}"
         target_dir.mkdir(parents=True, exist_ok=True)
-        table = pa.Table.from_pandas(df)
-        ds.write_dataset(
-            table,
-            base_dir=str(target_dir),
-            format="parquet",
-            partitioning=ds.partitioning(field_names=["market_regime", "vol_bucket"]),
-            existing_data_behavior="overwrite_or_ignore",
-        )
+        write_partitioned(df, target_dir, ["market_regime", "vol_bucket"])
         return target_dir
 
     def _persist_manifest(self, df: pd.DataFrame, dataset_path: Path, filters: DatasetFilters) -> dict:
@@ -237,6 +189,11 @@ class ConfidenceDatasetBuilder:
         return metadata
 
 
+def _label(values: pd.Series, default: str) -> pd.Series:
+    """Lower-cased labels, with ``default`` for null or empty values."""
+    return values.fillna("").astype(str).replace("", default).str.lower()
+
+
 def _parse_list(ctx, param, value: str | None) -> list[str] | None:
     if not value:
         return None
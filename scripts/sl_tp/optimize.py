@@ -2,6 +2,7 @@
 """CLI script for SL/TP optimization with walk-forward validation."""
 import argparse
 import sys
+import time
 from pathlib import Path
 
 import pandas as pd
@@ -147,6 +148,12 @@ Examples:
         type=float,
         help="TP ratio values (overrides default search space)",
     )
+    parser.add_argument(
+        "--breakeven-buffer",
+        nargs="+",
+        type=float,
+        help="Breakeven buffer values as fraction of the TP distance (overrides default search space)",
+    )
     parser.add_argument(
         "--benchmark-rr",
         type=float,
@@ -175,7 +182,7 @@ Examples:
 
     # Build search space if custom values provided
     search_space = None
-    if args.atr_sl or args.atr_tp or args.tp_ratio:
+    if args.atr_sl or args.atr_tp or args.tp_ratio or args.breakeven_buffer:
         search_space = {}
         if args.atr_sl:
             search_space["atr_multiplier_sl"] = args.atr_sl
@@ -183,6 +190,8 @@ Examples:
             search_space["atr_multiplier_tp"] = args.atr_tp
         if args.tp_ratio:
             search_space["tp_ratio"] = args.tp_ratio
+        if args.breakeven_buffer:
+            search_space["breakeven_buffer_pct"] = args.breakeven_buffer
 
     # Initialize optimizer
     optimizer = StopLossTakeProfitOptimizer(
@@ -195,6 +204,7 @@ Examples:
     # Run optimization
     logger.info(f"Starting optimization for {args.symbol}" + (f" (regime: {args.regime})" if args.regime else ""))
     try:
+        started = time.perf_counter()
         results = optimizer.optimize(
             trades=trades_df,
             symbol=args.symbol,
@@ -203,6 +213,9 @@ Examples:
             search_space=search_space,
             method=args.method,
         )
+        logger.info(
+            f"Scored {len(trades_df)} trades across {len(results)} regime(s) in {time.perf_counter() - started:.2f}s"
+        )
 
         if not results:
             logger.error("No optimization results generated")
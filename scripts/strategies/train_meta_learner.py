@@ -3,136 +3,91 @@ from __future__ import annotations
 
 import argparse
 import json
+import shutil
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from sqlalchemy import select, and_
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
 from app.core.logging import logger
-from app.db.models import SignalOutcomeORM
+from app.signals.outcomes import load_recommendation_signals, load_signal_outcomes, write_partitioned
 from app.strategies.meta_learner import MetaLearner
 
 
-def load_training_data(
+def build_training_set(
     session: Session,
     regime: str | None = None,
     lookback_days: int = 365,
-    min_samples: int = 100,
-) -> tuple[pd.DataFrame, pd.Series]:
+) -> pd.DataFrame:
     """
-    Load training data from signal_outcomes.
-    
+    Feature matrix and target for every closed signal in the lookback window.
+
+    Outcomes are read in one query and the strategy signals of their
+    recommendations in a few ``recommendation_id IN (...)`` queries; features
+    are built for all rows at once with ``MetaLearner.build_feature_matrix``.
+
     Args:
         session: Database session
         regime: Optional regime filter
         lookback_days: Days to look back
-        min_samples: Minimum samples required
-    
+
     Returns:
-        Tuple of (X, y) where X is features and y is target (1=BUY win, 0=otherwise)
+        One row per signal: identifiers, ``market_regime``, ``target`` and
+        ``feature_00`` .. ``feature_NN``
     """
     cutoff_date = datetime.utcnow() - timedelta(days=lookback_days)
-
-    # Query signal outcomes with outcomes
-    stmt = (
-        select(SignalOutcomeORM)
-        .where(
-            and_(
-                SignalOutcomeORM.decision_timestamp >= cutoff_date,
-                SignalOutcomeORM.outcome.isnot(None),
-                SignalOutcomeORM.outcome != "open",
-                SignalOutcomeORM.pnl_pct.isnot(None),
-            )
-        )
-        .order_by(SignalOutcomeORM.decision_timestamp)
+    outcomes = load_signal_outcomes(
+        session,
+        since=cutoff_date,
+        market_regimes=[regime] if regime else None,
+        closed_only=True,
     )
+    related = load_recommendation_signals(session, outcomes["recommendation_id"])
+    features = MetaLearner.build_feature_matrix(outcomes, related)
+
+    # Target: 1 if BUY signal and win (outcome "win" or pnl > 0)
+    is_win = (outcomes["outcome"] == "win") | (outcomes["pnl_pct"] > 0)
+    target = ((outcomes["signal"] == "BUY") & is_win).astype(int)
+
+    frame = pd.DataFrame(
+        {
+            "signal_id": outcomes["id"],
+            "recommendation_id": outcomes["recommendation_id"],
+            "decision_timestamp": outcomes["decision_timestamp"],
+            "signal": outcomes["signal"],
+            "market_regime": outcomes["market_regime"],
+            "outcome": outcomes["outcome"],
+            "pnl_pct": outcomes["pnl_pct"],
+            "target": target,
+        }
+    )
+    feature_columns = [f"feature_{i:02d}" for i in range(features.shape[1])]
+    frame = pd.concat([frame, pd.DataFrame(features, columns=feature_columns, index=frame.index)], axis=1)
 
-    if regime:
-        stmt = stmt.where(SignalOutcomeORM.market_regime == regime)
-
-    rows = session.execute(stmt).scalars().all()
+    invalid = ~np.isfinite(features).all(axis=1)
+    if invalid.any():
+        logger.warning(f"Dropping {int(invalid.sum())} rows with non-numeric features")
+        frame = frame[~invalid]
+    return frame
 
-    if len(rows) < min_samples:
-        raise ValueError(
-            f"Insufficient samples: {len(rows)} < {min_samples} "
-            f"(regime={regime}, lookback_days={lookback_days})"
-        )
 
-    # Build feature matrix
-    records = []
-    for row in rows:
-        # Get all signals for this recommendation_id (same timestamp)
-        if row.recommendation_id:
-            related_signals = session.execute(
-                select(SignalOutcomeORM).where(
-                    SignalOutcomeORM.recommendation_id == row.recommendation_id
-                )
-            ).scalars().all()
-        else:
-            related_signals = [row]
-
-        # Build strategy signals list
-        strategy_signals = []
-        for sig in related_signals:
-            strategy_signals.append({
-                "strategy": sig.strategy_id,
-                "signal": sig.signal,
-                "confidence": sig.confidence_raw,
-            })
-
-        # Build regime features
-        regime_features = {
-            "regime": row.market_regime or "neutral",
-            "vol_bucket": row.vol_bucket or "unknown",
-            "features_regimen": row.features_regimen or {},
-        }
+def training_matrix(
+    frame: pd.DataFrame,
+    regime: str | None = None,
+    min_samples: int = 100,
+) -> tuple[pd.DataFrame, pd.Series]:
+    """Split a ``build_training_set`` frame into ``(X, y)`` for one regime."""
+    if regime:
+        frame = frame[frame["market_regime"] == regime]
+    if len(frame) < min_samples:
+        raise ValueError(f"Insufficient samples: {len(frame)} < {min_samples} (regime={regime})")
 
-        # Build volatility state (extract from features_regimen if available)
-        volatility_state = {}
-        if row.features_regimen:
-            volatility_state = {
-                "volatility": row.features_regimen.get("volatility_30", 0.0),
-                "atr": row.features_regimen.get("atr_14", 0.0),
-            }
-
-        # Build features using MetaLearner
-        learner = MetaLearner()
-        try:
-            features = learner.build_features(
-                strategy_signals,
-                regime_features,
-                volatility_state,
-            )
-
-            # Target: 1 if BUY signal and win, or SELL signal and win (pnl > 0)
-            is_win = row.outcome == "win" or (row.pnl_pct is not None and row.pnl_pct > 0)
-            is_buy = row.signal == "BUY"
-            target = 1 if (is_buy and is_win) or (not is_buy and not is_win and is_win) else 0
-
-            records.append({
-                "features": features,
-                "target": target,
-                "signal": row.signal,
-                "outcome": row.outcome,
-                "pnl_pct": row.pnl_pct,
-            })
-        except Exception as exc:
-            logger.warning(f"Failed to build features for row {row.id}: {exc}")
-            continue
-
-    if len(records) < min_samples:
-        raise ValueError(f"Insufficient valid samples after feature building: {len(records)} < {min_samples}")
-
-    # Convert to DataFrame
-    df = pd.DataFrame(records)
-
-    # Extract features and target
-    X = np.vstack(df["features"].values)
-    y = df["target"].values
+    feature_columns = [col for col in frame.columns if col.startswith("feature_")]
+    X = frame[feature_columns].to_numpy()
+    y = frame["target"].to_numpy()
 
     logger.info(
         "Loaded training data",
@@ -147,6 +102,40 @@ def load_training_data(
     return pd.DataFrame(X), pd.Series(y)
 
 
+def load_training_data(
+    session: Session,
+    regime: str | None = None,
+    lookback_days: int = 365,
+    min_samples: int = 100,
+) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Load training data from signal_outcomes.
+    
+    Args:
+        session: Database session
+        regime: Optional regime filter
+        lookback_days: Days to look back
+        min_samples: Minimum samples required
+    
+    Returns:
+        Tuple of (X, y) where X is features and y is target (1=BUY win, 0=otherwise)
+    """
+    frame = build_training_set(session, regime=regime, lookback_days=lookback_days)
+    return training_matrix(frame, regime=regime, min_samples=min_samples)
+
+
+def write_training_set(frame: pd.DataFrame, base_dir: Path) -> Path:
+    """Write the training set as Parquet partitioned by regime (``market_regime=<name>/``)."""
+    # Partitions from a previous run would mix with this one
+    for stale in base_dir.glob("market_regime=*"):
+        shutil.rmtree(stale)
+    return write_partitioned(
+        frame.assign(market_regime=frame["market_regime"].fillna("unknown")),
+        base_dir,
+        ["market_regime"],
+    )
+
+
 def train_model(
     X: pd.DataFrame,
     y: pd.Series,
@@ -206,6 +195,12 @@ def main():
         default="artifacts/meta_learner",
         help="Output directory for models (default: artifacts/meta_learner)",
     )
+    parser.add_argument(
+        "--dataset-dir",
+        type=str,
+        default=None,
+        help="Where to write the training set as partitioned Parquet (default: <output-dir>/dataset)",
+    )
     args = parser.parse_args()
 
     logger.info(
@@ -226,17 +221,25 @@ def main():
     try:
         regimes_to_train = ["bull", "bear", "range", "neutral"] if args.regime == "all" else [args.regime]
 
+        # One pass over signal_outcomes for every regime
+        training_set = build_training_set(
+            session,
+            regime=None if args.regime == "all" else args.regime,
+            lookback_days=args.lookback_days,
+        )
+        dataset_dir = Path(args.dataset_dir) if args.dataset_dir else output_dir / "dataset"
+        write_training_set(training_set, dataset_dir)
+        logger.info(
+            "Training set written",
+            extra={"rows": len(training_set), "dataset_dir": str(dataset_dir)},
+        )
+
         for regime in regimes_to_train:
             try:
                 logger.info(f"Training model for regime: {regime}")
 
                 # Load data
-                X, y = load_training_data(
-                    session,
-                    regime=regime if regime != "all" else None,
-                    lookback_days=args.lookback_days,
-                    min_samples=args.min_samples,
-                )
+                X, y = training_matrix(training_set, regime=regime, min_samples=args.min_samples)
 
                 # Train model
                 learner, metrics = train_model(X, y, model_type=args.model_type, regime=regime)
@@ -285,6 +288,8 @@ def main():
             "trained_at": datetime.utcnow().isoformat(),
             "model_type": args.model_type,
             "lookback_days": args.lookback_days,
+            "n_samples": len(training_set),
+            "dataset_dir": str(dataset_dir),
             "results": results,
         }
         with open(summary_path, "w") as f:
@@ -5,6 +5,7 @@ from unittest.mock import Mock
 import pandas as pd
 
 from app.backtesting.engine import BacktestEngine, BacktestState, CandleSeries
+from app.backtesting.equity_ledger import EquityLedger
 from app.backtesting.position import Position, PositionSide
 
 
@@ -26,7 +27,7 @@ def engine():
 
 
 def test_equity_curve_dataframe_structure(engine):
-    """Test that equity curve is stored as DataFrame with correct columns."""
+    """Test that equity curve is stored as a ledger that materializes the canonical DataFrame."""
     initial_timestamp = pd.Timestamp("2020-01-01")
     initial_capital = 10000.0
     
@@ -55,8 +56,8 @@ def test_equity_curve_dataframe_structure(engine):
     )
     
     # Verify structure
-    assert isinstance(state.equity_curve, pd.DataFrame)
-    assert list(state.equity_curve.columns) == ["timestamp", "equity_theoretical", "equity_realistic", "equity_divergence_pct"]
+    assert isinstance(state.equity_curve, EquityLedger)
+    assert list(state.equity_curve.to_frame().columns) == ["timestamp", "equity_theoretical", "equity_realistic", "equity_divergence_pct"]
     assert len(state.equity_curve) == 1
 
 
@@ -97,7 +98,7 @@ def test_equity_divergence_calculation(engine):
     state.update_equity(theoretical, realistic, timestamp)
     
     # Check divergence
-    latest = state.equity_curve.iloc[-1]
+    latest = state.equity_curve.to_frame().iloc[-1]
     assert latest["equity_theoretical"] == theoretical
     assert latest["equity_realistic"] == realistic
     expected_divergence = ((realistic - theoretical) / theoretical) * 100.0
@@ -142,7 +143,7 @@ def test_equity_realistic_never_exceeds_theoretical(engine):
     state.update_equity(theoretical, realistic, timestamp)
     
     # Check that divergence is recorded
-    latest = state.equity_curve.iloc[-1]
+    latest = state.equity_curve.to_frame().iloc[-1]
     assert latest["equity_divergence_pct"] > 0.0  # Positive divergence (invalid)
 
 
@@ -347,9 +348,10 @@ def test_equity_curve_query_by_timestamp(engine):
     start_ts = pd.Timestamp("2020-01-01 02:00:00")
     end_ts = pd.Timestamp("2020-01-01 05:00:00")
     
-    filtered = state.equity_curve[
-        (state.equity_curve["timestamp"] >= start_ts) &
-        (state.equity_curve["timestamp"] <= end_ts)
+    equity_curve = state.equity_curve.to_frame()
+    filtered = equity_curve[
+        (equity_curve["timestamp"] >= start_ts) &
+        (equity_curve["timestamp"] <= end_ts)
     ]
     
     assert len(filtered) == 4  # 02:00, 03:00, 04:00, 05:00